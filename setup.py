@@ -12,6 +12,7 @@ setup(
         "fastapi>=0.104.1",
         "uvicorn>=0.24.0",
         "sqlalchemy>=2.0.23",
+        "aiosqlite>=0.19.0",
         "pydantic>=2.5.0",
         "python-dotenv>=1.0.0",
         "pytest>=7.4.3",
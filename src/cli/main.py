@@ -2,6 +2,7 @@
 Interface CLI interativa para o Sistema de Biblioteca
 """
 import sys
+from functools import cached_property
 from pathlib import Path
 
 # Adiciona o diretório raiz ao path
@@ -18,21 +19,51 @@ from src.models.usuario import Usuario
 from src.models.emprestimo import Emprestimo
 from src.models.autor import Autor
 from src.models.categoria import Categoria
+from src.repositories.paginacao import Pagina
 from datetime import date
-from typing import Optional
+from typing import Any, Callable, Optional
 
 
 class BibliotecaCLI:
     """Interface CLI interativa para o sistema de biblioteca"""
     
+    # Registros por página nas telas de listagem
+    TAMANHO_PAGINA = 20
+    
+    # Colunas lidas pelas telas de listagem (projeção, sem hidratar entidades)
+    CAMPOS_LIVRO = ("id", "titulo", "disponivel", "quantidade_disponivel")
+    CAMPOS_USUARIO = ("id", "nome", "email", "ativo")
+    CAMPOS_EMPRESTIMO = ("id", "livro_id", "usuario_id", "devolvido")
+    CAMPOS_NOME = ("id", "nome")
+    
     def __init__(self):
-        """Inicializa a CLI"""
-        self.session = db_config.get_session()
-        self.livro_service = LivroService(self.session)
-        self.usuario_service = UsuarioService(self.session)
-        self.emprestimo_service = EmprestimoService(self.session)
-        self.autor_service = AutorService(self.session)
-        self.categoria_service = CategoriaService(self.session)
+        """Inicializa a CLI (a sessão e os serviços são criados no primeiro uso)"""
+        self.db_config = db_config
+    
+    @cached_property
+    def session(self):
+        """Sessão do banco, aberta apenas quando alguma operação precisa dela"""
+        return self.db_config.get_session()
+    
+    @cached_property
+    def livro_service(self) -> LivroService:
+        return LivroService(self.session)
+    
+    @cached_property
+    def usuario_service(self) -> UsuarioService:
+        return UsuarioService(self.session)
+    
+    @cached_property
+    def emprestimo_service(self) -> EmprestimoService:
+        return EmprestimoService(self.session)
+    
+    @cached_property
+    def autor_service(self) -> AutorService:
+        return AutorService(self.session)
+    
+    @cached_property
+    def categoria_service(self) -> CategoriaService:
+        return CategoriaService(self.session)
     
     def exibir_menu_principal(self):
         """Exibe o menu principal"""
@@ -60,6 +91,7 @@ class BibliotecaCLI:
         print("5. Deletar livro")
         print("6. Buscar livros disponíveis")
         print("7. Buscar com filtros")
+        print("8. Livros mais emprestados")
         print("0. Voltar")
         print("="*60)
     
@@ -140,6 +172,39 @@ class BibliotecaCLI:
             except ValueError:
                 print("❌ Data inválida. Use o formato YYYY-MM-DD (ex: 1990-05-15)")
     
+    def exibir_paginas(
+        self,
+        buscar_pagina: Callable[[Optional[str]], Pagina],
+        exibir_item: Callable[[Any], None],
+        titulo: str,
+        vazio: str
+    ) -> None:
+        """
+        Exibe resultados página a página, seguindo o cursor de cada página
+        
+        Args:
+            buscar_pagina: Função que recebe o cursor (None na primeira) e devolve a página
+            exibir_item: Função que imprime um item
+            titulo: Cabeçalho exibido quando há resultados
+            vazio: Mensagem exibida quando não há resultados
+        """
+        pagina = buscar_pagina(None)
+        if not pagina.itens:
+            print(vazio)
+            return
+        
+        print(titulo)
+        numero = 1
+        while True:
+            for item in pagina:
+                exibir_item(item)
+            if not pagina.tem_proxima:
+                return
+            if input(f"-- Página {numero}. Enter para a próxima ou 'q' para parar: ").strip().lower() == "q":
+                return
+            pagina = buscar_pagina(pagina.proximo_cursor)
+            numero += 1
+    
     def processar_menu_livros(self):
         """Processa o menu de livros"""
         while True:
@@ -162,6 +227,8 @@ class BibliotecaCLI:
                 self.buscar_livros_disponiveis()
             elif opcao == "7":
                 self.buscar_livros_filtros()
+            elif opcao == "8":
+                self.listar_livros_mais_emprestados()
             else:
                 print("❌ Opção inválida!")
     
@@ -258,16 +325,22 @@ class BibliotecaCLI:
                 print("❌ Opção inválida!")
     
     # Métodos para Livros
+    def exibir_livro_resumo(self, livro) -> None:
+        """Imprime a linha de um livro nas listagens (entidade ou linha projetada)"""
+        disponivel = livro.disponivel and livro.quantidade_disponivel > 0
+        print(f"  ID: {livro.id} | {livro.titulo} | Disponível: {'Sim' if disponivel else 'Não'}")
+    
     def listar_livros(self):
         """Lista todos os livros"""
         try:
-            livros = self.livro_service.listar_todos()
-            if not livros:
-                print("\n📚 Nenhum livro cadastrado.")
-            else:
-                print(f"\n📚 Total de livros: {len(livros)}")
-                for livro in livros:
-                    print(f"  ID: {livro.id} | {livro.titulo} | Disponível: {'Sim' if livro.esta_disponivel() else 'Não'}")
+            self.exibir_paginas(
+                lambda cursor: self.livro_service.listar_pagina(
+                    cursor, self.TAMANHO_PAGINA, campos=self.CAMPOS_LIVRO
+                ),
+                self.exibir_livro_resumo,
+                "\n📚 Livros cadastrados:",
+                "\n📚 Nenhum livro cadastrado."
+            )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -282,6 +355,7 @@ class BibliotecaCLI:
             print(f"  Título: {livro.titulo}")
             print(f"  Disponível: {'Sim' if livro.esta_disponivel() else 'Não'}")
             print(f"  Quantidade: {livro.quantidade_disponivel}/{livro.quantidade_total}")
+            print(f"  Empréstimos: {livro.total_emprestimos} ({livro.emprestimos_ativos} ativos)")
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -346,13 +420,28 @@ class BibliotecaCLI:
     def buscar_livros_disponiveis(self):
         """Busca livros disponíveis"""
         try:
-            livros = self.livro_service.buscar_disponiveis()
-            if not livros:
-                print("\n📚 Nenhum livro disponível no momento.")
-            else:
-                print(f"\n📚 Livros disponíveis ({len(livros)}):")
+            self.exibir_paginas(
+                lambda cursor: self.livro_service.buscar_pagina_com_filtros(
+                    {"disponivel": True}, cursor, self.TAMANHO_PAGINA, campos=("id", "titulo")
+                ),
+                lambda livro: print(f"  ID: {livro.id} | {livro.titulo}"),
+                f"\n📚 Livros disponíveis ({self.livro_service.contar_disponiveis()}):",
+                "\n📚 Nenhum livro disponível no momento."
+            )
+        except Exception as e:
+            print(f"❌ Erro: {e}")
+        input("\nPressione Enter para continuar...")
+    
+    def listar_livros_mais_emprestados(self):
+        """Lista os livros mais emprestados"""
+        try:
+            livros = self.livro_service.listar_mais_emprestados()
+            if livros:
+                print("\n🏆 Livros mais emprestados:")
                 for livro in livros:
-                    print(f"  ID: {livro.id} | {livro.titulo}")
+                    print(f"  ID: {livro.id} | {livro.titulo} | Empréstimos: {livro.total_emprestimos}")
+            else:
+                print("\n🏆 Nenhum livro emprestado ainda.")
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -361,36 +450,65 @@ class BibliotecaCLI:
         """Busca livros com filtros"""
         try:
             print("\nFiltros (deixe em branco para ignorar):")
-            titulo = input("Título (busca parcial): ").strip()
+            titulo = input("Título ou palavras da sinopse: ").strip()
             disponivel_input = input("Disponível? (s/n): ").strip().lower()
             disponivel = None if not disponivel_input else (disponivel_input == 's')
             
             filtros = {}
-            if titulo:
-                filtros["titulo"] = {"like": f"%{titulo}%"}
             if disponivel is not None:
                 filtros["disponivel"] = disponivel
             
-            livros = self.livro_service.buscar_com_filtros(filtros)
-            print(f"\n📚 Resultados encontrados: {len(livros)}")
-            for livro in livros:
-                print(f"  ID: {livro.id} | {livro.titulo} | Disponível: {'Sim' if livro.esta_disponivel() else 'Não'}")
+            if titulo:
+                # Títulos que começam com o texto digitado (autocompletar, sem ir ao banco)
+                sugestoes = self.livro_service.sugerir_titulos(titulo, 5)
+                if sugestoes:
+                    print("\n🔎 Títulos mais emprestados começando assim:")
+                    for sugestao in sugestoes:
+                        print(f"  ID: {sugestao.id} | {sugestao.texto} ({sugestao.popularidade} empréstimos)")
+                
+                # Busca textual: por relevância, no título e na sinopse
+                livros = self.livro_service.buscar_texto(titulo, filtros, self.TAMANHO_PAGINA)
+                print("\n📚 Resultados encontrados:" if livros else "\n📚 Nenhum livro encontrado.")
+                for livro in livros:
+                    self.exibir_livro_resumo(livro)
+                
+                if not livros:
+                    # Provável erro de digitação: títulos parecidos
+                    candidatos = self.livro_service.buscar_titulo_aproximado(titulo, 5)
+                    if candidatos:
+                        print("\n🤔 Você quis dizer:")
+                        for livro, similaridade in candidatos:
+                            print(f"  ID: {livro.id} | {livro.titulo} ({similaridade:.0%} parecido)")
+            else:
+                self.exibir_paginas(
+                    lambda cursor: self.livro_service.buscar_pagina_com_filtros(
+                        filtros, cursor, self.TAMANHO_PAGINA, campos=self.CAMPOS_LIVRO
+                    ),
+                    self.exibir_livro_resumo,
+                    "\n📚 Resultados encontrados:",
+                    "\n📚 Nenhum livro encontrado."
+                )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
     
     # Métodos para Usuários
+    def exibir_usuario_resumo(self, usuario) -> None:
+        """Imprime a linha de um usuário nas listagens (entidade ou linha projetada)"""
+        status = "Ativo" if usuario.ativo else "Inativo"
+        print(f"  ID: {usuario.id} | {usuario.nome} | {usuario.email} | {status}")
+    
     def listar_usuarios(self):
         """Lista todos os usuários"""
         try:
-            usuarios = self.usuario_service.listar_todos()
-            if not usuarios:
-                print("\n👥 Nenhum usuário cadastrado.")
-            else:
-                print(f"\n👥 Total de usuários: {len(usuarios)}")
-                for usuario in usuarios:
-                    status = "Ativo" if usuario.ativo else "Inativo"
-                    print(f"  ID: {usuario.id} | {usuario.nome} | {usuario.email} | {status}")
+            self.exibir_paginas(
+                lambda cursor: self.usuario_service.listar_pagina(
+                    cursor, self.TAMANHO_PAGINA, campos=self.CAMPOS_USUARIO
+                ),
+                self.exibir_usuario_resumo,
+                "\n👥 Usuários cadastrados:",
+                "\n👥 Nenhum usuário cadastrado."
+            )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -466,21 +584,24 @@ class BibliotecaCLI:
         """Busca usuários com filtros"""
         try:
             print("\nFiltros (deixe em branco para ignorar):")
-            nome = input("Nome (busca parcial): ").strip()
+            nome = input("Início do nome: ").strip()
             ativo_input = input("Ativo? (s/n): ").strip().lower()
             ativo = None if not ativo_input else (ativo_input == 's')
             
             filtros = {}
             if nome:
-                filtros["nome"] = {"like": f"%{nome}%"}
+                filtros["nome"] = {"iprefixo": nome}
             if ativo is not None:
                 filtros["ativo"] = ativo
             
-            usuarios = self.usuario_service.buscar_com_filtros(filtros)
-            print(f"\n👥 Resultados encontrados: {len(usuarios)}")
-            for usuario in usuarios:
-                status = "Ativo" if usuario.ativo else "Inativo"
-                print(f"  ID: {usuario.id} | {usuario.nome} | {usuario.email} | {status}")
+            self.exibir_paginas(
+                lambda cursor: self.usuario_service.buscar_pagina_com_filtros(
+                    filtros, cursor, self.TAMANHO_PAGINA, campos=self.CAMPOS_USUARIO
+                ),
+                self.exibir_usuario_resumo,
+                "\n👥 Resultados encontrados:",
+                "\n👥 Nenhum usuário encontrado."
+            )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -489,14 +610,17 @@ class BibliotecaCLI:
     def listar_emprestimos(self):
         """Lista todos os empréstimos"""
         try:
-            emprestimos = self.emprestimo_service.listar_todos()
-            if not emprestimos:
-                print("\n📋 Nenhum empréstimo cadastrado.")
-            else:
-                print(f"\n📋 Total de empréstimos: {len(emprestimos)}")
-                for emp in emprestimos:
-                    status = "Devolvido" if emp.devolvido else "Ativo"
-                    print(f"  ID: {emp.id} | Livro: {emp.livro_id} | Usuário: {emp.usuario_id} | {status}")
+            self.exibir_paginas(
+                lambda cursor: self.emprestimo_service.listar_pagina(
+                    cursor, self.TAMANHO_PAGINA, campos=self.CAMPOS_EMPRESTIMO
+                ),
+                lambda emp: print(
+                    f"  ID: {emp.id} | Livro: {emp.livro_id} | Usuário: {emp.usuario_id} | "
+                    f"{'Devolvido' if emp.devolvido else 'Ativo'}"
+                ),
+                "\n📋 Empréstimos cadastrados:",
+                "\n📋 Nenhum empréstimo cadastrado."
+            )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -546,11 +670,15 @@ class BibliotecaCLI:
         """Busca empréstimos de um usuário"""
         try:
             usuario_id = self.ler_inteiro("Digite o ID do usuário: ")
-            emprestimos = self.emprestimo_service.buscar_por_usuario(usuario_id)
+            incluir_arquivo = input("Incluir histórico arquivado? (s/N): ").strip().lower() == "s"
+            emprestimos = self.emprestimo_service.buscar_por_usuario(
+                usuario_id, incluir_arquivo, carregar="emprestimo_com_livro"
+            )
             print(f"\n📋 Empréstimos do usuário {usuario_id}: {len(emprestimos)}")
             for emp in emprestimos:
                 status = "Devolvido" if emp.devolvido else "Ativo"
-                print(f"  ID: {emp.id} | Livro: {emp.livro_id} | {status}")
+                titulo = emp.livro.titulo if emp.livro else emp.livro_id
+                print(f"  ID: {emp.id} | Livro: {titulo} | {status}")
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -558,14 +686,17 @@ class BibliotecaCLI:
     def buscar_emprestimos_atrasados(self):
         """Busca empréstimos atrasados"""
         try:
-            emprestimos = self.emprestimo_service.buscar_atrasados()
-            if not emprestimos:
+            total = self.emprestimo_service.contar_atrasados()
+            if not total:
                 print("\n📋 Nenhum empréstimo atrasado.")
             else:
-                print(f"\n📋 Empréstimos atrasados: {len(emprestimos)}")
-                for emp in emprestimos:
+                print(f"\n📋 Empréstimos atrasados: {total}")
+                for emp in self.emprestimo_service.buscar_atrasados(carregar="emprestimo_com_livro_e_usuario"):
                     dias = emp.dias_atraso()
-                    print(f"  ID: {emp.id} | Livro: {emp.livro_id} | Usuário: {emp.usuario_id} | {dias} dias de atraso")
+                    print(
+                        f"  ID: {emp.id} | Livro: {emp.livro.titulo} | "
+                        f"Usuário: {emp.usuario.nome} | {dias} dias de atraso"
+                    )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -584,13 +715,14 @@ class BibliotecaCLI:
     def listar_autores(self):
         """Lista todos os autores"""
         try:
-            autores = self.autor_service.listar_todos()
-            if not autores:
-                print("\n✍️ Nenhum autor cadastrado.")
-            else:
-                print(f"\n✍️ Total de autores: {len(autores)}")
-                for autor in autores:
-                    print(f"  ID: {autor.id} | {autor.nome}")
+            self.exibir_paginas(
+                lambda cursor: self.autor_service.listar_pagina(
+                    cursor, self.TAMANHO_PAGINA, campos=self.CAMPOS_NOME
+                ),
+                lambda autor: print(f"  ID: {autor.id} | {autor.nome}"),
+                "\n✍️ Autores cadastrados:",
+                "\n✍️ Nenhum autor cadastrado."
+            )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -658,11 +790,18 @@ class BibliotecaCLI:
     def buscar_autor_nome(self):
         """Busca autor por nome"""
         try:
-            nome = input("Digite o nome do autor (busca parcial): ")
-            autores = self.autor_service.buscar_por_nome(nome)
+            nome = input("Digite o início do nome do autor: ")
+            autores = self.autor_service.sugerir_nomes(nome, self.TAMANHO_PAGINA)
             print(f"\n✍️ Resultados encontrados: {len(autores)}")
             for autor in autores:
-                print(f"  ID: {autor.id} | {autor.nome}")
+                print(f"  ID: {autor.id} | {autor.texto}")
+            
+            if not autores:
+                candidatos = self.autor_service.buscar_nome_aproximado(nome, 5)
+                if candidatos:
+                    print("\n🤔 Você quis dizer:")
+                    for autor, similaridade in candidatos:
+                        print(f"  ID: {autor.id} | {autor.nome} ({similaridade:.0%} parecido)")
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -671,13 +810,14 @@ class BibliotecaCLI:
     def listar_categorias(self):
         """Lista todas as categorias"""
         try:
-            categorias = self.categoria_service.listar_todos()
-            if not categorias:
-                print("\n📂 Nenhuma categoria cadastrada.")
-            else:
-                print(f"\n📂 Total de categorias: {len(categorias)}")
-                for categoria in categorias:
-                    print(f"  ID: {categoria.id} | {categoria.nome}")
+            self.exibir_paginas(
+                lambda cursor: self.categoria_service.listar_pagina(
+                    cursor, self.TAMANHO_PAGINA, campos=self.CAMPOS_NOME
+                ),
+                lambda categoria: print(f"  ID: {categoria.id} | {categoria.nome}"),
+                "\n📂 Categorias cadastradas:",
+                "\n📂 Nenhuma categoria cadastrada."
+            )
         except Exception as e:
             print(f"❌ Erro: {e}")
         input("\nPressione Enter para continuar...")
@@ -769,7 +909,8 @@ class BibliotecaCLI:
         except Exception as e:
             print(f"\n❌ Erro inesperado: {e}")
         finally:
-            self.session.close()
+            if "session" in self.__dict__:
+                self.session.close()
 
 
 def main():
@@ -0,0 +1,35 @@
+"""
+Script para arquivar empréstimos devolvidos antigos
+"""
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database.config import db_config
+from src.services.arquivamento_service import ArquivamentoService
+
+
+def arquivar_emprestimos() -> int:
+    """
+    Move para o arquivo os empréstimos devolvidos há mais tempo que o configurado
+    
+    Usa o bloco ``arquivamento`` do config.json (idade_minima_dias, tamanho_lote).
+    
+    Returns:
+        Quantidade de empréstimos arquivados
+    """
+    opcoes = db_config.config.get("arquivamento", {})
+    session = db_config.get_session()
+    try:
+        service = ArquivamentoService(session, **opcoes)
+        total = service.arquivar()
+    finally:
+        session.close()
+    print(f"{total} empréstimos arquivados")
+    return total
+
+
+if __name__ == "__main__":
+    arquivar_emprestimos()
@@ -0,0 +1,109 @@
+"""
+Configuração assíncrona do banco de dados (AsyncSession)
+"""
+import os
+from typing import Any, Dict
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.database.config import DatabaseConfig, PRAGMAS_PERFORMANCE
+from src.database.routing import RoutingSession
+
+# Driver assíncrono usado quando a URL configurada não informa um
+DRIVERS_ASSINCRONOS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def url_assincrona(db_url: str) -> str:
+    """
+    Converte uma URL síncrona para o driver assíncrono correspondente
+    
+    Args:
+        db_url: URL do banco (ex.: sqlite:///./biblioteca.db)
+    
+    Returns:
+        URL com driver assíncrono (ex.: sqlite+aiosqlite:///./biblioteca.db)
+    """
+    esquema, separador, resto = db_url.partition("://")
+    dialeto = esquema.split("+", 1)[0]
+    if dialeto not in DRIVERS_ASSINCRONOS:
+        return db_url
+    return f"{DRIVERS_ASSINCRONOS[dialeto]}{separador}{resto}"
+
+
+class AsyncDatabaseConfig(DatabaseConfig):
+    """
+    Configuração do banco com engine e sessões assíncronas
+    
+    Usa o mesmo config.json (inclusive o perfil de performance) e a mesma
+    criação preguiçosa e segura para fork de DatabaseConfig; localmente o
+    SQLite é acessado pelo driver aiosqlite.
+    """
+    
+    def _new_engine(self, db_url: str, **kwargs):
+        """Cria uma AsyncEngine para a URL convertida"""
+        return create_async_engine(url_assincrona(db_url), **kwargs)
+    
+    def _create_session_factory(self, engine) -> async_sessionmaker:
+        """Cria a fábrica de AsyncSession (sem expirar objetos no commit)"""
+        info = self._session_info()
+        if self._replica_engine is not None:
+            return async_sessionmaker(
+                engine, autoflush=False, expire_on_commit=False, info=info,
+                sync_session_class=RoutingSession, replica=self._replica_engine.sync_engine
+            )
+        return async_sessionmaker(engine, autoflush=False, expire_on_commit=False, info=info)
+    
+    def _aquecer_cache(self) -> int:
+        """
+        Não aquece: os repositórios assíncronos não têm consultas quentes
+        declaradas e uma AsyncEngine não executa fora do loop de eventos
+        """
+        return 0
+    
+    def get_session(self) -> AsyncSession:
+        """
+        Retorna uma sessão assíncrona do banco de dados
+        
+        Returns:
+            AsyncSession do SQLAlchemy
+        """
+        return self.SessionLocal()
+    
+    async def get_effective_pragmas(self) -> Dict[str, Any]:
+        """
+        Lê do banco os valores efetivamente em uso dos PRAGMAs de performance
+        
+        Returns:
+            Dicionário PRAGMA -> valor reportado pelo SQLite (vazio se não for SQLite)
+        """
+        if self.engine.dialect.name != "sqlite":
+            return {}
+        
+        pragmas = {}
+        async with self.engine.connect() as conn:
+            for nome in PRAGMAS_PERFORMANCE:
+                resultado = await conn.exec_driver_sql(f"PRAGMA {nome}")
+                pragmas[nome] = resultado.scalar()
+        return pragmas
+    
+    async def dispose(self) -> None:
+        """Fecha as conexões do pool; a engine será recriada no próximo uso"""
+        engine, mesmo_processo = self._engine, self._pid == os.getpid()
+        replica = self._replica_engine
+        self._engine = None
+        self._replica_engine = None
+        self._session_factory = None
+        self._pid = None
+        
+        if engine is not None:
+            if mesmo_processo:
+                await engine.dispose()
+            else:
+                engine.sync_engine.dispose(close=False)
+        if replica is not None:
+            if mesmo_processo:
+                await replica.dispose()
+            else:
+                replica.sync_engine.dispose(close=False)
@@ -0,0 +1,480 @@
+"""
+Autocompletar em memória por prefixo de títulos e nomes de autores
+"""
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.database.normalizacao import normalizar
+
+# Chave em Session.info com o autocompletar compartilhado pelas sessões
+AUTOCOMPLETAR = "autocompletar"
+
+# Chave em Session.info com as alterações da transação atual (ver _registrar_flush)
+ALTERACOES_AUTOCOMPLETAR = "alteracoes_autocompletar"
+
+Sugestao = namedtuple("Sugestao", ["id", "texto", "popularidade"])
+
+# Campos lidos de cada modelo para as sugestões (além do ID)
+CAMPOS_SUGESTOES = {"Livro": ("titulo", "autor_id"), "Autor": ("nome",)}
+
+
+def _fim_prefixo(prefixo: str) -> str:
+    """Menor texto maior que todos os que começam com o prefixo"""
+    return prefixo[:-1] + chr(ord(prefixo[-1]) + 1)
+
+
+class IndicePrefixos:
+    """
+    Vetor ordenado de chaves normalizadas com consulta dos k mais populares
+    
+    Um prefixo corresponde a uma faixa contígua do vetor (duas buscas
+    binárias). Faixas curtas são percorridas direto; para as longas (ex.: uma
+    só letra) os mais populares ficam guardados por prefixo e são descartados
+    quando alguma chave com aquele prefixo muda. Acima de ``max_itens`` a
+    entrada menos popular é descartada, limitando a memória; ela é achada em
+    um heap de (popularidade, id) em que cada mudança de popularidade empilha
+    um par novo e os pares desatualizados são ignorados ao sair do topo.
+    """
+    
+    def __init__(self, max_itens: int = 50000, limite_varredura: int = 256, k_guardado: int = 20) -> None:
+        """
+        Inicializa o índice vazio
+        
+        Args:
+            max_itens: Quantidade máxima de entradas
+            limite_varredura: Faixas maiores que isso usam os mais populares guardados
+            k_guardado: Quantos mais populares são guardados por prefixo
+        
+        Raises:
+            ValueError: Se algum limite não for positivo
+        """
+        if min(max_itens, limite_varredura, k_guardado) < 1:
+            raise ValueError("Os limites do índice de prefixos devem ser positivos")
+        self.max_itens = max_itens
+        self.limite_varredura = limite_varredura
+        self.k_guardado = k_guardado
+        self._chaves: List[Tuple[str, int]] = []
+        self._entradas: Dict[int, List[Any]] = {}
+        self._populares: Dict[str, List[int]] = {}
+        self._heap: List[Tuple[int, int]] = []
+        self.descartados = 0
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+    
+    def __contains__(self, id: int) -> bool:
+        return id in self._entradas
+    
+    def carregar(self, itens: Iterable[Tuple[int, str, int]]) -> None:
+        """
+        Substitui o conteúdo pelos itens, mantendo os ``max_itens`` mais populares
+        
+        Args:
+            itens: Tuplas (id, texto, popularidade)
+        """
+        itens = list(itens)
+        melhores = heapq.nlargest(self.max_itens, itens, key=lambda item: item[2])
+        self.descartados += len(itens) - len(melhores)
+        self._entradas = {id: [texto, normalizar(texto), popularidade] for id, texto, popularidade in melhores}
+        self._chaves = sorted((entrada[1], id) for id, entrada in self._entradas.items())
+        self._populares = {}
+        self._refazer_heap()
+    
+    def inserir(self, id: int, texto: str, popularidade: int = 0) -> None:
+        """Insere ou substitui a entrada de um ID (O(log n), inclusive o descarte)"""
+        if id in self._entradas:
+            self.remover(id)
+        elif len(self._entradas) >= self.max_itens:
+            menos_popular = self._menos_popular()
+            if self._entradas[menos_popular][2] > popularidade:
+                self.descartados += 1
+                return
+            self.remover(menos_popular)
+            self.descartados += 1
+        chave = normalizar(texto)
+        self._entradas[id] = [texto, chave, popularidade]
+        insort(self._chaves, (chave, id))
+        self._empilhar(id, popularidade)
+        self._esquecer_populares(chave)
+    
+    def remover(self, id: int) -> None:
+        """Remove a entrada de um ID, se existir"""
+        entrada = self._entradas.pop(id, None)
+        if entrada is None:
+            return
+        posicao = bisect_left(self._chaves, (entrada[1], id))
+        del self._chaves[posicao]
+        self._esquecer_populares(entrada[1])
+    
+    def somar_popularidade(self, id: int, delta: int) -> None:
+        """Soma delta à popularidade da entrada, se existir"""
+        entrada = self._entradas.get(id)
+        if entrada is not None:
+            entrada[2] += delta
+            self._empilhar(id, entrada[2])
+            self._esquecer_populares(entrada[1])
+    
+    def popularidade(self, id: int) -> int:
+        """Popularidade atual da entrada (0 se ausente)"""
+        entrada = self._entradas.get(id)
+        return entrada[2] if entrada is not None else 0
+    
+    def sugerir(self, prefixo: str, k: int = 10) -> List[Sugestao]:
+        """
+        Entradas que começam com o prefixo, das mais para as menos populares
+        
+        Args:
+            prefixo: Início do texto (acentos e maiúsculas são ignorados)
+            k: Quantidade máxima de sugestões
+        
+        Returns:
+            Sugestões ordenadas por popularidade e, no empate, pelo texto
+        """
+        prefixo = normalizar(prefixo or "")
+        if k <= 0:
+            return []
+        if prefixo:
+            inicio = bisect_left(self._chaves, (prefixo,))
+            fim = bisect_left(self._chaves, (_fim_prefixo(prefixo),))
+        else:
+            inicio, fim = 0, len(self._chaves)
+        
+        if fim - inicio > self.limite_varredura and k <= self.k_guardado:
+            ids = self._populares.get(prefixo)
+            if ids is None:
+                ids = self._mais_populares(inicio, fim, self.k_guardado)
+                self._populares[prefixo] = ids
+            ids = ids[:k]
+        else:
+            ids = self._mais_populares(inicio, fim, k)
+        return [Sugestao(id, self._entradas[id][0], self._entradas[id][2]) for id in ids]
+    
+    def _mais_populares(self, inicio: int, fim: int, k: int) -> List[int]:
+        """IDs dos k mais populares da faixa [inicio, fim) do vetor"""
+        faixa = (self._chaves[posicao] for posicao in range(inicio, fim))
+        melhores = heapq.nsmallest(k, faixa, key=lambda chave: (-self._entradas[chave[1]][2], chave))
+        return [id for _, id in melhores]
+    
+    def _empilhar(self, id: int, popularidade: int) -> None:
+        """Registra a popularidade atual no heap, refazendo-o se acumular pares desatualizados"""
+        heapq.heappush(self._heap, (popularidade, id))
+        if len(self._heap) > 2 * len(self._entradas) + 64:
+            self._refazer_heap()
+    
+    def _refazer_heap(self) -> None:
+        """Recria o heap só com a popularidade atual de cada entrada"""
+        self._heap = [(entrada[2], id) for id, entrada in self._entradas.items()]
+        heapq.heapify(self._heap)
+    
+    def _menos_popular(self) -> int:
+        """ID da entrada menos popular, descartando do topo os pares desatualizados"""
+        while True:
+            popularidade, id = self._heap[0]
+            entrada = self._entradas.get(id)
+            if entrada is not None and entrada[2] == popularidade:
+                return id
+            heapq.heappop(self._heap)
+    
+    def _esquecer_populares(self, chave: str) -> None:
+        """Descarta os mais populares guardados dos prefixos da chave"""
+        if self._populares:
+            self._populares.pop("", None)
+            for tamanho in range(1, len(chave) + 1):
+                self._populares.pop(chave[:tamanho], None)
+
+
+class Autocompletar:
+    """
+    Autocompletar de títulos de livros e nomes de autores, compartilhado pelas sessões
+    
+    É carregado do banco com poucas consultas em lote no primeiro uso e depois
+    acompanha as transações confirmadas: livros e autores criados, renomeados
+    ou removidos e empréstimos novos (popularidade). Gravações em massa
+    (criar_em_lote, atualizar_em_massa, deletar_em_massa) também são
+    aplicadas entrada a entrada: as linhas atingidas são lidas na própria
+    transação (ver _registrar_dml). Só um INSERT em massa sem RETURNING do
+    ID marca o índice para ser recarregado na próxima consulta.
+    
+    A popularidade de um livro é o número de empréstimos (inclusive os
+    arquivados); a de um autor, a soma da dos seus livros.
+    """
+    
+    def __init__(self, max_itens: int = 50000, limite_varredura: int = 256) -> None:
+        """
+        Inicializa o autocompletar (vazio até o primeiro uso)
+        
+        Args:
+            max_itens: Máximo de entradas por índice (livros e autores)
+            limite_varredura: Ver IndicePrefixos
+        
+        Raises:
+            ValueError: Se algum limite não for positivo
+        """
+        self.livros = IndicePrefixos(max_itens, limite_varredura)
+        self.autores = IndicePrefixos(max_itens, limite_varredura)
+        self._autor_do_livro: Dict[int, int] = {}
+        self._carregado = False
+        self._lock = threading.RLock()
+        self.consultas = 0
+        self.recargas = 0
+    
+    @classmethod
+    def de_config(cls, opcoes: Optional[Dict[str, Any]]) -> Optional["Autocompletar"]:
+        """
+        Cria o autocompletar a partir do bloco ``autocomplete`` da configuração
+        
+        Args:
+            opcoes: Dicionário com max_itens e limite_varredura (None desativa)
+        """
+        if not opcoes:
+            return None
+        return cls(**opcoes)
+    
+    @property
+    def carregado(self) -> bool:
+        """Indica se os índices estão carregados e atualizados"""
+        return self._carregado
+    
+    def carregar(self, engine: Engine) -> None:
+        """
+        Lê títulos, nomes e contagens de empréstimos em lote e recria os índices
+        
+        Args:
+            engine: Engine de onde os dados são lidos (fora da transação das sessões)
+        """
+        from src.models.autor import Autor
+        from src.models.emprestimo import Emprestimo
+        from src.models.emprestimo_arquivado import EmprestimoArquivado
+        from src.models.livro import Livro
+        
+        with engine.connect() as conn:
+            emprestimos: Dict[int, int] = {}
+            for modelo in (Emprestimo, EmprestimoArquivado):
+                for livro_id, total in conn.execute(
+                    select(modelo.livro_id, func.count()).group_by(modelo.livro_id)
+                ):
+                    emprestimos[livro_id] = emprestimos.get(livro_id, 0) + total
+            livros = conn.execute(select(Livro.id, Livro.titulo, Livro.autor_id)).all()
+            autores = conn.execute(select(Autor.id, Autor.nome)).all()
+        
+        por_autor: Dict[int, int] = {}
+        for id, _, autor_id in livros:
+            por_autor[autor_id] = por_autor.get(autor_id, 0) + emprestimos.get(id, 0)
+        
+        with self._lock:
+            self.livros.carregar((id, titulo, emprestimos.get(id, 0)) for id, titulo, _ in livros)
+            self.autores.carregar((id, nome, por_autor.get(id, 0)) for id, nome in autores)
+            self._autor_do_livro = {id: autor_id for id, _, autor_id in livros}
+            self._carregado = True
+            self.recargas += 1
+    
+    def invalidar(self) -> None:
+        """Marca os índices para serem recarregados na próxima consulta"""
+        with self._lock:
+            self._carregado = False
+    
+    def sugerir_livros(self, engine: Engine, prefixo: str, k: int = 10) -> List[Sugestao]:
+        """
+        Títulos que começam com o prefixo, dos mais para os menos emprestados
+        
+        Args:
+            engine: Engine usada se os índices precisarem ser (re)carregados
+            prefixo: Início do título
+            k: Quantidade máxima de sugestões
+        """
+        return self._sugerir(self.livros, engine, prefixo, k)
+    
+    def sugerir_autores(self, engine: Engine, prefixo: str, k: int = 10) -> List[Sugestao]:
+        """
+        Autores cujo nome começa com o prefixo, dos mais para os menos lidos
+        
+        Args:
+            engine: Engine usada se os índices precisarem ser (re)carregados
+            prefixo: Início do nome
+            k: Quantidade máxima de sugestões
+        """
+        return self._sugerir(self.autores, engine, prefixo, k)
+    
+    def _sugerir(self, indice: IndicePrefixos, engine: Engine, prefixo: str, k: int) -> List[Sugestao]:
+        with self._lock:
+            if not self._carregado:
+                self.carregar(engine)
+            self.consultas += 1
+            return indice.sugerir(prefixo, k)
+    
+    def aplicar(self, alteracoes: List[Tuple[Callable[..., None], tuple]]) -> None:
+        """Aplica as alterações de uma transação confirmada (ver _registrar_flush)"""
+        with self._lock:
+            if not self._carregado:
+                return
+            for alteracao, argumentos in alteracoes:
+                alteracao(*argumentos)
+    
+    def _livro_gravado(self, id: int, titulo: str, autor_id: int) -> None:
+        autor_anterior = self._autor_do_livro.get(id)
+        popularidade = self.livros.popularidade(id)
+        if autor_anterior is not None and autor_anterior != autor_id:
+            self.autores.somar_popularidade(autor_anterior, -popularidade)
+            self.autores.somar_popularidade(autor_id, popularidade)
+        self._autor_do_livro[id] = autor_id
+        self.livros.inserir(id, titulo, popularidade)
+    
+    def _livro_removido(self, id: int) -> None:
+        autor_id = self._autor_do_livro.pop(id, None)
+        if autor_id is not None:
+            self.autores.somar_popularidade(autor_id, -self.livros.popularidade(id))
+        self.livros.remover(id)
+    
+    def _autor_gravado(self, id: int, nome: str) -> None:
+        self.autores.inserir(id, nome, self.autores.popularidade(id))
+    
+    def _emprestimo_criado(self, livro_id: int) -> None:
+        self.livros.somar_popularidade(livro_id, 1)
+        autor_id = self._autor_do_livro.get(livro_id)
+        if autor_id is not None:
+            self.autores.somar_popularidade(autor_id, 1)
+    
+    def como_dict(self) -> Dict[str, Any]:
+        """Tamanho dos índices, descartes, consultas e recargas"""
+        with self._lock:
+            return {
+                "livros": len(self.livros),
+                "autores": len(self.autores),
+                "max_itens": self.livros.max_itens,
+                "descartados": self.livros.descartados + self.autores.descartados,
+                "consultas": self.consultas,
+                "recargas": self.recargas,
+                "carregado": self._carregado,
+            }
+
+
+def autocompletar_da_sessao(session: Session) -> Optional[Autocompletar]:
+    """
+    Autocompletar associado à sessão (None se não houver)
+    
+    Args:
+        session: Sessão síncrona
+    """
+    return session.info.get(AUTOCOMPLETAR)
+
+
+def _alteracoes(session: Session) -> List[Any]:
+    """Alterações da transação atual a aplicar no commit (None pede recarga)"""
+    return session.info.setdefault(ALTERACOES_AUTOCOMPLETAR, [])
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_flush(session, flush_context):
+    autocompletar = autocompletar_da_sessao(session)
+    if autocompletar is None:
+        return
+    alteracoes = _alteracoes(session)
+    for entidade in session.new:
+        modelo = type(entidade).__name__
+        if modelo == "Livro":
+            alteracoes.append((autocompletar._livro_gravado, (entidade.id, entidade.titulo, entidade.autor_id)))
+        elif modelo == "Autor":
+            alteracoes.append((autocompletar._autor_gravado, (entidade.id, entidade.nome)))
+        elif modelo == "Emprestimo":
+            alteracoes.append((autocompletar._emprestimo_criado, (entidade.livro_id,)))
+    for entidade in session.dirty:
+        modelo = type(entidade).__name__
+        estado = inspect(entidade)
+        if modelo == "Livro" and (estado.attrs.titulo.history.has_changes() or estado.attrs.autor_id.history.has_changes()):
+            alteracoes.append((autocompletar._livro_gravado, (entidade.id, entidade.titulo, entidade.autor_id)))
+        elif modelo == "Autor" and estado.attrs.nome.history.has_changes():
+            alteracoes.append((autocompletar._autor_gravado, (entidade.id, entidade.nome)))
+    for entidade in session.deleted:
+        modelo = type(entidade).__name__
+        if modelo == "Livro":
+            alteracoes.append((autocompletar._livro_removido, (entidade.id,)))
+        elif modelo == "Autor":
+            alteracoes.append((autocompletar.autores.remover, (entidade.id,)))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml(orm_execute_state):
+    # Gravações em massa não passam pelo flush: as linhas atingidas são lidas
+    # na transação e viram alterações comuns do índice
+    mapper = orm_execute_state.bind_mapper
+    session = orm_execute_state.session
+    autocompletar = autocompletar_da_sessao(session)
+    if mapper is None or autocompletar is None:
+        return None
+    modelo = mapper.class_.__name__
+    if modelo == "Emprestimo" and orm_execute_state.is_insert:
+        linhas = orm_execute_state.parameters
+        linhas = [linhas] if isinstance(linhas, dict) else linhas or []
+        if linhas and all("livro_id" in linha for linha in linhas):
+            _alteracoes(session).extend((autocompletar._emprestimo_criado, (linha["livro_id"],)) for linha in linhas)
+        else:
+            _alteracoes(session).append(None)
+        return None
+    if modelo not in CAMPOS_SUGESTOES or not (
+        orm_execute_state.is_insert or orm_execute_state.is_delete
+        or (orm_execute_state.is_update and _altera_sugestoes(modelo, orm_execute_state.statement))
+    ):
+        return None
+    
+    model_class = mapper.class_
+    # As leituras usam a mesma conexão da gravação (nunca a réplica, ver routing)
+    no_primario = {"bind": session.get_bind(mapper, clause=orm_execute_state.statement)}
+    if orm_execute_state.is_insert:
+        if "id" not in orm_execute_state.statement.exported_columns.keys():
+            # Sem RETURNING do ID não há como saber as linhas criadas
+            _alteracoes(session).append(None)
+            return None
+        congelado = orm_execute_state.invoke_statement().freeze()
+        posicao = list(congelado.metadata.keys).index("id")
+        ids = [linha[posicao] for linha in congelado.data]
+        resultado = congelado()
+    else:
+        consulta = select(model_class.id)
+        if orm_execute_state.statement.whereclause is not None:
+            consulta = consulta.where(orm_execute_state.statement.whereclause)
+        ids = session.scalars(consulta, bind_arguments=no_primario).all()
+        resultado = orm_execute_state.invoke_statement()
+    
+    if orm_execute_state.is_delete:
+        remover = autocompletar._livro_removido if modelo == "Livro" else autocompletar.autores.remover
+        _alteracoes(session).extend((remover, (id,)) for id in ids)
+        return resultado
+    gravar = autocompletar._livro_gravado if modelo == "Livro" else autocompletar._autor_gravado
+    colunas = [model_class.id] + [getattr(model_class, campo) for campo in CAMPOS_SUGESTOES[modelo]]
+    for inicio in range(0, len(ids), 500):
+        bloco = select(*colunas).where(model_class.id.in_(ids[inicio:inicio + 500]))
+        for linha in session.execute(bloco, bind_arguments=no_primario):
+            _alteracoes(session).append((gravar, tuple(linha)))
+    return resultado
+
+
+def _altera_sugestoes(modelo: str, consulta: Any) -> bool:
+    """Indica se o UPDATE em massa altera algum campo que aparece nas sugestões"""
+    valores = consulta._values
+    if valores is None:
+        return True
+    alterados = {getattr(coluna, "key", coluna) for coluna in valores}
+    return bool(alterados & set(CAMPOS_SUGESTOES[modelo]))
+
+
+@event.listens_for(Session, "after_commit")
+def _concluir_transacao(session):
+    alteracoes = session.info.pop(ALTERACOES_AUTOCOMPLETAR, None)
+    autocompletar = autocompletar_da_sessao(session)
+    if autocompletar is None or not alteracoes:
+        return
+    if None in alteracoes:
+        autocompletar.invalidar()
+    else:
+        autocompletar.aplicar(alteracoes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_transacao(session):
+    session.info.pop(ALTERACOES_AUTOCOMPLETAR, None)
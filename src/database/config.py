@@ -3,30 +3,270 @@ Configuração do banco de dados
 """
 import json
 import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
-from sqlalchemy import create_engine
+from typing import Dict, Any, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
 from dotenv import load_dotenv
 
-# Carrega variáveis de ambiente
-load_dotenv()
+from src.database.routing import RoutingSession
+from src.database.query_cache import EstatisticasCache, aquecer
+from src.database.entity_cache import CACHE_ENTIDADES, CacheEntidades
+from src.database.autocompletar import AUTOCOMPLETAR, Autocompletar
+from src.database.facet_cache import CACHE_FACETAS, CacheFacetas
+from src.database.retry import POLITICA_RETRY, PoliticaRetry
+
+# Valores aceitos pelos PRAGMAs textuais do perfil de performance do SQLite.
+# PRAGMAs não aceitam parâmetros, então tudo é validado antes de ser interpolado.
+PRAGMAS_TEXTUAIS = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+PRAGMAS_PERFORMANCE = ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout")
+# PRAGMAs que alteram o arquivo e não se aplicam a uma réplica somente leitura
+PRAGMAS_ESCRITA = ("journal_mode", "synchronous")
+
+# Opções de pool aceitas no bloco de um banco (limitam conexões abertas por engine)
+OPCOES_POOL = ("pool_size", "max_overflow")
+
+DEFAULT_DATABASE = "default"
+
+# IDs de filial viram nomes de arquivo: só letras, dígitos, "_" e "-"
+FILIAL_ID_VALIDO = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_dotenv_carregado = False
+
+
+def _carregar_dotenv() -> None:
+    """Carrega o arquivo .env uma única vez, no primeiro uso da configuração"""
+    global _dotenv_carregado
+    if not _dotenv_carregado:
+        load_dotenv()
+        _dotenv_carregado = True
 
 
 class DatabaseConfig:
-    """Classe para gerenciar configurações do banco de dados"""
+    """
+    Classe para gerenciar configurações do banco de dados
     
-    def __init__(self, config_path: str = "config/config.json") -> None:
+    Nada é lido ou conectado na construção: o arquivo de configuração é
+    carregado no primeiro acesso a ``config`` e a engine é criada no primeiro
+    acesso a ``engine``/``get_session``. Se o processo for bifurcado (fork),
+    o filho descarta a engine herdada e cria a sua própria.
+    
+    Se o bloco do banco tiver ``replica`` (ex.: ``{"url": "sqlite:///file:./biblioteca.db?mode=ro&uri=true"}``),
+    as sessões passam a ser ``RoutingSession``: leituras vão para a réplica e
+    escritas para o primário.
+    
+    ``query_cache_size`` define o tamanho do cache de instruções compiladas e
+    ``warmup: true`` pré-compila as consultas quentes dos repositórios na
+    criação da engine (ver ``get_query_cache_stats``). O bloco ``retry``
+    configura a repetição de transações que falham por lock (ver
+    ``get_retry_stats``). O bloco ``entity_cache`` (ex.: ``{"max_itens": 2048,
+    "ttl": 300, "modelos": ["Livro", "Autor"]}``) ativa o cache de
+    ``buscar_por_id`` para os modelos listados (ver ``get_entity_cache_stats``).
+    O bloco ``autocomplete`` (ex.: ``{"max_itens": 50000}``) ativa o
+    autocompletar em memória de títulos e autores (ver ``get_autocomplete_stats``).
+    O bloco ``facet_cache`` (ex.: ``{"max_itens": 256, "ttl": 60}``) guarda as
+    contagens por faceta do catálogo (ver ``get_facet_cache_stats``).
+    """
+    
+    def __init__(
+        self,
+        config_path: str = "config/config.json",
+        name: str = DEFAULT_DATABASE,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> None:
         """
         Inicializa a configuração do banco de dados
         
         Args:
             config_path: Caminho para o arquivo de configuração JSON
+            name: Nome do banco (``default`` usa o bloco ``database``, os demais
+                o bloco correspondente em ``databases``)
+            settings: Bloco de configuração já montado (ex.: o de uma filial);
+                se informado, dispensa a leitura do arquivo
         """
         self.config_path = config_path
-        self.config: Dict[str, Any] = self._load_config()
-        self.engine = self._create_engine()
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.name = name
+        self._settings = settings
+        self._config: Optional[Dict[str, Any]] = None
+        self._engine: Optional[Engine] = None
+        self._replica_engine: Optional[Engine] = None
+        self._session_factory: Optional[sessionmaker] = None
+        self._pid: Optional[int] = None
+        self._estatisticas_cache = EstatisticasCache()
+        self._consultas_aquecidas = 0
+        self._politica_retry: Optional[PoliticaRetry] = None
+        self._cache_entidades: Optional[CacheEntidades] = None
+        self._cache_entidades_lido = False
+        self._autocompletar: Optional[Autocompletar] = None
+        self._autocompletar_lido = False
+        self._cache_facetas: Optional[CacheFacetas] = None
+        self._cache_facetas_lido = False
+        self._lock = threading.RLock()
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configurações carregadas sob demanda"""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+    
+    @property
+    def database_settings(self) -> Dict[str, Any]:
+        """
+        Bloco de configuração deste banco
+        
+        Raises:
+            KeyError: Se o banco nomeado não estiver configurado
+        """
+        if self._settings is not None:
+            return self._settings
+        
+        if self.name == DEFAULT_DATABASE:
+            return self.config.get("database", {})
+        
+        databases = self.config.get("databases", {})
+        if self.name not in databases:
+            raise KeyError(f"Banco de dados '{self.name}' não está configurado em 'databases'")
+        return databases[self.name]
+    
+    @property
+    def engine(self) -> Engine:
+        """Engine do processo atual, criada no primeiro uso"""
+        self._ensure_engine()
+        return self._engine
+    
+    @property
+    def SessionLocal(self) -> sessionmaker:
+        """Fábrica de sessões ligada à engine do processo atual"""
+        self._ensure_engine()
+        return self._session_factory
+    
+    @property
+    def replica_engine(self) -> Optional[Engine]:
+        """Engine somente leitura da réplica (None se não houver réplica configurada)"""
+        self._ensure_engine()
+        return self._replica_engine
+    
+    @property
+    def politica_retry(self) -> PoliticaRetry:
+        """
+        Política de repetição das transações bloqueadas (bloco ``retry``)
+        
+        Raises:
+            ValueError: Se o bloco retry tiver valores inválidos
+        """
+        if self._politica_retry is None:
+            self._politica_retry = PoliticaRetry.de_config(self.database_settings.get("retry"))
+        return self._politica_retry
+    
+    @property
+    def cache_entidades(self) -> Optional[CacheEntidades]:
+        """
+        Cache de entidades compartilhado pelas sessões (bloco ``entity_cache``)
+        
+        Returns:
+            O cache, ou None se o bloco não estiver configurado
+        
+        Raises:
+            ValueError: Se o bloco entity_cache tiver valores inválidos
+        """
+        if not self._cache_entidades_lido:
+            self._cache_entidades = CacheEntidades.de_config(self.database_settings.get("entity_cache"))
+            self._cache_entidades_lido = True
+        return self._cache_entidades
+    
+    @property
+    def autocompletar(self) -> Optional[Autocompletar]:
+        """
+        Autocompletar de títulos e autores compartilhado pelas sessões (bloco ``autocomplete``)
+        
+        Returns:
+            O autocompletar, ou None se o bloco não estiver configurado
+        
+        Raises:
+            ValueError: Se o bloco autocomplete tiver valores inválidos
+        """
+        if not self._autocompletar_lido:
+            self._autocompletar = Autocompletar.de_config(self.database_settings.get("autocomplete"))
+            self._autocompletar_lido = True
+        return self._autocompletar
+    
+    @property
+    def cache_facetas(self) -> Optional[CacheFacetas]:
+        """
+        Cache das contagens por faceta compartilhado pelas sessões (bloco ``facet_cache``)
+        
+        Returns:
+            O cache, ou None se o bloco não estiver configurado
+        
+        Raises:
+            ValueError: Se o bloco facet_cache tiver valores inválidos
+        """
+        if not self._cache_facetas_lido:
+            self._cache_facetas = CacheFacetas.de_config(self.database_settings.get("facet_cache"))
+            self._cache_facetas_lido = True
+        return self._cache_facetas
+    
+    @property
+    def is_initialized(self) -> bool:
+        """Indica se a engine já foi criada neste processo"""
+        return self._engine is not None and self._pid == os.getpid()
+    
+    def _ensure_engine(self) -> None:
+        """Cria a engine se necessário, recriando-a após um fork"""
+        pid = os.getpid()
+        if self._engine is not None and self._pid == pid:
+            return
+        
+        with self._lock:
+            if self._engine is not None and self._pid != pid:
+                # Engine herdada do processo pai: abandona o pool sem fechar
+                # as conexões, que ainda pertencem ao pai
+                self._sync_engine(self._engine).dispose(close=False)
+                if self._replica_engine is not None:
+                    self._sync_engine(self._replica_engine).dispose(close=False)
+                self._engine = None
+                self._replica_engine = None
+            
+            if self._engine is None:
+                self._engine = self._create_engine()
+                self._replica_engine = self._create_replica_engine()
+                self._session_factory = self._create_session_factory(self._engine)
+                self._preparar_cache()
+                self._pid = pid
+    
+    def _preparar_cache(self) -> None:
+        """Registra os contadores do cache de compilação e, se configurado, aquece o cache"""
+        self._estatisticas_cache = EstatisticasCache()
+        for engine in (self._engine, self._replica_engine):
+            if engine is not None:
+                self._estatisticas_cache.registrar(self._sync_engine(engine))
+        
+        self._consultas_aquecidas = 0
+        if self.database_settings.get("warmup", False):
+            self._consultas_aquecidas = self._aquecer_cache()
+            self._estatisticas_cache.zerar()
+    
+    def _aquecer_cache(self) -> int:
+        """
+        Pré-compila as consultas quentes no primário e na réplica
+        
+        Returns:
+            Quantidade de consultas aquecidas
+        """
+        total = 0
+        for engine in (self._engine, self._replica_engine):
+            if engine is not None:
+                total += aquecer(engine)
+        return total
     
     def _load_config(self) -> Dict[str, Any]:
         """
@@ -35,6 +275,7 @@ class DatabaseConfig:
         Returns:
             Dicionário com as configurações
         """
+        _carregar_dotenv()
         config_file = Path(self.config_path)
         
         if config_file.exists():
@@ -56,12 +297,248 @@ class DatabaseConfig:
         Returns:
             Engine do SQLAlchemy
         """
-        db_url = self.config.get("database", {}).get("url")
+        settings = self.database_settings
+        db_url = settings.get("url")
         if not db_url:
             db_url = os.getenv("DATABASE_URL", "sqlite:///./biblioteca.db")
         
-        echo = self.config.get("database", {}).get("echo", False)
-        return create_engine(db_url, echo=echo, connect_args={"check_same_thread": False} if "sqlite" in db_url else {})
+        kwargs = self._pool_kwargs(settings)
+        kwargs.update(self._cache_kwargs())
+        kwargs["echo"] = settings.get("echo", False)
+        kwargs["connect_args"] = {"check_same_thread": False} if "sqlite" in db_url else {}
+        engine = self._new_engine(db_url, **kwargs)
+        
+        if "sqlite" in db_url:
+            pragmas = self._build_performance_pragmas()
+            if pragmas:
+                self._register_pragmas(self._sync_engine(engine), pragmas)
+        
+        return engine
+    
+    def _create_replica_engine(self):
+        """
+        Cria a engine da réplica de leitura, se configurada em database.replica
+        
+        Na réplica só valem os PRAGMAs de leitura do perfil de performance, e
+        ``query_only`` impede qualquer escrita pela conexão.
+        
+        Returns:
+            Engine do SQLAlchemy, ou None se não houver réplica
+        """
+        replica = self.database_settings.get("replica")
+        if not replica:
+            return None
+        
+        db_url = replica.get("url")
+        if not db_url:
+            raise ValueError("database.replica exige a chave 'url'")
+        
+        kwargs = self._pool_kwargs(replica)
+        kwargs.update(self._cache_kwargs())
+        kwargs["echo"] = replica.get("echo", self.database_settings.get("echo", False))
+        if "sqlite" in db_url:
+            kwargs["connect_args"] = {"check_same_thread": False}
+        engine = self._new_engine(db_url, **kwargs)
+        
+        if "sqlite" in db_url:
+            pragmas = {
+                nome: valor for nome, valor in self._build_performance_pragmas().items()
+                if nome not in PRAGMAS_ESCRITA
+            }
+            pragmas["query_only"] = "ON"
+            self._register_pragmas(self._sync_engine(engine), pragmas)
+        
+        return engine
+    
+    @staticmethod
+    def _pool_kwargs(settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Opções de pool (pool_size, max_overflow) presentes no bloco de configuração"""
+        return {opcao: settings[opcao] for opcao in OPCOES_POOL if opcao in settings}
+    
+    def _cache_kwargs(self) -> Dict[str, Any]:
+        """
+        Tamanho do cache de instruções compiladas (database.query_cache_size)
+        
+        Raises:
+            ValueError: Se o tamanho não for um inteiro não negativo
+        """
+        if "query_cache_size" not in self.database_settings:
+            return {}
+        
+        tamanho = self.database_settings["query_cache_size"]
+        if isinstance(tamanho, bool) or not isinstance(tamanho, int) or tamanho < 0:
+            raise ValueError("query_cache_size deve ser um inteiro não negativo")
+        return {"query_cache_size": tamanho}
+    
+    def _new_engine(self, db_url: str, **kwargs):
+        """
+        Instancia a engine (ponto de extensão para variantes, ex.: assíncrona)
+        
+        Args:
+            db_url: URL do banco
+            **kwargs: Argumentos repassados a create_engine
+        
+        Returns:
+            Engine do SQLAlchemy
+        """
+        return create_engine(db_url, **kwargs)
+    
+    def _create_session_factory(self, engine) -> sessionmaker:
+        """
+        Cria a fábrica de sessões ligada à engine
+        
+        Args:
+            engine: Engine do SQLAlchemy
+        
+        Returns:
+            Fábrica de sessões
+        """
+        info = self._session_info()
+        if self._replica_engine is not None:
+            return sessionmaker(
+                class_=RoutingSession, replica=self._replica_engine,
+                autocommit=False, autoflush=False, bind=engine, info=info
+            )
+        return sessionmaker(autocommit=False, autoflush=False, bind=engine, info=info)
+    
+    def _session_info(self) -> Dict[str, Any]:
+        """Session.info inicial das sessões: política de retry e, se houver, caches compartilhados"""
+        info: Dict[str, Any] = {POLITICA_RETRY: self.politica_retry}
+        if self.cache_entidades is not None:
+            info[CACHE_ENTIDADES] = self.cache_entidades
+        if self.autocompletar is not None:
+            info[AUTOCOMPLETAR] = self.autocompletar
+        if self.cache_facetas is not None:
+            info[CACHE_FACETAS] = self.cache_facetas
+        return info
+    
+    @staticmethod
+    def _sync_engine(engine) -> Engine:
+        """Engine síncrona subjacente (a própria engine, ou sync_engine de uma AsyncEngine)"""
+        return getattr(engine, "sync_engine", engine)
+    
+    def _build_performance_pragmas(self) -> Dict[str, Any]:
+        """
+        Monta os PRAGMAs do perfil de performance definidos em database.performance
+        
+        Returns:
+            Dicionário PRAGMA -> valor, na ordem em que devem ser aplicados
+        
+        Raises:
+            ValueError: Se algum PRAGMA ou valor for inválido
+        """
+        perfil = self.database_settings.get("performance") or {}
+        pragmas: Dict[str, Any] = {}
+        
+        for nome, valor in perfil.items():
+            if nome not in PRAGMAS_PERFORMANCE:
+                raise ValueError(f"PRAGMA '{nome}' não é suportado pelo perfil de performance")
+            
+            if nome in PRAGMAS_TEXTUAIS:
+                valor = str(valor).upper()
+                if valor not in PRAGMAS_TEXTUAIS[nome]:
+                    raise ValueError(f"Valor '{valor}' inválido para o PRAGMA '{nome}'")
+            else:
+                if isinstance(valor, bool) or not isinstance(valor, int):
+                    raise ValueError(f"PRAGMA '{nome}' exige um valor inteiro")
+            
+            pragmas[nome] = valor
+        
+        # journal_mode precisa vir primeiro: os demais PRAGMAs dependem do modo de journal
+        return {nome: pragmas[nome] for nome in PRAGMAS_PERFORMANCE if nome in pragmas}
+    
+    @staticmethod
+    def _register_pragmas(engine, pragmas: Dict[str, Any]) -> None:
+        """
+        Aplica os PRAGMAs em toda nova conexão do pool
+        
+        Args:
+            engine: Engine do SQLAlchemy
+            pragmas: Dicionário PRAGMA -> valor já validado
+        """
+        @event.listens_for(engine, "connect")
+        def _aplicar_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for nome, valor in pragmas.items():
+                    cursor.execute(f"PRAGMA {nome}={valor}")
+            finally:
+                cursor.close()
+    
+    def get_effective_pragmas(self) -> Dict[str, Any]:
+        """
+        Lê do banco os valores efetivamente em uso dos PRAGMAs de performance
+        
+        Returns:
+            Dicionário PRAGMA -> valor reportado pelo SQLite (vazio se não for SQLite)
+        """
+        if self.engine.dialect.name != "sqlite":
+            return {}
+        
+        with self.engine.connect() as conn:
+            return {
+                nome: conn.exec_driver_sql(f"PRAGMA {nome}").scalar()
+                for nome in PRAGMAS_PERFORMANCE
+            }
+    
+    def get_query_cache_stats(self) -> Dict[str, int]:
+        """
+        Estatísticas do cache de instruções compiladas
+        
+        Returns:
+            Dicionário com acertos, falhas e execuções sem cache desde a criação
+            da engine (ou desde o aquecimento), além do tamanho atual, da
+            capacidade do cache do primário e do número de consultas aquecidas
+        """
+        cache = getattr(self._sync_engine(self.engine), "_compiled_cache", None)
+        estatisticas = self._estatisticas_cache.como_dict()
+        estatisticas["tamanho"] = len(cache) if cache is not None else 0
+        estatisticas["capacidade"] = getattr(cache, "capacity", 0)
+        estatisticas["aquecidas"] = self._consultas_aquecidas
+        return estatisticas
+    
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """
+        Métricas de repetição por contenção de lock
+        
+        Returns:
+            Dicionário com operações repetidas, repetições, operações que
+            esgotaram as tentativas e o tempo total (s) perdido com locks
+        """
+        return self.politica_retry.metricas.como_dict()
+    
+    def get_entity_cache_stats(self) -> Dict[str, Any]:
+        """
+        Métricas do cache de entidades
+        
+        Returns:
+            Dicionário com acertos, falhas, expirados, descartados,
+            invalidações, taxa de acerto e ocupação (vazio se desativado)
+        """
+        cache = self.cache_entidades
+        return cache.como_dict() if cache is not None else {}
+    
+    def get_autocomplete_stats(self) -> Dict[str, Any]:
+        """
+        Métricas do autocompletar
+        
+        Returns:
+            Dicionário com o tamanho dos índices, descartes, consultas e
+            recargas (vazio se desativado)
+        """
+        autocompletar = self.autocompletar
+        return autocompletar.como_dict() if autocompletar is not None else {}
+    
+    def get_facet_cache_stats(self) -> Dict[str, Any]:
+        """
+        Métricas do cache de facetas
+        
+        Returns:
+            Dicionário com acertos, falhas, invalidações, taxa de acerto e
+            ocupação (vazio se desativado)
+        """
+        cache = self.cache_facetas
+        return cache.como_dict() if cache is not None else {}
     
     def get_session(self) -> Session:
         """
@@ -71,8 +548,205 @@ class DatabaseConfig:
             Sessão do SQLAlchemy
         """
         return self.SessionLocal()
+    
+    def dispose(self) -> None:
+        """Fecha as conexões do pool; a engine será recriada no próximo uso"""
+        with self._lock:
+            if self._engine is not None:
+                self._engine.dispose(close=self._pid == os.getpid())
+                self._engine = None
+            if self._replica_engine is not None:
+                self._replica_engine.dispose(close=self._pid == os.getpid())
+                self._replica_engine = None
+            self._session_factory = None
+            self._pid = None
+
+
+class EngineRegistry:
+    """
+    Registro de bancos nomeados, cada um com sua engine criada sob demanda
+    
+    Também mapeia cada filial para o seu próprio banco, a partir do bloco
+    ``filiais`` da configuração::
+        
+        "filiais": {"url": "sqlite:///./filiais/{filial}.db", "max_engines": 16, "pool_size": 2}
+    
+    No máximo ``max_engines`` engines de filial ficam abertas: ao passar do
+    limite, a filial usada há mais tempo (e não fixada) tem suas conexões
+    fechadas. Filiais em uso devem ser fixadas com ``fixar``/``liberar`` (ou
+    via ContextoFilial) para não serem descartadas no meio de uma operação.
+    """
+    
+    def __init__(self, config_path: str = "config/config.json") -> None:
+        """
+        Inicializa o registro
+        
+        Args:
+            config_path: Caminho para o arquivo de configuração JSON
+        """
+        self.config_path = config_path
+        self._databases: Dict[str, DatabaseConfig] = {}
+        self._filiais: "OrderedDict[str, DatabaseConfig]" = OrderedDict()
+        self._fixacoes: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def get(self, name: str = DEFAULT_DATABASE) -> DatabaseConfig:
+        """
+        Retorna a configuração do banco nomeado (sem conectar)
+        
+        Args:
+            name: Nome do banco
+        
+        Returns:
+            Configuração do banco
+        """
+        database = self._databases.get(name)
+        if database is None:
+            with self._lock:
+                database = self._databases.get(name)
+                if database is None:
+                    database = DatabaseConfig(self.config_path, name)
+                    self._databases[name] = database
+        return database
+    
+    def get_session(self, name: str = DEFAULT_DATABASE) -> Session:
+        """
+        Retorna uma sessão do banco nomeado
+        
+        Args:
+            name: Nome do banco
+        
+        Returns:
+            Sessão do SQLAlchemy
+        """
+        return self.get(name).get_session()
+    
+    def names(self) -> List[str]:
+        """Nomes dos bancos já registrados"""
+        return list(self._databases)
+    
+    @property
+    def filiais_settings(self) -> Dict[str, Any]:
+        """
+        Bloco ``filiais`` da configuração
+        
+        Raises:
+            KeyError: Se não houver filiais configuradas
+        """
+        filiais = self.get().config.get("filiais")
+        if not filiais or "url" not in filiais:
+            raise KeyError("Filiais não configuradas: defina 'filiais.url' na configuração")
+        return filiais
+    
+    def get_filial(self, filial_id: str) -> DatabaseConfig:
+        """
+        Retorna a configuração do banco da filial, marcando-a como a mais recente
+        
+        Args:
+            filial_id: Identificador da filial
+        
+        Returns:
+            Configuração do banco da filial (a engine é criada no primeiro uso)
+        
+        Raises:
+            ValueError: Se o identificador da filial for inválido
+            KeyError: Se não houver filiais configuradas
+        """
+        filial_id = str(filial_id)
+        if not FILIAL_ID_VALIDO.match(filial_id):
+            raise ValueError(f"Identificador de filial inválido: '{filial_id}'")
+        
+        with self._lock:
+            database = self._filiais.get(filial_id)
+            if database is None:
+                database = DatabaseConfig(
+                    self.config_path, f"filial:{filial_id}", self._settings_filial(filial_id)
+                )
+                self._filiais[filial_id] = database
+            self._filiais.move_to_end(filial_id)
+            self._despejar_excedentes()
+            return database
+    
+    def fixar(self, filial_id: str) -> DatabaseConfig:
+        """
+        Fixa a filial: sua engine não é descartada enquanto houver fixações
+        
+        Args:
+            filial_id: Identificador da filial
+        
+        Returns:
+            Configuração do banco da filial
+        """
+        with self._lock:
+            database = self.get_filial(filial_id)
+            self._fixacoes[str(filial_id)] = self._fixacoes.get(str(filial_id), 0) + 1
+            return database
+    
+    def liberar(self, filial_id: str) -> None:
+        """
+        Desfaz uma fixação feita com ``fixar``
+        
+        Args:
+            filial_id: Identificador da filial
+        """
+        with self._lock:
+            restantes = self._fixacoes.get(str(filial_id), 0) - 1
+            if restantes > 0:
+                self._fixacoes[str(filial_id)] = restantes
+            else:
+                self._fixacoes.pop(str(filial_id), None)
+            self._despejar_excedentes()
+    
+    def filiais(self) -> List[str]:
+        """Filiais com configuração em memória, da menos para a mais recente"""
+        return list(self._filiais)
+    
+    def _settings_filial(self, filial_id: str) -> Dict[str, Any]:
+        """
+        Monta o bloco de configuração do banco de uma filial
+        
+        O perfil de performance do banco padrão vale para as filiais, a menos
+        que ``filiais.performance`` defina outro.
+        """
+        modelo = self.filiais_settings
+        settings = {
+            chave: valor for chave, valor in modelo.items()
+            if chave not in ("url", "max_engines")
+        }
+        settings["url"] = modelo["url"].format(filial=filial_id)
+        settings.setdefault("performance", self.get().database_settings.get("performance", {}))
+        
+        url = make_url(settings["url"])
+        if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+            Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+        return settings
+    
+    def _despejar_excedentes(self) -> None:
+        """Fecha as engines das filiais menos recentes acima de max_engines"""
+        limite = self.filiais_settings.get("max_engines", 16)
+        excedente = len(self._filiais) - limite
+        
+        # A filial mais recente é a que está sendo devolvida: nunca é despejada
+        for filial_id in list(self._filiais)[:-1]:
+            if excedente <= 0:
+                break
+            if self._fixacoes.get(filial_id):
+                continue
+            self._filiais.pop(filial_id).dispose()
+            excedente -= 1
+    
+    def dispose_all(self) -> None:
+        """Fecha as conexões de todas as engines registradas"""
+        for database in list(self._databases.values()):
+            database.dispose()
+        with self._lock:
+            for database in self._filiais.values():
+                database.dispose()
+            self._filiais.clear()
 
 
-# Instância global da configuração
-db_config = DatabaseConfig()
+# Registro global; nenhum arquivo é lido e nenhuma engine é criada na importação
+registry = EngineRegistry()
 
+# Configuração do banco padrão (mantida por compatibilidade)
+db_config = registry.get()
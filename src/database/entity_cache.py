@@ -0,0 +1,259 @@
+"""
+Cache de entidades por ID (LRU + TTL) compartilhado entre sessões
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# Chave em Session.info com o cache de entidades da sessão
+CACHE_ENTIDADES = "cache_entidades"
+
+# Chave em Session.info com o que a transação atual escreveu (ver _registrar_flush)
+ESCRITAS_CACHE = "escritas_cache"
+
+
+class CacheEntidades:
+    """
+    Cache de leitura de entidades por ID, com expulsão LRU e validade (TTL)
+    
+    Guarda cópias das colunas (não as entidades), então pode ser usado por
+    várias sessões ao mesmo tempo. Só os modelos habilitados são guardados.
+    As entradas são invalidadas pelos eventos da sessão: no flush de uma
+    entidade alterada ou removida, em UPDATE/DELETE em massa e de novo no
+    commit ou rollback da transação que escreveu. Cada invalidação avança
+    a geração do cache; uma leitura só é guardada se a geração não mudou
+    desde o seu SELECT.
+    
+    A invalidação só alcança o próprio processo, por isso o cache atende
+    apenas leituras fora de unidades de trabalho (ver buscar_por_id).
+    """
+    
+    def __init__(
+        self,
+        max_itens: int = 1024,
+        ttl: float = 300.0,
+        modelos: Optional[Iterable[str]] = None,
+        relogio: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Inicializa o cache
+        
+        Args:
+            max_itens: Capacidade; além dela, a entrada menos usada é descartada
+            ttl: Validade de cada entrada, em segundos
+            modelos: Nomes das classes de modelo habilitadas (ex.: ["Livro", "Autor"])
+            relogio: Função que devolve o instante atual (substituível em testes)
+        
+        Raises:
+            ValueError: Se max_itens ou ttl não forem positivos
+        """
+        if isinstance(max_itens, bool) or not isinstance(max_itens, int) or max_itens < 1:
+            raise ValueError("max_itens deve ser um inteiro positivo")
+        if ttl <= 0:
+            raise ValueError("ttl deve ser positivo")
+        
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.modelos: Set[str] = set(modelos or ())
+        self.relogio = relogio
+        self._itens: "OrderedDict[Tuple[str, Any], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.expirados = 0
+        self.descartados = 0
+        self.invalidacoes = 0
+        self.recusados = 0
+        self.geracao = 0
+    
+    @classmethod
+    def de_config(cls, opcoes: Optional[Dict[str, Any]]) -> Optional["CacheEntidades"]:
+        """
+        Cria o cache a partir do bloco ``entity_cache`` da configuração
+        
+        Args:
+            opcoes: Dicionário com max_itens, ttl e modelos (None desativa o cache)
+        """
+        if not opcoes:
+            return None
+        return cls(**opcoes)
+    
+    def habilitado(self, model_class: type) -> bool:
+        """Indica se o modelo participa do cache"""
+        return model_class.__name__ in self.modelos
+    
+    def obter(self, model_class: type, id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Busca os valores de colunas guardados para a entidade
+        
+        Args:
+            model_class: Classe do modelo
+            id: ID da entidade
+        
+        Returns:
+            Cópia dos valores, ou None se ausente ou expirada
+        """
+        chave = (model_class.__name__, id)
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+            if item[0] <= self.relogio():
+                del self._itens[chave]
+                self.expirados += 1
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return dict(item[1])
+    
+    def guardar(
+        self, model_class: type, id: Any, valores: Dict[str, Any], geracao: Optional[int] = None
+    ) -> bool:
+        """
+        Guarda os valores de colunas da entidade
+        
+        Args:
+            model_class: Classe do modelo
+            id: ID da entidade
+            valores: Valores das colunas (copiados)
+            geracao: Geração lida antes do SELECT; se houve invalidação
+                desde então, os valores podem estar desatualizados e não
+                são guardados
+        
+        Returns:
+            True se os valores foram guardados
+        """
+        chave = (model_class.__name__, id)
+        with self._lock:
+            if geracao is not None and geracao != self.geracao:
+                self.recusados += 1
+                return False
+            self._itens[chave] = (self.relogio() + self.ttl, dict(valores))
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self.descartados += 1
+            return True
+    
+    def invalidar(self, nome_modelo: str, id: Any) -> None:
+        """Remove a entrada de uma entidade, se existir, e avança a geração"""
+        with self._lock:
+            self.geracao += 1
+            if self._itens.pop((nome_modelo, id), None) is not None:
+                self.invalidacoes += 1
+    
+    def invalidar_modelo(self, nome_modelo: str) -> None:
+        """Remove todas as entradas de um modelo e avança a geração"""
+        with self._lock:
+            self.geracao += 1
+            chaves = [chave for chave in self._itens if chave[0] == nome_modelo]
+            for chave in chaves:
+                del self._itens[chave]
+            self.invalidacoes += len(chaves)
+    
+    def limpar(self) -> None:
+        """Remove todas as entradas e avança a geração (os contadores são mantidos)"""
+        with self._lock:
+            self.geracao += 1
+            self._itens.clear()
+    
+    def zerar(self) -> None:
+        """Zera os contadores"""
+        with self._lock:
+            self.acertos = self.falhas = self.expirados = self.descartados = self.invalidacoes = self.recusados = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._itens)
+    
+    def como_dict(self) -> Dict[str, Any]:
+        """Contadores atuais, taxa de acerto e ocupação como dicionário"""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "expirados": self.expirados,
+                "descartados": self.descartados,
+                "invalidacoes": self.invalidacoes,
+                "recusados": self.recusados,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+            }
+
+
+def cache_da_sessao(session: Session) -> Optional[CacheEntidades]:
+    """
+    Cache de entidades associado à sessão (None se não houver)
+    
+    Args:
+        session: Sessão síncrona
+    """
+    return session.info.get(CACHE_ENTIDADES)
+
+
+def escreveu_na_transacao(session: Session) -> bool:
+    """
+    Indica se a transação atual da sessão já gravou algo
+    
+    Leituras feitas depois disso podem conter dados ainda não confirmados e
+    não devem alimentar o cache.
+    """
+    escritas = session.info.get(ESCRITAS_CACHE)
+    return bool(escritas and (escritas[0] or escritas[1]))
+
+
+def _escritas(session: Session) -> Tuple[Set[Tuple[str, Any]], Set[str]]:
+    """Entidades e modelos escritos pela transação atual"""
+    return session.info.setdefault(ESCRITAS_CACHE, (set(), set()))
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_flush(session, flush_context):
+    cache = cache_da_sessao(session)
+    if cache is None:
+        return
+    entidades, _ = _escritas(session)
+    for entidade in list(session.new) + list(session.dirty) + list(session.deleted):
+        estado = inspect(entidade)
+        if not cache.habilitado(estado.class_):
+            continue
+        id = estado.key[1][0] if estado.key else estado.mapper.primary_key_from_instance(entidade)[0]
+        chave = (estado.class_.__name__, id)
+        entidades.add(chave)
+        cache.invalidar(*chave)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    session = orm_execute_state.session
+    cache = cache_da_sessao(session)
+    mapper = orm_execute_state.bind_mapper
+    if cache is None or mapper is None or not cache.habilitado(mapper.class_):
+        return
+    _escritas(session)[1].add(mapper.class_.__name__)
+    cache.invalidar_modelo(mapper.class_.__name__)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _concluir_transacao(session):
+    # Invalida de novo: outra sessão pode ter lido a versão antiga entre o
+    # flush e o fim da transação
+    escritas = session.info.pop(ESCRITAS_CACHE, None)
+    cache = cache_da_sessao(session)
+    if cache is None or escritas is None:
+        return
+    entidades, modelos = escritas
+    for chave in entidades:
+        cache.invalidar(*chave)
+    for nome_modelo in modelos:
+        cache.invalidar_modelo(nome_modelo)
@@ -0,0 +1,184 @@
+"""
+Cache das contagens por faceta do catálogo, por assinatura de filtros
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Chave em Session.info com o cache de facetas da sessão
+CACHE_FACETAS = "cache_facetas"
+
+# Chave em Session.info marcando que a transação atual alterou livros
+LIVROS_ALTERADOS = "livros_alterados"
+
+# Modelos cujas alterações mudam as contagens (livros e os nomes usados como rótulo)
+MODELOS_FACETAS = frozenset({"Livro", "Autor", "Categoria"})
+
+
+class CacheFacetas:
+    """
+    Cache LRU + TTL das contagens por faceta, compartilhado entre sessões
+    
+    Cada entrada é o resultado de uma combinação de facetas e filtros. Como
+    qualquer alteração de livro pode mudar qualquer contagem, o cache inteiro
+    é esvaziado no flush de um livro, autor ou categoria, em UPDATE/DELETE em
+    massa desses modelos e de novo no commit ou rollback da transação.
+    """
+    
+    def __init__(
+        self,
+        max_itens: int = 256,
+        ttl: float = 60.0,
+        relogio: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Inicializa o cache
+        
+        Args:
+            max_itens: Capacidade; além dela, a entrada menos usada é descartada
+            ttl: Validade de cada entrada, em segundos
+            relogio: Função que devolve o instante atual (substituível em testes)
+        
+        Raises:
+            ValueError: Se max_itens ou ttl não forem positivos
+        """
+        if isinstance(max_itens, bool) or not isinstance(max_itens, int) or max_itens < 1:
+            raise ValueError("max_itens deve ser um inteiro positivo")
+        if ttl <= 0:
+            raise ValueError("ttl deve ser positivo")
+        
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.relogio = relogio
+        self._itens: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+    
+    @classmethod
+    def de_config(cls, opcoes: Optional[Dict[str, Any]]) -> Optional["CacheFacetas"]:
+        """
+        Cria o cache a partir do bloco ``facet_cache`` da configuração
+        
+        Args:
+            opcoes: Dicionário com max_itens e ttl (None desativa o cache)
+        """
+        if not opcoes:
+            return None
+        return cls(**opcoes)
+    
+    def obter(self, assinatura: Hashable) -> Optional[Any]:
+        """
+        Resultado guardado para a assinatura, ou None se ausente ou expirado
+        
+        Args:
+            assinatura: Facetas e filtros da consulta (ver FacetasService)
+        """
+        with self._lock:
+            item = self._itens.get(assinatura)
+            if item is None or item[0] <= self.relogio():
+                self._itens.pop(assinatura, None)
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(assinatura)
+            self.acertos += 1
+            return item[1]
+    
+    def guardar(self, assinatura: Hashable, resultado: Any) -> None:
+        """
+        Guarda o resultado de uma assinatura
+        
+        Args:
+            assinatura: Facetas e filtros da consulta
+            resultado: Contagens (não devem ser alteradas depois de guardadas)
+        """
+        with self._lock:
+            self._itens[assinatura] = (self.relogio() + self.ttl, resultado)
+            self._itens.move_to_end(assinatura)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+    
+    def limpar(self) -> None:
+        """Remove todas as entradas"""
+        with self._lock:
+            if self._itens:
+                self._itens.clear()
+                self.invalidacoes += 1
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._itens)
+    
+    def como_dict(self) -> Dict[str, Any]:
+        """Contadores atuais, taxa de acerto e ocupação como dicionário"""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "invalidacoes": self.invalidacoes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+            }
+
+
+def cache_facetas_da_sessao(session: Session) -> Optional[CacheFacetas]:
+    """
+    Cache de facetas associado à sessão (None se não houver)
+    
+    Args:
+        session: Sessão síncrona
+    """
+    return session.info.get(CACHE_FACETAS)
+
+
+def alterou_livros(session: Session) -> bool:
+    """
+    Indica se a transação atual já alterou livros, autores ou categorias
+    
+    Contagens lidas depois disso podem conter dados ainda não confirmados e
+    não devem alimentar o cache.
+    """
+    return session.info.get(LIVROS_ALTERADOS, False)
+
+
+def _invalidar(session: Session) -> None:
+    cache = cache_facetas_da_sessao(session)
+    if cache is not None:
+        session.info[LIVROS_ALTERADOS] = True
+        cache.limpar()
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_flush(session, flush_context):
+    if cache_facetas_da_sessao(session) is None:
+        return
+    for entidade in list(session.new) + list(session.dirty) + list(session.deleted):
+        if type(entidade).__name__ in MODELOS_FACETAS:
+            _invalidar(session)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_.__name__ not in MODELOS_FACETAS:
+        return
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _invalidar(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _concluir_transacao(session):
+    # Esvazia de novo: outra sessão pode ter contado a versão antiga entre o
+    # flush e o fim da transação
+    if session.info.pop(LIVROS_ALTERADOS, False):
+        cache = cache_facetas_da_sessao(session)
+        if cache is not None:
+            cache.limpar()
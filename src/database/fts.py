@@ -0,0 +1,168 @@
+"""
+Busca textual com tabelas FTS5 de conteúdo externo (SQLite)
+"""
+import re
+from collections import namedtuple
+from typing import Any, Dict, FrozenSet, List, Optional
+from sqlalchemy import DDL, Table, column, event, func, literal_column, table, text
+from sqlalchemy.engine import Engine
+
+# Índices textuais declarados pelos modelos (ver IndiceTextual)
+INDICES_TEXTUAIS: List["IndiceTextual"] = []
+
+# Palavras da consulta do usuário; o restante (aspas, operadores FTS5) é descartado
+PALAVRA = re.compile(r"\w+")
+
+# Tokenizadores: palavras sem acentos (busca textual) e trigramas (busca aproximada)
+TOKENIZADOR_PALAVRAS = "unicode61 remove_diacritics 2"
+TOKENIZADOR_TRIGRAMAS = "trigram"
+
+# Resultado da busca aproximada: entidade e similaridade (0 a 1)
+Candidato = namedtuple("Candidato", ["entidade", "similaridade"])
+
+
+def consulta_textual(texto: str) -> Optional[str]:
+    """
+    Converte o texto digitado em uma consulta FTS5 segura
+    
+    Cada palavra vira um termo entre aspas (todas precisam aparecer) e a
+    última casa também como prefixo, para a busca funcionar enquanto se digita.
+    
+    Args:
+        texto: Texto livre
+    
+    Returns:
+        Consulta para MATCH, ou None se o texto não tiver palavras
+    """
+    palavras = PALAVRA.findall(texto or "")
+    if not palavras:
+        return None
+    return " ".join(f'"{palavra}"' for palavra in palavras) + "*"
+
+
+def consulta_trigramas(texto_normalizado: str) -> Optional[str]:
+    """
+    Consulta FTS5 que casa linhas com qualquer trigrama do texto
+    
+    Serve para selecionar candidatos na busca aproximada: o índice devolve as
+    linhas que compartilham trigramas com o texto, sem varrer a tabela.
+    
+    Args:
+        texto_normalizado: Texto já normalizado (ver src.database.normalizacao)
+    
+    Returns:
+        Consulta para MATCH, ou None se o texto tiver menos de 3 caracteres
+    """
+    trigramas = dict.fromkeys(
+        texto_normalizado[posicao:posicao + 3] for posicao in range(len(texto_normalizado) - 2)
+    )
+    if not trigramas:
+        return None
+    return " OR ".join('"' + trigrama.replace('"', '""') + '"' for trigrama in trigramas)
+
+
+def trigramas(texto_normalizado: str) -> FrozenSet[str]:
+    """
+    Trigramas das palavras do texto, com as bordas marcadas por espaços
+    
+    Como no pg_trgm: "dom" gera "  d", " do", "dom" e "om ", então erros no
+    início e no fim das palavras também reduzem a similaridade.
+    """
+    conjunto = set()
+    for palavra in PALAVRA.findall(texto_normalizado):
+        marcada = f"  {palavra} "
+        conjunto.update(marcada[posicao:posicao + 3] for posicao in range(len(marcada) - 2))
+    return frozenset(conjunto)
+
+
+def similaridade(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Similaridade de Jaccard entre dois conjuntos de trigramas (0 a 1)"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class IndiceTextual:
+    """
+    Tabela FTS5 de conteúdo externo sobre colunas de texto de uma tabela
+    
+    O índice guarda só os termos: o texto continua na tabela do modelo
+    (content=...). Triggers de INSERT, DELETE e UPDATE das colunas indexadas
+    o mantêm sincronizado, inclusive em gravações em lote ou em massa que não
+    passam pelo ORM. A tabela e os triggers são criados junto com a tabela
+    do modelo (create_all) ou por criar_indices_textuais em bancos existentes.
+    Com o tokenizador padrão, maiúsculas e acentos são ignorados (unicode61
+    remove_diacritics); com TOKENIZADOR_TRIGRAMAS o índice guarda trigramas.
+    """
+    
+    def __init__(
+        self,
+        tabela: Table,
+        pesos: Dict[str, float],
+        tokenizador: str = TOKENIZADOR_PALAVRAS,
+        nome: Optional[str] = None
+    ) -> None:
+        """
+        Declara o índice textual
+        
+        Args:
+            tabela: Tabela do modelo (chave primária inteira ``id``)
+            pesos: Colunas indexadas e seus pesos na relevância (bm25)
+            tokenizador: Tokenizador do FTS5
+            nome: Nome da tabela FTS5 (padrão: ``<tabela>_fts``)
+        """
+        self.tabela = tabela
+        self.nome = nome or f"{tabela.name}_fts"
+        self.pesos = dict(pesos)
+        self.tokenizador = tokenizador
+        self.tabela_fts = table(self.nome, column("rowid"))
+        
+        for instrucao in self.instrucoes_criacao():
+            event.listen(tabela, "after_create", DDL(instrucao).execute_if(dialect="sqlite"))
+        event.listen(tabela, "before_drop", DDL(f"DROP TABLE IF EXISTS {self.nome}").execute_if(dialect="sqlite"))
+        INDICES_TEXTUAIS.append(self)
+    
+    def instrucoes_criacao(self) -> List[str]:
+        """DDL da tabela FTS5 e dos triggers de sincronização"""
+        colunas = ", ".join(self.pesos)
+        novos = ", ".join(f"new.{coluna}" for coluna in self.pesos)
+        antigos = ", ".join(f"old.{coluna}" for coluna in self.pesos)
+        inserir = f"INSERT INTO {self.nome}(rowid, {colunas}) VALUES (new.id, {novos});"
+        remover = f"INSERT INTO {self.nome}({self.nome}, rowid, {colunas}) VALUES ('delete', old.id, {antigos});"
+        origem = self.tabela.name
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.nome} USING fts5({colunas}, content='{origem}', "
+            f"content_rowid='id', tokenize='{self.tokenizador}')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.nome}_ai AFTER INSERT ON {origem} BEGIN {inserir} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.nome}_ad AFTER DELETE ON {origem} BEGIN {remover} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.nome}_au AFTER UPDATE OF {colunas} ON {origem} "
+            f"BEGIN {remover} {inserir} END",
+        ]
+    
+    def condicao(self, consulta: str) -> Any:
+        """Condição MATCH sobre o índice"""
+        return literal_column(self.nome).op("MATCH")(consulta)
+    
+    def relevancia(self) -> Any:
+        """Pontuação bm25 com os pesos das colunas (menor é mais relevante)"""
+        return func.bm25(literal_column(self.nome), *self.pesos.values())
+
+
+def criar_indices_textuais(engine: Engine) -> int:
+    """
+    Cria os índices textuais que faltam e os preenche com as linhas existentes
+    
+    Args:
+        engine: Engine do SQLAlchemy (índices só existem no SQLite)
+    
+    Returns:
+        Quantidade de índices reconstruídos
+    """
+    if engine.dialect.name != "sqlite":
+        return 0
+    with engine.begin() as conn:
+        for indice in INDICES_TEXTUAIS:
+            for instrucao in indice.instrucoes_criacao():
+                conn.execute(text(instrucao))
+            conn.execute(text(f"INSERT INTO {indice.nome}({indice.nome}) VALUES ('rebuild')"))
+    return len(INDICES_TEXTUAIS)
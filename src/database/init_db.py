@@ -3,28 +3,165 @@ Script para inicializar o banco de dados
 """
 import sys
 from pathlib import Path
+from typing import List
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.database.config import db_config
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+
+from src.database.config import DatabaseConfig, db_config, registry
 from src.database.base import Base
+from src.database.fts import criar_indices_textuais
+from src.database.normalizacao import preencher_normalizados
+from src.database.reconciliar_contadores import reconciliar_contadores
 from src.models.livro import Livro
 from src.models.usuario import Usuario
 from src.models.emprestimo import Emprestimo
+from src.models.emprestimo_arquivado import EmprestimoArquivado
 from src.models.autor import Autor
 from src.models.categoria import Categoria
 
+# Tabelas cujos IDs também existem em outra tabela (o arquivo preserva os IDs
+# dos empréstimos movidos): a sequência parte do maior ID das duas
+IDS_PRESERVADOS = {Emprestimo.__table__: EmprestimoArquivado.__table__}
+
+
+def adicionar_colunas(engine) -> List[str]:
+    """
+    Adiciona as colunas declaradas nos modelos que ainda não existem no banco
+    
+    create_all não altera tabelas existentes. Só colunas que aceitam NULL ou
+    têm server_default podem ser adicionadas assim; as demais são ignoradas.
+    É também assim que as colunas normalizadas chegam a bancos antigos, antes
+    de preencher_normalizados.
+    
+    Args:
+        engine: Engine do SQLAlchemy
+    
+    Returns:
+        Colunas adicionadas, como "tabela.coluna"
+    """
+    adicionadas = []
+    with engine.begin() as conn:
+        for tabela in Base.metadata.sorted_tables:
+            existentes = {coluna["name"] for coluna in inspect(conn).get_columns(tabela.name)}
+            for coluna in tabela.columns:
+                if coluna.name in existentes or not (coluna.nullable or coluna.server_default is not None):
+                    continue
+                definicao = CreateColumn(coluna).compile(dialect=engine.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {tabela.name} ADD COLUMN {definicao}")
+                adicionadas.append(f"{tabela.name}.{coluna.name}")
+    return adicionadas
+
+
+def recriar_com_autoincremento(engine) -> List[str]:
+    """
+    Recria as tabelas declaradas com sqlite_autoincrement que existem sem AUTOINCREMENT
+    
+    O SQLite não altera a chave primária de uma tabela existente: os índices
+    da tabela antiga são removidos, ela é renomeada, a tabela é criada com a
+    definição atual e as linhas são copiadas com os mesmos IDs. A sequência
+    parte do maior ID já usado (ver IDS_PRESERVADOS), então nenhum ID removido
+    volta a ser usado.
+    
+    Args:
+        engine: Engine do SQLAlchemy (só o SQLite reaproveita IDs)
+    
+    Returns:
+        Nomes das tabelas recriadas
+    """
+    if engine.dialect.name != "sqlite":
+        return []
+    recriadas = []
+    with engine.begin() as conn:
+        for tabela in Base.metadata.sorted_tables:
+            if not tabela.dialect_options["sqlite"]["autoincrement"]:
+                continue
+            ddl = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela.name,)
+            ).scalar()
+            if ddl is None or "AUTOINCREMENT" in ddl.upper():
+                continue
+            
+            antiga = f"{tabela.name}_antiga"
+            existentes = {coluna["name"] for coluna in inspect(conn).get_columns(tabela.name)}
+            colunas = ", ".join(coluna.name for coluna in tabela.columns if coluna.name in existentes)
+            for indice in inspect(conn).get_indexes(tabela.name):
+                conn.exec_driver_sql(f"DROP INDEX {indice['name']}")
+            conn.exec_driver_sql(f"ALTER TABLE {tabela.name} RENAME TO {antiga}")
+            tabela.create(bind=conn)
+            conn.exec_driver_sql(f"INSERT INTO {tabela.name} ({colunas}) SELECT {colunas} FROM {antiga}")
+            conn.exec_driver_sql(f"DROP TABLE {antiga}")
+            
+            maior_id = max(
+                conn.exec_driver_sql(f"SELECT COALESCE(MAX(id), 0) FROM {outra.name}").scalar()
+                for outra in (tabela, IDS_PRESERVADOS.get(tabela, tabela))
+            )
+            conn.exec_driver_sql("DELETE FROM sqlite_sequence WHERE name = ?", (tabela.name,))
+            conn.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (tabela.name, maior_id))
+            recriadas.append(tabela.name)
+    return recriadas
+
+
+def criar_indices(engine) -> None:
+    """
+    Cria os índices declarados nos modelos que ainda não existem no banco
+    
+    create_all só cria índices junto com tabelas novas; bancos criados antes
+    de um índice ser declarado recebem o índice aqui.
+    
+    Args:
+        engine: Engine do SQLAlchemy
+    """
+    for tabela in Base.metadata.sorted_tables:
+        for indice in tabela.indexes:
+            indice.create(bind=engine, checkfirst=True)
+
 
-def init_database() -> None:
+def init_database(config: DatabaseConfig = db_config) -> None:
     """
-    Inicializa o banco de dados criando todas as tabelas
+    Inicializa o banco de dados criando todas as tabelas e índices
+    
+    Colunas que faltam em bancos antigos são adicionadas: as normalizadas de
+    busca são preenchidas e, se algo foi adicionado, os contadores de
+    circulação são recalculados. Tabelas declaradas com AUTOINCREMENT depois
+    de criadas são recriadas. Os índices textuais (FTS5) são criados se
+    faltarem e reconstruídos a partir das linhas existentes.
+    
+    Args:
+        config: Configuração do banco (padrão: o banco principal)
     """
     print("Criando tabelas do banco de dados...")
-    Base.metadata.create_all(bind=db_config.engine)
+    engine = config.engine
+    Base.metadata.create_all(bind=engine)
+    adicionadas = adicionar_colunas(engine)
+    recriar_com_autoincremento(engine)
+    preencher_normalizados(engine)
+    criar_indices(engine)
+    criar_indices_textuais(engine)
+    if adicionadas:
+        reconciliar_contadores(config)
     print("Banco de dados inicializado com sucesso!")
 
 
+def init_filial(filial_id: str) -> None:
+    """
+    Cria as tabelas e índices no banco de uma filial (ver init_database)
+    
+    Args:
+        filial_id: Identificador da filial (ver bloco ``filiais`` da configuração)
+    """
+    print(f"Inicializando o banco da filial '{filial_id}'...")
+    init_database(registry.get_filial(filial_id))
+
+
 if __name__ == "__main__":
-    init_database()
+    # Sem argumentos inicializa o banco padrão; com argumentos, as filiais indicadas
+    if len(sys.argv) > 1:
+        for filial_id in sys.argv[1:]:
+            init_filial(filial_id)
+    else:
+        init_database()
 
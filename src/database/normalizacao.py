@@ -0,0 +1,141 @@
+"""
+Chaves de busca normalizadas (sem acentos e sem diferença de maiúsculas)
+"""
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+from sqlalchemy import Column, String, bindparam, event, select, update
+from sqlalchemy.engine import Engine
+
+# Sufixo da coluna normalizada de um campo (ex.: titulo -> titulo_normalizado)
+SUFIXO = "_normalizado"
+
+# Campos com chave normalizada, por modelo: campo -> coluna normalizada
+CAMPOS_NORMALIZADOS: Dict[type, Dict[str, str]] = {}
+
+ESPACOS = re.compile(r"\s+")
+
+
+def normalizar(texto: Optional[str]) -> Optional[str]:
+    """
+    Normaliza um texto para comparação: sem acentos, casefold e espaços simples
+    
+    Exemplo: "  José   de ALENCAR " -> "jose de alencar"
+    
+    Args:
+        texto: Texto original
+    
+    Returns:
+        Texto normalizado (None se texto for None)
+    """
+    if texto is None:
+        return None
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+    return ESPACOS.sub(" ", sem_acentos.casefold()).strip()
+
+
+def coluna_normalizada(campo: str, tamanho: int) -> Column:
+    """
+    Declara a coluna normalizada (indexada) de um campo de texto
+    
+    O default calcula o valor a partir do campo nos INSERTs que não passam
+    pelo ORM; no ORM o valor é mantido por normalizar_campos.
+    
+    Args:
+        campo: Nome do campo de origem
+        tamanho: Tamanho máximo (o mesmo do campo de origem)
+    """
+    def default(contexto: Any) -> Optional[str]:
+        if contexto is None:
+            return None
+        return normalizar(contexto.get_current_parameters().get(campo))
+    
+    return Column(String(tamanho), nullable=True, index=True, default=default)
+
+
+def normalizar_campos(model_class: type, *campos: str) -> None:
+    """
+    Mantém as colunas normalizadas dos campos sincronizadas nas entidades
+    
+    Cada atribuição ao campo (no construtor ou depois) atualiza a coluna
+    ``<campo>_normalizado``, que precisa estar declarada no modelo (ver
+    coluna_normalizada). UPDATEs em massa usam com_normalizados.
+    
+    Args:
+        model_class: Classe do modelo
+        campos: Campos de texto com chave normalizada
+    """
+    for campo in campos:
+        destino = campo + SUFIXO
+        
+        def ao_atribuir(entidade, valor, anterior, iniciador, destino=destino):
+            setattr(entidade, destino, normalizar(valor))
+        
+        event.listen(getattr(model_class, campo), "set", ao_atribuir)
+        CAMPOS_NORMALIZADOS.setdefault(model_class, {})[campo] = destino
+
+
+def coluna_de_busca(model_class: type, campo: str) -> Optional[Any]:
+    """
+    Atributo da coluna normalizada de um campo
+    
+    Returns:
+        Atributo do modelo, ou None se o campo não tiver chave normalizada
+    """
+    destino = CAMPOS_NORMALIZADOS.get(model_class, {}).get(campo)
+    return getattr(model_class, destino) if destino else None
+
+
+def com_normalizados(model_class: type, valores: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Completa os valores de um UPDATE com as colunas normalizadas afetadas
+    
+    Args:
+        model_class: Classe do modelo
+        valores: Campos e novos valores
+    
+    Returns:
+        Novo dicionário (o original não é alterado)
+    """
+    completos = dict(valores)
+    for campo, destino in CAMPOS_NORMALIZADOS.get(model_class, {}).items():
+        if campo in valores:
+            completos[destino] = normalizar(valores[campo])
+    return completos
+
+
+def preencher_normalizados(engine: Engine, tamanho_lote: int = 1000) -> int:
+    """
+    Preenche as colunas normalizadas vazias de bancos existentes
+    
+    As colunas que faltam são criadas antes por init_db.adicionar_colunas.
+    Só as linhas com a coluna vazia são calculadas, em lotes; os índices são
+    criados depois por criar_indices.
+    
+    Args:
+        engine: Engine do SQLAlchemy
+        tamanho_lote: Linhas atualizadas por UPDATE em lote
+    
+    Returns:
+        Quantidade de linhas preenchidas
+    """
+    preenchidas = 0
+    with engine.begin() as conn:
+        for model_class, campos in CAMPOS_NORMALIZADOS.items():
+            tabela = model_class.__table__
+            for campo, destino in campos.items():
+                pendentes = conn.execute(
+                    select(tabela.c.id, tabela.c[campo]).where(
+                        tabela.c[destino].is_(None), tabela.c[campo].is_not(None)
+                    )
+                ).all()
+                consulta = update(tabela).where(tabela.c.id == bindparam("_id")).values({destino: bindparam("_valor")})
+                for inicio in range(0, len(pendentes), tamanho_lote):
+                    conn.execute(consulta, [
+                        {"_id": id, "_valor": normalizar(valor)}
+                        for id, valor in pendentes[inicio:inicio + tamanho_lote]
+                    ])
+                preenchidas += len(pendentes)
+    return preenchidas
+
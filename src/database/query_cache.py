@@ -0,0 +1,105 @@
+"""
+Cache de instruções compiladas: aquecimento e estatísticas de acerto
+"""
+import threading
+from typing import Dict, Iterable, Optional, Type
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.repositories.base_repository import BaseRepository
+from src.repositories.livro_repository import LivroRepository
+from src.repositories.usuario_repository import UsuarioRepository
+from src.repositories.emprestimo_repository import EmprestimoRepository
+from src.repositories.autor_repository import AutorRepository
+from src.repositories.categoria_repository import CategoriaRepository
+
+# Repositórios cujas CONSULTAS_QUENTES são compiladas no aquecimento
+REPOSITORIOS = (LivroRepository, UsuarioRepository, EmprestimoRepository, AutorRepository, CategoriaRepository)
+
+
+class EstatisticasCache:
+    """Contadores de acerto/falha do cache de compilação de uma engine"""
+    
+    def __init__(self) -> None:
+        """Inicializa os contadores zerados"""
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.sem_cache = 0
+    
+    def registrar(self, engine: Engine) -> "EstatisticasCache":
+        """
+        Passa a contar as execuções da engine
+        
+        Args:
+            engine: Engine do SQLAlchemy (síncrona)
+        
+        Returns:
+            O próprio objeto de estatísticas
+        """
+        event.listen(engine, "after_cursor_execute", self._contar)
+        return self
+    
+    def _contar(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        situacao = getattr(context, "cache_hit", None)
+        with self._lock:
+            if situacao == context.dialect.CACHE_HIT:
+                self.acertos += 1
+            elif situacao == context.dialect.CACHE_MISS:
+                self.falhas += 1
+            else:
+                self.sem_cache += 1
+    
+    def zerar(self) -> None:
+        """Zera os contadores"""
+        with self._lock:
+            self.acertos = self.falhas = self.sem_cache = 0
+    
+    def como_dict(self) -> Dict[str, int]:
+        """Contadores atuais como dicionário"""
+        with self._lock:
+            return {"acertos": self.acertos, "falhas": self.falhas, "sem_cache": self.sem_cache}
+
+
+def _sem_linhas(conn, cursor, statement, parameters, context, executemany):
+    """Executa os SELECTs do aquecimento sem ler nenhuma linha"""
+    if statement.lstrip().upper().startswith("SELECT"):
+        statement = f"SELECT * FROM ({statement}) LIMIT 0"
+    return statement, parameters
+
+
+def aquecer(engine: Engine, repositorios: Optional[Iterable[Type[BaseRepository]]] = None) -> int:
+    """
+    Compila antecipadamente as consultas quentes dos repositórios
+    
+    Cada método listado em ``CONSULTAS_QUENTES`` é executado uma vez em uma
+    conexão própria, com os SELECTs envolvidos em ``LIMIT 0``: a instrução
+    é compilada e guardada no cache da engine sem trazer dados. Bancos ainda
+    sem tabelas são ignorados.
+    
+    Args:
+        engine: Engine do SQLAlchemy (síncrona)
+        repositorios: Classes de repositório (padrão: REPOSITORIOS)
+    
+    Returns:
+        Quantidade de consultas aquecidas
+    """
+    aquecidas = 0
+    with engine.connect() as conn:
+        event.listen(conn, "before_cursor_execute", _sem_linhas, retval=True)
+        session = Session(bind=conn)
+        try:
+            for classe in repositorios or REPOSITORIOS:
+                repo = classe(session)
+                for metodo, argumentos in classe.CONSULTAS_QUENTES:
+                    getattr(repo, metodo)(*argumentos)
+                    aquecidas += 1
+        except OperationalError:
+            # Tabelas ainda não criadas: o cache será preenchido no primeiro uso
+            pass
+        finally:
+            session.close()
+            conn.rollback()
+    return aquecidas
@@ -0,0 +1,108 @@
+"""
+Verificação de planos de consulta (EXPLAIN QUERY PLAN) do SQLite
+"""
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class VarreduraCompleta:
+    """Consulta cujo plano contém uma varredura completa de tabela"""
+    
+    def __init__(self, sql: str, detalhe: str) -> None:
+        """
+        Inicializa o registro
+        
+        Args:
+            sql: SQL executado
+            detalhe: Linha do plano que indica a varredura
+        """
+        self.sql = sql
+        self.detalhe = detalhe
+    
+    def __repr__(self) -> str:
+        return f"<VarreduraCompleta({self.detalhe!r})>"
+
+
+@contextmanager
+def capturar_consultas(engine: Engine) -> Iterator[List[Tuple[str, Any]]]:
+    """
+    Captura os SELECTs executados na engine enquanto o bloco estiver ativo
+    
+    Args:
+        engine: Engine do SQLAlchemy
+    
+    Yields:
+        Lista (preenchida durante o bloco) de pares (sql, parâmetros)
+    """
+    consultas: List[Tuple[str, Any]] = []
+    
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            consultas.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", _registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", _registrar)
+
+
+def explicar(engine: Engine, sql: str, parametros: Any = ()) -> List[str]:
+    """
+    Executa EXPLAIN QUERY PLAN para um SQL
+    
+    Args:
+        engine: Engine do SQLAlchemy (SQLite)
+        sql: SQL a explicar
+        parametros: Parâmetros posicionais do SQL
+    
+    Returns:
+        Linhas de detalhe do plano
+    """
+    with engine.connect() as conn:
+        linhas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", tuple(parametros or ())).fetchall()
+    return [linha[-1] for linha in linhas]
+
+
+def eh_varredura_completa(detalhe: str) -> bool:
+    """
+    Indica se uma linha do plano é uma varredura completa de tabela
+    
+    Varreduras por índice ("SCAN t USING INDEX ...") não contam, nem as de
+    tabelas virtuais atendidas pelo próprio índice ("SCAN t_fts VIRTUAL
+    TABLE INDEX n:M...", ex.: um MATCH do FTS5).
+    
+    Args:
+        detalhe: Linha de detalhe do EXPLAIN QUERY PLAN
+    """
+    detalhe = detalhe.upper()
+    return (
+        detalhe.startswith("SCAN ")
+        and " USING " not in detalhe
+        and "CONSTANT ROW" not in detalhe
+        and " VIRTUAL TABLE INDEX " not in detalhe
+    )
+
+
+def varreduras_completas(engine: Engine, operacao: Callable[[], Any]) -> List[VarreduraCompleta]:
+    """
+    Executa uma operação e devolve as varreduras completas dos seus SELECTs
+    
+    Args:
+        engine: Engine do SQLAlchemy (SQLite)
+        operacao: Função sem argumentos que executa as consultas (ex.: um método de repositório)
+    
+    Returns:
+        Lista de varreduras completas encontradas (vazia se todas usam índice)
+    """
+    with capturar_consultas(engine) as consultas:
+        operacao()
+    
+    encontradas: List[VarreduraCompleta] = []
+    for sql, parametros in consultas:
+        for detalhe in explicar(engine, sql, parametros):
+            if eh_varredura_completa(detalhe):
+                encontradas.append(VarreduraCompleta(sql, detalhe))
+    return encontradas
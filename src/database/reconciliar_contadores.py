@@ -0,0 +1,40 @@
+"""
+Script para recalcular os contadores de circulação de livros e usuários
+"""
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database.config import DatabaseConfig, db_config, registry
+from src.services.emprestimo_service import EmprestimoService
+
+
+def reconciliar_contadores(config: DatabaseConfig = db_config) -> Dict[str, int]:
+    """
+    Recalcula em lote os contadores de circulação a partir dos empréstimos
+    
+    Args:
+        config: Configuração do banco (padrão: o banco principal)
+    
+    Returns:
+        Quantidade de livros e de usuários atualizados
+    """
+    session = config.get_session()
+    try:
+        totais = EmprestimoService(session).reconciliar_contadores()
+    finally:
+        session.close()
+    print(f"Contadores reconciliados: {totais['livros']} livros, {totais['usuarios']} usuários")
+    return totais
+
+
+if __name__ == "__main__":
+    # Sem argumentos reconcilia o banco padrão; com argumentos, as filiais indicadas
+    if len(sys.argv) > 1:
+        for filial_id in sys.argv[1:]:
+            reconciliar_contadores(registry.get_filial(filial_id))
+    else:
+        reconciliar_contadores()
@@ -0,0 +1,216 @@
+"""
+Repetição de transações que falham por contenção de lock no SQLite
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from sqlalchemy.exc import OperationalError
+
+R = TypeVar("R")
+
+# Chave em Session.info com a política de repetição da sessão
+POLITICA_RETRY = "politica_retry"
+
+# Trechos das mensagens do SQLite que indicam contenção (e não erro de SQL)
+MENSAGENS_LOCK = ("database is locked", "database table is locked", "database is busy")
+
+
+def eh_erro_de_lock(erro: BaseException) -> bool:
+    """
+    Indica se a exceção é uma falha transitória de lock do SQLite
+    
+    Args:
+        erro: Exceção capturada
+    
+    Returns:
+        True se repetir a transação pode resolver
+    """
+    if not isinstance(erro, OperationalError):
+        return False
+    mensagem = str(erro.orig if erro.orig is not None else erro).lower()
+    return any(trecho in mensagem for trecho in MENSAGENS_LOCK)
+
+
+class MetricasRetry:
+    """Contadores de repetições por contenção de lock"""
+    
+    def __init__(self) -> None:
+        """Inicializa os contadores zerados"""
+        self._lock = threading.Lock()
+        self.operacoes_repetidas = 0
+        self.repeticoes = 0
+        self.esgotadas = 0
+        self.tempo_espera_lock = 0.0
+    
+    def registrar_repeticao(self, primeira: bool, espera: float) -> None:
+        """
+        Registra uma nova tentativa
+        
+        Args:
+            primeira: Se é a primeira repetição desta operação
+            espera: Segundos perdidos com o lock (tentativa falha + pausa)
+        """
+        with self._lock:
+            self.repeticoes += 1
+            self.tempo_espera_lock += espera
+            if primeira:
+                self.operacoes_repetidas += 1
+    
+    def registrar_esgotada(self, espera: float) -> None:
+        """Registra uma operação que falhou mesmo após todas as tentativas"""
+        with self._lock:
+            self.esgotadas += 1
+            self.tempo_espera_lock += espera
+    
+    def como_dict(self) -> Dict[str, Any]:
+        """Contadores atuais como dicionário"""
+        with self._lock:
+            return {
+                "operacoes_repetidas": self.operacoes_repetidas,
+                "repeticoes": self.repeticoes,
+                "esgotadas": self.esgotadas,
+                "tempo_espera_lock": self.tempo_espera_lock,
+            }
+
+
+class PoliticaRetry:
+    """
+    Backoff exponencial limitado, com jitter, para transações bloqueadas
+    
+    A operação inteira é repetida desde o início (após rollback), então ela
+    não deve ter efeitos fora do banco que não possam ser refeitos.
+    """
+    
+    def __init__(
+        self,
+        tentativas: int = 5,
+        espera_inicial: float = 0.05,
+        espera_maxima: float = 1.0,
+        multiplicador: float = 2.0,
+        jitter: bool = True,
+        dormir: Callable[[float], None] = time.sleep,
+        metricas: Optional[MetricasRetry] = None
+    ) -> None:
+        """
+        Inicializa a política
+        
+        Args:
+            tentativas: Número máximo de execuções (1 desativa a repetição)
+            espera_inicial: Pausa base, em segundos, antes da primeira repetição
+            espera_maxima: Limite, em segundos, de cada pausa
+            multiplicador: Fator de crescimento da pausa a cada repetição
+            jitter: Se True, sorteia a pausa entre 0 e o limite calculado
+            dormir: Função de pausa (substituível em testes)
+            metricas: Contadores compartilhados (padrão: contadores próprios)
+        
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        if tentativas < 1:
+            raise ValueError("tentativas deve ser pelo menos 1")
+        if espera_inicial < 0 or espera_maxima < 0 or multiplicador < 1:
+            raise ValueError("esperas não podem ser negativas e o multiplicador deve ser >= 1")
+        
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.multiplicador = multiplicador
+        self.jitter = jitter
+        self.dormir = dormir
+        self.metricas = metricas or MetricasRetry()
+    
+    @classmethod
+    def de_config(cls, opcoes: Optional[Dict[str, Any]]) -> "PoliticaRetry":
+        """
+        Cria a política a partir do bloco ``retry`` da configuração
+        
+        Args:
+            opcoes: Dicionário com tentativas, espera_inicial, espera_maxima,
+                multiplicador e jitter (todos opcionais)
+        """
+        return cls(**(opcoes or {}))
+    
+    def pausa(self, repeticao: int) -> float:
+        """
+        Calcula a pausa antes de uma repetição
+        
+        Args:
+            repeticao: Número da repetição (1 para a primeira)
+        
+        Returns:
+            Pausa em segundos
+        """
+        limite = min(self.espera_maxima, self.espera_inicial * self.multiplicador ** (repeticao - 1))
+        return random.uniform(0, limite) if self.jitter else limite
+    
+    def executar(self, session, operacao: Callable[[], R]) -> R:
+        """
+        Executa a operação, repetindo-a enquanto falhar por lock
+        
+        Args:
+            session: Sessão usada pela operação (desfeita antes de repetir)
+            operacao: Função sem argumentos que executa a transação completa
+        
+        Returns:
+            Resultado da operação
+        """
+        for tentativa in range(1, self.tentativas + 1):
+            inicio = time.monotonic()
+            try:
+                return operacao()
+            except OperationalError as erro:
+                if not eh_erro_de_lock(erro):
+                    raise
+                espera = time.monotonic() - inicio
+                if tentativa == self.tentativas:
+                    self.metricas.registrar_esgotada(espera)
+                    raise
+                session.rollback()
+                pausa = self.pausa(tentativa)
+                self.dormir(pausa)
+                self.metricas.registrar_repeticao(tentativa == 1, espera + pausa)
+        raise AssertionError("inalcançável")  # pragma: no cover
+    
+    async def executar_async(self, session, operacao: Callable[[], Awaitable[R]]) -> R:
+        """
+        Variante assíncrona de ``executar`` (pausa com asyncio.sleep)
+        
+        Args:
+            session: AsyncSession usada pela operação
+            operacao: Função sem argumentos que devolve a corrotina da transação
+        
+        Returns:
+            Resultado da operação
+        """
+        for tentativa in range(1, self.tentativas + 1):
+            inicio = time.monotonic()
+            try:
+                return await operacao()
+            except OperationalError as erro:
+                if not eh_erro_de_lock(erro):
+                    raise
+                espera = time.monotonic() - inicio
+                if tentativa == self.tentativas:
+                    self.metricas.registrar_esgotada(espera)
+                    raise
+                await session.rollback()
+                pausa = self.pausa(tentativa)
+                await asyncio.sleep(pausa)
+                self.metricas.registrar_repeticao(tentativa == 1, espera + pausa)
+        raise AssertionError("inalcançável")  # pragma: no cover
+
+
+# Política usada por sessões que não receberam uma da configuração
+politica_padrao = PoliticaRetry()
+
+
+def politica_da_sessao(session) -> PoliticaRetry:
+    """
+    Política de repetição associada à sessão (ou a padrão)
+    
+    Args:
+        session: Sessão síncrona ou assíncrona
+    """
+    return session.info.get(POLITICA_RETRY) or politica_padrao
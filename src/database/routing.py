@@ -0,0 +1,62 @@
+"""
+Roteamento de sessões entre o banco primário (escrita) e a réplica de leitura
+"""
+from typing import Any, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.database.unit_of_work import em_unidade_de_trabalho
+
+# Chave em Session.info marcando que a transação atual já escreveu no primário
+ESCRITA_PENDENTE = "escrita_pendente"
+
+
+class RoutingSession(Session):
+    """
+    Sessão que envia leituras à réplica e escritas ao primário
+    
+    Vão para o primário: flushes, INSERT/UPDATE/DELETE, qualquer consulta
+    dentro de uma unidade de trabalho e qualquer consulta feita depois de uma
+    escrita ainda não confirmada (read-your-writes). As demais leituras vão
+    para a réplica. Sem réplica, tudo vai para o primário.
+    """
+    
+    def __init__(self, *args: Any, replica: Optional[Engine] = None, **kwargs: Any) -> None:
+        """
+        Inicializa a sessão
+        
+        Args:
+            replica: Engine somente leitura (None desativa o roteamento)
+            *args, **kwargs: Argumentos repassados a Session
+        """
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replica is None or self._usar_primario(clause):
+            return super().get_bind(mapper, clause=clause, **kw)
+        return self.replica
+    
+    def _usar_primario(self, clause) -> bool:
+        """Indica se a instrução precisa ser executada no primário"""
+        if self._flushing or getattr(clause, "is_dml", False):
+            return True
+        return em_unidade_de_trabalho(self) or self.info.get(ESCRITA_PENDENTE, False)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _marcar_escrita(session, flush_context):
+    session.info[ESCRITA_PENDENTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _marcar_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[ESCRITA_PENDENTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _limpar_escrita(session):
+    session.info.pop(ESCRITA_PENDENTE, None)
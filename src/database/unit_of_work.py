@@ -0,0 +1,157 @@
+"""
+Unidade de trabalho: agrupa várias escritas em uma única transação
+"""
+from functools import wraps
+from typing import Any, Callable, TypeVar
+from sqlalchemy.orm import Session
+
+from src.database.retry import politica_da_sessao
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Chave em Session.info com a profundidade de unidades de trabalho abertas
+UOW_PROFUNDIDADE = "uow_profundidade"
+
+
+def em_unidade_de_trabalho(session: Session) -> bool:
+    """
+    Verifica se a sessão está dentro de uma unidade de trabalho
+    
+    Args:
+        session: Sessão do banco de dados
+    
+    Returns:
+        True se houver uma unidade de trabalho aberta
+    """
+    return session.info.get(UOW_PROFUNDIDADE, 0) > 0
+
+
+class UnitOfWork:
+    """
+    Contexto transacional com commit adiado
+    
+    Dentro do bloco os repositórios apenas fazem flush; o commit acontece uma
+    única vez na saída do bloco mais externo. Se uma exceção escapar do bloco,
+    toda a transação é desfeita. Blocos aninhados participam da transação do
+    bloco externo.
+    
+    Exemplo:
+        with UnitOfWork(session):
+            livro_repo.atualizar(livro)
+            emprestimo_repo.criar(emprestimo)
+    """
+    
+    def __init__(self, session: Session) -> None:
+        """
+        Inicializa a unidade de trabalho
+        
+        Args:
+            session: Sessão do banco de dados
+        """
+        self.session = session
+    
+    def __enter__(self) -> "UnitOfWork":
+        self.session.info[UOW_PROFUNDIDADE] = self.session.info.get(UOW_PROFUNDIDADE, 0) + 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        profundidade = self.session.info.get(UOW_PROFUNDIDADE, 1) - 1
+        self.session.info[UOW_PROFUNDIDADE] = profundidade
+        
+        if profundidade > 0:
+            # Bloco aninhado: quem decide é o bloco externo
+            return False
+        
+        if exc_type is not None:
+            self.session.rollback()
+            return False
+        
+        try:
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return False
+
+
+def transacional(metodo: F) -> F:
+    """
+    Decorador para métodos de serviço: executa o método em uma unidade de trabalho
+    
+    O objeto decorado precisa expor a sessão em ``self.session``. Na unidade
+    mais externa, se a transação falhar por lock do SQLite ("database is
+    locked"), o método inteiro é desfeito e repetido conforme a política de
+    repetição da sessão (ver src/database/retry.py). Chamadas aninhadas apenas
+    participam da transação externa.
+    """
+    @wraps(metodo)
+    def wrapper(self, *args, **kwargs):
+        def executar():
+            with UnitOfWork(self.session):
+                return metodo(self, *args, **kwargs)
+        
+        if em_unidade_de_trabalho(self.session):
+            return executar()
+        return politica_da_sessao(self.session).executar(self.session, executar)
+    return wrapper  # type: ignore[return-value]
+
+
+class AsyncUnitOfWork:
+    """
+    Variante assíncrona da UnitOfWork, para AsyncSession
+    
+    Exemplo:
+        async with AsyncUnitOfWork(session):
+            await livro_repo.atualizar(livro)
+            await emprestimo_repo.criar(emprestimo)
+    """
+    
+    def __init__(self, session) -> None:
+        """
+        Inicializa a unidade de trabalho
+        
+        Args:
+            session: Sessão assíncrona do banco de dados
+        """
+        self.session = session
+    
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        self.session.info[UOW_PROFUNDIDADE] = self.session.info.get(UOW_PROFUNDIDADE, 0) + 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        profundidade = self.session.info.get(UOW_PROFUNDIDADE, 1) - 1
+        self.session.info[UOW_PROFUNDIDADE] = profundidade
+        
+        if profundidade > 0:
+            return False
+        
+        if exc_type is not None:
+            await self.session.rollback()
+            return False
+        
+        try:
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return False
+
+
+def transacional_async(metodo: F) -> F:
+    """
+    Decorador para métodos assíncronos de serviço: executa em uma AsyncUnitOfWork
+    
+    O objeto decorado precisa expor a sessão assíncrona em ``self.session``.
+    Falhas por lock são repetidas como em ``transacional``.
+    """
+    @wraps(metodo)
+    async def wrapper(self, *args, **kwargs):
+        async def executar():
+            async with AsyncUnitOfWork(self.session):
+                return await metodo(self, *args, **kwargs)
+        
+        if em_unidade_de_trabalho(self.session):
+            return await executar()
+        return await politica_da_sessao(self.session).executar_async(self.session, executar)
+    return wrapper  # type: ignore[return-value]
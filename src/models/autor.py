@@ -7,6 +7,8 @@ from typing import Optional, TYPE_CHECKING
 from datetime import date
 
 from src.database.base import BaseModel
+from src.database.fts import TOKENIZADOR_TRIGRAMAS, IndiceTextual
+from src.database.normalizacao import coluna_normalizada, normalizar_campos
 
 if TYPE_CHECKING:
     from src.models.livro import Livro
@@ -18,6 +20,7 @@ class Autor(BaseModel):
     __tablename__ = "autores"
     
     nome = Column(String(200), nullable=False, index=True)
+    nome_normalizado = coluna_normalizada("nome", 200)
     nacionalidade = Column(String(100), nullable=True)
     data_nascimento = Column(Date, nullable=True)
     biografia = Column(String(1000), nullable=True)
@@ -46,3 +49,12 @@ class Autor(BaseModel):
         
         return idade
 
+
+# Chave de busca sem acentos e sem diferença de maiúsculas
+normalizar_campos(Autor, "nome")
+
+# Busca textual no nome do autor
+BUSCA_AUTORES = IndiceTextual(Autor.__table__, {"nome": 1.0})
+
+# Trigramas da chave normalizada, para a busca aproximada (tolerante a erros de digitação)
+TRIGRAMAS_AUTORES = IndiceTextual(Autor.__table__, {"nome_normalizado": 1.0}, TOKENIZADOR_TRIGRAMAS, "autores_trigramas")
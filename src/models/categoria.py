@@ -6,6 +6,7 @@ from sqlalchemy.orm import relationship
 from typing import TYPE_CHECKING
 
 from src.database.base import BaseModel
+from src.database.normalizacao import coluna_normalizada, normalizar_campos
 
 if TYPE_CHECKING:
     from src.models.livro import Livro
@@ -17,6 +18,7 @@ class Categoria(BaseModel):
     __tablename__ = "categorias"
     
     nome = Column(String(100), unique=True, nullable=False, index=True)
+    nome_normalizado = coluna_normalizada("nome", 100)
     descricao = Column(Text, nullable=True)
     
     # Relacionamento com livros
@@ -25,3 +27,6 @@ class Categoria(BaseModel):
     def __repr__(self) -> str:
         return f"<Categoria(id={self.id}, nome='{self.nome}')>"
 
+
+# Chave de busca sem acentos e sem diferença de maiúsculas
+normalizar_campos(Categoria, "nome")
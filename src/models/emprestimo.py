@@ -1,7 +1,7 @@
 """
 Modelo de Empréstimo
 """
-from sqlalchemy import Column, Integer, ForeignKey, Date, Boolean, Numeric
+from sqlalchemy import Column, Integer, ForeignKey, Date, Boolean, Numeric, Index
 from sqlalchemy.orm import relationship
 from typing import Optional, TYPE_CHECKING
 from datetime import date, timedelta
@@ -17,6 +17,16 @@ class Emprestimo(BaseModel):
     """Modelo representando um empréstimo de livro"""
     
     __tablename__ = "emprestimos"
+    __table_args__ = (
+        # buscar_por_usuario / buscar_por_usuario_ativos
+        Index("ix_emprestimos_usuario_devolvido", "usuario_id", "devolvido"),
+        # buscar_ativos / buscar_atrasados
+        Index("ix_emprestimos_devolvido_prevista", "devolvido", "data_prevista_devolucao"),
+        # buscar_ids_para_arquivar
+        Index("ix_emprestimos_devolvido_devolucao", "devolvido", "data_devolucao"),
+        # IDs nunca reaproveitados: o arquivo preserva os IDs dos empréstimos movidos
+        {"sqlite_autoincrement": True},
+    )
     
     data_emprestimo = Column(Date, nullable=False, default=date.today)
     data_prevista_devolucao = Column(Date, nullable=False)
@@ -25,7 +35,7 @@ class Emprestimo(BaseModel):
     multa = Column(Numeric(10, 2), default=0.0, nullable=False)
     
     # Chaves estrangeiras
-    livro_id = Column(Integer, ForeignKey("livros.id"), nullable=False)
+    livro_id = Column(Integer, ForeignKey("livros.id"), nullable=False, index=True)
     usuario_id = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
     
     # Relacionamentos
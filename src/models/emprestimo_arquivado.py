@@ -0,0 +1,54 @@
+"""
+Modelo de Empréstimo Arquivado
+"""
+from sqlalchemy import Column, Integer, Date, Boolean, Numeric
+from sqlalchemy.orm import relationship
+from typing import TYPE_CHECKING
+from datetime import date
+
+from src.database.base import BaseModel
+
+if TYPE_CHECKING:
+    from src.models.livro import Livro
+    from src.models.usuario import Usuario
+
+
+class EmprestimoArquivado(BaseModel):
+    """
+    Empréstimo devolvido movido para a tabela fria de histórico
+    
+    Mantém o mesmo ID e as mesmas colunas do empréstimo original. Não há
+    chaves estrangeiras: o histórico sobrevive à remoção de livros e usuários.
+    """
+    
+    __tablename__ = "emprestimos_arquivo"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    data_emprestimo = Column(Date, nullable=False)
+    data_prevista_devolucao = Column(Date, nullable=False)
+    data_devolucao = Column(Date, nullable=True)
+    devolvido = Column(Boolean, default=True, nullable=False)
+    multa = Column(Numeric(10, 2), default=0.0, nullable=False)
+    arquivado_em = Column(Date, nullable=False, default=date.today)
+    
+    livro_id = Column(Integer, nullable=False, index=True)
+    usuario_id = Column(Integer, nullable=False, index=True)
+    
+    # Relacionamentos somente leitura (sem chave estrangeira no banco)
+    livro = relationship(
+        "Livro", primaryjoin="foreign(EmprestimoArquivado.livro_id) == Livro.id", viewonly=True
+    )
+    usuario = relationship(
+        "Usuario", primaryjoin="foreign(EmprestimoArquivado.usuario_id) == Usuario.id", viewonly=True
+    )
+    
+    def __repr__(self) -> str:
+        return f"<EmprestimoArquivado(id={self.id}, livro_id={self.livro_id}, usuario_id={self.usuario_id})>"
+    
+    def esta_atrasado(self) -> bool:
+        """Empréstimos arquivados já foram devolvidos"""
+        return False
+    
+    def dias_atraso(self) -> int:
+        """Empréstimos arquivados já foram devolvidos"""
+        return 0
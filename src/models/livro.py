@@ -1,11 +1,14 @@
 """
 Modelo de Livro
 """
-from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, Text, Numeric
+from sqlalchemy import Column, Date, String, Integer, ForeignKey, Boolean, Text, Numeric, case
 from sqlalchemy.orm import relationship
 from typing import TYPE_CHECKING
+from datetime import date
 
 from src.database.base import BaseModel
+from src.database.fts import TOKENIZADOR_TRIGRAMAS, IndiceTextual
+from src.database.normalizacao import coluna_normalizada, normalizar_campos
 
 if TYPE_CHECKING:
     from src.models.autor import Autor
@@ -19,18 +22,25 @@ class Livro(BaseModel):
     __tablename__ = "livros"
     
     titulo = Column(String(300), nullable=False, index=True)
+    titulo_normalizado = coluna_normalizada("titulo", 300)
     ano_publicacao = Column(Integer, nullable=True)
     editora = Column(String(200), nullable=True)
     numero_paginas = Column(Integer, nullable=True)
     sinopse = Column(Text, nullable=True)
     preco = Column(Numeric(10, 2), nullable=True)
-    disponivel = Column(Boolean, default=True, nullable=False)
+    disponivel = Column(Boolean, default=True, nullable=False, index=True)
     quantidade_total = Column(Integer, default=1, nullable=False)
     quantidade_disponivel = Column(Integer, default=1, nullable=False)
     
+    # Contadores de circulação (mantidos por EmprestimoService; reconstruídos por
+    # reconciliar_contadores). O índice atende o ranking dos mais emprestados.
+    total_emprestimos = Column(Integer, default=0, server_default="0", nullable=False, index=True)
+    emprestimos_ativos = Column(Integer, default=0, server_default="0", nullable=False)
+    ultimo_emprestimo_em = Column(Date, nullable=True)
+    
     # Chaves estrangeiras
-    autor_id = Column(Integer, ForeignKey("autores.id"), nullable=False)
-    categoria_id = Column(Integer, ForeignKey("categorias.id"), nullable=True)
+    autor_id = Column(Integer, ForeignKey("autores.id"), nullable=False, index=True)
+    categoria_id = Column(Integer, ForeignKey("categorias.id"), nullable=True, index=True)
     
     # Relacionamentos
     autor = relationship("Autor", back_populates="livros")
@@ -70,4 +80,32 @@ class Livro(BaseModel):
         if self.quantidade_disponivel < self.quantidade_total:
             self.quantidade_disponivel += 1
             self.disponivel = True
+    
+    def registrar_emprestimo(self, data: date) -> None:
+        """
+        Atualiza os contadores de circulação com um novo empréstimo
+        
+        Os contadores recebem expressões SQL, então o flush grava
+        ``SET total_emprestimos = total_emprestimos + 1`` e empréstimos
+        simultâneos não sobrescrevem o incremento um do outro.
+        
+        Args:
+            data: Data do empréstimo
+        """
+        self.total_emprestimos = Livro.total_emprestimos + 1
+        self.emprestimos_ativos = Livro.emprestimos_ativos + 1
+        self.ultimo_emprestimo_em = data
+    
+    def registrar_devolucao(self) -> None:
+        """Atualiza os contadores de circulação com uma devolução (expressão SQL, sem ficar negativo)"""
+        self.emprestimos_ativos = case((Livro.emprestimos_ativos > 0, Livro.emprestimos_ativos - 1), else_=0)
+
+
+# Chave de busca sem acentos e sem diferença de maiúsculas
+normalizar_campos(Livro, "titulo")
+
+# Busca textual no título (peso maior) e na sinopse
+BUSCA_LIVROS = IndiceTextual(Livro.__table__, {"titulo": 10.0, "sinopse": 1.0})
 
+# Trigramas da chave normalizada, para a busca aproximada (tolerante a erros de digitação)
+TRIGRAMAS_LIVROS = IndiceTextual(Livro.__table__, {"titulo_normalizado": 1.0}, TOKENIZADOR_TRIGRAMAS, "livros_trigramas")
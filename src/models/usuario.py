@@ -1,12 +1,14 @@
 """
 Modelo de Usuário
 """
-from sqlalchemy import Column, String, Date, Integer, Boolean
+from sqlalchemy import Column, String, Date, Integer, Boolean, Numeric, case
 from sqlalchemy.orm import relationship
 from typing import TYPE_CHECKING
 from datetime import date
+from decimal import Decimal
 
 from src.database.base import BaseModel
+from src.database.normalizacao import coluna_normalizada, normalizar_campos
 
 if TYPE_CHECKING:
     from src.models.emprestimo import Emprestimo
@@ -18,9 +20,17 @@ class Usuario(BaseModel):
     __tablename__ = "usuarios"
     
     nome = Column(String(200), nullable=False, index=True)
+    nome_normalizado = coluna_normalizada("nome", 200)
     email = Column(String(200), unique=True, nullable=False, index=True)
     data_nascimento = Column(Date, nullable=False)
-    ativo = Column(Boolean, default=True, nullable=False)
+    ativo = Column(Boolean, default=True, nullable=False, index=True)
+    
+    # Contadores de circulação (mantidos por EmprestimoService; reconstruídos por
+    # reconciliar_contadores). Multas pendentes somam as multas registradas nas
+    # devoluções, já que não há registro de pagamento.
+    emprestimos_ativos = Column(Integer, default=0, server_default="0", nullable=False)
+    total_emprestimos = Column(Integer, default=0, server_default="0", nullable=False)
+    multas_pendentes = Column(Numeric(10, 2), default=0, server_default="0", nullable=False)
     
     # Relacionamento com empréstimos
     emprestimos = relationship("Emprestimo", back_populates="usuario", cascade="all, delete-orphan")
@@ -47,6 +57,8 @@ class Usuario(BaseModel):
         """
         Verifica se o usuário pode fazer novos empréstimos
         
+        Lê o contador emprestimos_ativos, sem consultar os empréstimos.
+        
         Args:
             max_emprestimos: Número máximo de empréstimos permitidos
         
@@ -56,6 +68,26 @@ class Usuario(BaseModel):
         if not self.ativo:
             return False
         
-        emprestimos_ativos = sum(1 for emp in self.emprestimos if not emp.devolvido)
-        return emprestimos_ativos < max_emprestimos
+        return (self.emprestimos_ativos or 0) < max_emprestimos
+    
+    def registrar_emprestimo(self) -> None:
+        """Atualiza os contadores de circulação com um novo empréstimo (expressões SQL, ver Livro)"""
+        self.emprestimos_ativos = Usuario.emprestimos_ativos + 1
+        self.total_emprestimos = Usuario.total_emprestimos + 1
+    
+    def registrar_devolucao(self, multa: float) -> None:
+        """
+        Atualiza os contadores de circulação com uma devolução
+        
+        Os valores são expressões SQL sobre a linha atual, então devoluções
+        simultâneas do mesmo usuário somam as duas multas.
+        
+        Args:
+            multa: Multa registrada na devolução
+        """
+        self.emprestimos_ativos = case((Usuario.emprestimos_ativos > 0, Usuario.emprestimos_ativos - 1), else_=0)
+        self.multas_pendentes = Usuario.multas_pendentes + Decimal(str(multa))
+
 
+# Chave de busca sem acentos e sem diferença de maiúsculas
+normalizar_campos(Usuario, "nome")
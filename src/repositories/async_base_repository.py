@@ -0,0 +1,125 @@
+"""
+Repositório base assíncrono (AsyncSession)
+"""
+from typing import Any, Dict, Generic, List, Optional, TYPE_CHECKING
+from sqlalchemy import select
+
+from src.database.unit_of_work import em_unidade_de_trabalho
+from src.repositories.base_repository import (
+    T, condicoes_filtros, consulta_contagem, consulta_existencia, criterio_ordenacao
+)
+from src.repositories.carregamento import PlanoCarregamento, opcoes_carregamento
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncBaseRepository(Generic[T]):
+    """Contraparte assíncrona de BaseRepository, com as mesmas operações e filtros"""
+    
+    def __init__(self, session: "AsyncSession", model_class: type[T]) -> None:
+        """
+        Inicializa o repositório
+        
+        Args:
+            session: Sessão assíncrona do banco de dados
+            model_class: Classe do modelo
+        """
+        self.session = session
+        self.model_class = model_class
+    
+    async def _persistir(self, entidade: Optional[T] = None) -> None:
+        """
+        Conclui uma escrita respeitando a unidade de trabalho
+        
+        Args:
+            entidade: Entidade a recarregar após o commit (opcional)
+        """
+        if em_unidade_de_trabalho(self.session):
+            await self.session.flush()
+            return
+        
+        await self.session.commit()
+        if entidade is not None:
+            await self.session.refresh(entidade)
+    
+    async def _listar(self, stmt) -> List[T]:
+        """Executa um select de entidades e devolve a lista"""
+        resultado = await self.session.execute(stmt)
+        return list(resultado.scalars().all())
+    
+    async def _primeiro(self, stmt) -> Optional[T]:
+        """Executa um select de entidades e devolve a primeira (ou None)"""
+        resultado = await self.session.execute(stmt.limit(1))
+        return resultado.scalars().first()
+    
+    async def criar(self, entidade: T) -> T:
+        """Cria uma nova entidade"""
+        self.session.add(entidade)
+        await self._persistir(entidade)
+        return entidade
+    
+    def _select(self, carregar: Optional[PlanoCarregamento] = None) -> Any:
+        """SELECT das entidades com o plano de carregamento (lazy load é proibido em async)"""
+        return select(self.model_class).options(*opcoes_carregamento(self.model_class, carregar))
+    
+    async def buscar_por_id(self, id: int, carregar: Optional[PlanoCarregamento] = None) -> Optional[T]:
+        """Busca uma entidade por ID"""
+        return await self._primeiro(self._select(carregar).where(self.model_class.id == id))
+    
+    async def listar_todos(
+        self, skip: int = 0, limit: int = 100, carregar: Optional[PlanoCarregamento] = None
+    ) -> List[T]:
+        """Lista todas as entidades"""
+        return await self._listar(self._select(carregar).offset(skip).limit(limit))
+    
+    async def contar(self, filtros: Optional[Dict[str, Any]] = None) -> int:
+        """Conta as entidades que atendem aos filtros, com um único COUNT"""
+        return await self.session.scalar(consulta_contagem(self.model_class, filtros))
+    
+    async def existe(self, filtros: Optional[Dict[str, Any]] = None) -> bool:
+        """Verifica se alguma entidade atende aos filtros, sem carregá-la"""
+        return bool(await self.session.scalar(consulta_existencia(self.model_class, filtros)))
+    
+    async def atualizar(self, entidade: T) -> T:
+        """Atualiza uma entidade"""
+        await self._persistir(entidade)
+        return entidade
+    
+    async def deletar(self, id: int) -> bool:
+        """Deleta uma entidade"""
+        entidade = await self.buscar_por_id(id)
+        if entidade:
+            await self.session.delete(entidade)
+            await self._persistir()
+            return True
+        return False
+    
+    async def buscar_com_filtros(
+        self,
+        filtros: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False
+    ) -> List[T]:
+        """
+        Busca entidades com filtros e ordenação (mesma sintaxe de BaseRepository)
+        
+        Args:
+            filtros: Dicionário com filtros a aplicar
+            skip: Número de registros a pular
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação
+            ordem_desc: Se True, ordena em ordem decrescente
+        
+        Returns:
+            Lista de entidades filtradas
+        """
+        stmt = select(self.model_class).where(*condicoes_filtros(self.model_class, filtros))
+        
+        criterio = criterio_ordenacao(self.model_class, ordenar_por, ordem_desc)
+        if criterio is not None:
+            stmt = stmt.order_by(criterio)
+        
+        return await self._listar(stmt.offset(skip).limit(limit))
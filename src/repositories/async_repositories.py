@@ -0,0 +1,148 @@
+"""
+Repositórios assíncronos de domínio
+"""
+from typing import List, Optional, TYPE_CHECKING
+from datetime import date
+from sqlalchemy import select
+
+from src.database.normalizacao import normalizar
+from src.models.livro import Livro
+from src.models.usuario import Usuario
+from src.models.emprestimo import Emprestimo
+from src.models.emprestimo_arquivado import EmprestimoArquivado
+from src.models.autor import Autor
+from src.models.categoria import Categoria
+from src.repositories.async_base_repository import AsyncBaseRepository
+from src.repositories.emprestimo_repository import ORDEM_HISTORICO, ordenar_historico
+from src.repositories.filtros import condicoes_filtros
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncLivroRepository(AsyncBaseRepository[Livro]):
+    """Repositório assíncrono de livros"""
+    
+    def __init__(self, session: "AsyncSession") -> None:
+        """Inicializa o repositório"""
+        super().__init__(session, Livro)
+    
+    async def buscar_por_titulo(self, titulo: str) -> Optional[Livro]:
+        """Busca livro por título, ignorando acentos e maiúsculas"""
+        return await self._primeiro(select(Livro).where(Livro.titulo_normalizado == normalizar(titulo)))
+    
+    async def buscar_disponiveis(self) -> List[Livro]:
+        """Busca livros disponíveis"""
+        return await self._listar(select(Livro).where(Livro.disponivel == True))
+    
+    async def buscar_por_autor(self, autor_id: int) -> List[Livro]:
+        """Busca livros por autor"""
+        return await self._listar(select(Livro).where(Livro.autor_id == autor_id))
+    
+    async def buscar_por_categoria(self, categoria_id: int) -> List[Livro]:
+        """Busca livros por categoria"""
+        return await self._listar(select(Livro).where(Livro.categoria_id == categoria_id))
+
+
+class AsyncUsuarioRepository(AsyncBaseRepository[Usuario]):
+    """Repositório assíncrono de usuários"""
+    
+    def __init__(self, session: "AsyncSession") -> None:
+        """Inicializa o repositório"""
+        super().__init__(session, Usuario)
+    
+    async def buscar_por_email(self, email: str) -> Optional[Usuario]:
+        """Busca usuário por email"""
+        return await self._primeiro(select(Usuario).where(Usuario.email == email))
+    
+    async def buscar_ativos(self) -> List[Usuario]:
+        """Busca usuários ativos"""
+        return await self._listar(select(Usuario).where(Usuario.ativo == True))
+
+
+class AsyncEmprestimoRepository(AsyncBaseRepository[Emprestimo]):
+    """Repositório assíncrono de empréstimos"""
+    
+    def __init__(self, session: "AsyncSession") -> None:
+        """Inicializa o repositório"""
+        super().__init__(session, Emprestimo)
+    
+    async def buscar_por_id_com_livro(self, id: int) -> Optional[Emprestimo]:
+        """Busca empréstimo por ID já carregando o livro (sem lazy load, proibido em async)"""
+        return await self.buscar_por_id(id, carregar={"livro": "selectin"})
+    
+    async def buscar_por_usuario(self, usuario_id: int, incluir_arquivo: bool = False) -> List[Emprestimo]:
+        """Busca empréstimos por usuário (com o arquivo, se pedido), por data do empréstimo e ID"""
+        emprestimos = await self._listar(
+            select(Emprestimo).where(Emprestimo.usuario_id == usuario_id).order_by(*ORDEM_HISTORICO)
+        )
+        if not incluir_arquivo:
+            return emprestimos
+        arquivados = await self._listar(
+            select(EmprestimoArquivado).where(EmprestimoArquivado.usuario_id == usuario_id)
+        )
+        return ordenar_historico(arquivados + emprestimos)
+    
+    async def buscar_por_livro(self, livro_id: int, incluir_arquivo: bool = False) -> List[Emprestimo]:
+        """Busca empréstimos por livro (com o arquivo, se pedido), por data do empréstimo e ID"""
+        emprestimos = await self._listar(
+            select(Emprestimo).where(Emprestimo.livro_id == livro_id).order_by(*ORDEM_HISTORICO)
+        )
+        if not incluir_arquivo:
+            return emprestimos
+        arquivados = await self._listar(
+            select(EmprestimoArquivado).where(EmprestimoArquivado.livro_id == livro_id)
+        )
+        return ordenar_historico(arquivados + emprestimos)
+    
+    async def buscar_ativos(self) -> List[Emprestimo]:
+        """Busca empréstimos ativos (não devolvidos)"""
+        return await self._listar(select(Emprestimo).where(Emprestimo.devolvido == False))
+    
+    async def buscar_atrasados(self) -> List[Emprestimo]:
+        """Busca empréstimos atrasados"""
+        hoje = date.today()
+        return await self._listar(select(Emprestimo).where(
+            Emprestimo.devolvido == False,
+            Emprestimo.data_prevista_devolucao < hoje
+        ))
+    
+    async def buscar_por_usuario_ativos(self, usuario_id: int) -> List[Emprestimo]:
+        """Busca empréstimos ativos de um usuário"""
+        return await self._listar(select(Emprestimo).where(
+            Emprestimo.usuario_id == usuario_id,
+            Emprestimo.devolvido == False
+        ))
+    
+    async def contar_ativos_por_usuario(self, usuario_id: int) -> int:
+        """Conta os empréstimos ativos de um usuário"""
+        return await self.contar({"usuario_id": usuario_id, "devolvido": False})
+
+
+class AsyncAutorRepository(AsyncBaseRepository[Autor]):
+    """Repositório assíncrono de autores"""
+    
+    def __init__(self, session: "AsyncSession") -> None:
+        """Inicializa o repositório"""
+        super().__init__(session, Autor)
+    
+    async def buscar_por_nome(self, nome: str, limit: int = 100) -> List[Autor]:
+        """Busca autores pelo início do nome, ignorando acentos e maiúsculas"""
+        return await self._listar(
+            select(Autor)
+            .where(*condicoes_filtros(Autor, {"nome": {"iprefixo": nome}}))
+            .order_by(Autor.nome_normalizado)
+            .limit(limit)
+        )
+
+
+class AsyncCategoriaRepository(AsyncBaseRepository[Categoria]):
+    """Repositório assíncrono de categorias"""
+    
+    def __init__(self, session: "AsyncSession") -> None:
+        """Inicializa o repositório"""
+        super().__init__(session, Categoria)
+    
+    async def buscar_por_nome(self, nome: str) -> Optional[Categoria]:
+        """Busca categoria por nome, ignorando acentos e maiúsculas"""
+        return await self._primeiro(select(Categoria).where(Categoria.nome_normalizado == normalizar(nome)))
@@ -4,26 +4,73 @@ Repositório para Autor
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
-from src.models.autor import Autor
+from src.database.fts import Candidato
+from src.models.autor import BUSCA_AUTORES, TRIGRAMAS_AUTORES, Autor
 from src.repositories.base_repository import BaseRepository
 
 
 class IAutorRepository:
     """Interface do repositório de autores"""
     
-    def buscar_por_nome(self, nome: str) -> List[Autor]:
-        """Busca autores por nome"""
+    def buscar_por_nome(self, nome: str, limit: int = 100) -> List[Autor]:
+        """Busca autores pelo início do nome"""
+        pass
+    
+    def buscar_texto(self, texto: str, limit: int = 20) -> List[Autor]:
+        """Busca autores por palavras do nome"""
+        pass
+    
+    def buscar_nome_aproximado(self, nome: str, limit: int = 10) -> List[Candidato]:
+        """Busca autores por nome, tolerando erros de digitação"""
         pass
 
 
 class AutorRepository(BaseRepository[Autor], IAutorRepository):
     """Implementação do repositório de autores"""
     
+    CONSULTAS_QUENTES = BaseRepository.CONSULTAS_QUENTES + (
+        ("buscar_por_nome", ("",)),
+    )
+    
     def __init__(self, session: Session) -> None:
         """Inicializa o repositório"""
         super().__init__(session, Autor)
     
-    def buscar_por_nome(self, nome: str) -> List[Autor]:
-        """Busca autores por nome (busca parcial)"""
-        return self.session.query(Autor).filter(Autor.nome.like(f"%{nome}%")).all()
-
+    def buscar_por_nome(self, nome: str, limit: int = 100) -> List[Autor]:
+        """
+        Busca autores pelo início do nome, ignorando acentos e maiúsculas
+        
+        Usa a chave normalizada indexada ("jose" encontra "José de Alencar");
+        para palavras no meio do nome use buscar_texto.
+        """
+        return self._buscar_prefixo("nome", nome, limit)
+    
+    def buscar_texto(self, texto: str, limit: int = 20) -> List[Autor]:
+        """
+        Busca autores por palavras do nome (índice FTS5), por relevância
+        
+        Ao contrário de buscar_por_nome (início do nome), casa qualquer
+        palavra do nome.
+        
+        Args:
+            texto: Texto livre
+            limit: Número máximo de resultados
+        
+        Returns:
+            Autores, do mais para o menos relevante
+        """
+        return self._buscar_texto(BUSCA_AUTORES, texto, limit=limit)
+    
+    def buscar_nome_aproximado(self, nome: str, limit: int = 10, similaridade_minima: float = 0.3) -> List[Candidato]:
+        """
+        Busca autores por nome, tolerando erros de digitação
+        
+        Args:
+            nome: Nome digitado (ex.: "machdo de asis")
+            limit: Número máximo de resultados
+            similaridade_minima: Similaridade mínima (0 a 1) para um candidato ser devolvido
+        
+        Returns:
+            Candidatos (autor, similaridade), do mais para o menos similar
+        """
+        return self._buscar_aproximado(TRIGRAMAS_AUTORES, "nome", nome, limit, similaridade_minima)
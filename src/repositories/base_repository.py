@@ -2,14 +2,128 @@
 Repositório base com interface abstrata
 """
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from collections import namedtuple
+from functools import lru_cache
+from typing import Generic, TypeVar, List, Optional, Dict, Any, Tuple, Iterable, Iterator, Sequence, Set
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import delete, desc, asc, event, func, insert, inspect, select, update
 
 from src.database.base import BaseModel
+from src.database.fts import Candidato, IndiceTextual, consulta_textual, consulta_trigramas, similaridade, trigramas
+from src.database.entity_cache import cache_da_sessao, escreveu_na_transacao
+from src.database.normalizacao import coluna_de_busca, com_normalizados, normalizar
+from src.database.unit_of_work import em_unidade_de_trabalho
+from src.repositories.carregamento import PlanoCarregamento, opcoes_carregamento
+from src.repositories.filtros import condicoes_filtros
+from src.repositories.paginacao import (
+    Pagina, campo_ordenacao, codificar_cursor, condicao_apos_cursor, criterios_pagina, decodificar_cursor
+)
 
 T = TypeVar('T', bound=BaseModel)
 
+# Chave em Session.info com as entidades de criar_em_lote à espera do commit
+LOTE_PENDENTE = "lote_pendente"
+
+
+@event.listens_for(Session, "after_commit")
+def _anexar_lote(session):
+    # Só depois do commit as entidades gravadas em lote entram na sessão
+    for entidade in session.info.pop(LOTE_PENDENTE, ()):
+        make_transient_to_detached(entidade)
+        session.add(entidade)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_lote(session):
+    for entidade in session.info.pop(LOTE_PENDENTE, ()):
+        entidade.id = None
+
+
+def criterio_ordenacao(model_class: type, ordenar_por: Optional[str], ordem_desc: bool = False) -> Optional[Any]:
+    """
+    Monta o critério de ordenação para um campo do modelo
+    
+    Args:
+        model_class: Classe do modelo
+        ordenar_por: Campo para ordenação (ignorado se não existir)
+        ordem_desc: Se True, ordena em ordem decrescente
+    
+    Returns:
+        Critério para order_by() ou None
+    """
+    if ordenar_por and hasattr(model_class, ordenar_por):
+        coluna = getattr(model_class, ordenar_por)
+        return desc(coluna) if ordem_desc else asc(coluna)
+    return None
+
+
+def colunas_projecao(model_class: type, campos: Sequence[str]) -> List[Any]:
+    """
+    Converte os nomes de campos de uma projeção em colunas do modelo
+    
+    Args:
+        model_class: Classe do modelo
+        campos: Nomes das colunas pedidas
+    
+    Returns:
+        Colunas para usar em select()/query()
+    
+    Raises:
+        ValueError: Se a lista estiver vazia ou algum campo não for coluna do modelo
+    """
+    invalidos = [campo for campo in campos if campo not in model_class.__table__.columns]
+    if not campos or invalidos:
+        raise ValueError(f"Campos inválidos para projeção: {invalidos or 'nenhum campo informado'}")
+    return [getattr(model_class, campo) for campo in campos]
+
+
+@lru_cache(maxsize=None)
+def tipo_linha(model_class: type, campos: Tuple[str, ...]) -> type:
+    """
+    Tipo de linha (namedtuple) de uma projeção, criado uma vez por forma
+    
+    Named tuples não têm __dict__ nem rastreamento de alterações, então cada
+    linha ocupa só o espaço dos valores pedidos.
+    
+    Args:
+        model_class: Classe do modelo
+        campos: Nomes das colunas, na ordem da linha
+    """
+    return namedtuple(f"{model_class.__name__}Linha", campos)
+
+
+def consulta_contagem(model_class: type, filtros: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Monta o SELECT COUNT(*) das entidades que atendem aos filtros
+    
+    Args:
+        model_class: Classe do modelo
+        filtros: Dicionário com filtros (mesma sintaxe de filtros.condicoes_filtros)
+    
+    Returns:
+        Consulta escalar com a contagem
+    """
+    return select(func.count()).select_from(model_class).where(*condicoes_filtros(model_class, filtros or {}))
+
+
+def consulta_existencia(model_class: type, filtros: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Monta o SELECT EXISTS das entidades que atendem aos filtros
+    
+    O banco para na primeira linha encontrada, sem contar as demais.
+    
+    Args:
+        model_class: Classe do modelo
+        filtros: Dicionário com filtros (mesma sintaxe de filtros.condicoes_filtros)
+    
+    Returns:
+        Consulta escalar booleana
+    """
+    return select(
+        select(model_class.id).where(*condicoes_filtros(model_class, filtros or {})).exists()
+    )
+
 
 class IRepository(ABC, Generic[T]):
     """Interface abstrata para repositórios"""
@@ -84,6 +198,13 @@ class IRepository(ABC, Generic[T]):
 class BaseRepository(IRepository[T]):
     """Implementação base do repositório"""
     
+    # Leituras frequentes (método, argumentos de exemplo) pré-compiladas no
+    # aquecimento do cache de instruções (ver src/database/query_cache.py)
+    CONSULTAS_QUENTES: Tuple[Tuple[str, tuple], ...] = (
+        ("buscar_por_id", (0,)),
+        ("listar_todos", ()),
+    )
+    
     def __init__(self, session: Session, model_class: type[T]) -> None:
         """
         Inicializa o repositório
@@ -95,25 +216,301 @@ class BaseRepository(IRepository[T]):
         self.session = session
         self.model_class = model_class
     
+    def _persistir(self, entidade: Optional[T] = None) -> None:
+        """
+        Conclui uma escrita respeitando a unidade de trabalho
+        
+        Dentro de uma UnitOfWork apenas envia as alterações (flush) e deixa o
+        commit para a saída do bloco; fora dela faz commit imediatamente.
+        
+        Args:
+            entidade: Entidade a recarregar após o commit (opcional)
+        """
+        if em_unidade_de_trabalho(self.session):
+            self.session.flush()
+            return
+        
+        self.session.commit()
+        if entidade is not None:
+            self.session.refresh(entidade)
+    
     def criar(self, entidade: T) -> T:
         """Cria uma nova entidade"""
         self.session.add(entidade)
-        self.session.commit()
-        self.session.refresh(entidade)
+        self._persistir(entidade)
         return entidade
     
-    def buscar_por_id(self, id: int) -> Optional[T]:
-        """Busca uma entidade por ID"""
-        return self.session.query(self.model_class).filter(self.model_class.id == id).first()
+    def criar_em_lote(self, entidades: Sequence[T], tamanho_lote: int = 500) -> List[int]:
+        """
+        Cria várias entidades com um INSERT em lote por bloco
+        
+        Cada bloco de ``tamanho_lote`` entidades vira um único INSERT de
+        múltiplas linhas (insertmanyvalues com RETURNING) e é confirmado com
+        um commit, sem refresh por entidade. Dentro de uma UnitOfWork os
+        blocos não fazem commit e a confirmação fica para a saída da unidade.
+        As entidades recebem o ID na hora, mas só passam a pertencer à sessão
+        depois do commit (ver _anexar_lote): até lá continuam transientes e
+        com os valores intactos, então uma transação desfeita (ex.: repetida
+        por lock, ver retry) pode gravá-las de novo.
+        
+        Args:
+            entidades: Entidades novas (sem ID e fora da sessão)
+            tamanho_lote: Quantidade de entidades por bloco/commit
+        
+        Returns:
+            IDs gerados, na ordem das entidades
+        
+        Raises:
+            ValueError: Se tamanho_lote não for positivo
+        """
+        if tamanho_lote <= 0:
+            raise ValueError("tamanho_lote deve ser positivo")
+        
+        ids: List[int] = []
+        for inicio in range(0, len(entidades), tamanho_lote):
+            bloco = entidades[inicio:inicio + tamanho_lote]
+            linhas = self._linhas_para_insert(bloco)
+            # Sem ordenação explícita o SQLAlchemy envia um único INSERT; o
+            # SQLite atribui rowids crescentes dentro da mesma instrução
+            gerados = sorted(self.session.scalars(
+                insert(self.model_class).returning(self.model_class.id), linhas
+            ))
+            for entidade, linha, id_gerado in zip(bloco, linhas, gerados):
+                for chave, valor in linha.items():
+                    setattr(entidade, chave, valor)
+                entidade.id = id_gerado
+            self.session.info.setdefault(LOTE_PENDENTE, []).extend(bloco)
+            ids.extend(gerados)
+            self._persistir()
+        return ids
     
-    def listar_todos(self, skip: int = 0, limit: int = 100) -> List[T]:
-        """Lista todas as entidades"""
-        return self.session.query(self.model_class).offset(skip).limit(limit).all()
+    def _linhas_para_insert(self, entidades: Sequence[T]) -> List[Dict[str, Any]]:
+        """
+        Converte entidades em parâmetros com o mesmo conjunto de colunas
+        
+        O INSERT em lote exige que todas as linhas informem as mesmas colunas;
+        colunas não preenchidas recebem o default do modelo (ou None).
+        """
+        colunas = [
+            coluna for coluna in self.model_class.__table__.columns
+            if not coluna.primary_key and any(coluna.key in vars(e) for e in entidades)
+        ]
+        linhas = []
+        for entidade in entidades:
+            linha = {}
+            for coluna in colunas:
+                if coluna.key in vars(entidade):
+                    linha[coluna.key] = vars(entidade)[coluna.key]
+                elif coluna.default is None:
+                    linha[coluna.key] = None
+                elif coluna.default.is_callable:
+                    linha[coluna.key] = coluna.default.arg(None)
+                else:
+                    linha[coluna.key] = coluna.default.arg
+            linhas.append(linha)
+        return linhas
+    
+    def buscar_por_id(
+        self, id: int, carregar: Optional[PlanoCarregamento] = None, para_escrita: bool = False
+    ) -> Optional[T]:
+        """
+        Busca uma entidade por ID
+        
+        Se a sessão tiver um cache de entidades (ver entity_cache) com este
+        modelo habilitado, a busca sem plano de carregamento é atendida por
+        ele quando possível, sem ir ao banco. Dentro de uma unidade de
+        trabalho, ou com para_escrita, a entidade sempre vem do banco: o
+        cache só é invalidado no próprio processo e uma cópia antiga usada
+        em uma escrita sobrescreveria alterações de outros processos.
+        
+        Args:
+            id: ID da entidade
+            carregar: Plano de carregamento dos relacionamentos (ver carregamento.PLANOS)
+            para_escrita: Se a entidade será alterada pelo chamador (ignora o cache)
+        
+        Returns:
+            Entidade ou None
+        """
+        cache = cache_da_sessao(self.session)
+        if (
+            carregar is not None or cache is None or not cache.habilitado(self.model_class)
+            or para_escrita or em_unidade_de_trabalho(self.session)
+        ):
+            return self._query(carregar=carregar).filter(self.model_class.id == id).first()
+        
+        # Entidade já na sessão: devolve a mesma instância, como o ORM faria
+        entidade = self.session.identity_map.get(self.session.identity_key(self.model_class, id))
+        if entidade is not None and not inspect(entidade).expired_attributes:
+            return entidade
+        
+        valores = cache.obter(self.model_class, id)
+        if valores is not None:
+            return self._do_cache(valores)
+        
+        # A geração lida antes do SELECT impede guardar uma linha que um
+        # commit concluído nesse meio-tempo já tornou antiga
+        geracao = cache.geracao
+        entidade = self._query().filter(self.model_class.id == id).first()
+        if entidade is not None and not escreveu_na_transacao(self.session) and entidade not in self.session.dirty:
+            estado = inspect(entidade)
+            colunas = [atributo.key for atributo in estado.mapper.column_attrs]
+            if all(coluna in estado.dict for coluna in colunas):
+                cache.guardar(self.model_class, id, {coluna: estado.dict[coluna] for coluna in colunas}, geracao)
+        return entidade
+    
+    def _do_cache(self, valores: Dict[str, Any]) -> T:
+        """Reconstrói a entidade a partir das colunas guardadas e a anexa à sessão sem SELECT"""
+        entidade = inspect(self.model_class).class_manager.new_instance()
+        for coluna, valor in valores.items():
+            set_committed_value(entidade, coluna, valor)
+        make_transient_to_detached(entidade)
+        return self.session.merge(entidade, load=False)
+    
+    def ids_existentes(self, ids: Iterable[int]) -> Set[int]:
+        """
+        Filtra os IDs que existem no banco, com uma única consulta
+        
+        Args:
+            ids: IDs a verificar
+        
+        Returns:
+            Conjunto dos IDs encontrados
+        """
+        ids = set(ids)
+        if not ids:
+            return set()
+        return set(self.session.scalars(select(self.model_class.id).where(self.model_class.id.in_(ids))))
+    
+    def _query(
+        self,
+        campos: Optional[Sequence[str]] = None,
+        carregar: Optional[PlanoCarregamento] = None
+    ) -> Any:
+        """
+        Query das entidades ou, com campos, só das colunas pedidas
+        
+        O plano de carregamento só vale para entidades: projeções não têm
+        relacionamentos e o ignoram.
+        """
+        if campos is None:
+            return self.session.query(self.model_class).options(*opcoes_carregamento(self.model_class, carregar))
+        return self.session.query(*colunas_projecao(self.model_class, campos))
+    
+    def _linhas(self, resultados: List[Any], campos: Optional[Sequence[str]] = None) -> List[Any]:
+        """Converte o resultado de uma projeção em linhas leves (ver tipo_linha)"""
+        if campos is None:
+            return resultados
+        tipo = tipo_linha(self.model_class, tuple(campos))
+        return [tipo._make(linha) for linha in resultados]
+    
+    def listar_todos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        campos: Optional[Sequence[str]] = None,
+        carregar: Optional[PlanoCarregamento] = None
+    ) -> List[T]:
+        """
+        Lista todas as entidades
+        
+        Com ``campos``, devolve linhas leves (named tuples) só com essas
+        colunas, sem hidratar entidades. Com ``carregar``, os relacionamentos
+        do plano vêm na mesma leitura, sem uma consulta por entidade.
+        """
+        return self._linhas(self._query(campos, carregar).offset(skip).limit(limit).all(), campos)
+    
+    def contar(self, filtros: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Conta as entidades que atendem aos filtros, com um único COUNT
+        
+        Args:
+            filtros: Dicionário com filtros (mesma sintaxe de buscar_com_filtros)
+        
+        Returns:
+            Quantidade de entidades
+        """
+        return self.session.scalar(consulta_contagem(self.model_class, filtros))
+    
+    def existe(self, filtros: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Verifica se alguma entidade atende aos filtros, sem carregá-la
+        
+        Args:
+            filtros: Dicionário com filtros (mesma sintaxe de buscar_com_filtros)
+        
+        Returns:
+            True se existir ao menos uma
+        """
+        return bool(self.session.scalar(consulta_existencia(self.model_class, filtros)))
+    
+    def iterar(
+        self,
+        filtros: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 500,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None,
+        carregar: Optional[PlanoCarregamento] = None
+    ) -> Iterator[T]:
+        """
+        Percorre as entidades em fluxo, sem materializar a lista
+        
+        As linhas são lidas do cursor em blocos de ``chunk_size`` (yield_per)
+        e cada bloco é removido da sessão depois de consumido, então a memória
+        fica constante mesmo em tabelas grandes. As entidades devolvidas
+        servem para leitura: alterações nelas não são gravadas. Entidades que
+        já estavam na sessão antes da iteração são preservadas.
+        
+        Args:
+            filtros: Dicionário com filtros (mesma sintaxe de buscar_com_filtros)
+            chunk_size: Quantidade de linhas lidas por vez
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, produz linhas leves só com essas colunas
+            carregar: Plano de carregamento dos relacionamentos (ver carregamento.PLANOS)
+        
+        Yields:
+            Entidades (ou linhas), uma por vez
+        """
+        campo = campo_ordenacao(self.model_class, ordenar_por)
+        colunas = [self.model_class] if campos is None else colunas_projecao(self.model_class, campos)
+        consulta = (
+            select(*colunas)
+            .where(*condicoes_filtros(self.model_class, filtros or {}))
+            .order_by(*criterios_pagina(self.model_class, campo, ordem_desc))
+        )
+        if campos is None:
+            consulta = consulta.options(*opcoes_carregamento(self.model_class, carregar))
+            yield from self._iterar_consulta(consulta, chunk_size)
+            return
+        
+        if chunk_size <= 0:
+            raise ValueError("chunk_size deve ser positivo")
+        tipo = tipo_linha(self.model_class, tuple(campos))
+        for bloco in self.session.execute(consulta.execution_options(yield_per=chunk_size)).partitions():
+            yield from map(tipo._make, bloco)
+    
+    def _iterar_consulta(self, consulta: Any, chunk_size: int) -> Iterator[Any]:
+        """
+        Executa um SELECT de entidades em fluxo, expurgando cada bloco lido
+        
+        Raises:
+            ValueError: Se chunk_size não for positivo
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size deve ser positivo")
+        
+        ja_carregadas = set(self.session.identity_map.keys())
+        resultado = self.session.scalars(consulta.execution_options(yield_per=chunk_size))
+        for bloco in resultado.partitions():
+            yield from bloco
+            for entidade in bloco:
+                if inspect(entidade).key not in ja_carregadas and entidade in self.session:
+                    self.session.expunge(entidade)
     
     def atualizar(self, entidade: T) -> T:
         """Atualiza uma entidade"""
-        self.session.commit()
-        self.session.refresh(entidade)
+        self._persistir(entidade)
         return entidade
     
     def deletar(self, id: int) -> bool:
@@ -121,58 +518,311 @@ class BaseRepository(IRepository[T]):
         entidade = self.buscar_por_id(id)
         if entidade:
             self.session.delete(entidade)
-            self.session.commit()
+            self._persistir()
             return True
         return False
     
+    def atualizar_em_massa(self, filtros: Dict[str, Any], valores: Dict[str, Any]) -> int:
+        """
+        Atualiza todas as entidades que atendem aos filtros com um único UPDATE
+        
+        Nada é carregado: o UPDATE ... WHERE usa a sintaxe de filtros de
+        buscar_com_filtros. Colunas normalizadas dos campos alterados (ver
+        src.database.normalizacao) são atualizadas junto. Entidades já
+        presentes na sessão são sincronizadas com os novos valores
+        (synchronize_session="fetch", via RETURNING).
+        
+        Args:
+            filtros: Dicionário com filtros (mesma sintaxe de buscar_com_filtros)
+            valores: Campos e novos valores
+        
+        Returns:
+            Quantidade de registros atualizados
+        
+        Raises:
+            ValueError: Se não houver filtros válidos ou algum campo de valores não existir
+        """
+        invalidos = [campo for campo in valores if campo not in self.model_class.__table__.columns]
+        if not valores or invalidos:
+            raise ValueError(f"Campos inválidos para atualização: {invalidos or 'nenhum campo informado'}")
+        
+        consulta = (
+            update(self.model_class)
+            .where(*self._condicoes_em_massa(filtros))
+            .values(**com_normalizados(self.model_class, valores))
+            .execution_options(synchronize_session="fetch")
+        )
+        afetados = self.session.execute(consulta).rowcount
+        self._persistir()
+        return afetados
+    
+    def deletar_em_massa(self, filtros: Dict[str, Any]) -> int:
+        """
+        Deleta todas as entidades que atendem aos filtros com um único DELETE
+        
+        As cascatas do ORM (ex.: livros de uma categoria) não são executadas,
+        pois as entidades não são carregadas; entidades removidas que estavam
+        na sessão são retiradas dela.
+        
+        Args:
+            filtros: Dicionário com filtros (mesma sintaxe de buscar_com_filtros)
+        
+        Returns:
+            Quantidade de registros deletados
+        
+        Raises:
+            ValueError: Se não houver filtros válidos
+        """
+        consulta = (
+            delete(self.model_class)
+            .where(*self._condicoes_em_massa(filtros))
+            .execution_options(synchronize_session="fetch")
+        )
+        afetados = self.session.execute(consulta).rowcount
+        self._persistir()
+        return afetados
+    
+    def _condicoes_em_massa(self, filtros: Dict[str, Any]) -> List[Any]:
+        """
+        Converte os filtros de uma operação em massa, exigindo ao menos um
+        
+        Evita que um filtro vazio (ou só com campos inexistentes) atinja a
+        tabela inteira.
+        """
+        condicoes = condicoes_filtros(self.model_class, filtros)
+        if not condicoes:
+            raise ValueError("Operações em massa exigem ao menos um filtro válido")
+        return condicoes
+    
     def buscar_com_filtros(
         self,
         filtros: Dict[str, Any],
         skip: int = 0,
         limit: int = 100,
         ordenar_por: Optional[str] = None,
-        ordem_desc: bool = False
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None,
+        carregar: Optional[PlanoCarregamento] = None
     ) -> List[T]:
         """
         Busca entidades com filtros e ordenação
         
+        Os operadores aceitos (in, between, ne, isnull, prefixo, grupos
+        "ou"...) estão em filtros.condicoes_filtros; filtros.indices_filtros
+        mostra qual índice cada condição pode usar.
+        
         Args:
             filtros: Dicionário com filtros a aplicar
             skip: Número de registros a pular
             limit: Número máximo de registros
             ordenar_por: Campo para ordenação
             ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves (named tuples) só com essas colunas
+            carregar: Plano de carregamento dos relacionamentos (ver carregamento.PLANOS)
         
         Returns:
-            Lista de entidades filtradas
-        """
-        query = self.session.query(self.model_class)
-        
-        # Aplica filtros
-        for campo, valor in filtros.items():
-            if hasattr(self.model_class, campo):
-                if isinstance(valor, dict):
-                    # Suporta operadores como {'like': '%texto%'}
-                    for op, val in valor.items():
-                        if op == 'like':
-                            query = query.filter(getattr(self.model_class, campo).like(val))
-                        elif op == 'gt':
-                            query = query.filter(getattr(self.model_class, campo) > val)
-                        elif op == 'lt':
-                            query = query.filter(getattr(self.model_class, campo) < val)
-                        elif op == 'gte':
-                            query = query.filter(getattr(self.model_class, campo) >= val)
-                        elif op == 'lte':
-                            query = query.filter(getattr(self.model_class, campo) <= val)
-                else:
-                    query = query.filter(getattr(self.model_class, campo) == valor)
+            Lista de entidades (ou linhas) filtradas
+        
+        Raises:
+            ValueError: Se algum filtro, campo da projeção ou o plano de carregamento for inválido
+        """
+        query = self._query(campos, carregar).filter(*condicoes_filtros(self.model_class, filtros))
         
         # Aplica ordenação
-        if ordenar_por and hasattr(self.model_class, ordenar_por):
-            if ordem_desc:
-                query = query.order_by(desc(getattr(self.model_class, ordenar_por)))
-            else:
-                query = query.order_by(asc(getattr(self.model_class, ordenar_por)))
+        criterio = criterio_ordenacao(self.model_class, ordenar_por, ordem_desc)
+        if criterio is not None:
+            query = query.order_by(criterio)
         
-        return query.offset(skip).limit(limit).all()
-
+        return self._linhas(query.offset(skip).limit(limit).all(), campos)
+    
+    def listar_pagina(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None,
+        carregar: Optional[PlanoCarregamento] = None
+    ) -> Pagina[T]:
+        """
+        Lista entidades por página, com paginação por cursor
+        
+        Args:
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, a página traz linhas leves (ver buscar_pagina)
+            carregar: Plano de carregamento dos relacionamentos (ver carregamento.PLANOS)
+        
+        Returns:
+            Página com as entidades e o cursor da próxima
+        """
+        return self.buscar_pagina({}, cursor, limit, ordenar_por, ordem_desc, campos, carregar)
+    
+    def buscar_pagina(
+        self,
+        filtros: Dict[str, Any],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None,
+        carregar: Optional[PlanoCarregamento] = None
+    ) -> Pagina[T]:
+        """
+        Busca entidades com filtros, com paginação por cursor (keyset)
+        
+        Em vez de OFFSET, cada página continua a partir da chave (campo, id)
+        da última entidade da anterior, então qualquer página custa o mesmo
+        que a primeira quando o campo de ordenação é indexado.
+        
+        Args:
+            filtros: Dicionário com filtros a aplicar (mesma sintaxe de buscar_com_filtros)
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, a página traz linhas leves só com essas
+                colunas; o id e o campo de ordenação, necessários ao cursor,
+                são acrescentados ao final se faltarem
+            carregar: Plano de carregamento dos relacionamentos (ver carregamento.PLANOS)
+        
+        Returns:
+            Página com as entidades e o cursor da próxima
+        
+        Raises:
+            ValueError: Se o cursor for inválido ou de outra ordenação
+        """
+        campo = campo_ordenacao(self.model_class, ordenar_por)
+        if campos is not None:
+            campos = list(campos) + [chave for chave in dict.fromkeys(("id", campo)) if chave not in campos]
+        condicoes = condicoes_filtros(self.model_class, filtros)
+        if cursor:
+            valor, ultimo_id = decodificar_cursor(self.model_class, cursor, campo, ordem_desc)
+            condicoes.append(condicao_apos_cursor(self.model_class, campo, valor, ultimo_id, ordem_desc))
+        
+        itens = self._linhas(
+            self._query(campos, carregar)
+            .filter(*condicoes)
+            .order_by(*criterios_pagina(self.model_class, campo, ordem_desc))
+            .limit(limit + 1)
+            .all(),
+            campos
+        )
+        
+        proximo = None
+        if len(itens) > limit:
+            itens = itens[:limit]
+            proximo = codificar_cursor(itens[-1], campo, ordem_desc)
+        return Pagina(itens, proximo)
+    
+    def _buscar_texto(
+        self,
+        indice: IndiceTextual,
+        texto: str,
+        filtros: Optional[Dict[str, Any]] = None,
+        limit: int = 20
+    ) -> List[T]:
+        """
+        Busca por texto no índice FTS5 do modelo, da mais para a menos relevante
+        
+        Args:
+            indice: Índice textual do modelo
+            texto: Texto livre (palavras; a última também casa como prefixo)
+            filtros: Filtros adicionais sobre as colunas (mesma sintaxe de buscar_com_filtros)
+            limit: Número máximo de resultados
+        
+        Returns:
+            Entidades encontradas, ordenadas por relevância (bm25)
+        """
+        consulta = consulta_textual(texto)
+        if consulta is None:
+            return []
+        return list(self.session.scalars(
+            select(self.model_class)
+            .join(indice.tabela_fts, indice.tabela_fts.c.rowid == self.model_class.id)
+            .where(indice.condicao(consulta), *condicoes_filtros(self.model_class, filtros or {}))
+            .order_by(indice.relevancia())
+            .limit(limit)
+        ))
+    
+    def _buscar_aproximado(
+        self,
+        indice: IndiceTextual,
+        campo: str,
+        texto: str,
+        limit: int = 10,
+        similaridade_minima: float = 0.3
+    ) -> List[Candidato]:
+        """
+        Busca tolerante a erros de digitação pela similaridade de trigramas
+        
+        O índice de trigramas da chave normalizada do campo seleciona poucos
+        candidatos (os que mais compartilham trigramas com o texto, sem varrer
+        a tabela); só eles são pontuados pela similaridade de Jaccard.
+        
+        Args:
+            indice: Índice de trigramas sobre a coluna normalizada do campo
+            campo: Campo com chave normalizada (ex.: "titulo")
+            texto: Texto digitado, possivelmente com erros
+            limit: Número máximo de resultados
+            similaridade_minima: Candidatos abaixo disso são descartados
+        
+        Returns:
+            Candidatos (entidade, similaridade), do mais para o menos similar
+        
+        Raises:
+            ValueError: Se o campo não tiver chave normalizada
+        """
+        coluna = coluna_de_busca(self.model_class, campo)
+        if coluna is None:
+            raise ValueError(f"{self.model_class.__name__}.{campo} não tem chave normalizada")
+        chave = normalizar(texto or "")
+        consulta = consulta_trigramas(chave)
+        if consulta is None:
+            return []
+        
+        entidades = self.session.scalars(
+            select(self.model_class)
+            .join(indice.tabela_fts, indice.tabela_fts.c.rowid == self.model_class.id)
+            .where(indice.condicao(consulta))
+            .order_by(indice.relevancia())
+            .limit(max(limit * 5, 50))
+        )
+        procurados = trigramas(chave)
+        candidatos = [
+            Candidato(entidade, similaridade(procurados, trigramas(getattr(entidade, coluna.key) or "")))
+            for entidade in entidades
+        ]
+        candidatos = [candidato for candidato in candidatos if candidato.similaridade >= similaridade_minima]
+        candidatos.sort(key=lambda candidato: candidato.similaridade, reverse=True)
+        return candidatos[:limit]
+    
+    def _buscar_prefixo(self, campo: str, prefixo: str, limit: int = 100) -> List[T]:
+        """
+        Busca pelo início de um campo, ignorando acentos e maiúsculas
+        
+        Usa a coluna normalizada do campo: o filtro e a ordenação (pela chave
+        normalizada) saem do mesmo índice.
+        
+        Args:
+            campo: Campo com chave normalizada (ver src.database.normalizacao)
+            prefixo: Início do texto procurado
+            limit: Número máximo de resultados
+        
+        Returns:
+            Entidades encontradas, em ordem alfabética da chave normalizada
+        
+        Raises:
+            ValueError: Se o campo não tiver chave normalizada
+        """
+        coluna = coluna_de_busca(self.model_class, campo)
+        if coluna is None:
+            raise ValueError(f"{self.model_class.__name__}.{campo} não tem chave normalizada")
+        return list(self.session.scalars(
+            select(self.model_class)
+            .where(*condicoes_filtros(self.model_class, {campo: {"iprefixo": prefixo}}))
+            .order_by(coluna)
+            .limit(limit)
+        ))
@@ -0,0 +1,85 @@
+"""
+Planos de carregamento de relacionamentos (evitam consultas N+1)
+"""
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, lazyload, raiseload, selectinload
+
+# Estratégias aceitas em um plano: nome -> opção de carregamento do SQLAlchemy
+ESTRATEGIAS = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "raise": raiseload,
+    "lazy": lazyload,
+}
+
+# Planos nomeados: relacionamento (ou caminho "a.b") -> estratégia.
+# "*" aplica a estratégia a todos os relacionamentos não listados.
+PLANOS: Dict[str, Dict[str, str]] = {
+    "emprestimo_com_livro": {"livro": "joined"},
+    "emprestimo_com_livro_e_usuario": {"livro": "joined", "usuario": "joined"},
+    "livro_com_autor_e_categoria": {"autor": "joined", "categoria": "joined"},
+    "usuario_com_emprestimos": {"emprestimos": "selectin"},
+    "autor_com_livros": {"livros": "selectin"},
+    "sem_relacionamentos": {"*": "raise"},
+}
+
+PlanoCarregamento = Union[str, Dict[str, str]]
+
+
+def resolver_plano(plano: PlanoCarregamento) -> Dict[str, str]:
+    """
+    Converte o nome de um plano em seu dicionário de estratégias
+    
+    Raises:
+        ValueError: Se o plano nomeado não existir
+    """
+    if isinstance(plano, str):
+        if plano not in PLANOS:
+            raise ValueError(f"Plano de carregamento desconhecido: {plano}")
+        return PLANOS[plano]
+    return plano
+
+
+def opcoes_carregamento(model_class: type, plano: Optional[PlanoCarregamento]) -> List[Any]:
+    """
+    Monta as opções de carregamento de um plano para usar em options()
+    
+    Caminhos com ponto ("livro.autor") encadeiam relacionamentos; a
+    estratégia vale para o último trecho e os anteriores usam a mesma
+    estratégia, para que o caminho inteiro seja carregado de uma vez.
+    
+    Args:
+        model_class: Classe do modelo consultado
+        plano: Nome de um plano em PLANOS ou dicionário relacionamento -> estratégia
+    
+    Returns:
+        Lista de opções (vazia se plano for None)
+    
+    Raises:
+        ValueError: Se o plano, a estratégia ou algum relacionamento não existir
+    """
+    if plano is None:
+        return []
+    
+    opcoes = []
+    for caminho, estrategia in resolver_plano(plano).items():
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia de carregamento inválida: {estrategia}")
+        carregar = ESTRATEGIAS[estrategia]
+        
+        if caminho == "*":
+            opcoes.append(carregar("*"))
+            continue
+        
+        opcao = None
+        classe = model_class
+        for nome in caminho.split("."):
+            relacionamento = inspect(classe).relationships.get(nome)
+            if relacionamento is None:
+                raise ValueError(f"{classe.__name__} não tem o relacionamento {nome}")
+            atributo = getattr(classe, nome)
+            opcao = carregar(atributo) if opcao is None else getattr(opcao, carregar.__name__)(atributo)
+            classe = relacionamento.mapper.class_
+        opcoes.append(opcao)
+    return opcoes
@@ -4,6 +4,7 @@ Repositório para Categoria
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from src.database.normalizacao import normalizar
 from src.models.categoria import Categoria
 from src.repositories.base_repository import BaseRepository
 
@@ -19,11 +20,15 @@ class ICategoriaRepository:
 class CategoriaRepository(BaseRepository[Categoria], ICategoriaRepository):
     """Implementação do repositório de categorias"""
     
+    CONSULTAS_QUENTES = BaseRepository.CONSULTAS_QUENTES + (
+        ("buscar_por_nome", ("",)),
+    )
+    
     def __init__(self, session: Session) -> None:
         """Inicializa o repositório"""
         super().__init__(session, Categoria)
     
     def buscar_por_nome(self, nome: str) -> Optional[Categoria]:
-        """Busca categoria por nome"""
-        return self.session.query(Categoria).filter(Categoria.nome == nome).first()
+        """Busca categoria por nome, ignorando acentos e maiúsculas"""
+        return self.session.query(Categoria).filter(Categoria.nome_normalizado == normalizar(nome)).first()
 
@@ -1,61 +1,147 @@
 """
 Repositório para Emprestimo
 """
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional, Sequence, Union
 from datetime import date
+from sqlalchemy import delete, insert, literal, select
 from sqlalchemy.orm import Session
 
 from src.models.emprestimo import Emprestimo
+from src.models.emprestimo_arquivado import EmprestimoArquivado
 from src.repositories.base_repository import BaseRepository
+from src.repositories.carregamento import PlanoCarregamento, opcoes_carregamento
+
+# Ordem do histórico de empréstimos, a mesma com ou sem o arquivo
+ORDEM_HISTORICO = (Emprestimo.data_emprestimo, Emprestimo.id)
+
+
+def ordenar_historico(
+    emprestimos: List[Union[Emprestimo, EmprestimoArquivado]]
+) -> List[Union[Emprestimo, EmprestimoArquivado]]:
+    """Ordena empréstimos e arquivados juntos por data do empréstimo e ID (ver ORDEM_HISTORICO)"""
+    return sorted(emprestimos, key=lambda emprestimo: (emprestimo.data_emprestimo, emprestimo.id))
 
 
 class IEmprestimoRepository:
     """Interface do repositório de empréstimos"""
     
-    def buscar_por_usuario(self, usuario_id: int) -> List[Emprestimo]:
+    def buscar_por_usuario(
+        self, usuario_id: int, incluir_arquivo: bool = False, carregar: Optional[PlanoCarregamento] = None
+    ) -> List[Emprestimo]:
         """Busca empréstimos por usuário"""
         pass
     
-    def buscar_por_livro(self, livro_id: int) -> List[Emprestimo]:
+    def buscar_por_livro(
+        self, livro_id: int, incluir_arquivo: bool = False, carregar: Optional[PlanoCarregamento] = None
+    ) -> List[Emprestimo]:
         """Busca empréstimos por livro"""
         pass
     
-    def buscar_ativos(self) -> List[Emprestimo]:
+    def buscar_ativos(self, carregar: Optional[PlanoCarregamento] = None) -> List[Emprestimo]:
         """Busca empréstimos ativos (não devolvidos)"""
         pass
     
-    def buscar_atrasados(self) -> List[Emprestimo]:
+    def buscar_atrasados(self, carregar: Optional[PlanoCarregamento] = None) -> List[Emprestimo]:
         """Busca empréstimos atrasados"""
         pass
     
     def buscar_por_usuario_ativos(self, usuario_id: int) -> List[Emprestimo]:
         """Busca empréstimos ativos de um usuário"""
         pass
+    
+    def contar_ativos_por_usuario(self, usuario_id: int) -> int:
+        """Conta os empréstimos ativos de um usuário"""
+        pass
+    
+    def contar_atrasados(self) -> int:
+        """Conta os empréstimos atrasados"""
+        pass
+    
+    def iterar_historico(
+        self, incluir_arquivo: bool = True, chunk_size: int = 500
+    ) -> Iterator[Union[Emprestimo, EmprestimoArquivado]]:
+        """Percorre todo o histórico de empréstimos em fluxo"""
+        pass
 
 
 class EmprestimoRepository(BaseRepository[Emprestimo], IEmprestimoRepository):
     """Implementação do repositório de empréstimos"""
     
+    CONSULTAS_QUENTES = BaseRepository.CONSULTAS_QUENTES + (
+        ("buscar_por_usuario", (0,)),
+        ("buscar_por_livro", (0,)),
+        ("buscar_ativos", ()),
+        ("buscar_atrasados", ()),
+        ("buscar_por_usuario_ativos", (0,)),
+        ("contar_ativos_por_usuario", (0,)),
+    )
+    
     def __init__(self, session: Session) -> None:
         """Inicializa o repositório"""
         super().__init__(session, Emprestimo)
     
-    def buscar_por_usuario(self, usuario_id: int) -> List[Emprestimo]:
-        """Busca empréstimos por usuário"""
-        return self.session.query(Emprestimo).filter(Emprestimo.usuario_id == usuario_id).all()
+    def buscar_por_usuario(
+        self, usuario_id: int, incluir_arquivo: bool = False, carregar: Optional[PlanoCarregamento] = None
+    ) -> List[Union[Emprestimo, EmprestimoArquivado]]:
+        """
+        Busca empréstimos por usuário
+        
+        Args:
+            usuario_id: ID do usuário
+            incluir_arquivo: Se True, inclui o histórico arquivado
+            carregar: Plano de carregamento, aplicado também ao arquivo
+        
+        Returns:
+            Empréstimos por data do empréstimo e ID, com ou sem o arquivo
+        """
+        emprestimos = self._query(carregar=carregar).filter(
+            Emprestimo.usuario_id == usuario_id
+        ).order_by(*ORDEM_HISTORICO).all()
+        if not incluir_arquivo:
+            return emprestimos
+        arquivados = self._query_arquivo(carregar).filter(
+            EmprestimoArquivado.usuario_id == usuario_id
+        ).all()
+        return ordenar_historico(arquivados + emprestimos)
     
-    def buscar_por_livro(self, livro_id: int) -> List[Emprestimo]:
-        """Busca empréstimos por livro"""
-        return self.session.query(Emprestimo).filter(Emprestimo.livro_id == livro_id).all()
+    def buscar_por_livro(
+        self, livro_id: int, incluir_arquivo: bool = False, carregar: Optional[PlanoCarregamento] = None
+    ) -> List[Union[Emprestimo, EmprestimoArquivado]]:
+        """
+        Busca empréstimos por livro
+        
+        Args:
+            livro_id: ID do livro
+            incluir_arquivo: Se True, inclui o histórico arquivado
+            carregar: Plano de carregamento, aplicado também ao arquivo
+        
+        Returns:
+            Empréstimos por data do empréstimo e ID, com ou sem o arquivo
+        """
+        emprestimos = self._query(carregar=carregar).filter(
+            Emprestimo.livro_id == livro_id
+        ).order_by(*ORDEM_HISTORICO).all()
+        if not incluir_arquivo:
+            return emprestimos
+        arquivados = self._query_arquivo(carregar).filter(
+            EmprestimoArquivado.livro_id == livro_id
+        ).all()
+        return ordenar_historico(arquivados + emprestimos)
     
-    def buscar_ativos(self) -> List[Emprestimo]:
+    def _query_arquivo(self, carregar: Optional[PlanoCarregamento] = None) -> Any:
+        """Query do arquivo; livro e usuario existem nele, então os planos de Emprestimo servem"""
+        return self.session.query(EmprestimoArquivado).options(
+            *opcoes_carregamento(EmprestimoArquivado, carregar)
+        )
+    
+    def buscar_ativos(self, carregar: Optional[PlanoCarregamento] = None) -> List[Emprestimo]:
         """Busca empréstimos ativos (não devolvidos)"""
-        return self.session.query(Emprestimo).filter(Emprestimo.devolvido == False).all()
+        return self._query(carregar=carregar).filter(Emprestimo.devolvido == False).all()
     
-    def buscar_atrasados(self) -> List[Emprestimo]:
+    def buscar_atrasados(self, carregar: Optional[PlanoCarregamento] = None) -> List[Emprestimo]:
         """Busca empréstimos atrasados"""
         hoje = date.today()
-        return self.session.query(Emprestimo).filter(
+        return self._query(carregar=carregar).filter(
             Emprestimo.devolvido == False,
             Emprestimo.data_prevista_devolucao < hoje
         ).all()
@@ -66,4 +152,84 @@ class EmprestimoRepository(BaseRepository[Emprestimo], IEmprestimoRepository):
             Emprestimo.usuario_id == usuario_id,
             Emprestimo.devolvido == False
         ).all()
-
+    
+    def contar_ativos_por_usuario(self, usuario_id: int) -> int:
+        """
+        Conta os empréstimos ativos de um usuário
+        
+        Resolvido só com o índice (usuario_id, devolvido), sem ler a tabela.
+        """
+        return self.contar({"usuario_id": usuario_id, "devolvido": False})
+    
+    def contar_atrasados(self) -> int:
+        """Conta os empréstimos atrasados"""
+        return self.contar({"devolvido": False, "data_prevista_devolucao": {"lt": date.today()}})
+    
+    def iterar_historico(
+        self, incluir_arquivo: bool = True, chunk_size: int = 500
+    ) -> Iterator[Union[Emprestimo, EmprestimoArquivado]]:
+        """
+        Percorre todo o histórico de empréstimos em fluxo
+        
+        Lê em blocos de ``chunk_size`` e expurga cada bloco da sessão (ver
+        BaseRepository.iterar), permitindo exportar históricos maiores que a
+        memória disponível.
+        
+        Args:
+            incluir_arquivo: Se True, começa pelo histórico arquivado (mais antigo primeiro)
+            chunk_size: Quantidade de linhas lidas por vez
+        
+        Yields:
+            Empréstimos (arquivados e depois os da tabela principal), por ID
+        """
+        if incluir_arquivo:
+            yield from self._iterar_consulta(
+                select(EmprestimoArquivado).order_by(EmprestimoArquivado.id), chunk_size
+            )
+        yield from self.iterar(chunk_size=chunk_size)
+    
+    def buscar_ids_para_arquivar(self, data_corte: date, limite: int) -> List[int]:
+        """
+        Busca IDs de empréstimos devolvidos antes da data de corte
+        
+        Args:
+            data_corte: Devoluções anteriores a esta data são elegíveis
+            limite: Tamanho máximo do lote
+        
+        Returns:
+            Lista de IDs, em ordem crescente
+        """
+        return list(self.session.scalars(
+            select(Emprestimo.id)
+            .where(
+                Emprestimo.devolvido == True,
+                Emprestimo.data_devolucao < data_corte
+            )
+            .order_by(Emprestimo.id)
+            .limit(limite)
+        ))
+    
+    def mover_para_arquivo(self, ids: Sequence[int]) -> int:
+        """
+        Copia os empréstimos para a tabela de arquivo e os remove da tabela principal
+        
+        Não faz commit: deve ser chamado dentro de uma unidade de trabalho.
+        
+        Args:
+            ids: IDs dos empréstimos a mover
+        
+        Returns:
+            Quantidade de empréstimos movidos
+        """
+        if not ids:
+            return 0
+        
+        colunas = [coluna.name for coluna in Emprestimo.__table__.columns]
+        origem = select(
+            *[Emprestimo.__table__.c[nome] for nome in colunas], literal(date.today())
+        ).where(Emprestimo.id.in_(ids))
+        self.session.execute(
+            insert(EmprestimoArquivado.__table__).from_select(colunas + ["arquivado_em"], origem)
+        )
+        resultado = self.session.execute(delete(Emprestimo).where(Emprestimo.id.in_(ids)))
+        return resultado.rowcount
@@ -0,0 +1,233 @@
+"""
+Linguagem de filtros das buscas, com a tradução para SQL em cache por forma
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import and_, inspect, or_
+
+from src.database.normalizacao import CAMPOS_NORMALIZADOS, coluna_de_busca, normalizar
+
+# Chave de um grupo OU: {"ou": [{filtros}, {filtros}]} (cada grupo é um E)
+OU = "ou"
+
+
+def _prefixo(coluna: Any, prefixo: str) -> Any:
+    """
+    Prefixo como intervalo [prefixo, próximo prefixo)
+    
+    Ao contrário de LIKE 'x%' (que no SQLite não diferencia maiúsculas e por
+    isso não usa índices comuns), o intervalo usa o índice da coluna.
+    """
+    if not prefixo:
+        return coluna.is_not(None)
+    return and_(coluna >= prefixo, coluna < prefixo[:-1] + chr(ord(prefixo[-1]) + 1))
+
+
+def _entre(coluna: Any, limites: Any) -> Any:
+    """Intervalo fechado [inicio, fim]"""
+    if not isinstance(limites, (list, tuple)) or len(limites) != 2:
+        raise ValueError("between exige uma lista [inicio, fim]")
+    return coluna.between(limites[0], limites[1])
+
+
+def _em(coluna: Any, valores: Any) -> Any:
+    """Pertinência a uma lista (um único parâmetro expansível, qualquer tamanho)"""
+    if isinstance(valores, (str, bytes)) or not hasattr(valores, "__iter__"):
+        raise ValueError("in exige uma lista de valores")
+    return coluna.in_(list(valores))
+
+
+# Operadores aceitos em {"campo": {"operador": valor}}; valores simples usam eq
+OPERADORES: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": lambda coluna, valor: coluna == valor,
+    "ne": lambda coluna, valor: coluna != valor,
+    "gt": lambda coluna, valor: coluna > valor,
+    "lt": lambda coluna, valor: coluna < valor,
+    "gte": lambda coluna, valor: coluna >= valor,
+    "lte": lambda coluna, valor: coluna <= valor,
+    "like": lambda coluna, valor: coluna.like(valor),
+    "in": _em,
+    "between": _entre,
+    "isnull": lambda coluna, valor: coluna.is_(None) if valor else coluna.is_not(None),
+    "prefixo": _prefixo,
+    "ieq": lambda coluna, valor: coluna == normalizar(valor),
+    "iprefixo": lambda coluna, valor: _prefixo(coluna, normalizar(valor)),
+}
+
+# Operadores que ignoram acentos e maiúsculas: comparam com a coluna
+# normalizada do campo (ver src.database.normalizacao)
+OPERADORES_NORMALIZADOS = frozenset({"ieq", "iprefixo"})
+
+# Operadores que o SQLite resolve com um índice cuja primeira coluna é o campo.
+# like fica de fora: o LIKE padrão não diferencia maiúsculas e ignora índices BINARY.
+OPERADORES_INDEXAVEIS = frozenset({
+    "eq", "in", "gt", "lt", "gte", "lte", "between", "isnull", "prefixo", "ieq", "iprefixo",
+})
+
+Forma = Tuple[Tuple[str, Any], ...]
+
+
+def forma_filtros(filtros: Dict[str, Any]) -> Tuple[Forma, List[Any]]:
+    """
+    Separa os filtros em forma (campos e operadores) e valores
+    
+    Filtros com a mesma forma geram o mesmo SQL, então a tradução pode ser
+    reaproveitada (ver plano_filtros).
+    
+    Args:
+        filtros: Dicionário com filtros
+    
+    Returns:
+        Forma (hashable) e a lista de valores na mesma ordem
+    
+    Raises:
+        ValueError: Se um grupo OU não for uma lista de dicionários
+    """
+    forma = []
+    valores: List[Any] = []
+    for campo, valor in filtros.items():
+        if campo == OU:
+            if not isinstance(valor, (list, tuple)) or not all(isinstance(grupo, dict) for grupo in valor):
+                raise ValueError("O grupo 'ou' exige uma lista de dicionários de filtros")
+            grupos = [forma_filtros(grupo) for grupo in valor]
+            forma.append((OU, tuple(forma_grupo for forma_grupo, _ in grupos)))
+            valores.append([valores_grupo for _, valores_grupo in grupos])
+        elif isinstance(valor, dict):
+            for operador, valor_operador in valor.items():
+                forma.append((campo, operador))
+                valores.append(valor_operador)
+        else:
+            forma.append((campo, "eq"))
+            valores.append(valor)
+    return tuple(forma), valores
+
+
+@lru_cache(maxsize=512)
+def plano_filtros(model_class: type, forma: Forma) -> Tuple[Any, ...]:
+    """
+    Traduz uma forma de filtros em passos prontos (coluna + operador)
+    
+    Fica em cache por (modelo, forma): buscas repetidas com a mesma forma
+    não voltam a resolver campos e operadores (ver plano_filtros.cache_info()).
+    Campos que não são colunas do modelo são ignorados.
+    
+    Args:
+        model_class: Classe do modelo
+        forma: Forma devolvida por forma_filtros
+    
+    Returns:
+        Um passo por item da forma: ("coluna", coluna, operador),
+        ("ou", planos dos grupos) ou None (campo ignorado)
+    
+    Raises:
+        ValueError: Se algum operador for desconhecido ou exigir uma coluna
+            normalizada que o campo não tem
+    """
+    colunas = inspect(model_class).column_attrs
+    passos = []
+    for campo, operador in forma:
+        if campo == OU:
+            passos.append((OU, tuple(plano_filtros(model_class, grupo) for grupo in operador)))
+        elif campo not in colunas:
+            passos.append(None)
+        elif operador not in OPERADORES:
+            raise ValueError(f"Operador de filtro desconhecido: {operador}")
+        elif operador in OPERADORES_NORMALIZADOS:
+            coluna = coluna_de_busca(model_class, campo)
+            if coluna is None:
+                raise ValueError(f"{model_class.__name__}.{campo} não aceita {operador} (sem chave normalizada)")
+            passos.append(("coluna", coluna, OPERADORES[operador]))
+        else:
+            passos.append(("coluna", getattr(model_class, campo), OPERADORES[operador]))
+    return tuple(passos)
+
+
+def _aplicar(passos: Tuple[Any, ...], valores: List[Any]) -> List[Any]:
+    """Aplica os valores aos passos de um plano"""
+    condicoes = []
+    for passo, valor in zip(passos, valores):
+        if passo is None:
+            continue
+        if passo[0] == OU:
+            grupos = [_aplicar(plano, valores_grupo) for plano, valores_grupo in zip(passo[1], valor)]
+            # Um grupo vazio aceita tudo, então o OU inteiro não restringe nada
+            if grupos and all(grupos):
+                condicoes.append(or_(*[and_(*grupo) for grupo in grupos]))
+        else:
+            condicoes.append(passo[2](passo[1], valor))
+    return condicoes
+
+
+def condicoes_filtros(model_class: type, filtros: Dict[str, Any]) -> List[Any]:
+    """
+    Converte o dicionário de filtros em condições SQL
+    
+    Campos inexistentes no modelo são ignorados. Valores simples geram
+    igualdade; dicionários aceitam os operadores de OPERADORES, por exemplo:
+        
+        {"titulo": {"prefixo": "Dom"}, "ano_publicacao": {"between": [1900, 1950]}}
+        {"titulo": {"iprefixo": "memorias"}}  # casa "Memórias Póstumas..."
+        {"autor_id": {"in": [1, 2]}, "isbn": {"isnull": False}}
+        {"ou": [{"disponivel": True}, {"quantidade_total": {"gt": 3}}]}
+    
+    Args:
+        model_class: Classe do modelo
+        filtros: Dicionário com filtros a aplicar
+    
+    Returns:
+        Lista de condições para usar em filter()/where()
+    
+    Raises:
+        ValueError: Se algum operador ou valor de operador for inválido
+    """
+    forma, valores = forma_filtros(filtros)
+    return _aplicar(plano_filtros(model_class, forma), valores)
+
+
+@lru_cache(maxsize=None)
+def indices_por_campo(model_class: type) -> Dict[str, str]:
+    """
+    Índice que cada coluna pode usar, quando ela é a primeira do índice
+    
+    A chave primária inteira é o próprio rowid ("PRIMARY KEY"); entre os
+    demais, índices de uma só coluna têm preferência.
+    """
+    tabela = model_class.__table__
+    indices: Dict[str, str] = {}
+    for coluna in tabela.primary_key.columns:
+        indices[coluna.key] = "PRIMARY KEY"
+    for indice in sorted(tabela.indexes, key=lambda indice: (len(indice.columns), indice.name)):
+        indices.setdefault(list(indice.columns)[0].key, indice.name)
+    return indices
+
+
+def indices_filtros(model_class: type, filtros: Dict[str, Any]) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Mostra qual índice cada condição dos filtros pode usar
+    
+    Condições de grupos OU aparecem como "ou[i].campo": o SQLite só usa
+    índices em um OU se todos os grupos tiverem uma condição indexável.
+    
+    Args:
+        model_class: Classe do modelo
+        filtros: Dicionário com filtros (mesma sintaxe de condicoes_filtros)
+    
+    Returns:
+        Lista de (campo, operador, índice ou None se a condição não usa índice)
+    """
+    indices = indices_por_campo(model_class)
+    normalizados = CAMPOS_NORMALIZADOS.get(model_class, {})
+    
+    def percorrer(forma: Forma, prefixo: str) -> List[Tuple[str, str, Optional[str]]]:
+        linhas = []
+        for campo, operador in forma:
+            if campo == OU:
+                for posicao, grupo in enumerate(operador):
+                    linhas.extend(percorrer(grupo, f"{prefixo}ou[{posicao}]."))
+            elif campo in model_class.__table__.columns:
+                coluna = normalizados.get(campo, campo) if operador in OPERADORES_NORMALIZADOS else campo
+                indice = indices.get(coluna) if operador in OPERADORES_INDEXAVEIS else None
+                linhas.append((prefixo + campo, operador, indice))
+        return linhas
+    
+    return percorrer(forma_filtros(filtros)[0], "")
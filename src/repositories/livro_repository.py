@@ -1,11 +1,48 @@
 """
 Repositório para Livro
 """
-from typing import List, Optional
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import func, literal, null, select, union_all, update
 from sqlalchemy.orm import Session
 
-from src.models.livro import Livro
+from src.database.fts import Candidato
+from src.database.normalizacao import normalizar
+from src.models.autor import Autor
+from src.models.categoria import Categoria
+from src.models.emprestimo import Emprestimo
+from src.models.emprestimo_arquivado import EmprestimoArquivado
+from src.models.livro import BUSCA_LIVROS, TRIGRAMAS_LIVROS, Livro
 from src.repositories.base_repository import BaseRepository
+from src.repositories.filtros import condicoes_filtros
+
+# Facetas do catálogo: nome -> valor agrupado (a década sai do ano de publicação)
+FACETAS = {
+    "categoria": Livro.categoria_id,
+    "autor": Livro.autor_id,
+    "disponivel": Livro.disponivel,
+    "decada": (Livro.ano_publicacao // 10) * 10,
+}
+
+# Rótulos lidos junto com a contagem (LEFT JOIN) para as facetas por ID
+ROTULOS_FACETAS = {
+    "categoria": (Categoria, Categoria.nome),
+    "autor": (Autor, Autor.nome),
+}
+
+# Um valor de faceta: valor agrupado, rótulo para exibição e quantidade de livros
+ValorFaceta = namedtuple("ValorFaceta", ["valor", "rotulo", "quantidade"])
+
+
+def rotulo_faceta(faceta: str, valor: Any) -> str:
+    """Rótulo padrão de um valor de faceta sem nome próprio"""
+    if faceta == "disponivel":
+        return "Disponível" if valor else "Indisponível"
+    if valor is None:
+        return {"categoria": "Sem categoria", "decada": "Sem ano"}.get(faceta, "Não informado")
+    if faceta == "decada":
+        return f"Anos {valor}"
+    return str(valor)
 
 
 class ILivroRepository:
@@ -15,10 +52,22 @@ class ILivroRepository:
         """Busca livro por título"""
         pass
     
+    def buscar_por_prefixo_titulo(self, prefixo: str, limit: int = 20) -> List[Livro]:
+        """Busca livros pelo início do título"""
+        pass
+    
+    def buscar_titulo_aproximado(self, titulo: str, limit: int = 10) -> List[Candidato]:
+        """Busca livros por título, tolerando erros de digitação"""
+        pass
+    
     def buscar_disponiveis(self) -> List[Livro]:
         """Busca livros disponíveis"""
         pass
     
+    def contar_disponiveis(self) -> int:
+        """Conta livros disponíveis"""
+        pass
+    
     def buscar_por_autor(self, autor_id: int) -> List[Livro]:
         """Busca livros por autor"""
         pass
@@ -26,23 +75,170 @@ class ILivroRepository:
     def buscar_por_categoria(self, categoria_id: int) -> List[Livro]:
         """Busca livros por categoria"""
         pass
+    
+    def buscar_texto(self, texto: str, filtros: Optional[Dict[str, Any]] = None, limit: int = 20) -> List[Livro]:
+        """Busca livros por texto no título e na sinopse"""
+        pass
+    
+    def contar_facetas(
+        self, facetas: Sequence[str] = tuple(FACETAS), filtros: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[ValorFaceta]]:
+        """Conta os livros por valor de cada faceta"""
+        pass
+    
+    def buscar_mais_emprestados(self, limit: int = 10) -> List[Livro]:
+        """Busca os livros mais emprestados"""
+        pass
+    
+    def reconciliar_contadores(self) -> int:
+        """Recalcula os contadores de circulação de todos os livros"""
+        pass
 
 
 class LivroRepository(BaseRepository[Livro], ILivroRepository):
     """Implementação do repositório de livros"""
     
+    CONSULTAS_QUENTES = BaseRepository.CONSULTAS_QUENTES + (
+        ("buscar_por_titulo", ("",)),
+        ("buscar_disponiveis", ()),
+        ("buscar_por_autor", (0,)),
+        ("buscar_por_categoria", (0,)),
+    )
+    
     def __init__(self, session: Session) -> None:
         """Inicializa o repositório"""
         super().__init__(session, Livro)
     
     def buscar_por_titulo(self, titulo: str) -> Optional[Livro]:
-        """Busca livro por título"""
-        return self.session.query(Livro).filter(Livro.titulo == titulo).first()
+        """Busca livro por título, ignorando acentos e maiúsculas"""
+        return self.session.query(Livro).filter(Livro.titulo_normalizado == normalizar(titulo)).first()
+    
+    def buscar_por_prefixo_titulo(self, prefixo: str, limit: int = 20) -> List[Livro]:
+        """Busca livros pelo início do título, ignorando acentos e maiúsculas"""
+        return self._buscar_prefixo("titulo", prefixo, limit)
+    
+    def contar_facetas(
+        self, facetas: Sequence[str] = tuple(FACETAS), filtros: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[ValorFaceta]]:
+        """
+        Conta os livros por valor de cada faceta com uma única consulta
+        
+        Cada faceta tem o próprio GROUP BY, e os agrupamentos são unidos com
+        UNION ALL: cada faceta devolve só os seus valores distintos, sem o
+        produto cartesiano das facetas pedidas, e tudo vai ao banco em uma
+        só ida. Os nomes de categoria e autor vêm na mesma consulta.
+        
+        Args:
+            facetas: Facetas a contar, entre as de FACETAS
+            filtros: Filtros dos livros contados (mesma sintaxe de buscar_com_filtros)
+        
+        Returns:
+            Para cada faceta, valores com rótulo e quantidade, do mais para o
+            menos frequente
+        
+        Raises:
+            ValueError: Se nenhuma faceta for pedida ou alguma não existir
+        """
+        invalidas = [faceta for faceta in facetas if faceta not in FACETAS]
+        if not facetas or invalidas:
+            raise ValueError(f"Facetas inválidas: {invalidas or 'nenhuma faceta informada'}")
+        
+        condicoes = condicoes_filtros(Livro, filtros or {})
+        agrupamentos = []
+        for faceta in dict.fromkeys(facetas):
+            valor = FACETAS[faceta]
+            consulta = select(literal(faceta).label("faceta"), valor.label("valor")).select_from(Livro)
+            if faceta in ROTULOS_FACETAS:
+                modelo, nome = ROTULOS_FACETAS[faceta]
+                consulta = consulta.outerjoin(modelo, modelo.id == valor).add_columns(nome.label("rotulo"))
+                agrupados = (valor, nome)
+            else:
+                consulta = consulta.add_columns(null().label("rotulo"))
+                agrupados = (valor,)
+            agrupamentos.append(
+                consulta.add_columns(func.count().label("quantidade")).where(*condicoes).group_by(*agrupados)
+            )
+        
+        totais: Dict[str, List[ValorFaceta]] = {faceta: [] for faceta in facetas}
+        for linha in self.session.execute(union_all(*agrupamentos)).mappings():
+            faceta, valor = linha["faceta"], linha["valor"]
+            # O UNION tipa a coluna valor pela primeira faceta: cada valor volta ao tipo da sua
+            if valor is not None:
+                valor = FACETAS[faceta].type.python_type(valor)
+            rotulo = linha["rotulo"] or rotulo_faceta(faceta, valor)
+            totais[faceta].append(ValorFaceta(valor, rotulo, linha["quantidade"]))
+        return {
+            faceta: sorted(valores, key=lambda item: (-item.quantidade, item.rotulo))
+            for faceta, valores in totais.items()
+        }
+    
+    def buscar_mais_emprestados(self, limit: int = 10) -> List[Livro]:
+        """
+        Busca os livros mais emprestados, pelo contador total_emprestimos
+        
+        A ordenação usa o índice do contador, sem contar empréstimos.
+        
+        Args:
+            limit: Número máximo de livros
+        
+        Returns:
+            Livros já emprestados, do mais para o menos emprestado
+        """
+        return self.session.scalars(
+            select(Livro)
+            .where(Livro.total_emprestimos > 0)
+            .order_by(Livro.total_emprestimos.desc(), Livro.id.desc())
+            .limit(limit)
+        ).all()
+    
+    def reconciliar_contadores(self) -> int:
+        """
+        Recalcula os contadores de circulação de todos os livros com um único UPDATE
+        
+        Cada contador vem de subconsultas correlacionadas (indexadas por
+        livro_id) nos empréstimos e no arquivo. Não faz commit.
+        
+        Returns:
+            Quantidade de livros atualizados
+        """
+        def agregado(modelo, expressao, *condicoes):
+            return select(expressao).where(modelo.livro_id == Livro.id, *condicoes).scalar_subquery()
+        
+        ultimo = agregado(Emprestimo, func.max(Emprestimo.data_emprestimo))
+        ultimo_arquivado = agregado(EmprestimoArquivado, func.max(EmprestimoArquivado.data_emprestimo))
+        consulta = update(Livro).values(
+            total_emprestimos=agregado(Emprestimo, func.count()) + agregado(EmprestimoArquivado, func.count()),
+            emprestimos_ativos=agregado(Emprestimo, func.count(), Emprestimo.devolvido == False),
+            # max(a, b) do SQLite é NULL se um dos lados for NULL
+            ultimo_emprestimo_em=func.coalesce(func.max(ultimo, ultimo_arquivado), ultimo, ultimo_arquivado),
+        ).execution_options(synchronize_session="fetch")
+        return self.session.execute(consulta).rowcount
+    
+    def buscar_titulo_aproximado(self, titulo: str, limit: int = 10, similaridade_minima: float = 0.3) -> List[Candidato]:
+        """
+        Busca livros por título, tolerando erros de digitação
+        
+        Para quando buscar_por_titulo não encontra nada: "dom casmuro"
+        encontra "Dom Casmurro". Usa o índice de trigramas do título.
+        
+        Args:
+            titulo: Título digitado
+            limit: Número máximo de resultados
+            similaridade_minima: Similaridade mínima (0 a 1) para um candidato ser devolvido
+        
+        Returns:
+            Candidatos (livro, similaridade), do mais para o menos similar
+        """
+        return self._buscar_aproximado(TRIGRAMAS_LIVROS, "titulo", titulo, limit, similaridade_minima)
     
     def buscar_disponiveis(self) -> List[Livro]:
         """Busca livros disponíveis"""
         return self.session.query(Livro).filter(Livro.disponivel == True).all()
     
+    def contar_disponiveis(self) -> int:
+        """Conta livros disponíveis"""
+        return self.contar({"disponivel": True})
+    
     def buscar_por_autor(self, autor_id: int) -> List[Livro]:
         """Busca livros por autor"""
         return self.session.query(Livro).filter(Livro.autor_id == autor_id).all()
@@ -50,4 +246,20 @@ class LivroRepository(BaseRepository[Livro], ILivroRepository):
     def buscar_por_categoria(self, categoria_id: int) -> List[Livro]:
         """Busca livros por categoria"""
         return self.session.query(Livro).filter(Livro.categoria_id == categoria_id).all()
-
+    
+    def buscar_texto(self, texto: str, filtros: Optional[Dict[str, Any]] = None, limit: int = 20) -> List[Livro]:
+        """
+        Busca livros por texto no título e na sinopse (índice FTS5)
+        
+        Acertos no título pesam mais que na sinopse; maiúsculas e acentos
+        são ignorados.
+        
+        Args:
+            texto: Texto livre
+            filtros: Filtros adicionais (ex.: {"disponivel": True})
+            limit: Número máximo de resultados
+        
+        Returns:
+            Livros, do mais para o menos relevante
+        """
+        return self._buscar_texto(BUSCA_LIVROS, texto, filtros, limit)
@@ -0,0 +1,147 @@
+"""
+Paginação por cursor (keyset) para os repositórios
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, Iterator, List, Optional, Tuple, TypeVar
+from sqlalchemy import and_, asc, desc, or_, tuple_
+
+T = TypeVar('T')
+
+
+class Pagina(Generic[T]):
+    """Página de resultados de uma paginação por cursor"""
+    
+    def __init__(self, itens: List[T], proximo_cursor: Optional[str]) -> None:
+        """
+        Inicializa a página
+        
+        Args:
+            itens: Entidades da página, já na ordem solicitada
+            proximo_cursor: Cursor da página seguinte ou None se esta for a última
+        """
+        self.itens = itens
+        self.proximo_cursor = proximo_cursor
+    
+    @property
+    def tem_proxima(self) -> bool:
+        """Indica se existe página seguinte"""
+        return self.proximo_cursor is not None
+    
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.itens)
+    
+    def __len__(self) -> int:
+        return len(self.itens)
+    
+    def __repr__(self) -> str:
+        return f"<Pagina(itens={len(self.itens)}, tem_proxima={self.tem_proxima})>"
+
+
+def campo_ordenacao(model_class: type, ordenar_por: Optional[str]) -> str:
+    """
+    Resolve o campo de ordenação da paginação
+    
+    Campos inexistentes no modelo caem na ordenação por ID, como em
+    criterio_ordenacao.
+    """
+    if ordenar_por and ordenar_por != "id" and hasattr(model_class, ordenar_por):
+        return ordenar_por
+    return "id"
+
+
+def criterios_pagina(model_class: type, campo: str, ordem_desc: bool = False) -> List[Any]:
+    """
+    Monta a ordenação estável (campo, id) usada pela paginação
+    
+    O ID desempata valores repetidos; nos índices de coluna única do SQLite o
+    rowid já faz parte da chave, então a ordenação é servida pelo índice.
+    """
+    direcao = desc if ordem_desc else asc
+    if campo == "id":
+        return [direcao(model_class.id)]
+    return [direcao(getattr(model_class, campo)), direcao(model_class.id)]
+
+
+def codificar_cursor(entidade: Any, campo: str, ordem_desc: bool = False) -> str:
+    """
+    Gera o cursor opaco que aponta para depois da entidade
+    
+    Args:
+        entidade: Última entidade da página
+        campo: Campo de ordenação (ver campo_ordenacao)
+        ordem_desc: Se a ordenação é decrescente
+    
+    Returns:
+        Cursor em base64 seguro para URLs
+    """
+    valor = getattr(entidade, campo)
+    if isinstance(valor, (date, datetime, Decimal)):
+        valor = str(valor)
+    dados = {"o": campo, "d": ordem_desc, "v": valor, "id": entidade.id}
+    bruto = json.dumps(dados, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decodificar_cursor(model_class: type, cursor: str, campo: str, ordem_desc: bool = False) -> Tuple[Any, int]:
+    """
+    Lê a chave de ordenação (valor, id) de um cursor
+    
+    Args:
+        model_class: Classe do modelo
+        cursor: Cursor gerado por codificar_cursor
+        campo: Campo de ordenação esperado
+        ordem_desc: Direção esperada
+    
+    Returns:
+        Tupla (valor do campo, id) da última entidade vista
+    
+    Raises:
+        ValueError: Se o cursor for inválido ou de outra ordenação
+    """
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        dados = json.loads(bruto)
+        valor, ultimo_id = dados["v"], int(dados["id"])
+        mesma_ordem = dados["o"] == campo and dados["d"] == ordem_desc
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Cursor inválido")
+    
+    if not mesma_ordem:
+        raise ValueError("Cursor não corresponde à ordenação solicitada")
+    
+    if isinstance(valor, str):
+        tipo = getattr(model_class, campo).type.python_type
+        if tipo is datetime:
+            valor = datetime.fromisoformat(valor)
+        elif tipo is date:
+            valor = date.fromisoformat(valor)
+        elif tipo is Decimal:
+            valor = Decimal(valor)
+    return valor, ultimo_id
+
+
+def condicao_apos_cursor(model_class: type, campo: str, valor: Any, ultimo_id: int, ordem_desc: bool = False) -> Any:
+    """
+    Monta o predicado de busca (seek) que começa depois do cursor
+    
+    Usa comparação de tuplas (campo, id), que o SQLite resolve com uma busca
+    por faixa no índice do campo. NULLs vêm primeiro na ordem crescente e por
+    último na decrescente, como no ORDER BY do SQLite.
+    """
+    id_coluna = model_class.id
+    if campo == "id":
+        return id_coluna < ultimo_id if ordem_desc else id_coluna > ultimo_id
+    
+    coluna = getattr(model_class, campo)
+    if valor is None:
+        depois_no_nulo = id_coluna < ultimo_id if ordem_desc else id_coluna > ultimo_id
+        condicao = and_(coluna.is_(None), depois_no_nulo)
+        return condicao if ordem_desc else or_(condicao, coluna.isnot(None))
+    
+    if ordem_desc:
+        return or_(tuple_(coluna, id_coluna) < tuple_(valor, ultimo_id), coluna.is_(None))
+    return tuple_(coluna, id_coluna) > tuple_(valor, ultimo_id)
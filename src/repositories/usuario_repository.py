@@ -1,9 +1,12 @@
 """
 Repositório para Usuario
 """
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
+from src.models.emprestimo import Emprestimo
+from src.models.emprestimo_arquivado import EmprestimoArquivado
 from src.models.usuario import Usuario
 from src.repositories.base_repository import BaseRepository
 
@@ -18,11 +21,28 @@ class IUsuarioRepository:
     def buscar_ativos(self) -> List[Usuario]:
         """Busca usuários ativos"""
         pass
+    
+    def buscar_por_nome(self, nome: str, limit: int = 100) -> List[Usuario]:
+        """Busca usuários pelo início do nome"""
+        pass
+    
+    def emails_existentes(self, emails: Iterable[str]) -> Set[str]:
+        """Filtra os emails já cadastrados"""
+        pass
+    
+    def reconciliar_contadores(self) -> int:
+        """Recalcula os contadores de circulação de todos os usuários"""
+        pass
 
 
 class UsuarioRepository(BaseRepository[Usuario], IUsuarioRepository):
     """Implementação do repositório de usuários"""
     
+    CONSULTAS_QUENTES = BaseRepository.CONSULTAS_QUENTES + (
+        ("buscar_por_email", ("",)),
+        ("buscar_ativos", ()),
+    )
+    
     def __init__(self, session: Session) -> None:
         """Inicializa o repositório"""
         super().__init__(session, Usuario)
@@ -34,4 +54,45 @@ class UsuarioRepository(BaseRepository[Usuario], IUsuarioRepository):
     def buscar_ativos(self) -> List[Usuario]:
         """Busca usuários ativos"""
         return self.session.query(Usuario).filter(Usuario.ativo == True).all()
-
+    
+    def buscar_por_nome(self, nome: str, limit: int = 100) -> List[Usuario]:
+        """Busca usuários pelo início do nome, ignorando acentos e maiúsculas"""
+        return self._buscar_prefixo("nome", nome, limit)
+    
+    def emails_existentes(self, emails: Iterable[str]) -> Set[str]:
+        """
+        Filtra os emails já cadastrados, com uma única consulta
+        
+        Args:
+            emails: Emails a verificar
+        
+        Returns:
+            Conjunto dos emails encontrados
+        """
+        emails = set(emails)
+        if not emails:
+            return set()
+        return set(self.session.scalars(select(Usuario.email).where(Usuario.email.in_(emails))))
+    
+    def reconciliar_contadores(self) -> int:
+        """
+        Recalcula os contadores de circulação de todos os usuários com um único UPDATE
+        
+        Cada contador vem de subconsultas correlacionadas (indexadas por
+        usuario_id) nos empréstimos e no arquivo. Não faz commit.
+        
+        Returns:
+            Quantidade de usuários atualizados
+        """
+        def agregado(modelo, expressao, *condicoes):
+            return select(expressao).where(modelo.usuario_id == Usuario.id, *condicoes).scalar_subquery()
+        
+        consulta = update(Usuario).values(
+            emprestimos_ativos=agregado(Emprestimo, func.count(), Emprestimo.devolvido == False),
+            total_emprestimos=agregado(Emprestimo, func.count()) + agregado(EmprestimoArquivado, func.count()),
+            multas_pendentes=(
+                agregado(Emprestimo, func.coalesce(func.sum(Emprestimo.multa), 0))
+                + agregado(EmprestimoArquivado, func.coalesce(func.sum(EmprestimoArquivado.multa), 0))
+            ),
+        ).execution_options(synchronize_session="fetch")
+        return self.session.execute(consulta).rowcount
@@ -0,0 +1,94 @@
+"""
+Serviço de Arquivamento - move empréstimos devolvidos antigos para a tabela fria
+"""
+from typing import Optional
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+
+from src.repositories.emprestimo_repository import EmprestimoRepository
+from src.database.unit_of_work import UnitOfWork
+from src.utils.logger import get_logger
+
+
+class ArquivamentoService:
+    """
+    Serviço para manter pequena a tabela de empréstimos
+    
+    Empréstimos devolvidos há mais de ``idade_minima_dias`` são movidos, em
+    lotes de ``tamanho_lote``, para a tabela ``emprestimos_arquivo``. Cada lote
+    é uma transação própria, para não segurar o lock de escrita por muito tempo.
+    """
+    
+    def __init__(
+        self,
+        session: Session,
+        emprestimo_repo: Optional[EmprestimoRepository] = None,
+        idade_minima_dias: int = 365,
+        tamanho_lote: int = 500
+    ) -> None:
+        """
+        Inicializa o serviço
+        
+        Args:
+            session: Sessão do banco de dados
+            emprestimo_repo: Repositório de empréstimos (opcional)
+            idade_minima_dias: Dias desde a devolução para o empréstimo ser arquivado
+            tamanho_lote: Quantidade de empréstimos movidos por transação
+        
+        Raises:
+            ValueError: Se a idade ou o tamanho do lote forem inválidos
+        """
+        if idade_minima_dias < 0:
+            raise ValueError("idade_minima_dias não pode ser negativa")
+        if tamanho_lote <= 0:
+            raise ValueError("tamanho_lote deve ser positivo")
+        
+        self.session = session
+        self.emprestimo_repo = emprestimo_repo or EmprestimoRepository(session)
+        self.idade_minima_dias = idade_minima_dias
+        self.tamanho_lote = tamanho_lote
+        self.logger = get_logger("ArquivamentoService")
+    
+    def data_corte(self, hoje: Optional[date] = None) -> date:
+        """
+        Calcula a data de corte do arquivamento
+        
+        Args:
+            hoje: Data de referência (padrão: hoje)
+        
+        Returns:
+            Devoluções anteriores a esta data são arquivadas
+        """
+        return (hoje or date.today()) - timedelta(days=self.idade_minima_dias)
+    
+    def arquivar(self, hoje: Optional[date] = None, max_lotes: Optional[int] = None) -> int:
+        """
+        Arquiva empréstimos devolvidos antes da data de corte
+        
+        Args:
+            hoje: Data de referência (padrão: hoje)
+            max_lotes: Limite de lotes nesta execução (padrão: até esgotar)
+        
+        Returns:
+            Quantidade de empréstimos arquivados
+        """
+        corte = self.data_corte(hoje)
+        total = 0
+        lotes = 0
+        
+        while max_lotes is None or lotes < max_lotes:
+            with UnitOfWork(self.session):
+                ids = self.emprestimo_repo.buscar_ids_para_arquivar(corte, self.tamanho_lote)
+                movidos = self.emprestimo_repo.mover_para_arquivo(ids)
+            
+            if not movidos:
+                break
+            total += movidos
+            lotes += 1
+            self.logger.info(f"Lote {lotes} arquivado: {movidos} empréstimos")
+            
+            if len(ids) < self.tamanho_lote:
+                break
+        
+        self.logger.info(f"Arquivamento concluído: {total} empréstimos devolvidos antes de {corte}")
+        return total
@@ -0,0 +1,426 @@
+"""
+Serviços assíncronos (AsyncSession) com as mesmas regras de negócio dos síncronos
+"""
+from typing import List, Optional, TYPE_CHECKING
+from sqlalchemy import inspect
+
+from src.models.livro import Livro
+from src.models.usuario import Usuario
+from src.models.emprestimo import Emprestimo
+from src.models.autor import Autor
+from src.models.categoria import Categoria
+from src.repositories.async_repositories import (
+    AsyncLivroRepository,
+    AsyncUsuarioRepository,
+    AsyncEmprestimoRepository,
+    AsyncAutorRepository,
+    AsyncCategoriaRepository
+)
+from src.services.livro_service import RegrasLivro
+from src.services.usuario_service import RegrasUsuario
+from src.services.emprestimo_service import RegrasEmprestimo
+from src.services.autor_service import RegrasAutor
+from src.services.categoria_service import RegrasCategoria
+from src.exceptions.biblioteca_exceptions import (
+    EntidadeNaoEncontradaException,
+    EmprestimoNaoEncontradoException
+)
+from src.validators.validators import Validator
+from src.database.unit_of_work import transacional_async
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncLivroService(RegrasLivro):
+    """Serviço assíncrono para gerenciar livros"""
+    
+    def __init__(
+        self,
+        session: "AsyncSession",
+        livro_repo: Optional[AsyncLivroRepository] = None,
+        autor_repo: Optional[AsyncAutorRepository] = None,
+        categoria_repo: Optional[AsyncCategoriaRepository] = None
+    ) -> None:
+        """
+        Inicializa o serviço com injeção de dependências
+        
+        Args:
+            session: Sessão assíncrona do banco de dados
+            livro_repo: Repositório de livros (opcional)
+            autor_repo: Repositório de autores (opcional)
+            categoria_repo: Repositório de categorias (opcional)
+        """
+        self.session = session
+        self.livro_repo = livro_repo or AsyncLivroRepository(session)
+        self.autor_repo = autor_repo or AsyncAutorRepository(session)
+        self.categoria_repo = categoria_repo or AsyncCategoriaRepository(session)
+        self.logger = get_logger("AsyncLivroService")
+    
+    async def _validar_referencias(self, autor_id: Optional[int], categoria_id: Optional[int]) -> None:
+        """Valida a existência do autor e da categoria (se informados)"""
+        if autor_id is not None and not await self.autor_repo.buscar_por_id(autor_id):
+            raise EntidadeNaoEncontradaException("Autor", str(autor_id))
+        
+        if categoria_id and not await self.categoria_repo.buscar_por_id(categoria_id):
+            raise EntidadeNaoEncontradaException("Categoria", str(categoria_id))
+    
+    @transacional_async
+    async def criar_livro(self, livro: Livro) -> Livro:
+        """Cria um novo livro com validações"""
+        self.logger.info(f"Criando livro: {livro.titulo}")
+        await self._validar_referencias(livro.autor_id, livro.categoria_id)
+        self._validar_quantidades(livro)
+        
+        livro = await self.livro_repo.criar(livro)
+        self.logger.info(f"Livro criado com sucesso: ID {livro.id}")
+        return livro
+    
+    async def buscar_por_id(self, livro_id: int) -> Livro:
+        """Busca livro por ID"""
+        livro = await self.livro_repo.buscar_por_id(livro_id)
+        if not livro:
+            raise EntidadeNaoEncontradaException("Livro", str(livro_id))
+        return livro
+    
+    async def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Livro]:
+        """Lista todos os livros"""
+        return await self.livro_repo.listar_todos(skip, limit)
+    
+    @transacional_async
+    async def atualizar_livro(self, livro_id: int, dados_atualizacao: dict) -> Livro:
+        """Atualiza um livro"""
+        self.logger.info(f"Atualizando livro ID {livro_id}")
+        livro = await self.buscar_por_id(livro_id)
+        self._preparar_atualizacao(livro, dados_atualizacao)
+        await self._validar_referencias(
+            dados_atualizacao.get("autor_id"),
+            dados_atualizacao.get("categoria_id")
+        )
+        self._aplicar_dados(livro, dados_atualizacao)
+        
+        livro = await self.livro_repo.atualizar(livro)
+        self.logger.info(f"Livro ID {livro_id} atualizado com sucesso")
+        return livro
+    
+    @transacional_async
+    async def deletar_livro(self, livro_id: int) -> bool:
+        """Deleta um livro"""
+        self.logger.info(f"Deletando livro ID {livro_id}")
+        await self.buscar_por_id(livro_id)
+        return await self.livro_repo.deletar(livro_id)
+    
+    async def buscar_com_filtros(
+        self,
+        filtros: dict,
+        skip: int = 0,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False
+    ) -> List[Livro]:
+        """Busca livros com filtros e ordenação"""
+        return await self.livro_repo.buscar_com_filtros(filtros, skip, limit, ordenar_por, ordem_desc)
+    
+    async def buscar_disponiveis(self) -> List[Livro]:
+        """Busca livros disponíveis"""
+        return await self.livro_repo.buscar_disponiveis()
+
+
+class AsyncUsuarioService(RegrasUsuario):
+    """Serviço assíncrono para gerenciar usuários"""
+    
+    def __init__(self, session: "AsyncSession", usuario_repo: Optional[AsyncUsuarioRepository] = None) -> None:
+        """
+        Inicializa o serviço
+        
+        Args:
+            session: Sessão assíncrona do banco de dados
+            usuario_repo: Repositório de usuários (opcional)
+        """
+        self.session = session
+        self.usuario_repo = usuario_repo or AsyncUsuarioRepository(session)
+        self.logger = get_logger("AsyncUsuarioService")
+    
+    @transacional_async
+    async def criar_usuario(self, usuario: Usuario) -> Usuario:
+        """Cria um novo usuário com validações"""
+        self.logger.info(f"Criando usuário: {usuario.nome}")
+        Validator.validar_email(usuario.email)
+        
+        self._validar_email_disponivel(usuario.email, await self.usuario_repo.buscar_por_email(usuario.email))
+        
+        Validator.validar_data_nascimento(usuario.data_nascimento, idade_minima=12)
+        
+        usuario = await self.usuario_repo.criar(usuario)
+        self.logger.info(f"Usuário criado com sucesso: ID {usuario.id}")
+        return usuario
+    
+    async def buscar_por_id(self, usuario_id: int) -> Usuario:
+        """Busca usuário por ID"""
+        return self._exigir_usuario(await self.usuario_repo.buscar_por_id(usuario_id), usuario_id)
+    
+    async def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Usuario]:
+        """Lista todos os usuários"""
+        return await self.usuario_repo.listar_todos(skip, limit)
+    
+    @transacional_async
+    async def atualizar_usuario(self, usuario_id: int, dados_atualizacao: dict) -> Usuario:
+        """Atualiza um usuário"""
+        self.logger.info(f"Atualizando usuário ID {usuario_id}")
+        usuario = await self.buscar_por_id(usuario_id)
+        
+        if "email" in dados_atualizacao:
+            email = dados_atualizacao["email"]
+            Validator.validar_email(email)
+            self._validar_email_disponivel(email, await self.usuario_repo.buscar_por_email(email), usuario_id)
+        
+        self._validar_data_nascimento(dados_atualizacao)
+        self._aplicar_dados(usuario, dados_atualizacao)
+        
+        usuario = await self.usuario_repo.atualizar(usuario)
+        self.logger.info(f"Usuário ID {usuario_id} atualizado com sucesso")
+        return usuario
+    
+    @transacional_async
+    async def deletar_usuario(self, usuario_id: int) -> bool:
+        """Deleta um usuário"""
+        self.logger.info(f"Deletando usuário ID {usuario_id}")
+        await self.buscar_por_id(usuario_id)
+        return await self.usuario_repo.deletar(usuario_id)
+    
+    async def buscar_com_filtros(
+        self,
+        filtros: dict,
+        skip: int = 0,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False
+    ) -> List[Usuario]:
+        """Busca usuários com filtros e ordenação"""
+        return await self.usuario_repo.buscar_com_filtros(filtros, skip, limit, ordenar_por, ordem_desc)
+
+
+class AsyncEmprestimoService(RegrasEmprestimo):
+    """Serviço assíncrono de empréstimos, com as regras de negócio de EmprestimoService"""
+    
+    def __init__(
+        self,
+        session: "AsyncSession",
+        emprestimo_repo: Optional[AsyncEmprestimoRepository] = None,
+        livro_repo: Optional[AsyncLivroRepository] = None,
+        usuario_repo: Optional[AsyncUsuarioRepository] = None,
+        max_emprestimos: int = 5,
+        dias_emprestimo: int = 14,
+        multa_diaria: float = 2.50,
+        idade_minima: int = 12
+    ) -> None:
+        """
+        Inicializa o serviço com injeção de dependências
+        
+        Args:
+            session: Sessão assíncrona do banco de dados
+            emprestimo_repo: Repositório de empréstimos (opcional)
+            livro_repo: Repositório de livros (opcional)
+            usuario_repo: Repositório de usuários (opcional)
+            max_emprestimos: Número máximo de empréstimos por usuário
+            dias_emprestimo: Número de dias para empréstimo
+            multa_diaria: Valor da multa por dia de atraso
+            idade_minima: Idade mínima para empréstimo
+        """
+        self.session = session
+        self.emprestimo_repo = emprestimo_repo or AsyncEmprestimoRepository(session)
+        self.livro_repo = livro_repo or AsyncLivroRepository(session)
+        self.usuario_repo = usuario_repo or AsyncUsuarioRepository(session)
+        self.max_emprestimos = max_emprestimos
+        self.dias_emprestimo = dias_emprestimo
+        self.multa_diaria = multa_diaria
+        self.idade_minima = idade_minima
+        self.logger = get_logger("AsyncEmprestimoService")
+    
+    @transacional_async
+    async def criar_emprestimo(self, livro_id: int, usuario_id: int) -> Emprestimo:
+        """Cria um empréstimo aplicando as regras de EmprestimoService.criar_emprestimo"""
+        self.logger.info(f"Criando empréstimo: livro_id={livro_id}, usuario_id={usuario_id}")
+        
+        livro = await self.livro_repo.buscar_por_id(livro_id)
+        usuario = await self.usuario_repo.buscar_por_id(usuario_id)
+        self._validar_livro_e_usuario(livro, usuario, livro_id, usuario_id)
+        
+        self._validar_limite(usuario_id, usuario.emprestimos_ativos)
+        
+        self._validar_usuario_apto(usuario, usuario_id)
+        
+        emprestimo = self._novo_emprestimo(livro_id, usuario_id)
+        
+        livro.emprestar()
+        self._registrar_circulacao(livro, usuario, emprestimo)
+        await self.livro_repo.atualizar(livro)
+        
+        emprestimo = await self.emprestimo_repo.criar(emprestimo)
+        await self._recarregar_contadores(livro, usuario)
+        self.logger.info(f"Empréstimo criado com sucesso: ID {emprestimo.id}")
+        return emprestimo
+    
+    @transacional_async
+    async def devolver_emprestimo(self, emprestimo_id: int) -> Emprestimo:
+        """Devolve um empréstimo aplicando as regras de EmprestimoService.devolver_emprestimo"""
+        self.logger.info(f"Devolvendo empréstimo ID {emprestimo_id}")
+        
+        emprestimo = await self.emprestimo_repo.buscar_por_id_com_livro(emprestimo_id)
+        self._validar_devolucao(emprestimo, emprestimo_id)
+        
+        emprestimo.devolver_emprestimo(self.multa_diaria)
+        usuario = await self.usuario_repo.buscar_por_id(emprestimo.usuario_id)
+        self._registrar_devolucao(emprestimo, usuario)
+        if emprestimo.livro:
+            await self.livro_repo.atualizar(emprestimo.livro)
+        
+        emprestimo = await self.emprestimo_repo.atualizar(emprestimo)
+        await self._recarregar_contadores(emprestimo.livro, usuario)
+        self.logger.info(f"Empréstimo {emprestimo_id} devolvido com sucesso. Multa: R$ {emprestimo.multa:.2f}")
+        return emprestimo
+    
+    async def _recarregar_contadores(self, *entidades) -> None:
+        """
+        Recarrega os contadores de circulação expirados pelo flush
+        
+        Os contadores são gravados como expressões SQL (ver
+        Livro.registrar_emprestimo) e o flush os expira; em async não há
+        carga preguiçosa, então são lidos de novo aqui, na mesma transação.
+        """
+        for entidade in entidades:
+            if entidade is None:
+                continue
+            expirados = inspect(entidade).expired_attributes
+            if expirados:
+                await self.session.refresh(entidade, list(expirados))
+    
+    async def calcular_multa_emprestimo(self, emprestimo_id: int) -> float:
+        """Calcula a multa de um empréstimo"""
+        emprestimo = await self.emprestimo_repo.buscar_por_id(emprestimo_id)
+        return self._multa_atual(emprestimo, emprestimo_id)
+    
+    async def buscar_por_id(self, emprestimo_id: int) -> Emprestimo:
+        """Busca empréstimo por ID"""
+        emprestimo = await self.emprestimo_repo.buscar_por_id(emprestimo_id)
+        if not emprestimo:
+            raise EmprestimoNaoEncontradoException(emprestimo_id)
+        return emprestimo
+    
+    async def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Emprestimo]:
+        """Lista todos os empréstimos"""
+        return await self.emprestimo_repo.listar_todos(skip, limit)
+    
+    async def buscar_por_usuario(self, usuario_id: int, incluir_arquivo: bool = False) -> List[Emprestimo]:
+        """Busca empréstimos de um usuário (com o histórico arquivado, se pedido)"""
+        return await self.emprestimo_repo.buscar_por_usuario(usuario_id, incluir_arquivo)
+    
+    async def buscar_atrasados(self) -> List[Emprestimo]:
+        """Busca empréstimos atrasados"""
+        return await self.emprestimo_repo.buscar_atrasados()
+    
+    async def buscar_ativos(self) -> List[Emprestimo]:
+        """Busca empréstimos ativos"""
+        return await self.emprestimo_repo.buscar_ativos()
+
+
+class AsyncAutorService(RegrasAutor):
+    """Serviço assíncrono para gerenciar autores"""
+    
+    def __init__(self, session: "AsyncSession", autor_repo: Optional[AsyncAutorRepository] = None) -> None:
+        """
+        Inicializa o serviço
+        
+        Args:
+            session: Sessão assíncrona do banco de dados
+            autor_repo: Repositório de autores (opcional)
+        """
+        self.session = session
+        self.autor_repo = autor_repo or AsyncAutorRepository(session)
+        self.logger = get_logger("AsyncAutorService")
+    
+    @transacional_async
+    async def criar_autor(self, autor: Autor) -> Autor:
+        """Cria um novo autor"""
+        self.logger.info(f"Criando autor: {autor.nome}")
+        autor = await self.autor_repo.criar(autor)
+        self.logger.info(f"Autor criado com sucesso: ID {autor.id}")
+        return autor
+    
+    async def buscar_por_id(self, autor_id: int) -> Autor:
+        """Busca autor por ID"""
+        return self._exigir_autor(await self.autor_repo.buscar_por_id(autor_id), autor_id)
+    
+    async def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Autor]:
+        """Lista todos os autores"""
+        return await self.autor_repo.listar_todos(skip, limit)
+    
+    @transacional_async
+    async def atualizar_autor(self, autor_id: int, dados_atualizacao: dict) -> Autor:
+        """Atualiza um autor"""
+        autor = await self.buscar_por_id(autor_id)
+        self._aplicar_dados(autor, dados_atualizacao)
+        return await self.autor_repo.atualizar(autor)
+    
+    @transacional_async
+    async def deletar_autor(self, autor_id: int) -> bool:
+        """Deleta um autor"""
+        await self.buscar_por_id(autor_id)
+        return await self.autor_repo.deletar(autor_id)
+    
+    async def buscar_por_nome(self, nome: str) -> List[Autor]:
+        """Busca autores por nome"""
+        return await self.autor_repo.buscar_por_nome(nome)
+
+
+class AsyncCategoriaService(RegrasCategoria):
+    """Serviço assíncrono para gerenciar categorias"""
+    
+    def __init__(self, session: "AsyncSession", categoria_repo: Optional[AsyncCategoriaRepository] = None) -> None:
+        """
+        Inicializa o serviço
+        
+        Args:
+            session: Sessão assíncrona do banco de dados
+            categoria_repo: Repositório de categorias (opcional)
+        """
+        self.session = session
+        self.categoria_repo = categoria_repo or AsyncCategoriaRepository(session)
+        self.logger = get_logger("AsyncCategoriaService")
+    
+    @transacional_async
+    async def criar_categoria(self, categoria: Categoria) -> Categoria:
+        """Cria uma nova categoria"""
+        self.logger.info(f"Criando categoria: {categoria.nome}")
+        categoria = await self.categoria_repo.criar(categoria)
+        self.logger.info(f"Categoria criada com sucesso: ID {categoria.id}")
+        return categoria
+    
+    async def buscar_por_id(self, categoria_id: int) -> Categoria:
+        """Busca categoria por ID"""
+        return self._exigir_categoria(await self.categoria_repo.buscar_por_id(categoria_id), categoria_id)
+    
+    async def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Categoria]:
+        """Lista todas as categorias"""
+        return await self.categoria_repo.listar_todos(skip, limit)
+    
+    @transacional_async
+    async def atualizar_categoria(self, categoria_id: int, dados_atualizacao: dict) -> Categoria:
+        """Atualiza uma categoria"""
+        categoria = await self.buscar_por_id(categoria_id)
+        self._aplicar_dados(categoria, dados_atualizacao)
+        return await self.categoria_repo.atualizar(categoria)
+    
+    @transacional_async
+    async def deletar_categoria(self, categoria_id: int) -> bool:
+        """Deleta uma categoria"""
+        await self.buscar_por_id(categoria_id)
+        return await self.categoria_repo.deletar(categoria_id)
+    
+    async def buscar_por_nome(self, nome: str) -> Categoria:
+        """Busca categoria por nome"""
+        categoria = await self.categoria_repo.buscar_por_nome(nome)
+        if not categoria:
+            raise EntidadeNaoEncontradaException("Categoria", nome)
+        return categoria
@@ -1,16 +1,47 @@
 """
 Serviço de Autor
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.orm import Session
 
 from src.models.autor import Autor
 from src.repositories.autor_repository import AutorRepository
+from src.repositories.paginacao import Pagina
 from src.exceptions.biblioteca_exceptions import EntidadeNaoEncontradaException
+from src.database.autocompletar import Sugestao, autocompletar_da_sessao
+from src.database.fts import Candidato
+from src.database.unit_of_work import transacional
 from src.utils.logger import get_logger
 
 
-class AutorService:
+class RegrasAutor:
+    """
+    Regras de autor, sem acesso a dados
+    
+    Compartilhadas entre AutorService e a variante assíncrona.
+    """
+    
+    @staticmethod
+    def _exigir_autor(autor: Optional[Autor], autor_id: int) -> Autor:
+        """
+        Devolve o autor buscado, se existir
+        
+        Raises:
+            EntidadeNaoEncontradaException: Se o autor não for encontrado
+        """
+        if not autor:
+            raise EntidadeNaoEncontradaException("Autor", str(autor_id))
+        return autor
+    
+    @staticmethod
+    def _aplicar_dados(autor: Autor, dados_atualizacao: dict) -> None:
+        """Copia para o autor os campos existentes em dados_atualizacao"""
+        for campo, valor in dados_atualizacao.items():
+            if hasattr(autor, campo):
+                setattr(autor, campo, valor)
+
+
+class AutorService(RegrasAutor):
     """Serviço para gerenciar autores"""
     
     def __init__(self, session: Session, autor_repo: Optional[AutorRepository] = None) -> None:
@@ -25,6 +56,7 @@ class AutorService:
         self.autor_repo = autor_repo or AutorRepository(session)
         self.logger = get_logger("AutorService")
     
+    @transacional
     def criar_autor(self, autor: Autor) -> Autor:
         """Cria um novo autor"""
         self.logger.info(f"Criando autor: {autor.nome}")
@@ -34,29 +66,59 @@ class AutorService:
     
     def buscar_por_id(self, autor_id: int) -> Autor:
         """Busca autor por ID"""
-        autor = self.autor_repo.buscar_por_id(autor_id)
-        if not autor:
-            raise EntidadeNaoEncontradaException("Autor", str(autor_id))
-        return autor
+        return self._exigir_autor(self.autor_repo.buscar_por_id(autor_id), autor_id)
     
     def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Autor]:
         """Lista todos os autores"""
         return self.autor_repo.listar_todos(skip, limit)
     
+    def listar_pagina(
+        self, cursor: Optional[str] = None, limit: int = 100, campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Autor]:
+        """Lista autores por página, com paginação por cursor"""
+        return self.autor_repo.listar_pagina(cursor, limit, campos=campos)
+    
+    @transacional
     def atualizar_autor(self, autor_id: int, dados_atualizacao: dict) -> Autor:
         """Atualiza um autor"""
         autor = self.buscar_por_id(autor_id)
-        for campo, valor in dados_atualizacao.items():
-            if hasattr(autor, campo):
-                setattr(autor, campo, valor)
+        self._aplicar_dados(autor, dados_atualizacao)
         return self.autor_repo.atualizar(autor)
     
+    @transacional
     def deletar_autor(self, autor_id: int) -> bool:
         """Deleta um autor"""
         self.buscar_por_id(autor_id)
         return self.autor_repo.deletar(autor_id)
     
     def buscar_por_nome(self, nome: str) -> List[Autor]:
-        """Busca autores por nome"""
+        """Busca autores pelo início do nome, ignorando acentos e maiúsculas"""
         return self.autor_repo.buscar_por_nome(nome)
-
+    
+    def buscar_texto(self, texto: str, limit: int = 20) -> List[Autor]:
+        """Busca autores por palavras do nome, por relevância (índice textual)"""
+        return self.autor_repo.buscar_texto(texto, limit)
+    
+    def sugerir_nomes(self, prefixo: str, limit: int = 10) -> List[Sugestao]:
+        """
+        Autores cujo nome começa com o prefixo, dos mais para os menos lidos
+        
+        Com o autocompletar configurado (bloco ``autocomplete``) a resposta
+        vem da memória; sem ele, de uma busca por prefixo no banco (em ordem
+        alfabética e sem popularidade).
+        
+        Args:
+            prefixo: Início do texto (acentos e maiúsculas são ignorados)
+            limit: Quantidade máxima de sugestões
+        
+        Returns:
+            Sugestões (id, texto, popularidade)
+        """
+        autocompletar = autocompletar_da_sessao(self.session)
+        if autocompletar is not None:
+            return autocompletar.sugerir_autores(self.session.get_bind(), prefixo, limit)
+        return [Sugestao(entidade.id, entidade.nome, 0) for entidade in self.autor_repo.buscar_por_nome(prefixo, limit)]
+    
+    def buscar_nome_aproximado(self, nome: str, limit: int = 10) -> List[Candidato]:
+        """Busca autores por nome tolerando erros de digitação, com a similaridade de cada candidato"""
+        return self.autor_repo.buscar_nome_aproximado(nome, limit)
@@ -1,16 +1,45 @@
 """
 Serviço de Categoria
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.orm import Session
 
 from src.models.categoria import Categoria
 from src.repositories.categoria_repository import CategoriaRepository
+from src.repositories.paginacao import Pagina
 from src.exceptions.biblioteca_exceptions import EntidadeNaoEncontradaException
+from src.database.unit_of_work import transacional
 from src.utils.logger import get_logger
 
 
-class CategoriaService:
+class RegrasCategoria:
+    """
+    Regras de categoria, sem acesso a dados
+    
+    Compartilhadas entre CategoriaService e a variante assíncrona.
+    """
+    
+    @staticmethod
+    def _exigir_categoria(categoria: Optional[Categoria], categoria_id: int) -> Categoria:
+        """
+        Devolve a categoria buscada, se existir
+        
+        Raises:
+            EntidadeNaoEncontradaException: Se a categoria não for encontrada
+        """
+        if not categoria:
+            raise EntidadeNaoEncontradaException("Categoria", str(categoria_id))
+        return categoria
+    
+    @staticmethod
+    def _aplicar_dados(categoria: Categoria, dados_atualizacao: dict) -> None:
+        """Copia para a categoria os campos existentes em dados_atualizacao"""
+        for campo, valor in dados_atualizacao.items():
+            if hasattr(categoria, campo):
+                setattr(categoria, campo, valor)
+
+
+class CategoriaService(RegrasCategoria):
     """Serviço para gerenciar categorias"""
     
     def __init__(self, session: Session, categoria_repo: Optional[CategoriaRepository] = None) -> None:
@@ -25,6 +54,7 @@ class CategoriaService:
         self.categoria_repo = categoria_repo or CategoriaRepository(session)
         self.logger = get_logger("CategoriaService")
     
+    @transacional
     def criar_categoria(self, categoria: Categoria) -> Categoria:
         """Cria uma nova categoria"""
         self.logger.info(f"Criando categoria: {categoria.nome}")
@@ -34,23 +64,26 @@ class CategoriaService:
     
     def buscar_por_id(self, categoria_id: int) -> Categoria:
         """Busca categoria por ID"""
-        categoria = self.categoria_repo.buscar_por_id(categoria_id)
-        if not categoria:
-            raise EntidadeNaoEncontradaException("Categoria", str(categoria_id))
-        return categoria
+        return self._exigir_categoria(self.categoria_repo.buscar_por_id(categoria_id), categoria_id)
     
     def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Categoria]:
         """Lista todas as categorias"""
         return self.categoria_repo.listar_todos(skip, limit)
     
+    def listar_pagina(
+        self, cursor: Optional[str] = None, limit: int = 100, campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Categoria]:
+        """Lista categorias por página, com paginação por cursor"""
+        return self.categoria_repo.listar_pagina(cursor, limit, campos=campos)
+    
+    @transacional
     def atualizar_categoria(self, categoria_id: int, dados_atualizacao: dict) -> Categoria:
         """Atualiza uma categoria"""
         categoria = self.buscar_por_id(categoria_id)
-        for campo, valor in dados_atualizacao.items():
-            if hasattr(categoria, campo):
-                setattr(categoria, campo, valor)
+        self._aplicar_dados(categoria, dados_atualizacao)
         return self.categoria_repo.atualizar(categoria)
     
+    @transacional
     def deletar_categoria(self, categoria_id: int) -> bool:
         """Deleta uma categoria"""
         self.buscar_por_id(categoria_id)
@@ -0,0 +1,94 @@
+"""
+Contexto de filial - sessão e serviços ligados ao banco de uma filial
+"""
+from functools import cached_property
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from src.database.config import EngineRegistry, registry as registry_padrao
+from src.services.livro_service import LivroService
+from src.services.usuario_service import UsuarioService
+from src.services.emprestimo_service import EmprestimoService
+from src.services.autor_service import AutorService
+from src.services.categoria_service import CategoriaService
+
+# Serviços criados sob demanda (descartados ao sair do bloco, junto com a sessão)
+SERVICOS = ("livro_service", "usuario_service", "emprestimo_service", "autor_service", "categoria_service")
+
+
+class ContextoFilial:
+    """
+    Sessão e serviços de uma filial, com a engine fixada durante o uso
+    
+    Enquanto o bloco estiver aberto a engine da filial não é despejada pelo
+    registro; na saída a sessão é fechada e a fixação desfeita. Os serviços
+    são criados sob demanda e compartilham a sessão do contexto.
+    
+    Exemplo:
+        with ContextoFilial("centro") as filial:
+            filial.emprestimo_service.criar_emprestimo(livro_id, usuario_id)
+    """
+    
+    def __init__(self, filial_id: str, registry: Optional[EngineRegistry] = None) -> None:
+        """
+        Inicializa o contexto (nada é aberto antes de entrar no bloco)
+        
+        Args:
+            filial_id: Identificador da filial
+            registry: Registro de engines (padrão: registro global)
+        """
+        self.filial_id = str(filial_id)
+        self.registry = registry or registry_padrao
+        self._session: Optional[Session] = None
+    
+    def __enter__(self) -> "ContextoFilial":
+        database = self.registry.fixar(self.filial_id)
+        try:
+            self._session = database.get_session()
+        except Exception:
+            self.registry.liberar(self.filial_id)
+            raise
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        try:
+            if self._session is not None:
+                self._session.close()
+        finally:
+            self._session = None
+            for nome in SERVICOS:
+                self.__dict__.pop(nome, None)
+            self.registry.liberar(self.filial_id)
+        return False
+    
+    @property
+    def session(self) -> Session:
+        """
+        Sessão da filial
+        
+        Raises:
+            RuntimeError: Se usada fora do bloco with
+        """
+        if self._session is None:
+            raise RuntimeError("ContextoFilial deve ser usado em um bloco with")
+        return self._session
+    
+    @cached_property
+    def livro_service(self) -> LivroService:
+        return LivroService(self.session)
+    
+    @cached_property
+    def usuario_service(self) -> UsuarioService:
+        return UsuarioService(self.session)
+    
+    @cached_property
+    def emprestimo_service(self) -> EmprestimoService:
+        return EmprestimoService(self.session)
+    
+    @cached_property
+    def autor_service(self) -> AutorService:
+        return AutorService(self.session)
+    
+    @cached_property
+    def categoria_service(self) -> CategoriaService:
+        return CategoriaService(self.session)
@@ -1,7 +1,7 @@
 """
 Serviço de Emprestimo - Contém as regras de negócio complexas
 """
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 
@@ -9,6 +9,8 @@ from src.models.emprestimo import Emprestimo
 from src.repositories.emprestimo_repository import EmprestimoRepository, IEmprestimoRepository
 from src.repositories.livro_repository import LivroRepository
 from src.repositories.usuario_repository import UsuarioRepository
+from src.repositories.carregamento import PlanoCarregamento
+from src.repositories.paginacao import Pagina
 from src.exceptions.biblioteca_exceptions import (
     EntidadeNaoEncontradaException,
     LivroIndisponivelException,
@@ -17,10 +19,139 @@ from src.exceptions.biblioteca_exceptions import (
     EmprestimoNaoEncontradoException,
     EmprestimoJaDevolvidoException
 )
+from src.database.unit_of_work import transacional
 from src.utils.logger import get_logger
 
 
-class EmprestimoService:
+class RegrasEmprestimo:
+    """
+    Regras de negócio de empréstimo, sem acesso a dados
+    
+    Compartilhadas entre EmprestimoService e a variante assíncrona, que só
+    diferem na forma de carregar e gravar as entidades.
+    """
+    
+    max_emprestimos: int
+    dias_emprestimo: int
+    multa_diaria: float
+    idade_minima: int
+    logger: Any
+    
+    def _validar_livro_e_usuario(self, livro, usuario, livro_id: int, usuario_id: int) -> None:
+        """
+        Valida existência do livro e do usuário e a disponibilidade do livro
+        
+        Raises:
+            EntidadeNaoEncontradaException: Se livro ou usuário não existirem
+            LivroIndisponivelException: Se livro não estiver disponível
+        """
+        if not livro:
+            raise EntidadeNaoEncontradaException("Livro", str(livro_id))
+        
+        if not usuario:
+            raise EntidadeNaoEncontradaException("Usuario", str(usuario_id))
+        
+        # REGRA 1: Verifica se livro está disponível
+        if not livro.esta_disponivel():
+            self.logger.warning(f"Livro {livro_id} não está disponível")
+            raise LivroIndisponivelException(livro_id)
+    
+    def _validar_limite(self, usuario_id: int, quantidade_ativos: int) -> None:
+        """
+        REGRA 2: Verifica limite de empréstimos do usuário
+        
+        Raises:
+            LimiteEmprestimosException: Se usuário exceder limite
+        """
+        if quantidade_ativos >= self.max_emprestimos:
+            self.logger.warning(f"Usuário {usuario_id} excedeu limite de empréstimos")
+            raise LimiteEmprestimosException(usuario_id, self.max_emprestimos)
+    
+    def _validar_usuario_apto(self, usuario, usuario_id: int) -> None:
+        """
+        REGRA 3: Verifica idade mínima e se o usuário está ativo
+        
+        Raises:
+            IdadeMinimaException: Se usuário não atender idade mínima
+            EntidadeNaoEncontradaException: Se usuário estiver inativo
+        """
+        idade_usuario = usuario.idade()
+        if idade_usuario < self.idade_minima:
+            self.logger.warning(f"Usuário {usuario_id} não atende idade mínima: {idade_usuario} < {self.idade_minima}")
+            raise IdadeMinimaException(idade_usuario, self.idade_minima)
+        
+        # Verifica se usuário está ativo
+        if not usuario.ativo:
+            raise EntidadeNaoEncontradaException("Usuario", f"{usuario_id} (inativo)")
+    
+    def _novo_emprestimo(self, livro_id: int, usuario_id: int) -> Emprestimo:
+        """Monta o empréstimo com a data prevista de devolução"""
+        hoje = date.today()
+        data_prevista = hoje + timedelta(days=self.dias_emprestimo)
+        
+        return Emprestimo(
+            livro_id=livro_id,
+            usuario_id=usuario_id,
+            data_emprestimo=hoje,
+            data_prevista_devolucao=data_prevista,
+            devolvido=False,
+            multa=0.0
+        )
+    
+    def _registrar_circulacao(self, livro, usuario, emprestimo: Emprestimo) -> None:
+        """Atualiza os contadores de circulação do livro e do usuário com o novo empréstimo"""
+        livro.registrar_emprestimo(emprestimo.data_emprestimo)
+        usuario.registrar_emprestimo()
+    
+    def _registrar_devolucao(self, emprestimo: Emprestimo, usuario) -> None:
+        """Atualiza os contadores de circulação do livro e do usuário com a devolução"""
+        if emprestimo.livro:
+            emprestimo.livro.registrar_devolucao()
+        if usuario:
+            usuario.registrar_devolucao(emprestimo.multa)
+    
+    def _validar_devolucao(self, emprestimo: Optional[Emprestimo], emprestimo_id: int) -> None:
+        """
+        Valida se o empréstimo pode ser devolvido e registra eventual atraso
+        
+        Raises:
+            EmprestimoNaoEncontradoException: Se empréstimo não for encontrado
+            EmprestimoJaDevolvidoException: Se empréstimo já foi devolvido
+        """
+        if not emprestimo:
+            raise EmprestimoNaoEncontradoException(emprestimo_id)
+        
+        if emprestimo.devolvido:
+            raise EmprestimoJaDevolvidoException(emprestimo_id)
+        
+        # Calcula multa se houver atraso
+        if emprestimo.esta_atrasado():
+            dias_atraso = emprestimo.dias_atraso()
+            multa = emprestimo.calcular_multa(self.multa_diaria)
+            self.logger.warning(
+                f"Empréstimo {emprestimo_id} atrasado por {dias_atraso} dias. "
+                f"Multa calculada: R$ {multa:.2f}"
+            )
+    
+    def _multa_atual(self, emprestimo: Optional[Emprestimo], emprestimo_id: int) -> float:
+        """
+        Multa de um empréstimo: a registrada se já devolvido, senão a calculada hoje
+        
+        Raises:
+            EmprestimoNaoEncontradoException: Se empréstimo não for encontrado
+        """
+        if not emprestimo:
+            raise EmprestimoNaoEncontradoException(emprestimo_id)
+        
+        if emprestimo.devolvido:
+            # Se já foi devolvido, retorna a multa já calculada
+            return float(emprestimo.multa)
+        
+        # Calcula multa atual
+        return emprestimo.calcular_multa(self.multa_diaria)
+
+
+class EmprestimoService(RegrasEmprestimo):
     """Serviço para gerenciar empréstimos com regras de negócio complexas"""
     
     def __init__(
@@ -57,6 +188,7 @@ class EmprestimoService:
         self.idade_minima = idade_minima
         self.logger = get_logger("EmprestimoService")
     
+    @transacional
     def criar_emprestimo(self, livro_id: int, usuario_id: int) -> Emprestimo:
         """
         REGRA DE NEGÓCIO COMPLEXA 1: Validação completa de empréstimo
@@ -68,6 +200,10 @@ class EmprestimoService:
         - Usuário atende idade mínima
         - Cálculo de data de devolução
         
+        O limite é verificado pelo contador de empréstimos ativos do usuário,
+        e os contadores de circulação do livro e do usuário são atualizados
+        na mesma transação.
+        
         Args:
             livro_id: ID do livro
             usuario_id: ID do usuário
@@ -83,58 +219,26 @@ class EmprestimoService:
         """
         self.logger.info(f"Criando empréstimo: livro_id={livro_id}, usuario_id={usuario_id}")
         
-        # Valida livro
         livro = self.livro_repo.buscar_por_id(livro_id)
-        if not livro:
-            raise EntidadeNaoEncontradaException("Livro", str(livro_id))
-        
-        # Valida usuário
         usuario = self.usuario_repo.buscar_por_id(usuario_id)
-        if not usuario:
-            raise EntidadeNaoEncontradaException("Usuario", str(usuario_id))
-        
-        # REGRA 1: Verifica se livro está disponível
-        if not livro.esta_disponivel():
-            self.logger.warning(f"Livro {livro_id} não está disponível")
-            raise LivroIndisponivelException(livro_id)
+        self._validar_livro_e_usuario(livro, usuario, livro_id, usuario_id)
         
-        # REGRA 2: Verifica limite de empréstimos do usuário
-        emprestimos_ativos = self.emprestimo_repo.buscar_por_usuario_ativos(usuario_id)
-        if len(emprestimos_ativos) >= self.max_emprestimos:
-            self.logger.warning(f"Usuário {usuario_id} excedeu limite de empréstimos")
-            raise LimiteEmprestimosException(usuario_id, self.max_emprestimos)
-        
-        # REGRA 3: Verifica idade mínima do usuário
-        idade_usuario = usuario.idade()
-        if idade_usuario < self.idade_minima:
-            self.logger.warning(f"Usuário {usuario_id} não atende idade mínima: {idade_usuario} < {self.idade_minima}")
-            raise IdadeMinimaException(idade_usuario, self.idade_minima)
-        
-        # Verifica se usuário está ativo
-        if not usuario.ativo:
-            raise EntidadeNaoEncontradaException("Usuario", f"{usuario_id} (inativo)")
+        self._validar_limite(usuario_id, usuario.emprestimos_ativos)
         
-        # Cria empréstimo
-        hoje = date.today()
-        data_prevista = hoje + timedelta(days=self.dias_emprestimo)
+        self._validar_usuario_apto(usuario, usuario_id)
         
-        emprestimo = Emprestimo(
-            livro_id=livro_id,
-            usuario_id=usuario_id,
-            data_emprestimo=hoje,
-            data_prevista_devolucao=data_prevista,
-            devolvido=False,
-            multa=0.0
-        )
+        emprestimo = self._novo_emprestimo(livro_id, usuario_id)
         
-        # Empresta o livro (atualiza quantidade disponível)
+        # Empresta o livro (atualiza quantidade disponível) e conta a circulação
         livro.emprestar()
+        self._registrar_circulacao(livro, usuario, emprestimo)
         self.livro_repo.atualizar(livro)
         
         emprestimo = self.emprestimo_repo.criar(emprestimo)
         self.logger.info(f"Empréstimo criado com sucesso: ID {emprestimo.id}")
         return emprestimo
     
+    @transacional
     def devolver_emprestimo(self, emprestimo_id: int) -> Emprestimo:
         """
         REGRA DE NEGÓCIO COMPLEXA 2: Cálculo de multa por atraso
@@ -144,6 +248,7 @@ class EmprestimoService:
         - Data atual
         - Valor da multa diária
         - Atualização de disponibilidade do livro
+        - Atualização dos contadores de circulação do livro e do usuário
         
         Args:
             emprestimo_id: ID do empréstimo
@@ -157,24 +262,12 @@ class EmprestimoService:
         """
         self.logger.info(f"Devolvendo empréstimo ID {emprestimo_id}")
         
-        emprestimo = self.emprestimo_repo.buscar_por_id(emprestimo_id)
-        if not emprestimo:
-            raise EmprestimoNaoEncontradoException(emprestimo_id)
-        
-        if emprestimo.devolvido:
-            raise EmprestimoJaDevolvidoException(emprestimo_id)
-        
-        # Calcula multa se houver atraso
-        if emprestimo.esta_atrasado():
-            dias_atraso = emprestimo.dias_atraso()
-            multa = emprestimo.calcular_multa(self.multa_diaria)
-            self.logger.warning(
-                f"Empréstimo {emprestimo_id} atrasado por {dias_atraso} dias. "
-                f"Multa calculada: R$ {multa:.2f}"
-            )
+        emprestimo = self.emprestimo_repo.buscar_por_id(emprestimo_id, carregar="emprestimo_com_livro_e_usuario")
+        self._validar_devolucao(emprestimo, emprestimo_id)
         
         # Devolve o empréstimo (marca como devolvido e calcula multa)
         emprestimo.devolver_emprestimo(self.multa_diaria)
+        self._registrar_devolucao(emprestimo, emprestimo.usuario)
         
         # Atualiza livro
         if emprestimo.livro:
@@ -184,6 +277,24 @@ class EmprestimoService:
         self.logger.info(f"Empréstimo {emprestimo_id} devolvido com sucesso. Multa: R$ {emprestimo.multa:.2f}")
         return emprestimo
     
+    @transacional
+    def reconciliar_contadores(self) -> Dict[str, int]:
+        """
+        Recalcula em lote os contadores de circulação de livros e usuários
+        
+        Corrige contadores desatualizados por empréstimos gravados fora deste
+        serviço (ex.: importações em lote) ou anteriores aos contadores.
+        
+        Returns:
+            Quantidade de livros e de usuários atualizados
+        """
+        totais = {
+            "livros": self.livro_repo.reconciliar_contadores(),
+            "usuarios": self.usuario_repo.reconciliar_contadores(),
+        }
+        self.logger.info(f"Contadores de circulação reconciliados: {totais}")
+        return totais
+    
     def calcular_multa_emprestimo(self, emprestimo_id: int) -> float:
         """
         REGRA DE NEGÓCIO COMPLEXA 3: Processamento de multa
@@ -204,15 +315,7 @@ class EmprestimoService:
             EmprestimoNaoEncontradoException: Se empréstimo não for encontrado
         """
         emprestimo = self.emprestimo_repo.buscar_por_id(emprestimo_id)
-        if not emprestimo:
-            raise EmprestimoNaoEncontradoException(emprestimo_id)
-        
-        if emprestimo.devolvido:
-            # Se já foi devolvido, retorna a multa já calculada
-            return float(emprestimo.multa)
-        
-        # Calcula multa atual
-        return emprestimo.calcular_multa(self.multa_diaria)
+        return self._multa_atual(emprestimo, emprestimo_id)
     
     def buscar_por_id(self, emprestimo_id: int) -> Emprestimo:
         """
@@ -232,46 +335,117 @@ class EmprestimoService:
             raise EmprestimoNaoEncontradoException(emprestimo_id)
         return emprestimo
     
-    def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Emprestimo]:
+    def listar_todos(
+        self, skip: int = 0, limit: int = 100, carregar: Optional[PlanoCarregamento] = None
+    ) -> List[Emprestimo]:
         """
         Lista todos os empréstimos
         
         Args:
             skip: Número de registros a pular
             limit: Número máximo de registros
+            carregar: Plano de carregamento (ex.: "emprestimo_com_livro_e_usuario")
         
         Returns:
             Lista de empréstimos
         """
-        return self.emprestimo_repo.listar_todos(skip, limit)
+        return self.emprestimo_repo.listar_todos(skip, limit, carregar=carregar)
     
-    def buscar_por_usuario(self, usuario_id: int) -> List[Emprestimo]:
+    def listar_pagina(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Emprestimo]:
+        """
+        Lista empréstimos por página, com paginação por cursor
+        
+        Args:
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves só com essas colunas
+        
+        Returns:
+            Página de empréstimos com o cursor da próxima
+        """
+        return self.emprestimo_repo.listar_pagina(cursor, limit, ordenar_por, ordem_desc, campos)
+    
+    def buscar_por_usuario(
+        self, usuario_id: int, incluir_arquivo: bool = False, carregar: Optional[PlanoCarregamento] = None
+    ) -> List[Emprestimo]:
         """
         Busca empréstimos de um usuário
         
         Args:
             usuario_id: ID do usuário
+            incluir_arquivo: Se True, inclui os empréstimos já arquivados
+            carregar: Plano de carregamento (ex.: "emprestimo_com_livro")
         
         Returns:
             Lista de empréstimos
         """
-        return self.emprestimo_repo.buscar_por_usuario(usuario_id)
+        return self.emprestimo_repo.buscar_por_usuario(usuario_id, incluir_arquivo, carregar)
+    
+    def iterar_historico(self, incluir_arquivo: bool = True, chunk_size: int = 500) -> Iterator[Emprestimo]:
+        """
+        Percorre todo o histórico de empréstimos em fluxo, com memória constante
+        
+        Args:
+            incluir_arquivo: Se True, inclui os empréstimos já arquivados
+            chunk_size: Quantidade de linhas lidas do banco por vez
+        
+        Returns:
+            Iterador de empréstimos (arquivados primeiro), somente leitura
+        """
+        return self.emprestimo_repo.iterar_historico(incluir_arquivo, chunk_size)
+    
+    def iterar_historico_dicts(self, incluir_arquivo: bool = True, chunk_size: int = 500) -> Iterator[dict]:
+        """
+        Percorre o histórico como dicionários de colunas, para exportação
+        
+        Exemplo:
+            FileHandler().exportar_emprestimos_json(service.iterar_historico_dicts(), "historico.json")
+        """
+        for emprestimo in self.iterar_historico(incluir_arquivo, chunk_size):
+            yield {
+                coluna.key: getattr(emprestimo, coluna.key)
+                for coluna in Emprestimo.__table__.columns
+            }
     
-    def buscar_atrasados(self) -> List[Emprestimo]:
+    def buscar_atrasados(self, carregar: Optional[PlanoCarregamento] = None) -> List[Emprestimo]:
         """
         Busca empréstimos atrasados
         
+        Args:
+            carregar: Plano de carregamento (ex.: "emprestimo_com_livro_e_usuario")
+        
         Returns:
             Lista de empréstimos atrasados
         """
-        return self.emprestimo_repo.buscar_atrasados()
+        return self.emprestimo_repo.buscar_atrasados(carregar)
     
-    def buscar_ativos(self) -> List[Emprestimo]:
+    def contar_atrasados(self) -> int:
+        """
+        Conta empréstimos atrasados, sem carregá-los
+        
+        Returns:
+            Quantidade de empréstimos atrasados
+        """
+        return self.emprestimo_repo.contar_atrasados()
+    
+    def buscar_ativos(self, carregar: Optional[PlanoCarregamento] = None) -> List[Emprestimo]:
         """
         Busca empréstimos ativos
         
+        Args:
+            carregar: Plano de carregamento (ex.: "emprestimo_com_livro_e_usuario")
+        
         Returns:
             Lista de empréstimos ativos
         """
-        return self.emprestimo_repo.buscar_ativos()
+        return self.emprestimo_repo.buscar_ativos(carregar)
 
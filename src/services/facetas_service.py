@@ -0,0 +1,65 @@
+"""
+Serviço de Facetas do catálogo
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy.orm import Session
+
+from src.database.facet_cache import CacheFacetas, alterou_livros, cache_facetas_da_sessao
+from src.repositories.livro_repository import FACETAS, LivroRepository, ValorFaceta
+from src.utils.logger import get_logger
+
+
+class FacetasService:
+    """Serviço para contar os livros por faceta (categoria, autor, disponibilidade, década)"""
+    
+    def __init__(
+        self,
+        session: Session,
+        livro_repo: Optional[LivroRepository] = None,
+        cache: Optional[CacheFacetas] = None
+    ) -> None:
+        """
+        Inicializa o serviço
+        
+        Args:
+            session: Sessão do banco de dados
+            livro_repo: Repositório de livros (opcional)
+            cache: Cache das contagens (padrão: o da sessão, bloco ``facet_cache``)
+        """
+        self.session = session
+        self.livro_repo = livro_repo or LivroRepository(session)
+        self.cache = cache if cache is not None else cache_facetas_da_sessao(session)
+        self.logger = get_logger("FacetasService")
+    
+    def contar(
+        self, facetas: Sequence[str] = tuple(FACETAS), filtros: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[ValorFaceta]]:
+        """
+        Conta os livros por faceta para um conjunto de filtros
+        
+        O resultado é guardado no cache pela assinatura (facetas + filtros),
+        então a mesma navegação repetida não volta ao banco até um livro,
+        autor ou categoria ser alterado.
+        
+        Args:
+            facetas: Facetas a contar (ver LivroRepository.contar_facetas)
+            filtros: Filtros dos livros contados
+        
+        Returns:
+            Valores de cada faceta com rótulo e quantidade
+        
+        Raises:
+            ValueError: Se alguma faceta não existir
+        """
+        assinatura = (tuple(facetas), json.dumps(filtros or {}, sort_keys=True, default=str))
+        if self.cache is not None:
+            resultado = self.cache.obter(assinatura)
+            if resultado is not None:
+                return resultado
+        
+        resultado = self.livro_repo.contar_facetas(facetas, filtros)
+        # Contagens que incluem alterações ainda não confirmadas não vão para o cache
+        if self.cache is not None and not alterou_livros(self.session):
+            self.cache.guardar(assinatura, resultado)
+        return resultado
@@ -1,19 +1,91 @@
 """
 Serviço de Livro
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.orm import Session
 
 from src.models.livro import Livro
 from src.repositories.livro_repository import LivroRepository, ILivroRepository
+from src.repositories.paginacao import Pagina
 from src.repositories.autor_repository import AutorRepository
 from src.repositories.categoria_repository import CategoriaRepository
 from src.exceptions.biblioteca_exceptions import EntidadeNaoEncontradaException, ValidacaoException
 from src.validators.validators import Validator
+from src.database.autocompletar import Sugestao, autocompletar_da_sessao
+from src.database.fts import Candidato
+from src.database.unit_of_work import transacional
 from src.utils.logger import get_logger
 
 
-class LivroService:
+class RegrasLivro:
+    """
+    Regras de validação de livro, sem acesso a dados
+    
+    Compartilhadas entre LivroService e a variante assíncrona.
+    """
+    
+    def _validar_quantidades(self, livro: Livro) -> None:
+        """
+        Valida as quantidades de um novo livro
+        
+        Raises:
+            ValidacaoException: Se as quantidades forem inválidas
+        """
+        # Valida quantidade
+        if livro.quantidade_total < 1:
+            raise ValidacaoException("Quantidade total deve ser maior que zero", "quantidade_total")
+        
+        # Define quantidade_disponivel se não foi especificado
+        if livro.quantidade_disponivel is None:
+            livro.quantidade_disponivel = livro.quantidade_total
+        
+        if livro.quantidade_disponivel > livro.quantidade_total:
+            raise ValidacaoException(
+                "Quantidade disponível não pode ser maior que quantidade total",
+                "quantidade_disponivel"
+            )
+    
+    def _preparar_atualizacao(self, livro: Livro, dados_atualizacao: dict) -> None:
+        """
+        Valida e ajusta as quantidades de uma atualização (altera dados_atualizacao)
+        
+        Raises:
+            ValidacaoException: Se as quantidades forem inválidas
+        """
+        # Valida quantidade se fornecida
+        if "quantidade_total" in dados_atualizacao:
+            if dados_atualizacao["quantidade_total"] < 1:
+                raise ValidacaoException("Quantidade total deve ser maior que zero", "quantidade_total")
+        
+        # Define quantidade_disponivel se quantidade_total foi atualizada
+        if "quantidade_total" in dados_atualizacao and "quantidade_disponivel" not in dados_atualizacao:
+            nova_quantidade_total = dados_atualizacao["quantidade_total"]
+            if livro.quantidade_disponivel > nova_quantidade_total:
+                dados_atualizacao["quantidade_disponivel"] = nova_quantidade_total
+        
+        # Valida quantidade_disponivel se fornecida
+        if "quantidade_disponivel" in dados_atualizacao and "quantidade_total" in dados_atualizacao:
+            if dados_atualizacao["quantidade_disponivel"] > dados_atualizacao["quantidade_total"]:
+                raise ValidacaoException(
+                    "Quantidade disponível não pode ser maior que quantidade total",
+                    "quantidade_disponivel"
+                )
+        elif "quantidade_disponivel" in dados_atualizacao:
+            if dados_atualizacao["quantidade_disponivel"] > livro.quantidade_total:
+                raise ValidacaoException(
+                    "Quantidade disponível não pode ser maior que quantidade total",
+                    "quantidade_disponivel"
+                )
+    
+    @staticmethod
+    def _aplicar_dados(livro: Livro, dados_atualizacao: dict) -> None:
+        """Copia para o livro os campos existentes em dados_atualizacao"""
+        for campo, valor in dados_atualizacao.items():
+            if hasattr(livro, campo):
+                setattr(livro, campo, valor)
+
+
+class LivroService(RegrasLivro):
     """Serviço para gerenciar livros"""
     
     def __init__(
@@ -38,6 +110,7 @@ class LivroService:
         self.categoria_repo = categoria_repo or CategoriaRepository(session)
         self.logger = get_logger("LivroService")
     
+    @transacional
     def criar_livro(self, livro: Livro) -> Livro:
         """
         Cria um novo livro com validações
@@ -66,24 +139,73 @@ class LivroService:
             if not categoria:
                 raise EntidadeNaoEncontradaException("Categoria", str(livro.categoria_id))
         
-        # Valida quantidade
-        if livro.quantidade_total < 1:
-            raise ValidacaoException("Quantidade total deve ser maior que zero", "quantidade_total")
-        
-        # Define quantidade_disponivel se não foi especificado
-        if livro.quantidade_disponivel is None:
-            livro.quantidade_disponivel = livro.quantidade_total
-        
-        if livro.quantidade_disponivel > livro.quantidade_total:
-            raise ValidacaoException(
-                "Quantidade disponível não pode ser maior que quantidade total",
-                "quantidade_disponivel"
-            )
+        self._validar_quantidades(livro)
         
         livro = self.livro_repo.criar(livro)
         self.logger.info(f"Livro criado com sucesso: ID {livro.id}")
         return livro
     
+    def criar_livros_em_lote(self, livros: List[Livro], tamanho_lote: int = 500) -> List[int]:
+        """
+        Cria vários livros, validando autores e categorias por conjunto
+        
+        Todos os blocos são validados antes da primeira gravação, com uma
+        consulta de autores e uma de categorias por bloco. Cada bloco é então
+        gravado com um INSERT em lote e um commit; dentro de uma UnitOfWork
+        externa, tudo fica em uma única transação.
+        
+        Args:
+            livros: Livros a criar
+            tamanho_lote: Quantidade de livros por bloco
+        
+        Returns:
+            IDs dos livros criados, na ordem recebida
+        
+        Raises:
+            ValidacaoException: Se validações falharem
+            EntidadeNaoEncontradaException: Se algum autor ou categoria não existir
+            ValueError: Se tamanho_lote não for positivo
+        """
+        if tamanho_lote <= 0:
+            raise ValueError("tamanho_lote deve ser positivo")
+        
+        self.logger.info(f"Criando {len(livros)} livros em lote")
+        blocos = [livros[inicio:inicio + tamanho_lote] for inicio in range(0, len(livros), tamanho_lote)]
+        
+        for bloco in blocos:
+            self._validar_referencias(bloco)
+            for livro in bloco:
+                self._validar_quantidades(livro)
+        
+        ids: List[int] = []
+        for bloco in blocos:
+            ids.extend(self._gravar_bloco(bloco))
+        self.logger.info(f"{len(ids)} livros criados em {len(blocos)} blocos")
+        return ids
+    
+    def _validar_referencias(self, livros: List[Livro]) -> None:
+        """
+        Verifica autores e categorias de um bloco com uma consulta para cada
+        
+        Raises:
+            EntidadeNaoEncontradaException: No primeiro livro com referência inexistente
+        """
+        autores = self.autor_repo.ids_existentes(livro.autor_id for livro in livros)
+        categorias = self.categoria_repo.ids_existentes(
+            livro.categoria_id for livro in livros if livro.categoria_id
+        )
+        
+        for livro in livros:
+            if livro.autor_id not in autores:
+                raise EntidadeNaoEncontradaException("Autor", str(livro.autor_id))
+            if livro.categoria_id and livro.categoria_id not in categorias:
+                raise EntidadeNaoEncontradaException("Categoria", str(livro.categoria_id))
+    
+    @transacional
+    def _gravar_bloco(self, livros: List[Livro]) -> List[int]:
+        """Grava um bloco já validado em uma transação"""
+        return self.livro_repo.criar_em_lote(livros, len(livros))
+    
     def buscar_por_id(self, livro_id: int) -> Livro:
         """
         Busca livro por ID
@@ -102,19 +224,44 @@ class LivroService:
             raise EntidadeNaoEncontradaException("Livro", str(livro_id))
         return livro
     
-    def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Livro]:
+    def listar_todos(self, skip: int = 0, limit: int = 100, campos: Optional[Sequence[str]] = None) -> List[Livro]:
         """
         Lista todos os livros
         
         Args:
             skip: Número de registros a pular
             limit: Número máximo de registros
+            campos: Se informado, devolve linhas leves só com essas colunas
         
         Returns:
             Lista de livros
         """
-        return self.livro_repo.listar_todos(skip, limit)
+        return self.livro_repo.listar_todos(skip, limit, campos)
     
+    def listar_pagina(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Livro]:
+        """
+        Lista livros por página, com paginação por cursor
+        
+        Args:
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves só com essas colunas
+        
+        Returns:
+            Página de livros com o cursor da próxima
+        """
+        return self.livro_repo.listar_pagina(cursor, limit, ordenar_por, ordem_desc, campos)
+    
+    @transacional
     def atualizar_livro(self, livro_id: int, dados_atualizacao: dict) -> Livro:
         """
         Atualiza um livro
@@ -134,30 +281,7 @@ class LivroService:
         
         livro = self.buscar_por_id(livro_id)
         
-        # Valida quantidade se fornecida
-        if "quantidade_total" in dados_atualizacao:
-            if dados_atualizacao["quantidade_total"] < 1:
-                raise ValidacaoException("Quantidade total deve ser maior que zero", "quantidade_total")
-        
-        # Define quantidade_disponivel se quantidade_total foi atualizada
-        if "quantidade_total" in dados_atualizacao and "quantidade_disponivel" not in dados_atualizacao:
-            nova_quantidade_total = dados_atualizacao["quantidade_total"]
-            if livro.quantidade_disponivel > nova_quantidade_total:
-                dados_atualizacao["quantidade_disponivel"] = nova_quantidade_total
-        
-        # Valida quantidade_disponivel se fornecida
-        if "quantidade_disponivel" in dados_atualizacao and "quantidade_total" in dados_atualizacao:
-            if dados_atualizacao["quantidade_disponivel"] > dados_atualizacao["quantidade_total"]:
-                raise ValidacaoException(
-                    "Quantidade disponível não pode ser maior que quantidade total",
-                    "quantidade_disponivel"
-                )
-        elif "quantidade_disponivel" in dados_atualizacao:
-            if dados_atualizacao["quantidade_disponivel"] > livro.quantidade_total:
-                raise ValidacaoException(
-                    "Quantidade disponível não pode ser maior que quantidade total",
-                    "quantidade_disponivel"
-                )
+        self._preparar_atualizacao(livro, dados_atualizacao)
         
         # Valida autor se fornecido
         if "autor_id" in dados_atualizacao:
@@ -171,15 +295,13 @@ class LivroService:
             if not categoria:
                 raise EntidadeNaoEncontradaException("Categoria", str(dados_atualizacao["categoria_id"]))
         
-        # Atualiza campos
-        for campo, valor in dados_atualizacao.items():
-            if hasattr(livro, campo):
-                setattr(livro, campo, valor)
+        self._aplicar_dados(livro, dados_atualizacao)
         
         livro = self.livro_repo.atualizar(livro)
         self.logger.info(f"Livro ID {livro_id} atualizado com sucesso")
         return livro
     
+    @transacional
     def deletar_livro(self, livro_id: int) -> bool:
         """
         Deleta um livro
@@ -203,7 +325,8 @@ class LivroService:
         skip: int = 0,
         limit: int = 100,
         ordenar_por: Optional[str] = None,
-        ordem_desc: bool = False
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None
     ) -> List[Livro]:
         """
         Busca livros com filtros e ordenação
@@ -214,11 +337,37 @@ class LivroService:
             limit: Número máximo de registros
             ordenar_por: Campo para ordenação
             ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves só com essas colunas
         
         Returns:
             Lista de livros filtrados
         """
-        return self.livro_repo.buscar_com_filtros(filtros, skip, limit, ordenar_por, ordem_desc)
+        return self.livro_repo.buscar_com_filtros(filtros, skip, limit, ordenar_por, ordem_desc, campos)
+    
+    def buscar_pagina_com_filtros(
+        self,
+        filtros: dict,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Livro]:
+        """
+        Busca livros com filtros, com paginação por cursor
+        
+        Args:
+            filtros: Dicionário com filtros
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves só com essas colunas
+        
+        Returns:
+            Página de livros filtrados com o cursor da próxima
+        """
+        return self.livro_repo.buscar_pagina(filtros, cursor, limit, ordenar_por, ordem_desc, campos)
     
     def buscar_disponiveis(self) -> List[Livro]:
         """
@@ -228,4 +377,62 @@ class LivroService:
             Lista de livros disponíveis
         """
         return self.livro_repo.buscar_disponiveis()
-
+    
+    def contar_disponiveis(self) -> int:
+        """
+        Conta livros disponíveis, sem carregá-los
+        
+        Returns:
+            Quantidade de livros disponíveis
+        """
+        return self.livro_repo.contar_disponiveis()
+    
+    def listar_mais_emprestados(self, limit: int = 10) -> List[Livro]:
+        """
+        Lista os livros mais emprestados, pelos contadores de circulação
+        
+        Args:
+            limit: Número máximo de livros
+        
+        Returns:
+            Livros do mais para o menos emprestado
+        """
+        return self.livro_repo.buscar_mais_emprestados(limit)
+    
+    def buscar_texto(self, texto: str, filtros: Optional[dict] = None, limit: int = 20) -> List[Livro]:
+        """
+        Busca livros por texto no título e na sinopse, por relevância
+        
+        Args:
+            texto: Texto livre (ex.: "dom casm")
+            filtros: Filtros adicionais (ex.: {"disponivel": True})
+            limit: Número máximo de resultados
+        
+        Returns:
+            Livros, do mais para o menos relevante
+        """
+        return self.livro_repo.buscar_texto(texto, filtros, limit)
+    
+    def sugerir_titulos(self, prefixo: str, limit: int = 10) -> List[Sugestao]:
+        """
+        Títulos que começam com o prefixo, dos mais para os menos emprestados
+        
+        Com o autocompletar configurado (bloco ``autocomplete``) a resposta
+        vem da memória; sem ele, de uma busca por prefixo no banco (em ordem
+        alfabética e sem popularidade).
+        
+        Args:
+            prefixo: Início do texto (acentos e maiúsculas são ignorados)
+            limit: Quantidade máxima de sugestões
+        
+        Returns:
+            Sugestões (id, texto, popularidade)
+        """
+        autocompletar = autocompletar_da_sessao(self.session)
+        if autocompletar is not None:
+            return autocompletar.sugerir_livros(self.session.get_bind(), prefixo, limit)
+        return [Sugestao(entidade.id, entidade.titulo, 0) for entidade in self.livro_repo.buscar_por_prefixo_titulo(prefixo, limit)]
+    
+    def buscar_titulo_aproximado(self, titulo: str, limit: int = 10) -> List[Candidato]:
+        """Busca livros por título tolerando erros de digitação, com a similaridade de cada candidato"""
+        return self.livro_repo.buscar_titulo_aproximado(titulo, limit)
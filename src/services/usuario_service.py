@@ -1,18 +1,79 @@
 """
 Serviço de Usuario
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from datetime import date
 from sqlalchemy.orm import Session
 
 from src.models.usuario import Usuario
 from src.repositories.usuario_repository import UsuarioRepository, IUsuarioRepository
+from src.repositories.paginacao import Pagina
 from src.exceptions.biblioteca_exceptions import EntidadeNaoEncontradaException, ValidacaoException
 from src.validators.validators import Validator
+from src.database.unit_of_work import transacional
 from src.utils.logger import get_logger
 
 
-class UsuarioService:
+class RegrasUsuario:
+    """
+    Regras de validação de usuário, sem acesso a dados
+    
+    Compartilhadas entre UsuarioService e a variante assíncrona; as buscas
+    (ex.: usuário com o mesmo email) ficam com o serviço.
+    """
+    
+    @staticmethod
+    def _exigir_usuario(usuario: Optional[Usuario], usuario_id: int) -> Usuario:
+        """
+        Devolve o usuário buscado, se existir
+        
+        Raises:
+            EntidadeNaoEncontradaException: Se usuário não for encontrado
+        """
+        if not usuario:
+            raise EntidadeNaoEncontradaException("Usuario", str(usuario_id))
+        return usuario
+    
+    @staticmethod
+    def _validar_email_disponivel(
+        email: str, usuario_existente: Optional[Usuario], usuario_id: Optional[int] = None
+    ) -> None:
+        """
+        Valida que o email não pertence a outro usuário
+        
+        Args:
+            email: Email pedido
+            usuario_existente: Usuário já cadastrado com o email (ou None)
+            usuario_id: ID do usuário sendo atualizado (None ao criar)
+        
+        Raises:
+            ValidacaoException: Se o email já estiver cadastrado para outro usuário
+        """
+        if usuario_existente and usuario_existente.id != usuario_id:
+            raise ValidacaoException(f"Email {email} já está cadastrado", "email")
+    
+    @staticmethod
+    def _validar_data_nascimento(dados_atualizacao: dict) -> None:
+        """
+        Converte (se texto) e valida a data de nascimento de uma atualização (altera dados_atualizacao)
+        
+        Raises:
+            ValidacaoException: Se a data for inválida ou abaixo da idade mínima
+        """
+        if "data_nascimento" in dados_atualizacao:
+            if isinstance(dados_atualizacao["data_nascimento"], str):
+                dados_atualizacao["data_nascimento"] = date.fromisoformat(dados_atualizacao["data_nascimento"])
+            Validator.validar_data_nascimento(dados_atualizacao["data_nascimento"], idade_minima=12)
+    
+    @staticmethod
+    def _aplicar_dados(usuario: Usuario, dados_atualizacao: dict) -> None:
+        """Copia para o usuário os campos existentes em dados_atualizacao"""
+        for campo, valor in dados_atualizacao.items():
+            if hasattr(usuario, campo):
+                setattr(usuario, campo, valor)
+
+
+class UsuarioService(RegrasUsuario):
     """Serviço para gerenciar usuários"""
     
     def __init__(
@@ -31,6 +92,7 @@ class UsuarioService:
         self.usuario_repo = usuario_repo or UsuarioRepository(session)
         self.logger = get_logger("UsuarioService")
     
+    @transacional
     def criar_usuario(self, usuario: Usuario) -> Usuario:
         """
         Cria um novo usuário com validações
@@ -50,9 +112,7 @@ class UsuarioService:
         Validator.validar_email(usuario.email)
         
         # Verifica se email já existe
-        usuario_existente = self.usuario_repo.buscar_por_email(usuario.email)
-        if usuario_existente:
-            raise ValidacaoException(f"Email {usuario.email} já está cadastrado", "email")
+        self._validar_email_disponivel(usuario.email, self.usuario_repo.buscar_por_email(usuario.email))
         
         # Valida data de nascimento (idade mínima de 12 anos)
         Validator.validar_data_nascimento(usuario.data_nascimento, idade_minima=12)
@@ -61,6 +121,56 @@ class UsuarioService:
         self.logger.info(f"Usuário criado com sucesso: ID {usuario.id}")
         return usuario
     
+    def criar_usuarios_em_lote(self, usuarios: List[Usuario], tamanho_lote: int = 500) -> List[int]:
+        """
+        Cria vários usuários, verificando emails duplicados por conjunto
+        
+        Todos os blocos são validados antes da primeira gravação, com uma
+        consulta de emails por bloco. Cada bloco é então gravado com um INSERT
+        em lote e um commit; dentro de uma UnitOfWork externa, tudo fica em
+        uma única transação.
+        
+        Args:
+            usuarios: Usuários a criar
+            tamanho_lote: Quantidade de usuários por bloco
+        
+        Returns:
+            IDs dos usuários criados, na ordem recebida
+        
+        Raises:
+            ValidacaoException: Se algum email for inválido, repetido ou já
+                cadastrado, ou se a data de nascimento for inválida
+            ValueError: Se tamanho_lote não for positivo
+        """
+        if tamanho_lote <= 0:
+            raise ValueError("tamanho_lote deve ser positivo")
+        
+        self.logger.info(f"Criando {len(usuarios)} usuários em lote")
+        vistos = set()
+        for usuario in usuarios:
+            Validator.validar_email(usuario.email)
+            Validator.validar_data_nascimento(usuario.data_nascimento, idade_minima=12)
+            if usuario.email in vistos:
+                raise ValidacaoException(f"Email {usuario.email} repetido no lote", "email")
+            vistos.add(usuario.email)
+        
+        blocos = [usuarios[inicio:inicio + tamanho_lote] for inicio in range(0, len(usuarios), tamanho_lote)]
+        for bloco in blocos:
+            existentes = self.usuario_repo.emails_existentes(usuario.email for usuario in bloco)
+            if existentes:
+                raise ValidacaoException(f"Email {sorted(existentes)[0]} já está cadastrado", "email")
+        
+        ids: List[int] = []
+        for bloco in blocos:
+            ids.extend(self._gravar_bloco(bloco))
+        self.logger.info(f"{len(ids)} usuários criados em {len(blocos)} blocos")
+        return ids
+    
+    @transacional
+    def _gravar_bloco(self, usuarios: List[Usuario]) -> List[int]:
+        """Grava um bloco já validado em uma transação"""
+        return self.usuario_repo.criar_em_lote(usuarios, len(usuarios))
+    
     def buscar_por_id(self, usuario_id: int) -> Usuario:
         """
         Busca usuário por ID
@@ -74,24 +184,46 @@ class UsuarioService:
         Raises:
             EntidadeNaoEncontradaException: Se usuário não for encontrado
         """
-        usuario = self.usuario_repo.buscar_por_id(usuario_id)
-        if not usuario:
-            raise EntidadeNaoEncontradaException("Usuario", str(usuario_id))
-        return usuario
+        return self._exigir_usuario(self.usuario_repo.buscar_por_id(usuario_id), usuario_id)
     
-    def listar_todos(self, skip: int = 0, limit: int = 100) -> List[Usuario]:
+    def listar_todos(self, skip: int = 0, limit: int = 100, campos: Optional[Sequence[str]] = None) -> List[Usuario]:
         """
         Lista todos os usuários
         
         Args:
             skip: Número de registros a pular
             limit: Número máximo de registros
+            campos: Se informado, devolve linhas leves só com essas colunas
         
         Returns:
             Lista de usuários
         """
-        return self.usuario_repo.listar_todos(skip, limit)
+        return self.usuario_repo.listar_todos(skip, limit, campos)
     
+    def listar_pagina(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Usuario]:
+        """
+        Lista usuários por página, com paginação por cursor
+        
+        Args:
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves só com essas colunas
+        
+        Returns:
+            Página de usuários com o cursor da próxima
+        """
+        return self.usuario_repo.listar_pagina(cursor, limit, ordenar_por, ordem_desc, campos)
+    
+    @transacional
     def atualizar_usuario(self, usuario_id: int, dados_atualizacao: dict) -> Usuario:
         """
         Atualiza um usuário
@@ -113,26 +245,42 @@ class UsuarioService:
         
         # Valida email se fornecido
         if "email" in dados_atualizacao:
-            Validator.validar_email(dados_atualizacao["email"])
-            usuario_existente = self.usuario_repo.buscar_por_email(dados_atualizacao["email"])
-            if usuario_existente and usuario_existente.id != usuario_id:
-                raise ValidacaoException(f"Email {dados_atualizacao['email']} já está cadastrado", "email")
+            email = dados_atualizacao["email"]
+            Validator.validar_email(email)
+            self._validar_email_disponivel(email, self.usuario_repo.buscar_por_email(email), usuario_id)
         
         # Valida data de nascimento se fornecida
-        if "data_nascimento" in dados_atualizacao:
-            if isinstance(dados_atualizacao["data_nascimento"], str):
-                dados_atualizacao["data_nascimento"] = date.fromisoformat(dados_atualizacao["data_nascimento"])
-            Validator.validar_data_nascimento(dados_atualizacao["data_nascimento"], idade_minima=12)
+        self._validar_data_nascimento(dados_atualizacao)
         
         # Atualiza campos
-        for campo, valor in dados_atualizacao.items():
-            if hasattr(usuario, campo):
-                setattr(usuario, campo, valor)
+        self._aplicar_dados(usuario, dados_atualizacao)
         
         usuario = self.usuario_repo.atualizar(usuario)
         self.logger.info(f"Usuário ID {usuario_id} atualizado com sucesso")
         return usuario
     
+    @transacional
+    def desativar_usuarios(self, filtros: dict) -> int:
+        """
+        Desativa de uma vez todos os usuários que atendem aos filtros
+        
+        Executa um único UPDATE, sem carregar os usuários.
+        
+        Args:
+            filtros: Dicionário com filtros (mesma sintaxe de buscar_com_filtros)
+        
+        Returns:
+            Quantidade de usuários desativados
+        
+        Raises:
+            ValueError: Se não houver filtros válidos
+        """
+        self.logger.info(f"Desativando usuários com filtros {filtros}")
+        afetados = self.usuario_repo.atualizar_em_massa({**filtros, "ativo": True}, {"ativo": False})
+        self.logger.info(f"{afetados} usuários desativados")
+        return afetados
+    
+    @transacional
     def deletar_usuario(self, usuario_id: int) -> bool:
         """
         Deleta um usuário
@@ -156,7 +304,8 @@ class UsuarioService:
         skip: int = 0,
         limit: int = 100,
         ordenar_por: Optional[str] = None,
-        ordem_desc: bool = False
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None
     ) -> List[Usuario]:
         """
         Busca usuários com filtros e ordenação
@@ -167,9 +316,35 @@ class UsuarioService:
             limit: Número máximo de registros
             ordenar_por: Campo para ordenação
             ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves só com essas colunas
         
         Returns:
             Lista de usuários filtrados
         """
-        return self.usuario_repo.buscar_com_filtros(filtros, skip, limit, ordenar_por, ordem_desc)
+        return self.usuario_repo.buscar_com_filtros(filtros, skip, limit, ordenar_por, ordem_desc, campos)
+    
+    def buscar_pagina_com_filtros(
+        self,
+        filtros: dict,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        ordenar_por: Optional[str] = None,
+        ordem_desc: bool = False,
+        campos: Optional[Sequence[str]] = None
+    ) -> Pagina[Usuario]:
+        """
+        Busca usuários com filtros, com paginação por cursor
+        
+        Args:
+            filtros: Dicionário com filtros
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+            limit: Número máximo de registros
+            ordenar_por: Campo para ordenação (padrão: id)
+            ordem_desc: Se True, ordena em ordem decrescente
+            campos: Se informado, devolve linhas leves só com essas colunas
+        
+        Returns:
+            Página de usuários filtrados com o cursor da próxima
+        """
+        return self.usuario_repo.buscar_pagina(filtros, cursor, limit, ordenar_por, ordem_desc, campos)
 
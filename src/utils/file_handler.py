@@ -4,7 +4,7 @@ Utilitário para manipulação de arquivos
 import json
 import csv
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any
 from datetime import date, datetime
 
 from src.utils.logger import get_logger
@@ -17,32 +17,43 @@ class FileHandler:
         """Inicializa o handler"""
         self.logger = get_logger("FileHandler")
     
-    def exportar_emprestimos_json(self, emprestimos: List[Dict[str, Any]], arquivo: str) -> None:
+    def exportar_emprestimos_json(self, emprestimos: Iterable[Dict[str, Any]], arquivo: str) -> int:
         """
         Exporta empréstimos para arquivo JSON
         
+        Os registros são gravados à medida que são lidos, então aceita um
+        iterador (ex.: EmprestimoService.iterar_historico_dicts) sem carregar
+        o histórico inteiro na memória.
+        
         Args:
-            emprestimos: Lista de empréstimos (dicionários)
+            emprestimos: Empréstimos (dicionários), em lista ou iterador
             arquivo: Caminho do arquivo de saída
-        """
-        self.logger.info(f"Exportando {len(emprestimos)} empréstimos para {arquivo}")
         
-        # Converte datas para strings
-        dados_export = []
-        for emp in emprestimos:
-            emp_copy = emp.copy()
-            for key, value in emp_copy.items():
-                if isinstance(value, (date, datetime)):
-                    emp_copy[key] = value.isoformat()
-            dados_export.append(emp_copy)
+        Returns:
+            Quantidade de empréstimos exportados
+        """
+        self.logger.info(f"Exportando empréstimos para {arquivo}")
         
         arquivo_path = Path(arquivo)
         arquivo_path.parent.mkdir(parents=True, exist_ok=True)
         
+        total = 0
         with open(arquivo_path, 'w', encoding='utf-8') as f:
-            json.dump(dados_export, f, indent=2, ensure_ascii=False)
-        
-        self.logger.info(f"Exportação concluída: {arquivo}")
+            f.write("[")
+            for emp in emprestimos:
+                # Converte datas para strings
+                emp_copy = emp.copy()
+                for key, value in emp_copy.items():
+                    if isinstance(value, (date, datetime)):
+                        emp_copy[key] = value.isoformat()
+                
+                f.write(",\n  " if total else "\n  ")
+                f.write(json.dumps(emp_copy, ensure_ascii=False, default=str))
+                total += 1
+            f.write("\n]\n" if total else "]\n")
+        
+        self.logger.info(f"Exportação concluída: {total} empréstimos em {arquivo}")
+        return total
     
     def importar_emprestimos_json(self, arquivo: str) -> List[Dict[str, Any]]:
         """
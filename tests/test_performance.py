@@ -34,6 +34,24 @@ class TestPerformance:
         
         benchmark(criar_livros)
     
+    @pytest.mark.benchmark
+    def test_performance_criar_livros_em_lote(self, db_session, benchmark):
+        """Testa performance da criação de múltiplos livros em lote"""
+        autor = Autor(nome="Autor", nacionalidade="BR")
+        db_session.add(autor)
+        db_session.commit()
+        
+        livro_service = LivroService(db_session)
+        
+        def criar_livros():
+            livros = [
+                Livro(titulo=f"Livro {i}", autor_id=autor.id, quantidade_total=5)
+                for i in range(100)
+            ]
+            livro_service.criar_livros_em_lote(livros)
+        
+        benchmark(criar_livros)
+    
     @pytest.mark.benchmark
     def test_performance_buscar_com_filtros(self, db_session, benchmark):
         """Testa performance de busca com filtros"""
@@ -79,4 +97,68 @@ class TestPerformance:
             livro_service.listar_todos(skip=0, limit=100)
         
         benchmark(listar)
-
+    
+    @pytest.mark.benchmark
+    def test_performance_listar_todos_projecao(self, db_session, benchmark):
+        """Testa performance de listagem projetada (só as colunas exibidas)"""
+        autor = Autor(nome="Autor", nacionalidade="BR")
+        db_session.add(autor)
+        db_session.commit()
+        
+        livros = [
+            Livro(titulo=f"Livro {i}", autor_id=autor.id, quantidade_total=5, sinopse="Sinopse " * 100)
+            for i in range(200)
+        ]
+        db_session.add_all(livros)
+        db_session.commit()
+        db_session.expunge_all()
+        
+        livro_service = LivroService(db_session)
+        
+        def listar():
+            livro_service.listar_todos(skip=0, limit=100, campos=["id", "titulo", "disponivel"])
+        
+        benchmark(listar)
+    
+    
+    @pytest.mark.benchmark
+    def test_performance_buscar_por_id_com_cache(self, db_session, benchmark):
+        """Testa performance de buscas repetidas por ID servidas pelo cache de entidades"""
+        from src.database.entity_cache import CACHE_ENTIDADES, CacheEntidades
+        
+        autor = Autor(nome="Autor", nacionalidade="BR")
+        db_session.add(autor)
+        db_session.commit()
+        db_session.add_all([Livro(titulo=f"Livro {i}", autor_id=autor.id, quantidade_total=5) for i in range(50)])
+        db_session.commit()
+        db_session.info[CACHE_ENTIDADES] = CacheEntidades(modelos=["Livro"])
+        
+        livro_service = LivroService(db_session)
+        
+        def buscar():
+            for livro_id in range(1, 51):
+                livro_service.buscar_por_id(livro_id)
+            db_session.expunge_all()
+        
+        benchmark(buscar)
+    
+    @pytest.mark.benchmark
+    def test_performance_autocompletar_titulos(self, db_session, benchmark):
+        """Testa performance das sugestões de título servidas da memória"""
+        from src.database.autocompletar import AUTOCOMPLETAR, Autocompletar
+        
+        autor = Autor(nome="Autor", nacionalidade="BR")
+        db_session.add(autor)
+        db_session.commit()
+        LivroService(db_session).criar_livros_em_lote(
+            [Livro(titulo=f"Livro {i:04d}", autor_id=autor.id, quantidade_total=1) for i in range(2000)]
+        )
+        db_session.info[AUTOCOMPLETAR] = Autocompletar()
+        livro_service = LivroService(db_session)
+        livro_service.sugerir_titulos("liv")
+        
+        def sugerir():
+            for prefixo in ("l", "livro 1", "livro 12", "livro 0999"):
+                livro_service.sugerir_titulos(prefixo, 10)
+        
+        benchmark(sugerir)
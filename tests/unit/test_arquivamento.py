@@ -0,0 +1,173 @@
+"""
+Testes unitários para o arquivamento de empréstimos
+"""
+import json
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import inspect
+
+from src.database.init_db import recriar_com_autoincremento
+from src.models.emprestimo import Emprestimo
+from src.models.emprestimo_arquivado import EmprestimoArquivado
+from src.repositories.emprestimo_repository import EmprestimoRepository
+from src.services.arquivamento_service import ArquivamentoService
+from src.services.emprestimo_service import EmprestimoService
+from src.utils.file_handler import FileHandler
+
+
+HOJE = date(2024, 6, 1)
+
+
+@pytest.fixture
+def emprestimos_antigos(db_session, livro, usuario):
+    """Cria 5 empréstimos devolvidos há 2 anos, 1 devolvido ontem e 1 ativo"""
+    emprestimos = []
+    for _ in range(5):
+        emprestimos.append(Emprestimo(
+            livro_id=livro.id, usuario_id=usuario.id, devolvido=True,
+            data_emprestimo=HOJE - timedelta(days=750),
+            data_prevista_devolucao=HOJE - timedelta(days=736),
+            data_devolucao=HOJE - timedelta(days=740)
+        ))
+    emprestimos.append(Emprestimo(
+        livro_id=livro.id, usuario_id=usuario.id, devolvido=True,
+        data_emprestimo=HOJE - timedelta(days=10),
+        data_prevista_devolucao=HOJE + timedelta(days=4),
+        data_devolucao=HOJE - timedelta(days=1)
+    ))
+    emprestimos.append(Emprestimo(
+        livro_id=livro.id, usuario_id=usuario.id,
+        data_emprestimo=HOJE, data_prevista_devolucao=HOJE + timedelta(days=14)
+    ))
+    db_session.add_all(emprestimos)
+    db_session.commit()
+    return emprestimos
+
+
+class TestArquivamentoService:
+    """Testes para ArquivamentoService"""
+    
+    def test_arquiva_apenas_devolvidos_antigos(self, db_session, emprestimos_antigos, usuario):
+        """Testa que só devoluções anteriores ao corte saem da tabela principal"""
+        ids = [e.id for e in emprestimos_antigos]
+        service = ArquivamentoService(db_session, idade_minima_dias=365, tamanho_lote=2)
+        
+        assert service.arquivar(hoje=HOJE) == 5
+        
+        repo = EmprestimoRepository(db_session)
+        restantes = repo.buscar_por_usuario(usuario.id)
+        assert len(restantes) == 2
+        assert {e.id for e in restantes} == set(ids[5:])
+        
+        arquivados = db_session.query(EmprestimoArquivado).order_by(EmprestimoArquivado.id).all()
+        assert [a.id for a in arquivados] == ids[:5]
+        assert all(a.devolvido and a.arquivado_em is not None for a in arquivados)
+    
+    def test_historico_inclui_arquivo_quando_pedido(self, db_session, emprestimos_antigos, usuario, livro):
+        """Testa a união transparente com o arquivo"""
+        ArquivamentoService(db_session).arquivar(hoje=HOJE)
+        repo = EmprestimoRepository(db_session)
+        
+        historico = repo.buscar_por_usuario(usuario.id, incluir_arquivo=True)
+        assert len(historico) == 7
+        assert isinstance(historico[0], EmprestimoArquivado)
+        assert historico[0].livro.id == livro.id
+        assert len(repo.buscar_por_livro(livro.id, incluir_arquivo=True)) == 7
+        assert len(repo.buscar_por_livro(livro.id)) == 2
+    
+    def test_historico_ordenado_por_data(self, db_session, emprestimos_antigos, usuario, livro):
+        """Testa que o histórico sai por data do empréstimo e ID, com ou sem o arquivo"""
+        ArquivamentoService(db_session).arquivar(hoje=HOJE)
+        esquecido = Emprestimo(
+            livro_id=livro.id, usuario_id=usuario.id,
+            data_emprestimo=HOJE - timedelta(days=900), data_prevista_devolucao=HOJE - timedelta(days=886)
+        )
+        db_session.add(esquecido)
+        db_session.commit()
+        repo = EmprestimoRepository(db_session)
+        
+        for historico in (repo.buscar_por_usuario(usuario.id, incluir_arquivo=True),
+                          repo.buscar_por_livro(livro.id, incluir_arquivo=True)):
+            assert historico[0] is esquecido
+            chaves = [(e.data_emprestimo, e.id) for e in historico]
+            assert chaves == sorted(chaves)
+        assert repo.buscar_por_usuario(usuario.id)[0] is esquecido
+    
+    def test_exportar_historico_em_fluxo(self, db_session, emprestimos_antigos, tmp_path):
+        """Testa a exportação do histórico completo lido em fluxo"""
+        ids = [e.id for e in emprestimos_antigos]
+        ArquivamentoService(db_session).arquivar(hoje=HOJE)
+        arquivo = tmp_path / "historico.json"
+        
+        service = EmprestimoService(db_session)
+        total = FileHandler().exportar_emprestimos_json(service.iterar_historico_dicts(chunk_size=2), str(arquivo))
+        
+        assert total == 7
+        dados = json.loads(arquivo.read_text(encoding="utf-8"))
+        assert [d["id"] for d in dados] == ids
+        assert len(list(service.iterar_historico(incluir_arquivo=False))) == 2
+    
+    def test_limite_de_lotes(self, db_session, emprestimos_antigos):
+        """Testa que max_lotes interrompe o arquivamento"""
+        service = ArquivamentoService(db_session, tamanho_lote=2)
+        assert service.arquivar(hoje=HOJE, max_lotes=1) == 2
+        assert service.arquivar(hoje=HOJE) == 3
+        assert service.arquivar(hoje=HOJE) == 0
+    
+    def test_ids_nunca_reaproveitados(self, db_session, emprestimos_antigos, livro, usuario):
+        """Testa que um ID arquivado ou removido não volta a ser usado"""
+        ultimo = emprestimos_antigos[-1]
+        ultimo.devolvido = True
+        ultimo.data_devolucao = HOJE - timedelta(days=740)
+        db_session.commit()
+        maior_id = ultimo.id
+        assert ArquivamentoService(db_session).arquivar(hoje=HOJE) == 6
+        
+        novo = Emprestimo(livro_id=livro.id, usuario_id=usuario.id, data_prevista_devolucao=HOJE)
+        db_session.add(novo)
+        db_session.commit()
+        assert novo.id == maior_id + 1
+        
+        historico = EmprestimoRepository(db_session).buscar_por_usuario(usuario.id, incluir_arquivo=True)
+        assert len({e.id for e in historico}) == len(historico) == 8
+    
+    def test_parametros_invalidos(self, db_session):
+        """Testa a validação dos parâmetros"""
+        with pytest.raises(ValueError):
+            ArquivamentoService(db_session, idade_minima_dias=-1)
+        with pytest.raises(ValueError):
+            ArquivamentoService(db_session, tamanho_lote=0)
+
+
+class TestMigracaoAutoincremento:
+    """Testes de recriar_com_autoincremento em bancos criados sem AUTOINCREMENT"""
+    
+    def test_recria_preservando_linhas_e_ids_arquivados(self, db_session, emprestimos_antigos, livro, usuario):
+        """Testa a cópia das linhas, os índices e a sequência a partir do arquivo"""
+        db_session.add(EmprestimoArquivado(
+            id=50, livro_id=livro.id, usuario_id=usuario.id,
+            data_emprestimo=date(2020, 1, 1), data_prevista_devolucao=date(2020, 1, 15)
+        ))
+        db_session.commit()
+        engine = db_session.get_bind()
+        livro_id, usuario_id = livro.id, usuario.id
+        db_session.close()
+        with engine.begin() as conn:
+            ddl = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'emprestimos'").scalar()
+            conn.exec_driver_sql("ALTER TABLE emprestimos RENAME TO emprestimos_tmp")
+            conn.exec_driver_sql(ddl.replace("AUTOINCREMENT", ""))
+            conn.exec_driver_sql("INSERT INTO emprestimos SELECT * FROM emprestimos_tmp")
+            conn.exec_driver_sql("DROP TABLE emprestimos_tmp")
+        
+        assert recriar_com_autoincremento(engine) == ["emprestimos"]
+        assert recriar_com_autoincremento(engine) == []
+        
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT COUNT(*) FROM emprestimos").scalar() == 7
+            indices = {indice["name"] for indice in inspect(conn).get_indexes("emprestimos")}
+        assert "ix_emprestimos_usuario_devolvido" in indices
+        
+        novo = Emprestimo(livro_id=livro_id, usuario_id=usuario_id, data_prevista_devolucao=HOJE)
+        db_session.add(novo)
+        db_session.commit()
+        assert novo.id == 51
@@ -0,0 +1,176 @@
+"""
+Testes para a variante assíncrona (AsyncDatabaseConfig, repositórios e serviços)
+"""
+import asyncio
+import json
+import pytest
+from datetime import date
+
+pytest.importorskip("aiosqlite")
+
+from src.database.base import Base
+from src.database.async_config import AsyncDatabaseConfig, url_assincrona
+from src.services.async_services import (
+    AsyncLivroService,
+    AsyncUsuarioService,
+    AsyncEmprestimoService,
+    AsyncAutorService,
+    AsyncCategoriaService
+)
+from src.models.livro import Livro
+from src.models.usuario import Usuario
+from src.models.autor import Autor
+from src.models.categoria import Categoria
+from src.exceptions.biblioteca_exceptions import (
+    EntidadeNaoEncontradaException,
+    LivroIndisponivelException,
+    EmprestimoJaDevolvidoException,
+    ValidacaoException
+)
+
+
+@pytest.fixture
+def async_config(tmp_path):
+    """Configuração assíncrona apontando para um banco SQLite temporário"""
+    config_data = {
+        "database": {
+            "url": f"sqlite:///{tmp_path / 'async.db'}",
+            "performance": {"journal_mode": "WAL", "busy_timeout": 2000}
+        }
+    }
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config_data), encoding="utf-8")
+    return AsyncDatabaseConfig(str(config_path))
+
+
+def executar(coro):
+    """Executa uma corrotina no loop de eventos"""
+    return asyncio.run(coro)
+
+
+async def _criar_tabelas(config):
+    async with config.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+class TestAsyncDatabaseConfig:
+    """Testes para AsyncDatabaseConfig"""
+    
+    def test_url_assincrona(self):
+        """Testa a conversão de URLs para drivers assíncronos"""
+        assert url_assincrona("sqlite:///./biblioteca.db") == "sqlite+aiosqlite:///./biblioteca.db"
+        assert url_assincrona("sqlite+pysqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+        assert url_assincrona("mysql://host/db") == "mysql://host/db"
+    
+    def test_perfil_performance_aplicado(self, async_config):
+        """Testa que o perfil de performance vale também para a engine assíncrona"""
+        async def cenario():
+            pragmas = await async_config.get_effective_pragmas()
+            await async_config.dispose()
+            return pragmas
+        
+        pragmas = executar(cenario())
+        assert pragmas["journal_mode"] == "wal"
+        assert pragmas["busy_timeout"] == 2000
+
+
+class TestServicosAssincronos:
+    """Testes dos serviços assíncronos"""
+    
+    def test_fluxo_emprestimo(self, async_config):
+        """Testa criação e devolução de empréstimo com as mesmas regras do serviço síncrono"""
+        async def cenario():
+            await _criar_tabelas(async_config)
+            async with async_config.get_session() as session:
+                autor = await AsyncAutorService(session).criar_autor(Autor(nome="Autor"))
+                categoria = await AsyncCategoriaService(session).criar_categoria(Categoria(nome="Romance"))
+                livro = await AsyncLivroService(session).criar_livro(
+                    Livro(titulo="Livro", autor_id=autor.id, categoria_id=categoria.id, quantidade_total=1)
+                )
+                usuario = await AsyncUsuarioService(session).criar_usuario(
+                    Usuario(nome="Leitor", email="leitor@example.com", data_nascimento=date(1990, 1, 1))
+                )
+                
+                service = AsyncEmprestimoService(session)
+                emprestimo = await service.criar_emprestimo(livro.id, usuario.id)
+                assert livro.quantidade_disponivel == 0
+                assert (livro.total_emprestimos, livro.emprestimos_ativos) == (1, 1)
+                assert livro.ultimo_emprestimo_em == date.today()
+                assert (usuario.total_emprestimos, usuario.emprestimos_ativos) == (1, 1)
+                assert usuario.pode_emprestar() is True
+                livro_id, emprestimo_id = livro.id, emprestimo.id
+                
+                # A falha desfaz a transação (e expira os objetos carregados)
+                with pytest.raises(LivroIndisponivelException):
+                    await service.criar_emprestimo(livro_id, usuario.id)
+                
+                devolvido = await service.devolver_emprestimo(emprestimo_id)
+                assert devolvido.devolvido is True
+                assert (devolvido.livro.total_emprestimos, devolvido.livro.emprestimos_ativos) == (1, 0)
+                usuario = await AsyncUsuarioService(session).buscar_por_id(devolvido.usuario_id)
+                assert (usuario.total_emprestimos, usuario.emprestimos_ativos) == (1, 0)
+                assert float(usuario.multas_pendentes) == 0.0
+                assert (await AsyncLivroService(session).buscar_por_id(livro_id)).quantidade_disponivel == 1
+                
+                with pytest.raises(EmprestimoJaDevolvidoException):
+                    await service.devolver_emprestimo(emprestimo_id)
+            await async_config.dispose()
+        
+        executar(cenario())
+    
+    def test_livro_com_autor_inexistente(self, async_config):
+        """Testa que a validação de referências é aplicada"""
+        async def cenario():
+            await _criar_tabelas(async_config)
+            async with async_config.get_session() as session:
+                with pytest.raises(EntidadeNaoEncontradaException):
+                    await AsyncLivroService(session).criar_livro(
+                        Livro(titulo="Livro", autor_id=999, quantidade_total=1)
+                    )
+            await async_config.dispose()
+        
+        executar(cenario())
+    
+    def test_regras_de_usuario_autor_e_categoria(self, async_config):
+        """Testa que as atualizações assíncronas aplicam as mesmas regras dos serviços síncronos"""
+        async def cenario():
+            await _criar_tabelas(async_config)
+            async with async_config.get_session() as session:
+                usuarios = AsyncUsuarioService(session)
+                for email in ("ana@example.com", "bia@example.com"):
+                    await usuarios.criar_usuario(Usuario(nome="Leitor", email=email, data_nascimento=date(1990, 1, 1)))
+                bia = await usuarios.usuario_repo.buscar_por_email("bia@example.com")
+                bia_id = bia.id
+                
+                with pytest.raises(ValidacaoException):
+                    await usuarios.atualizar_usuario(bia_id, {"email": "ana@example.com"})
+                atualizado = await usuarios.atualizar_usuario(bia_id, {"data_nascimento": "1991-02-03"})
+                assert atualizado.data_nascimento == date(1991, 2, 3)
+                
+                autor = await AsyncAutorService(session).criar_autor(Autor(nome="Autor"))
+                assert (await AsyncAutorService(session).atualizar_autor(autor.id, {"nome": "Outro"})).nome == "Outro"
+                with pytest.raises(EntidadeNaoEncontradaException):
+                    await AsyncCategoriaService(session).atualizar_categoria(999, {"nome": "Drama"})
+            await async_config.dispose()
+        
+        executar(cenario())
+    
+    def test_sessoes_concorrentes(self, async_config):
+        """Testa várias sessões atendidas de forma concorrente no mesmo processo"""
+        async def criar_autor(indice):
+            async with async_config.get_session() as session:
+                return await AsyncAutorService(session).criar_autor(Autor(nome=f"Autor {indice}"))
+        
+        async def cenario():
+            await _criar_tabelas(async_config)
+            autores = await asyncio.gather(*(criar_autor(i) for i in range(10)))
+            async with async_config.get_session() as session:
+                filtrados = await AsyncAutorService(session).autor_repo.buscar_com_filtros(
+                    {"nome": {"like": "Autor%"}}, ordenar_por="nome"
+                )
+            await async_config.dispose()
+            return autores, filtrados
+        
+        autores, filtrados = executar(cenario())
+        assert len({a.id for a in autores}) == 10
+        assert len(filtrados) == 10
@@ -0,0 +1,188 @@
+"""
+Testes unitários para o autocompletar em memória
+"""
+import json
+import pytest
+from datetime import date, timedelta
+
+from src.database.autocompletar import AUTOCOMPLETAR, Autocompletar, IndicePrefixos
+from src.database.base import Base
+from src.database.config import DatabaseConfig
+from src.database.query_plan import capturar_consultas
+from src.models.autor import Autor
+from src.models.emprestimo import Emprestimo
+from src.models.livro import Livro
+from src.repositories.emprestimo_repository import EmprestimoRepository
+from src.repositories.livro_repository import LivroRepository
+from src.services.autor_service import AutorService
+from src.services.livro_service import LivroService
+
+
+class TestIndicePrefixos:
+    """Testes para IndicePrefixos"""
+    
+    def test_prefixo_ordenado_por_popularidade(self):
+        """Testa a faixa do prefixo, a ordem e a insensibilidade a acentos"""
+        indice = IndicePrefixos()
+        indice.carregar([(1, "Dom Casmurro", 3), (2, "Dom Quixote", 9), (3, "Dôra", 1), (4, "Helena", 50)])
+        
+        assert [s.texto for s in indice.sugerir("DOM ")] == ["Dom Quixote", "Dom Casmurro"]
+        assert [s.id for s in indice.sugerir("do")] == [2, 1, 3]
+        assert indice.sugerir("dom", k=1) == [(2, "Dom Quixote", 9)]
+        assert indice.sugerir("z") == []
+    
+    def test_atualizacoes_incrementais(self):
+        """Testa inserir, renomear, remover e somar popularidade"""
+        indice = IndicePrefixos()
+        indice.inserir(1, "Iracema")
+        indice.inserir(2, "Iaiá Garcia", 2)
+        indice.somar_popularidade(1, 5)
+        assert [s.id for s in indice.sugerir("i")] == [1, 2]
+        
+        indice.inserir(1, "O Guarani", indice.popularidade(1))
+        indice.remover(2)
+        assert indice.sugerir("i") == []
+        assert indice.sugerir("o gua") == [(1, "O Guarani", 5)]
+    
+    def test_faixas_longas_usam_mais_populares_guardados(self):
+        """Testa que os mais populares guardados são descartados quando a faixa muda"""
+        indice = IndicePrefixos(limite_varredura=2, k_guardado=3)
+        indice.carregar([(id, f"Livro {id}", id) for id in range(1, 7)])
+        assert [s.id for s in indice.sugerir("livro", 2)] == [6, 5]
+        
+        indice.somar_popularidade(1, 100)
+        assert [s.id for s in indice.sugerir("livro", 2)] == [1, 6]
+        assert [s.id for s in indice.sugerir("livro", 5)] == [1, 6, 5, 4, 3]
+    
+    def test_limite_de_itens(self):
+        """Testa que acima de max_itens ficam os mais populares"""
+        indice = IndicePrefixos(max_itens=2)
+        indice.carregar([(1, "A", 1), (2, "B", 5), (3, "C", 3)])
+        assert 1 not in indice and len(indice) == 2
+        
+        indice.inserir(4, "D", 0)
+        indice.inserir(5, "E", 4)
+        assert sorted(s.id for s in indice.sugerir("")) == [2, 5]
+        assert indice.descartados == 3
+        
+        with pytest.raises(ValueError):
+            IndicePrefixos(max_itens=0)
+    
+    def test_descarte_pela_popularidade_atual(self):
+        """Testa que o descarte usa a popularidade atual, não a da inserção"""
+        indice = IndicePrefixos(max_itens=3)
+        indice.carregar([(1, "A", 1), (2, "B", 2), (3, "C", 3)])
+        indice.somar_popularidade(1, 10)
+        indice.somar_popularidade(3, -3)
+        
+        indice.inserir(4, "D", 1)
+        assert sorted(s.id for s in indice.sugerir("")) == [1, 2, 4]
+        for id in range(5, 200):
+            indice.inserir(id, f"Livro {id}", id)
+            indice.somar_popularidade(id, 1)
+        assert sorted(s.id for s in indice.sugerir("", 3)) == [197, 198, 199]
+        assert len(indice._heap) <= 2 * len(indice) + 64
+
+
+class TestAutocompletarComSessao:
+    """Testes da carga em lote e do acompanhamento das transações"""
+    
+    @pytest.fixture
+    def autocompletar(self, db_session):
+        """Autocompletar ligado à sessão de teste"""
+        autocompletar = Autocompletar()
+        db_session.info[AUTOCOMPLETAR] = autocompletar
+        return autocompletar
+    
+    def test_carga_e_popularidade(self, db_session, autocompletar, livro, usuario):
+        """Testa a carga inicial, as consultas em memória e os empréstimos novos"""
+        LivroRepository(db_session).criar(Livro(titulo="Dom Quixote", autor_id=livro.autor_id))
+        db_session.add(Emprestimo(
+            livro_id=livro.id, usuario_id=usuario.id,
+            data_emprestimo=date.today(), data_prevista_devolucao=date.today() + timedelta(days=14)
+        ))
+        db_session.commit()
+        servico = LivroService(db_session)
+        
+        assert [s.texto for s in servico.sugerir_titulos("dom")] == ["Dom Casmurro", "Dom Quixote"]
+        with capturar_consultas(db_session.get_bind()) as consultas:
+            servico.sugerir_titulos("dom q")
+        assert consultas == []
+        
+        quixote = servico.sugerir_titulos("dom q")[0]
+        for _ in range(2):
+            db_session.add(Emprestimo(
+                livro_id=quixote.id, usuario_id=usuario.id,
+                data_emprestimo=date.today(), data_prevista_devolucao=date.today() + timedelta(days=14)
+            ))
+            db_session.commit()
+        assert servico.sugerir_titulos("dom") == [(quixote.id, "Dom Quixote", 2), (livro.id, "Dom Casmurro", 1)]
+        assert AutorService(db_session).sugerir_nomes("mach") == [(livro.autor_id, "Machado de Assis", 3)]
+        assert autocompletar.recargas == 1
+    
+    def test_acompanha_commits_e_descarta_rollbacks(self, db_session, autocompletar, livro):
+        """Testa renomear, remover, desfazer e gravar em lote"""
+        servico = LivroService(db_session)
+        servico.sugerir_titulos("dom")
+        
+        livro.titulo = "Casmurro"
+        db_session.commit()
+        assert servico.sugerir_titulos("dom") == []
+        assert [s.texto for s in servico.sugerir_titulos("casm")] == ["Casmurro"]
+        
+        db_session.add(Livro(titulo="Rascunho", autor_id=livro.autor_id))
+        db_session.flush()
+        db_session.rollback()
+        assert servico.sugerir_titulos("rasc") == []
+        
+        AutorService(db_session).criar_autor(Autor(nome="Aluísio Azevedo"))
+        assert [s.texto for s in AutorService(db_session).sugerir_nomes("aluisio")] == ["Aluísio Azevedo"]
+        
+        LivroRepository(db_session).deletar(livro.id)
+        assert servico.sugerir_titulos("casm") == []
+        
+        LivroRepository(db_session).criar_em_lote([Livro(titulo="O Cortiço", autor_id=livro.autor_id)])
+        assert [s.texto for s in servico.sugerir_titulos("o cort")] == ["O Cortiço"]
+        assert autocompletar.recargas == 1
+    
+    def test_gravacoes_em_massa_sem_recarga(self, db_session, autocompletar, livro, usuario):
+        """Testa que INSERT, UPDATE e DELETE em massa atualizam o índice entrada a entrada"""
+        repo = LivroRepository(db_session)
+        servico = LivroService(db_session)
+        servico.sugerir_titulos("dom")
+        
+        ids = repo.criar_em_lote([Livro(titulo=f"Memórias {i}", autor_id=livro.autor_id) for i in range(3)])
+        repo.atualizar_em_massa({"id": ids[0]}, {"titulo": "Esaú e Jacó"})
+        repo.atualizar_em_massa({"id": ids[1]}, {"editora": "Garnier"})
+        repo.deletar_em_massa({"id": ids[2]})
+        EmprestimoRepository(db_session).criar_em_lote([
+            Emprestimo(livro_id=ids[1], usuario_id=usuario.id,
+                       data_emprestimo=date.today(), data_prevista_devolucao=date.today() + timedelta(days=14))
+            for _ in range(2)
+        ])
+        
+        assert servico.sugerir_titulos("esau") == [(ids[0], "Esaú e Jacó", 0)]
+        assert servico.sugerir_titulos("memorias") == [(ids[1], "Memórias 1", 2)]
+        assert AutorService(db_session).sugerir_nomes("mach")[0].popularidade == 2
+        assert autocompletar.recargas == 1
+    
+    def test_sem_autocompletar_consulta_o_banco(self, db_session, livro):
+        """Testa a busca por prefixo no banco quando o autocompletar não está configurado"""
+        assert LivroService(db_session).sugerir_titulos("DOM") == [(livro.id, "Dom Casmurro", 0)]
+    
+    def test_configurado_em_database_config(self, tmp_path):
+        """Testa o bloco autocomplete da configuração e as métricas"""
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps({"database": {
+            "url": f"sqlite:///{tmp_path / 'autocompletar.db'}",
+            "autocomplete": {"max_itens": 100}
+        }}), encoding="utf-8")
+        config = DatabaseConfig(str(config_path))
+        Base.metadata.create_all(bind=config.engine)
+        
+        session = config.get_session()
+        AutorService(session).criar_autor(Autor(nome="Rachel de Queiroz"))
+        assert [s.texto for s in AutorService(session).sugerir_nomes("rach")] == ["Rachel de Queiroz"]
+        assert config.get_autocomplete_stats()["autores"] == 1
+        session.close()
+        config.dispose()
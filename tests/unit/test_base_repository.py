@@ -4,6 +4,7 @@ Testes unitários para BaseRepository
 import pytest
 
 from src.repositories.base_repository import BaseRepository
+from src.repositories.paginacao import campo_ordenacao, criterios_pagina
 from src.repositories.autor_repository import AutorRepository
 from src.models.autor import Autor
 
@@ -84,4 +85,225 @@ class TestBaseRepository:
         
         resultados = repo.buscar_com_filtros(filtros, skip=2, limit=2)
         assert len(resultados) <= 2
-
+    
+    
+    def test_criar_em_lote(self, db_session):
+        """Testa a criação em blocos com um commit e um INSERT por bloco"""
+        from sqlalchemy import event
+        repo = AutorRepository(db_session)
+        commits, inserts = [], []
+        event.listen(db_session, "after_commit", lambda session: commits.append(1))
+        event.listen(
+            db_session.get_bind(), "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statement.startswith("INSERT") and inserts.append(1)
+        )
+        
+        autores = [Autor(nome=f"Autor {i}") for i in range(7)]
+        ids = repo.criar_em_lote(autores, tamanho_lote=3)
+        
+        assert len(ids) == 7 and len(set(ids)) == 7
+        assert len(commits) == 3
+        assert len(inserts) == 3
+        assert [a.nome for a in repo.listar_todos()] == [f"Autor {i}" for i in range(7)]
+        
+        with pytest.raises(ValueError):
+            repo.criar_em_lote(autores, tamanho_lote=0)
+    
+    def test_ids_existentes(self, db_session):
+        """Testa a verificação de IDs por conjunto"""
+        repo = AutorRepository(db_session)
+        ids = repo.criar_em_lote([Autor(nome="A"), Autor(nome="B")])
+        
+        assert repo.ids_existentes(ids + [999]) == set(ids)
+        assert repo.ids_existentes([]) == set()
+    
+    def _percorrer(self, repo, **kwargs):
+        """Percorre todas as páginas e devolve os IDs na ordem recebida"""
+        ids, cursor = [], None
+        while True:
+            pagina = repo.buscar_pagina({}, cursor, limit=3, **kwargs)
+            ids.extend(a.id for a in pagina)
+            if not pagina.tem_proxima:
+                return ids
+            cursor = pagina.proximo_cursor
+    
+    def test_paginacao_por_cursor(self, db_session):
+        """Testa que as páginas cobrem todos os registros, na ordem, sem repetição"""
+        repo = AutorRepository(db_session)
+        nomes = ["C", "A", "B", "A", "C", "B", "A"]
+        nacionalidades = [None, "BR", None, "PT", "BR", None, "AR"]
+        autores = [Autor(nome=n, nacionalidade=x) for n, x in zip(nomes, nacionalidades)]
+        repo.criar_em_lote(autores)
+        
+        for campo in (None, "nome", "nacionalidade"):
+            for desc in (False, True):
+                esperado = [
+                    a.id for a in db_session.query(Autor).order_by(
+                        *criterios_pagina(Autor, campo_ordenacao(Autor, campo), desc)
+                    )
+                ]
+                assert self._percorrer(repo, ordenar_por=campo, ordem_desc=desc) == esperado
+        
+        primeira = repo.listar_pagina(limit=7)
+        assert len(primeira) == 7 and not primeira.tem_proxima
+    
+    def test_paginacao_com_filtros(self, db_session):
+        """Testa que o cursor respeita os filtros"""
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([Autor(nome=f"Autor {i}", nacionalidade="BR" if i % 2 else "PT") for i in range(10)])
+        
+        pagina = repo.buscar_pagina({"nacionalidade": "BR"}, limit=3, ordenar_por="nome")
+        segunda = repo.buscar_pagina({"nacionalidade": "BR"}, pagina.proximo_cursor, limit=3, ordenar_por="nome")
+        
+        assert [a.nome for a in pagina] == ["Autor 1", "Autor 3", "Autor 5"]
+        assert [a.nome for a in segunda] == ["Autor 7", "Autor 9"]
+        assert not segunda.tem_proxima
+    
+    def test_cursor_invalido(self, db_session):
+        """Testa a rejeição de cursores corrompidos ou de outra ordenação"""
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([Autor(nome=f"Autor {i}") for i in range(3)])
+        cursor = repo.listar_pagina(limit=1, ordenar_por="nome").proximo_cursor
+        
+        with pytest.raises(ValueError):
+            repo.listar_pagina(cursor="não é um cursor")
+        with pytest.raises(ValueError):
+            repo.listar_pagina(cursor=cursor, ordenar_por="nome", ordem_desc=True)
+    
+    def test_iterar_em_fluxo(self, db_session):
+        """Testa que a iteração lê em blocos e não acumula entidades na sessão"""
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([Autor(nome=f"Autor {i:02d}", nacionalidade="BR" if i % 2 else "PT") for i in range(20)])
+        db_session.expunge_all()
+        existente = repo.buscar_por_id(1)
+        
+        maior_sessao = 0
+        nomes = []
+        for autor in repo.iterar(chunk_size=4, ordenar_por="nome", ordem_desc=True):
+            nomes.append(autor.nome)
+            maior_sessao = max(maior_sessao, len(db_session.identity_map))
+        
+        assert nomes == [f"Autor {i:02d}" for i in reversed(range(20))]
+        assert maior_sessao <= 5
+        assert existente in db_session
+        assert [a.nome for a in repo.iterar({"nacionalidade": "BR"}, chunk_size=3)][:2] == ["Autor 01", "Autor 03"]
+        
+        with pytest.raises(ValueError):
+            list(repo.iterar(chunk_size=0))
+    
+    def test_atualizar_em_massa(self, db_session):
+        """Testa o UPDATE por filtro com um único comando e a sincronização da sessão"""
+        from sqlalchemy import event
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([Autor(nome=f"Autor {i}", nacionalidade="BR") for i in range(5)])
+        carregado = repo.buscar_por_id(2)
+        updates = []
+        event.listen(
+            db_session.get_bind(), "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statement.startswith("UPDATE") and updates.append(1)
+        )
+        
+        afetados = repo.atualizar_em_massa({"id": {"gte": 2}, "nome": {"like": "Autor%"}}, {"nacionalidade": "PT"})
+        
+        assert afetados == 4
+        assert len(updates) == 1
+        assert carregado.nacionalidade == "PT"
+        assert [a.nacionalidade for a in repo.listar_todos()] == ["BR", "PT", "PT", "PT", "PT"]
+        
+        with pytest.raises(ValueError):
+            repo.atualizar_em_massa({"id": 1}, {"inexistente": 1})
+        with pytest.raises(ValueError):
+            repo.atualizar_em_massa({}, {"nacionalidade": "AR"})
+    
+    def test_deletar_em_massa(self, db_session):
+        """Testa o DELETE por filtro e a remoção das entidades da sessão"""
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([Autor(nome=f"Autor {i}", nacionalidade="BR" if i < 3 else "PT") for i in range(5)])
+        carregado = repo.buscar_por_id(1)
+        
+        assert repo.deletar_em_massa({"nacionalidade": "BR"}) == 3
+        assert carregado not in db_session
+        assert [a.nacionalidade for a in repo.listar_todos()] == ["PT", "PT"]
+        assert repo.deletar_em_massa({"nacionalidade": "BR"}) == 0
+        
+        with pytest.raises(ValueError):
+            repo.deletar_em_massa({"campo_inexistente": 1})
+    
+    def test_contar_e_existe(self, db_session):
+        """Testa contagem e existência por filtro sem carregar entidades"""
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([Autor(nome=f"Autor {i}", nacionalidade="BR" if i < 3 else "PT") for i in range(5)])
+        db_session.expunge_all()
+        
+        assert repo.contar() == 5
+        assert repo.contar({"nacionalidade": "BR"}) == 3
+        assert repo.contar({"nome": {"like": "Nada%"}}) == 0
+        assert repo.existe({"nacionalidade": "PT"}) is True
+        assert repo.existe({"nacionalidade": "AR"}) is False
+        assert len(db_session.identity_map) == 0
+    
+    def test_projecao_de_campos(self, db_session):
+        """Testa consultas que devolvem linhas leves só com as colunas pedidas"""
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([Autor(nome=f"Autor {i}", nacionalidade="BR", biografia="x" * 500) for i in range(5)])
+        db_session.expunge_all()
+        
+        linhas = repo.listar_todos(campos=["id", "nome"])
+        assert [tuple(l) for l in linhas[:2]] == [(1, "Autor 0"), (2, "Autor 1")]
+        assert not hasattr(linhas[0], "__dict__") and not hasattr(linhas[0], "biografia")
+        assert len(db_session.identity_map) == 0
+        
+        filtradas = repo.buscar_com_filtros({"id": {"gt": 3}}, campos=("nome",), ordenar_por="nome", ordem_desc=True)
+        assert [l.nome for l in filtradas] == ["Autor 4", "Autor 3"]
+        assert [l.nome for l in repo.iterar(campos=["nome"], chunk_size=2)] == [f"Autor {i}" for i in range(5)]
+        
+        pagina = repo.listar_pagina(limit=2, ordenar_por="nome", campos=["nome"])
+        assert pagina.itens[0]._fields == ("nome", "id")
+        segunda = repo.listar_pagina(pagina.proximo_cursor, limit=2, ordenar_por="nome", campos=["nome"])
+        assert [l.id for l in segunda] == [3, 4]
+        
+        with pytest.raises(ValueError):
+            repo.listar_todos(campos=["nome", "livros"])
+        with pytest.raises(ValueError):
+            repo.buscar_com_filtros({}, campos=[])
+    
+    def test_operadores_de_filtro(self, db_session):
+        """Testa in, between, ne, isnull, prefixo e grupos ou"""
+        from datetime import date
+        repo = AutorRepository(db_session)
+        repo.criar_em_lote([
+            Autor(nome="Machado de Assis", nacionalidade="BR", data_nascimento=date(1839, 6, 21)),
+            Autor(nome="Machado Filho", nacionalidade="PT"),
+            Autor(nome="Clarice Lispector", nacionalidade="BR", data_nascimento=date(1920, 12, 10)),
+            Autor(nome="machado minúsculo", nacionalidade="AR"),
+        ])
+        
+        def nomes(filtros):
+            return sorted(a.nome for a in repo.buscar_com_filtros(filtros))
+        
+        assert nomes({"nome": {"prefixo": "Machado"}}) == ["Machado Filho", "Machado de Assis"]
+        assert nomes({"nacionalidade": {"in": ["PT", "AR"]}}) == ["Machado Filho", "machado minúsculo"]
+        assert nomes({"data_nascimento": {"between": [date(1800, 1, 1), date(1900, 1, 1)]}}) == ["Machado de Assis"]
+        assert nomes({"nacionalidade": {"ne": "BR"}, "data_nascimento": {"isnull": True}}) == [
+            "Machado Filho", "machado minúsculo"
+        ]
+        assert nomes({"ou": [{"nacionalidade": "PT"}, {"nome": {"prefixo": "Cla"}}]}) == [
+            "Clarice Lispector", "Machado Filho"
+        ]
+        assert len(nomes({"ou": [{"nacionalidade": "PT"}, {}]})) == 4
+        
+        with pytest.raises(ValueError):
+            repo.buscar_com_filtros({"nome": {"contem": "x"}})
+        with pytest.raises(ValueError):
+            repo.buscar_com_filtros({"data_nascimento": {"between": [date(1800, 1, 1)]}})
+        with pytest.raises(ValueError):
+            repo.buscar_com_filtros({"ou": {"nome": "x"}})
+    
+    def test_plano_de_filtros_em_cache(self):
+        """Testa que filtros com a mesma forma reaproveitam a tradução"""
+        from src.repositories.filtros import condicoes_filtros, plano_filtros
+        condicoes_filtros(Autor, {"nome": {"prefixo": "A"}, "id": {"in": [1]}})
+        antes = plano_filtros.cache_info()
+        condicoes_filtros(Autor, {"nome": {"prefixo": "B"}, "id": {"in": [1, 2, 3]}})
+        depois = plano_filtros.cache_info()
+        assert depois.hits == antes.hits + 1 and depois.misses == antes.misses
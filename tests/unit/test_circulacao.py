@@ -0,0 +1,127 @@
+"""
+Testes unitários para os contadores de circulação de livros e usuários
+"""
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.database.init_db import adicionar_colunas
+from src.database.query_plan import capturar_consultas
+from src.exceptions.biblioteca_exceptions import LimiteEmprestimosException
+from src.models.emprestimo import Emprestimo
+from src.models.emprestimo_arquivado import EmprestimoArquivado
+from src.models.livro import Livro
+from src.models.usuario import Usuario
+from src.repositories.livro_repository import LivroRepository
+from src.services.emprestimo_service import EmprestimoService
+
+
+class TestContadoresNoServico:
+    """Testes da manutenção dos contadores por EmprestimoService"""
+    
+    def test_emprestimo_e_devolucao_com_multa(self, db_session, emprestimo_service, livro, usuario):
+        """Testa os contadores após empréstimo e devolução em atraso"""
+        emprestimo = emprestimo_service.criar_emprestimo(livro.id, usuario.id)
+        assert (livro.total_emprestimos, livro.emprestimos_ativos, livro.ultimo_emprestimo_em) == (1, 1, date.today())
+        assert (usuario.total_emprestimos, usuario.emprestimos_ativos) == (1, 1)
+        
+        emprestimo.data_prevista_devolucao = date.today() - timedelta(days=4)
+        db_session.commit()
+        emprestimo_service.devolver_emprestimo(emprestimo.id)
+        db_session.expire_all()
+        
+        assert (livro.total_emprestimos, livro.emprestimos_ativos) == (1, 0)
+        assert (usuario.total_emprestimos, usuario.emprestimos_ativos) == (1, 0)
+        assert float(usuario.multas_pendentes) == 10.0
+    
+    def test_limite_pelo_contador(self, db_session, emprestimo_service, livro, usuario):
+        """Testa que o limite é verificado pelo contador, sem contar empréstimos"""
+        usuario.emprestimos_ativos = emprestimo_service.max_emprestimos
+        db_session.commit()
+        
+        with capturar_consultas(db_session.get_bind()) as consultas:
+            with pytest.raises(LimiteEmprestimosException):
+                emprestimo_service.criar_emprestimo(livro.id, usuario.id)
+        assert not any("FROM emprestimos" in sql for sql, _ in consultas)
+        assert usuario.pode_emprestar() is False
+    
+    def test_incrementos_concorrentes_somados(self, db_session, livro, usuario):
+        """Testa que instâncias desatualizadas não sobrescrevem o incremento uma da outra"""
+        outra_sessao = Session(bind=db_session.get_bind())
+        try:
+            outro_livro, outro_usuario = outra_sessao.get(Livro, livro.id), outra_sessao.get(Usuario, usuario.id)
+            livro.registrar_emprestimo(date.today())
+            usuario.registrar_emprestimo()
+            db_session.commit()
+            outro_livro.registrar_emprestimo(date.today())
+            outro_usuario.registrar_devolucao(2.5)
+            outra_sessao.commit()
+        finally:
+            outra_sessao.close()
+        
+        db_session.expire_all()
+        assert (livro.total_emprestimos, livro.emprestimos_ativos) == (2, 2)
+        assert (usuario.total_emprestimos, usuario.emprestimos_ativos) == (1, 0)
+        assert float(usuario.multas_pendentes) == 2.5
+    
+    def test_mais_emprestados(self, db_session, emprestimo_service, livro, usuario, autor):
+        """Testa o ranking pelo contador total_emprestimos"""
+        outro = Livro(titulo="Quincas Borba", autor_id=autor.id, quantidade_total=3, quantidade_disponivel=3)
+        db_session.add(outro)
+        db_session.commit()
+        for _ in range(2):
+            emprestimo_service.criar_emprestimo(outro.id, usuario.id)
+        emprestimo_service.criar_emprestimo(livro.id, usuario.id)
+        
+        assert LivroRepository(db_session).buscar_mais_emprestados() == [outro, livro]
+        assert LivroRepository(db_session).buscar_mais_emprestados(limit=1) == [outro]
+
+
+class TestReconciliacao:
+    """Testes da reconstrução em lote dos contadores"""
+    
+    def test_reconcilia_com_arquivo(self, db_session, livro, usuario):
+        """Testa que os contadores são recalculados a partir dos empréstimos e do arquivo"""
+        hoje = date.today()
+        db_session.add_all([
+            Emprestimo(livro_id=livro.id, usuario_id=usuario.id, data_emprestimo=hoje,
+                       data_prevista_devolucao=hoje + timedelta(days=14)),
+            Emprestimo(livro_id=livro.id, usuario_id=usuario.id, data_emprestimo=hoje - timedelta(days=30),
+                       data_prevista_devolucao=hoje - timedelta(days=16), data_devolucao=hoje,
+                       devolvido=True, multa=40),
+            EmprestimoArquivado(id=99, livro_id=livro.id, usuario_id=usuario.id,
+                                data_emprestimo=date(2020, 1, 1), data_prevista_devolucao=date(2020, 1, 15),
+                                multa=2.5),
+        ])
+        db_session.commit()
+        assert livro.total_emprestimos == 0
+        
+        totais = EmprestimoService(db_session).reconciliar_contadores()
+        
+        assert totais == {"livros": 1, "usuarios": 1}
+        assert (livro.total_emprestimos, livro.emprestimos_ativos, livro.ultimo_emprestimo_em) == (3, 1, hoje)
+        assert (usuario.total_emprestimos, usuario.emprestimos_ativos) == (3, 1)
+        assert float(usuario.multas_pendentes) == 42.5
+    
+    def test_livro_sem_emprestimos(self, db_session, livro):
+        """Testa que livros nunca emprestados ficam zerados"""
+        livro.total_emprestimos = 7
+        livro.ultimo_emprestimo_em = date(2020, 1, 1)
+        db_session.commit()
+        
+        EmprestimoService(db_session).reconciliar_contadores()
+        assert (livro.total_emprestimos, livro.emprestimos_ativos, livro.ultimo_emprestimo_em) == (0, 0, None)
+    
+    def test_colunas_adicionadas_em_banco_existente(self, db_session, livro):
+        """Testa que adicionar_colunas cria os contadores que faltam, com o valor padrão"""
+        engine = db_session.get_bind()
+        db_session.close()
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_livros_total_emprestimos"))
+            conn.execute(text("ALTER TABLE livros DROP COLUMN total_emprestimos"))
+        
+        assert adicionar_colunas(engine) == ["livros.total_emprestimos"]
+        assert adicionar_colunas(engine) == []
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT total_emprestimos FROM livros")).scalar() == 0
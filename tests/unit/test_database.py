@@ -46,12 +46,365 @@ class TestDatabaseConfig:
         assert "database" in config.config
         assert config.engine is not None
     
+    def test_perfil_performance_aplicado(self, tmp_path):
+        """Testa que o perfil de performance é aplicado em cada conexão"""
+        import json
+        config_data = {
+            "database": {
+                "url": f"sqlite:///{tmp_path / 'perf.db'}",
+                "performance": {
+                    "journal_mode": "wal",
+                    "synchronous": "NORMAL",
+                    "mmap_size": 1048576,
+                    "cache_size": -2000,
+                    "temp_store": "MEMORY",
+                    "busy_timeout": 3000
+                }
+            }
+        }
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
+        
+        config = DatabaseConfig(str(config_path))
+        pragmas = config.get_effective_pragmas()
+        
+        assert pragmas["journal_mode"] == "wal"
+        assert pragmas["synchronous"] == 1
+        assert pragmas["mmap_size"] == 1048576
+        assert pragmas["cache_size"] == -2000
+        assert pragmas["temp_store"] == 2
+        assert pragmas["busy_timeout"] == 3000
+        config.engine.dispose()
+    
+    def test_perfil_performance_valor_invalido(self, tmp_path):
+        """Testa que valores inválidos no perfil são rejeitados"""
+        import json
+        config_data = {
+            "database": {
+                "url": "sqlite:///:memory:",
+                "performance": {"journal_mode": "WAL; DROP TABLE livros"}
+            }
+        }
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
+        
+        config = DatabaseConfig(str(config_path))
+        with pytest.raises(ValueError):
+            config.engine
+    
     def test_get_session(self):
         """Testa obtenção de sessão"""
         config = DatabaseConfig()
         session = config.get_session()
         assert session is not None
         session.close()
+    
+    def test_config_preguicosa(self):
+        """Testa que nada é lido nem criado antes do primeiro uso"""
+        config = DatabaseConfig("config/nao_existe.json")
+        assert config._config is None
+        assert not config.is_initialized
+        
+        config.get_session().close()
+        assert config.is_initialized
+    
+    def test_engine_recriada_apos_fork(self, monkeypatch):
+        """Testa que um processo filho não reutiliza a engine herdada"""
+        config = DatabaseConfig("config/nao_existe.json")
+        engine_pai = config.engine
+        
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+        assert not config.is_initialized
+        assert config.engine is not engine_pai
+    
+    def test_dispose_sem_replica_recria_sessoes(self):
+        """Testa que dispose descarta a fábrica de sessões mesmo sem réplica"""
+        config = DatabaseConfig("config/nao_existe.json")
+        config.get_session().close()
+        engine_anterior = config.engine
+        
+        config.dispose()
+        assert config._session_factory is None and config._pid is None
+        session = config.get_session()
+        assert session.get_bind() is config.engine is not engine_anterior
+        session.close()
+
+
+class TestEngineRegistry:
+    """Testes para EngineRegistry"""
+    
+    def test_bancos_nomeados(self, tmp_path):
+        """Testa que bancos nomeados coexistem com engines independentes"""
+        import json
+        from src.database.config import EngineRegistry
+        
+        config_data = {
+            "database": {"url": "sqlite:///:memory:"},
+            "databases": {"relatorios": {"url": f"sqlite:///{tmp_path / 'relatorios.db'}"}}
+        }
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
+        
+        registry = EngineRegistry(str(config_path))
+        assert registry.get() is registry.get("default")
+        assert registry.get("relatorios").engine is not registry.get().engine
+        assert "relatorios" in str(registry.get("relatorios").engine.url)
+        assert set(registry.names()) == {"default", "relatorios"}
+        
+        with pytest.raises(KeyError):
+            registry.get("inexistente").engine
+        
+        registry.dispose_all()
+        assert not registry.get("relatorios").is_initialized
+
+
+class TestCacheConsultas:
+    """Testes para o cache de instruções compiladas"""
+    
+    @staticmethod
+    def _config(tmp_path, **database):
+        import json
+        config_data = {"database": dict({"url": f"sqlite:///{tmp_path / 'cache.db'}"}, **database)}
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
+        return DatabaseConfig(str(config_path))
+    
+    def test_tamanho_configuravel(self, tmp_path):
+        """Testa que query_cache_size chega à engine"""
+        config = self._config(tmp_path, query_cache_size=50)
+        assert config.get_query_cache_stats()["capacidade"] == 50
+        config.dispose()
+    
+    def test_tamanho_invalido(self, tmp_path):
+        """Testa que tamanhos inválidos são rejeitados"""
+        config = self._config(tmp_path, query_cache_size=-1)
+        with pytest.raises(ValueError):
+            config.engine
+    
+    def test_aquecimento_evita_recompilacao(self, tmp_path):
+        """Testa que, após o aquecimento, as consultas quentes não recompilam"""
+        from sqlalchemy import create_engine
+        from src.database.query_cache import REPOSITORIOS
+        from src.repositories.livro_repository import LivroRepository
+        from src.repositories.emprestimo_repository import EmprestimoRepository
+        
+        engine_schema = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+        Base.metadata.create_all(bind=engine_schema)
+        engine_schema.dispose()
+        
+        config = self._config(tmp_path, warmup=True)
+        esperadas = sum(len(classe.CONSULTAS_QUENTES) for classe in REPOSITORIOS)
+        assert config.get_query_cache_stats()["aquecidas"] == esperadas
+        
+        session = config.get_session()
+        LivroRepository(session).buscar_disponiveis()
+        LivroRepository(session).buscar_por_id(42)
+        EmprestimoRepository(session).buscar_atrasados()
+        session.close()
+        
+        estatisticas = config.get_query_cache_stats()
+        assert estatisticas["falhas"] == 0
+        assert estatisticas["acertos"] == 3
+        config.dispose()
+    
+    def test_aquecimento_sem_tabelas(self, tmp_path):
+        """Testa que o aquecimento não falha em um banco ainda vazio"""
+        config = self._config(tmp_path, warmup=True)
+        assert config.get_query_cache_stats()["aquecidas"] == 0
+        config.dispose()
+
+
+class TestFiliais:
+    """Testes para os bancos por filial do EngineRegistry"""
+    
+    @pytest.fixture
+    def registry_filiais(self, tmp_path):
+        """Registro com filiais em arquivos separados e no máximo 2 engines abertas"""
+        import json
+        from src.database.config import EngineRegistry
+        
+        config_data = {
+            "database": {"url": "sqlite:///:memory:", "performance": {"busy_timeout": 1000}},
+            "filiais": {"url": f"sqlite:///{tmp_path}/filiais/{{filial}}.db", "max_engines": 2, "pool_size": 1}
+        }
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
+        
+        registry = EngineRegistry(str(config_path))
+        yield registry
+        registry.dispose_all()
+    
+    def test_filiais_isoladas(self, registry_filiais, tmp_path):
+        """Testa que cada filial tem seu próprio arquivo e herda o perfil de performance"""
+        centro = registry_filiais.get_filial("centro")
+        norte = registry_filiais.get_filial("norte")
+        
+        assert centro is registry_filiais.get_filial("centro")
+        assert str(centro.engine.url).endswith("filiais/centro.db")
+        assert str(norte.engine.url).endswith("filiais/norte.db")
+        assert (tmp_path / "filiais").is_dir()
+        assert centro.get_effective_pragmas()["busy_timeout"] == 1000
+    
+    def test_despejo_lru(self, registry_filiais):
+        """Testa que a filial usada há mais tempo é descartada acima do limite"""
+        centro = registry_filiais.get_filial("centro")
+        centro.engine
+        registry_filiais.get_filial("norte")
+        registry_filiais.get_filial("centro")
+        registry_filiais.get_filial("sul")
+        
+        assert registry_filiais.filiais() == ["centro", "sul"]
+        
+        registry_filiais.get_filial("leste")
+        assert registry_filiais.filiais() == ["sul", "leste"]
+        assert not centro.is_initialized
+    
+    def test_filial_fixada_nao_e_despejada(self, registry_filiais):
+        """Testa que filiais fixadas sobrevivem ao despejo"""
+        registry_filiais.fixar("centro")
+        registry_filiais.get_filial("norte")
+        registry_filiais.get_filial("sul")
+        assert "centro" in registry_filiais.filiais()
+        
+        registry_filiais.liberar("centro")
+        registry_filiais.get_filial("leste")
+        assert "centro" not in registry_filiais.filiais()
+    
+    def test_identificador_invalido(self, registry_filiais):
+        """Testa que identificadores que não são nomes de arquivo seguros são rejeitados"""
+        with pytest.raises(ValueError):
+            registry_filiais.get_filial("../outro")
+    
+    def test_sem_filiais_configuradas(self):
+        """Testa o erro quando o bloco filiais não existe"""
+        from src.database.config import EngineRegistry
+        with pytest.raises(KeyError):
+            EngineRegistry("config/nao_existe.json").get_filial("centro")
+    
+    def test_contexto_filial(self, registry_filiais):
+        """Testa que os serviços do contexto gravam apenas no banco da filial"""
+        from src.services.contexto_filial import ContextoFilial
+        from src.models.autor import Autor
+        
+        for filial_id in ("centro", "norte"):
+            engine = registry_filiais.get_filial(filial_id).engine
+            Base.metadata.create_all(bind=engine)
+        
+        with ContextoFilial("centro", registry_filiais) as filial:
+            filial.autor_service.criar_autor(Autor(nome="Machado de Assis"))
+            assert registry_filiais._fixacoes == {"centro": 1}
+        
+        assert registry_filiais._fixacoes == {}
+        with pytest.raises(RuntimeError):
+            filial.session
+        
+        with ContextoFilial("centro", registry_filiais) as filial:
+            assert len(filial.autor_service.listar_todos()) == 1
+        with ContextoFilial("norte", registry_filiais) as filial:
+            assert filial.autor_service.listar_todos() == []
+
+
+class TestReplicaLeitura:
+    """Testes para o roteamento de leituras para a réplica"""
+    
+    @pytest.fixture
+    def config_replica(self, tmp_path):
+        """Configuração com primário em arquivo e réplica mode=ro do mesmo arquivo"""
+        import json
+        arquivo = tmp_path / "primario.db"
+        config_data = {
+            "database": {
+                "url": f"sqlite:///{arquivo}",
+                "performance": {"journal_mode": "WAL", "busy_timeout": 1000},
+                "replica": {"url": f"sqlite:///file:{arquivo}?mode=ro&uri=true"}
+            }
+        }
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps(config_data), encoding="utf-8")
+        
+        config = DatabaseConfig(str(config_path))
+        Base.metadata.create_all(bind=config.engine)
+        yield config
+        config.dispose()
+    
+    @staticmethod
+    def _registrar(engine, destino, nome):
+        from sqlalchemy import event
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: destino.append((nome, statement.split()[0])))
+    
+    def test_leituras_na_replica_e_escritas_no_primario(self, config_replica):
+        """Testa que leituras fora de transação vão para a réplica e escritas para o primário"""
+        from src.database.routing import RoutingSession
+        from src.models.autor import Autor
+        from src.repositories.autor_repository import AutorRepository
+        
+        execucoes = []
+        self._registrar(config_replica.engine, execucoes, "primario")
+        self._registrar(config_replica.replica_engine, execucoes, "replica")
+        
+        session = config_replica.get_session()
+        assert isinstance(session, RoutingSession)
+        repo = AutorRepository(session)
+        
+        autor = repo.criar(Autor(nome="Machado de Assis"))
+        assert ("primario", "INSERT") in execucoes
+        
+        execucoes.clear()
+        assert [a.nome for a in repo.listar_todos()] == ["Machado de Assis"]
+        assert execucoes == [("replica", "SELECT")]
+        
+        execucoes.clear()
+        autor.nome = "Joaquim Maria Machado de Assis"
+        repo.atualizar(autor)
+        assert ("primario", "UPDATE") in execucoes
+        assert all(instrucao == "SELECT" for nome, instrucao in execucoes if nome == "replica")
+        session.close()
+    
+    def test_le_as_proprias_escritas_na_unidade_de_trabalho(self, config_replica):
+        """Testa que, dentro da unidade de trabalho, as leituras vão para o primário"""
+        from src.database.unit_of_work import UnitOfWork
+        from src.models.autor import Autor
+        from src.repositories.autor_repository import AutorRepository
+        
+        execucoes = []
+        self._registrar(config_replica.replica_engine, execucoes, "replica")
+        
+        session = config_replica.get_session()
+        repo = AutorRepository(session)
+        with UnitOfWork(session):
+            repo.criar(Autor(nome="Clarice Lispector"))
+            assert len(repo.listar_todos()) == 1
+        assert execucoes == []
+        
+        # Escrita ainda não confirmada fora de uma unidade de trabalho
+        session.add(Autor(nome="Jorge Amado"))
+        session.flush()
+        assert len(repo.listar_todos()) == 2
+        assert execucoes == []
+        session.rollback()
+        
+        assert len(repo.listar_todos()) == 1
+        assert execucoes == [("replica", "SELECT")]
+        session.close()
+    
+    def test_replica_recusa_escritas(self, config_replica):
+        """Testa que a conexão da réplica é somente leitura"""
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+        
+        with config_replica.replica_engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO autores (nome) VALUES ('X')"))
+    
+    def test_sem_replica_usa_sessao_comum(self):
+        """Testa que, sem réplica configurada, a sessão não é roteada"""
+        from src.database.routing import RoutingSession
+        config = DatabaseConfig("config/nao_existe.json")
+        assert config.replica_engine is None
+        session = config.get_session()
+        assert not isinstance(session, RoutingSession)
+        session.close()
 
 
 class TestInitDatabase:
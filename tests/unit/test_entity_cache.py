@@ -0,0 +1,245 @@
+"""
+Testes unitários para o cache de entidades de buscar_por_id
+"""
+import json
+import pytest
+from datetime import date
+from sqlalchemy import event
+
+from src.database.base import Base
+from src.database.config import DatabaseConfig
+from src.database.entity_cache import CACHE_ENTIDADES, CacheEntidades
+from src.database.query_plan import capturar_consultas
+from src.database.unit_of_work import UnitOfWork
+from src.models.autor import Autor
+from src.models.categoria import Categoria
+from src.models.livro import Livro
+from src.models.usuario import Usuario
+from src.repositories.autor_repository import AutorRepository
+from src.repositories.categoria_repository import CategoriaRepository
+from src.repositories.livro_repository import LivroRepository
+from src.services.emprestimo_service import EmprestimoService
+
+
+class Relogio:
+    """Relógio manual para testar a validade das entradas"""
+    
+    def __init__(self) -> None:
+        self.agora = 0.0
+    
+    def __call__(self) -> float:
+        return self.agora
+
+
+class TestCacheEntidades:
+    """Testes para CacheEntidades"""
+    
+    def test_lru_e_ttl(self):
+        """Testa o descarte da entrada menos usada e a expiração"""
+        relogio = Relogio()
+        cache = CacheEntidades(max_itens=2, ttl=10, modelos=["Autor"], relogio=relogio)
+        cache.guardar(Autor, 1, {"nome": "A"})
+        cache.guardar(Autor, 2, {"nome": "B"})
+        assert cache.obter(Autor, 1) == {"nome": "A"}
+        cache.guardar(Autor, 3, {"nome": "C"})
+        
+        assert cache.obter(Autor, 2) is None
+        relogio.agora = 10
+        assert cache.obter(Autor, 1) is None
+        assert cache.como_dict() == {
+            "acertos": 1, "falhas": 2, "expirados": 1, "descartados": 1,
+            "invalidacoes": 0, "recusados": 0, "taxa_acerto": 1 / 3, "itens": 1, "max_itens": 2,
+        }
+    
+    def test_guardar_recusado_apos_invalidacao(self):
+        """Testa que uma leitura anterior a uma invalidação não é guardada"""
+        cache = CacheEntidades(modelos=["Autor"])
+        geracao = cache.geracao
+        cache.invalidar("Autor", 1)
+        
+        assert cache.guardar(Autor, 1, {"nome": "Antigo"}, geracao) is False
+        assert cache.guardar(Autor, 1, {"nome": "Novo"}, cache.geracao) is True
+        assert cache.obter(Autor, 1) == {"nome": "Novo"}
+        assert cache.como_dict()["recusados"] == 1
+    
+    def test_parametros_invalidos(self):
+        """Testa que capacidade e validade precisam ser positivas"""
+        with pytest.raises(ValueError):
+            CacheEntidades(max_itens=0)
+        with pytest.raises(ValueError):
+            CacheEntidades(ttl=0)
+        assert CacheEntidades.de_config(None) is None
+
+
+class TestBuscarPorIdComCache:
+    """Testes da integração do cache com BaseRepository.buscar_por_id"""
+    
+    @pytest.fixture
+    def cache(self, db_session):
+        """Cache com Autor habilitado, ligado à sessão de teste"""
+        cache = CacheEntidades(modelos=["Autor"])
+        db_session.info[CACHE_ENTIDADES] = cache
+        return cache
+    
+    def test_acerto_sem_consulta(self, db_session, cache):
+        """Testa que a segunda busca, em sessão limpa, não vai ao banco"""
+        repo = AutorRepository(db_session)
+        autor_id = repo.criar(Autor(nome="Machado de Assis", nacionalidade="Brasileiro")).id
+        db_session.expunge_all()
+        
+        repo.buscar_por_id(autor_id)
+        db_session.expunge_all()
+        with capturar_consultas(db_session.get_bind()) as consultas:
+            autor = repo.buscar_por_id(autor_id)
+            assert autor.nacionalidade == "Brasileiro"
+        assert consultas == []
+        assert autor in db_session and len(autor.livros) == 0
+        assert cache.como_dict()["acertos"] == 1
+    
+    def test_invalidado_ao_atualizar_e_deletar(self, db_session, cache):
+        """Testa que atualizar, atualizar_em_massa e deletar invalidam a entrada"""
+        repo = AutorRepository(db_session)
+        autor_id = repo.criar(Autor(nome="Autor")).id
+        db_session.expunge_all()
+        
+        autor = repo.buscar_por_id(autor_id)
+        autor.nome = "Autor Revisado"
+        repo.atualizar(autor)
+        db_session.expunge_all()
+        assert repo.buscar_por_id(autor_id).nome == "Autor Revisado"
+        
+        repo.atualizar_em_massa({"id": autor_id}, {"nome": "Autor Final"})
+        db_session.expunge_all()
+        assert repo.buscar_por_id(autor_id).nome == "Autor Final"
+        
+        repo.deletar(autor_id)
+        db_session.expunge_all()
+        assert repo.buscar_por_id(autor_id) is None
+    
+    def test_escrita_desfeita_nao_entra_no_cache(self, db_session, cache):
+        """Testa que leituras de uma transação que já escreveu não alimentam o cache"""
+        repo = AutorRepository(db_session)
+        db_session.add(Autor(nome="Rascunho"))
+        db_session.flush()
+        assert repo.buscar_por_id(1) is not None
+        db_session.rollback()
+        
+        assert len(cache) == 0
+        assert repo.buscar_por_id(1) is None
+    
+    def test_unidade_de_trabalho_vai_ao_banco(self, db_session, cache):
+        """Testa que dentro de uma unidade de trabalho, ou para escrita, o cache é ignorado"""
+        repo = AutorRepository(db_session)
+        autor_id = repo.criar(Autor(nome="Autor")).id
+        db_session.expunge_all()
+        repo.buscar_por_id(autor_id)
+        db_session.expunge_all()
+        
+        with UnitOfWork(db_session):
+            with capturar_consultas(db_session.get_bind()) as consultas:
+                repo.buscar_por_id(autor_id)
+            assert len(consultas) == 1
+        db_session.expunge_all()
+        with capturar_consultas(db_session.get_bind()) as consultas:
+            repo.buscar_por_id(autor_id, para_escrita=True)
+        assert len(consultas) == 1
+        assert cache.como_dict()["acertos"] == 0
+    
+    def test_commit_entre_select_e_guardar(self, db_session, cache):
+        """Testa que a linha lida antes de um commit de outra sessão não é guardada"""
+        repo = AutorRepository(db_session)
+        autor_id = repo.criar(Autor(nome="Original")).id
+        db_session.expunge_all()
+        
+        def commit_concorrente(estado):
+            # Simula outra sessão confirmando uma alteração logo após o SELECT
+            if estado.is_select:
+                resultado = estado.invoke_statement()
+                cache.invalidar("Autor", autor_id)
+                return resultado
+        
+        event.listen(db_session, "do_orm_execute", commit_concorrente)
+        try:
+            assert repo.buscar_por_id(autor_id).nome == "Original"
+        finally:
+            event.remove(db_session, "do_orm_execute", commit_concorrente)
+        assert len(cache) == 0
+        assert cache.como_dict()["recusados"] == 1
+    
+    def test_modelo_nao_habilitado(self, db_session, cache):
+        """Testa que modelos fora da lista sempre vão ao banco"""
+        repo = CategoriaRepository(db_session)
+        categoria_id = repo.criar(Categoria(nome="Romance")).id
+        db_session.expunge_all()
+        
+        repo.buscar_por_id(categoria_id)
+        assert len(cache) == 0
+
+
+class TestCacheCompartilhado:
+    """Testes do cache configurado em DatabaseConfig e compartilhado entre sessões"""
+    
+    def test_commit_de_outra_sessao_invalida(self, tmp_path):
+        """Testa que a alteração confirmada por uma sessão é vista pelas demais"""
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps({"database": {
+            "url": f"sqlite:///{tmp_path / 'cache.db'}",
+            "entity_cache": {"max_itens": 100, "ttl": 60, "modelos": ["Autor"]}
+        }}), encoding="utf-8")
+        config = DatabaseConfig(str(config_path))
+        Base.metadata.create_all(bind=config.engine)
+        
+        leitora, escritora = config.get_session(), config.get_session()
+        autor_id = AutorRepository(escritora).criar(Autor(nome="Original")).id
+        assert AutorRepository(leitora).buscar_por_id(autor_id).nome == "Original"
+        leitora.close()
+        assert AutorRepository(leitora).buscar_por_id(autor_id).nome == "Original"
+        
+        autor = AutorRepository(escritora).buscar_por_id(autor_id)
+        autor.nome = "Alterado"
+        AutorRepository(escritora).atualizar(autor)
+        leitora.close()
+        assert AutorRepository(leitora).buscar_por_id(autor_id).nome == "Alterado"
+        
+        estatisticas = config.get_entity_cache_stats()
+        assert estatisticas["acertos"] >= 1 and estatisticas["invalidacoes"] >= 1
+        leitora.close()
+        escritora.close()
+        config.dispose()
+    
+    def test_escrita_em_outro_processo_nao_e_perdida(self, tmp_path):
+        """Testa que o empréstimo não parte de uma cópia em cache desatualizada por outro processo"""
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps({"database": {
+            "url": f"sqlite:///{tmp_path / 'cache.db'}",
+            "entity_cache": {"max_itens": 100, "ttl": 60, "modelos": ["Livro", "Usuario"]}
+        }}), encoding="utf-8")
+        # Cada DatabaseConfig tem o próprio cache, como processos separados
+        processo_a, processo_b = DatabaseConfig(str(config_path)), DatabaseConfig(str(config_path))
+        Base.metadata.create_all(bind=processo_a.engine)
+        
+        session_a, session_b = processo_a.get_session(), processo_b.get_session()
+        autor = Autor(nome="Machado de Assis")
+        session_a.add(autor)
+        session_a.flush()
+        livro = Livro(titulo="Dom Casmurro", autor_id=autor.id, quantidade_total=3, quantidade_disponivel=3)
+        usuarios = [
+            Usuario(nome=f"Leitor {i}", email=f"leitor{i}@email.com", data_nascimento=date(1990, 1, 1)) for i in range(2)
+        ]
+        session_a.add_all([livro] + usuarios)
+        session_a.commit()
+        livro_id, usuario_ids = livro.id, [usuario.id for usuario in usuarios]
+        session_a.close()
+        
+        LivroRepository(session_a).buscar_por_id(livro_id)
+        session_a.close()
+        EmprestimoService(session_b).criar_emprestimo(livro_id, usuario_ids[0])
+        EmprestimoService(session_a).criar_emprestimo(livro_id, usuario_ids[1])
+        
+        session_b.close()
+        livro = session_b.get(Livro, livro_id)
+        assert (livro.quantidade_disponivel, livro.total_emprestimos) == (1, 2)
+        session_a.close()
+        session_b.close()
+        processo_a.dispose()
+        processo_b.dispose()
@@ -0,0 +1,114 @@
+"""
+Testes unitários para as contagens por faceta do catálogo
+"""
+import pytest
+
+from src.database.facet_cache import CACHE_FACETAS, CacheFacetas
+from src.database.query_plan import capturar_consultas
+from src.models.autor import Autor
+from src.models.livro import Livro
+from src.repositories.livro_repository import LivroRepository, ValorFaceta
+from src.services.facetas_service import FacetasService
+
+
+@pytest.fixture
+def livros(db_session, autor, categoria):
+    """Cria livros de dois autores, um sem categoria e um sem ano"""
+    outro = Autor(nome="José de Alencar")
+    db_session.add(outro)
+    db_session.commit()
+    repo = LivroRepository(db_session)
+    repo.criar_em_lote([
+        Livro(titulo="Dom Casmurro", ano_publicacao=1899, autor_id=autor.id, categoria_id=categoria.id),
+        Livro(titulo="Quincas Borba", ano_publicacao=1891, autor_id=autor.id, categoria_id=categoria.id),
+        Livro(titulo="Esaú e Jacó", ano_publicacao=1904, autor_id=autor.id, disponivel=False),
+        Livro(titulo="Iracema", autor_id=outro.id, categoria_id=categoria.id),
+    ])
+    return repo
+
+
+@pytest.fixture
+def servico(db_session):
+    """Serviço de facetas com o cache ligado à sessão de teste"""
+    db_session.info[CACHE_FACETAS] = CacheFacetas()
+    return FacetasService(db_session)
+
+
+class TestContarFacetas:
+    """Testes para LivroRepository.contar_facetas"""
+    
+    def test_todas_as_facetas_em_uma_consulta(self, db_session, livros, autor, categoria):
+        """Testa contagens, rótulos e ordenação com uma só consulta, um agrupamento por faceta"""
+        with capturar_consultas(db_session.get_bind()) as consultas:
+            facetas = livros.contar_facetas()
+        assert len(consultas) == 1
+        assert consultas[0][0].count("GROUP BY") == 4 and "UNION ALL" in consultas[0][0]
+        
+        assert facetas["categoria"] == [ValorFaceta(categoria.id, "Romance", 3), ValorFaceta(None, "Sem categoria", 1)]
+        assert facetas["autor"][0] == ValorFaceta(autor.id, "Machado de Assis", 3)
+        assert facetas["autor"][1].rotulo == "José de Alencar"
+        assert facetas["disponivel"] == [ValorFaceta(True, "Disponível", 3), ValorFaceta(False, "Indisponível", 1)]
+        assert facetas["decada"] == [
+            ValorFaceta(1890, "Anos 1890", 2), ValorFaceta(1900, "Anos 1900", 1), ValorFaceta(None, "Sem ano", 1)
+        ]
+    
+    def test_facetas_pedidas_e_filtros(self, db_session, livros, autor):
+        """Testa que só as facetas pedidas são contadas, sobre os livros filtrados"""
+        facetas = livros.contar_facetas(["decada"], {"autor_id": autor.id, "disponivel": True})
+        assert facetas == {"decada": [ValorFaceta(1890, "Anos 1890", 2)]}
+        assert livros.contar_facetas(["autor"], {"titulo": "Inexistente"}) == {"autor": []}
+    
+    def test_facetas_invalidas(self, db_session, livros):
+        """Testa que facetas desconhecidas ou ausentes são rejeitadas"""
+        with pytest.raises(ValueError):
+            livros.contar_facetas(["editora"])
+        with pytest.raises(ValueError):
+            livros.contar_facetas([])
+
+
+class TestFacetasService:
+    """Testes do cache de FacetasService"""
+    
+    def test_acerto_sem_consulta(self, db_session, livros, servico):
+        """Testa que a mesma assinatura é servida do cache, com filtros em qualquer ordem"""
+        primeira = servico.contar(["categoria", "decada"], {"disponivel": True, "ano_publicacao": {"gte": 1890}})
+        with capturar_consultas(db_session.get_bind()) as consultas:
+            segunda = servico.contar(["categoria", "decada"], {"ano_publicacao": {"gte": 1890}, "disponivel": True})
+        assert consultas == []
+        assert segunda == primeira
+        assert servico.cache.como_dict()["acertos"] == 1
+    
+    def test_invalidacao_ao_alterar_livros(self, db_session, livros, servico, autor):
+        """Testa que criação, atualização e UPDATE em massa esvaziam o cache"""
+        assert servico.contar(["disponivel"])["disponivel"][0].quantidade == 3
+        
+        livros.criar(Livro(titulo="Helena", autor_id=autor.id))
+        assert len(servico.cache) == 0
+        assert servico.contar(["disponivel"])["disponivel"][0].quantidade == 4
+        
+        livro = livros.buscar_por_titulo("Helena")
+        livro.disponivel = False
+        livros.atualizar(livro)
+        assert servico.contar(["disponivel"])["disponivel"][1].quantidade == 2
+        
+        servico.contar(["disponivel"])
+        livros.atualizar_em_massa({"disponivel": False}, {"disponivel": True})
+        assert len(servico.cache) == 0
+        assert servico.contar(["disponivel"])["disponivel"] == [ValorFaceta(True, "Disponível", 5)]
+    
+    def test_transacao_pendente_nao_alimenta_cache(self, db_session, livros, servico, autor):
+        """Testa que contagens com alterações não confirmadas não são guardadas"""
+        db_session.add(Livro(titulo="Helena", autor_id=autor.id))
+        db_session.flush()
+        servico.contar(["autor"])
+        assert len(servico.cache) == 0
+        
+        db_session.rollback()
+        servico.contar(["autor"])
+        assert len(servico.cache) == 1
+    
+    def test_sem_cache(self, db_session, livros):
+        """Testa o serviço sem o bloco facet_cache configurado"""
+        servico = FacetasService(db_session)
+        assert servico.cache is None
+        assert servico.contar(["autor"]) == servico.contar(["autor"])
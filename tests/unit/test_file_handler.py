@@ -125,3 +125,17 @@ class TestFileHandler:
             handler.ler_configuracao("config_inexistente.json")
     
 
+    
+    def test_exportar_emprestimos_json_de_iterador(self, tmp_path):
+        """Testa exportação em fluxo a partir de um gerador"""
+        handler = FileHandler()
+        arquivo = tmp_path / "historico.json"
+        emprestimos = ({"id": i, "data_emprestimo": date(2024, 1, 1)} for i in range(3))
+        
+        assert handler.exportar_emprestimos_json(emprestimos, str(arquivo)) == 3
+        dados = json.loads(arquivo.read_text(encoding="utf-8"))
+        assert [d["id"] for d in dados] == [0, 1, 2]
+        assert dados[0]["data_emprestimo"] == "2024-01-01"
+        
+        assert handler.exportar_emprestimos_json(iter([]), str(arquivo)) == 0
+        assert json.loads(arquivo.read_text(encoding="utf-8")) == []
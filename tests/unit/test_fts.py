@@ -0,0 +1,131 @@
+"""
+Testes unitários para a busca textual (FTS5)
+"""
+import pytest
+from sqlalchemy import text
+
+from src.database.fts import consulta_textual, consulta_trigramas, criar_indices_textuais, similaridade, trigramas
+from src.models.autor import Autor
+from src.models.livro import Livro
+from src.repositories.livro_repository import LivroRepository
+from src.services.autor_service import AutorService
+from src.services.livro_service import LivroService
+
+
+@pytest.fixture
+def livros(db_session, autor, categoria):
+    """Cria livros com títulos e sinopses variados"""
+    repo = LivroRepository(db_session)
+    dados = [
+        ("Memórias Póstumas de Brás Cubas", "Um defunto autor narra a própria vida."),
+        ("Quincas Borba", "Rubião herda a fortuna e o cão do filósofo Brás."),
+        ("Dom Casmurro", "Bentinho e Capitu, ciúme e memórias."),
+    ]
+    for titulo, sinopse in dados:
+        repo.criar(Livro(titulo=titulo, sinopse=sinopse, autor_id=autor.id, categoria_id=categoria.id))
+    return repo
+
+
+class TestConsultaTextual:
+    """Testes para consulta_textual"""
+    
+    def test_palavras_entre_aspas_e_prefixo(self):
+        """Testa que operadores FTS5 são descartados e a última palavra vira prefixo"""
+        assert consulta_textual('dom "casm') == '"dom" "casm"*'
+        assert consulta_textual("NOT OR*") == '"NOT" "OR"*'
+        assert consulta_textual(" -- ") is None
+        assert consulta_textual("") is None
+
+
+class TestBuscaTextual:
+    """Testes para LivroRepository.buscar_texto e AutorRepository.buscar_texto"""
+    
+    def test_titulo_pesa_mais_que_sinopse(self, db_session, livros):
+        """Testa a ordenação por relevância e a insensibilidade a acentos e maiúsculas"""
+        resultado = livros.buscar_texto("BRAS")
+        assert [l.titulo for l in resultado] == ["Memórias Póstumas de Brás Cubas", "Quincas Borba"]
+        
+        resultado = livros.buscar_texto("memorias")
+        assert resultado[0].titulo == "Memórias Póstumas de Brás Cubas"
+        assert len(resultado) == 2
+    
+    def test_prefixo_filtros_e_limite(self, db_session, livros):
+        """Testa o prefixo da última palavra, os filtros adicionais e o limite"""
+        assert [l.titulo for l in livros.buscar_texto("dom casm")] == ["Dom Casmurro"]
+        assert livros.buscar_texto("memorias", limit=1)[0].titulo == "Memórias Póstumas de Brás Cubas"
+        
+        livro = livros.buscar_por_titulo("Dom Casmurro")
+        livro.disponivel = False
+        livros.atualizar(livro)
+        assert livros.buscar_texto("memorias", {"disponivel": False}) == [livro]
+        assert livros.buscar_texto("!!") == []
+    
+    def test_indice_sincronizado(self, db_session, livros, autor):
+        """Testa que os triggers acompanham atualização, remoção e inserção em lote"""
+        livro = livros.buscar_por_titulo("Quincas Borba")
+        livro.titulo = "Quincas Borba Revisado"
+        livro.sinopse = "Sem o filósofo."
+        livros.atualizar(livro)
+        assert [l.titulo for l in livros.buscar_texto("bras")] == ["Memórias Póstumas de Brás Cubas"]
+        assert livros.buscar_texto("revisado") == [livro]
+        
+        livros.deletar(livro.id)
+        assert livros.buscar_texto("revisado") == []
+        
+        livros.criar_em_lote([Livro(titulo="Helena", autor_id=autor.id), Livro(titulo="Iaiá Garcia", autor_id=autor.id)])
+        assert [l.titulo for l in livros.buscar_texto("iaia")] == ["Iaiá Garcia"]
+    
+    def test_reconstrucao_de_indice_existente(self, db_session, livros):
+        """Testa que criar_indices_textuais preenche um índice esvaziado"""
+        db_session.execute(text("INSERT INTO livros_fts(livros_fts) VALUES ('delete-all')"))
+        db_session.commit()
+        assert livros.buscar_texto("casmurro") == []
+        
+        assert criar_indices_textuais(db_session.get_bind()) == 4
+        assert [l.titulo for l in livros.buscar_texto("casmurro")] == ["Dom Casmurro"]
+    
+    def test_servicos(self, db_session, livros):
+        """Testa a busca textual pelos serviços de livros e autores"""
+        AutorService(db_session).criar_autor(Autor(nome="José de Alencar"))
+        assert [a.nome for a in AutorService(db_session).buscar_texto("jose alen")] == ["José de Alencar"]
+        assert len(LivroService(db_session).buscar_texto("capitu")) == 1
+
+
+class TestBuscaAproximada:
+    """Testes da busca por trigramas (tolerante a erros de digitação)"""
+    
+    def test_trigramas_e_similaridade(self):
+        """Testa os trigramas com bordas e a similaridade de Jaccard"""
+        assert trigramas("dom") == {"  d", " do", "dom", "om "}
+        assert similaridade(trigramas("casmurro"), trigramas("casmurro")) == 1.0
+        assert 0 < similaridade(trigramas("casmuro"), trigramas("casmurro")) < 1
+        assert similaridade(trigramas(""), trigramas("dom")) == 0.0
+        assert consulta_trigramas("do") is None
+        assert consulta_trigramas('a"bc') == '"a""b" OR """bc"'
+    
+    def test_titulos_com_erros_de_digitacao(self, db_session, livros):
+        """Testa o ranking por similaridade e o corte pela similaridade mínima"""
+        candidatos = livros.buscar_titulo_aproximado("dom casmuro")
+        assert candidatos[0].entidade.titulo == "Dom Casmurro"
+        assert candidatos[0].similaridade > 0.5
+        assert all(a.similaridade >= b.similaridade for a, b in zip(candidatos, candidatos[1:]))
+        
+        assert livros.buscar_titulo_aproximado("QUINKAS borba")[0].entidade.titulo == "Quincas Borba"
+        assert livros.buscar_titulo_aproximado("memorias postumas de bras", similaridade_minima=0.99) == []
+        assert livros.buscar_titulo_aproximado("zz") == []
+    
+    def test_indice_acompanha_alteracoes(self, db_session, livros, autor):
+        """Testa que o índice de trigramas segue renomeações e inserções em lote"""
+        livro = livros.buscar_por_titulo("Quincas Borba")
+        livro.titulo = "Helena"
+        livros.atualizar(livro)
+        livros.criar_em_lote([Livro(titulo="Iaiá Garcia", autor_id=autor.id)])
+        
+        assert [c.entidade.titulo for c in livros.buscar_titulo_aproximado("quincas borba")] == []
+        assert livros.buscar_titulo_aproximado("iaia garsia")[0].entidade.titulo == "Iaiá Garcia"
+    
+    def test_autores_pelo_servico(self, db_session, autor):
+        """Testa a busca aproximada de autores pelo serviço"""
+        candidatos = AutorService(db_session).buscar_nome_aproximado("machdo de asis")
+        assert [(c.entidade, round(c.similaridade, 2) > 0.4) for c in candidatos] == [(autor, True)]
+        assert LivroService(db_session).buscar_titulo_aproximado("qualquer") == []
@@ -0,0 +1,103 @@
+"""
+Testes unitários para as chaves de busca normalizadas
+"""
+import pytest
+from datetime import date
+from sqlalchemy import create_engine, insert, text
+
+from src.database.base import Base
+from src.database.init_db import adicionar_colunas
+from src.database.normalizacao import normalizar, preencher_normalizados
+from src.models.autor import Autor
+from src.models.categoria import Categoria
+from src.models.livro import Livro
+from src.models.usuario import Usuario
+from src.repositories.autor_repository import AutorRepository
+from src.repositories.categoria_repository import CategoriaRepository
+from src.repositories.livro_repository import LivroRepository
+from src.repositories.usuario_repository import UsuarioRepository
+
+
+class TestNormalizar:
+    """Testes para normalizar"""
+    
+    def test_remove_acentos_maiusculas_e_espacos(self):
+        """Testa a forma normalizada de textos em português"""
+        assert normalizar("  José   de ALENCAR ") == "jose de alencar"
+        assert normalizar("Iaiá Garcia") == normalizar("IAIA GARCIA") == "iaia garcia"
+        assert normalizar("Ação, Coração") == "acao, coracao"
+        assert normalizar(None) is None
+
+
+class TestColunasNormalizadas:
+    """Testes da manutenção das colunas normalizadas na escrita"""
+    
+    def test_mantidas_no_orm_em_lote_e_em_massa(self, db_session, autor):
+        """Testa criação, alteração, inserção em lote, INSERT direto e UPDATE em massa"""
+        repo = AutorRepository(db_session)
+        assert autor.nome_normalizado == "machado de assis"
+        
+        autor.nome = "Joaquim Maria Machado de Assis"
+        repo.atualizar(autor)
+        assert autor.nome_normalizado == "joaquim maria machado de assis"
+        
+        ids = repo.criar_em_lote([Autor(nome="Érico Veríssimo"), Autor(nome="Clarice Lispector")])
+        db_session.execute(insert(Autor).values(nome="Cecília Meireles"))
+        repo.atualizar_em_massa({"id": ids[1]}, {"nome": "Clarice LISPECTOR"})
+        db_session.expunge_all()
+        
+        chaves = sorted(a.nome_normalizado for a in repo.listar_todos())
+        assert chaves == ["cecilia meireles", "clarice lispector", "erico verissimo", "joaquim maria machado de assis"]
+
+
+class TestBuscasNormalizadas:
+    """Testes das buscas dos repositórios pelas chaves normalizadas"""
+    
+    def test_buscas_ignoram_acentos_e_maiusculas(self, db_session, livro, categoria):
+        """Testa buscar_por_titulo, prefixos e buscar_por_nome dos repositórios"""
+        livros = LivroRepository(db_session)
+        livros.criar(Livro(titulo="Memórias Póstumas de Brás Cubas", autor_id=livro.autor_id))
+        AutorRepository(db_session).criar(Autor(nome="José de Alencar"))
+        UsuarioRepository(db_session).criar(
+            Usuario(nome="Joana Dárc", email="joana@example.com", data_nascimento=date(1990, 1, 1))
+        )
+        
+        assert livros.buscar_por_titulo("DOM CASMURRO") == livro
+        assert [l.titulo for l in livros.buscar_por_prefixo_titulo("memorias")] == ["Memórias Póstumas de Brás Cubas"]
+        assert [a.nome for a in AutorRepository(db_session).buscar_por_nome("jose")] == ["José de Alencar"]
+        assert [u.nome for u in UsuarioRepository(db_session).buscar_por_nome("JOANA D")] == ["Joana Dárc"]
+        assert CategoriaRepository(db_session).buscar_por_nome("romance") == categoria
+        assert livros.buscar_com_filtros({"titulo": {"ieq": "dom casmurro"}}) == [livro]
+    
+    def test_operador_sem_chave_normalizada(self, db_session):
+        """Testa que ieq/iprefixo exigem um campo com chave normalizada"""
+        with pytest.raises(ValueError):
+            LivroRepository(db_session).buscar_com_filtros({"editora": {"iprefixo": "atica"}})
+        with pytest.raises(ValueError):
+            LivroRepository(db_session)._buscar_prefixo("editora", "atica")
+
+
+class TestPreencherNormalizados:
+    """Testes para preencher_normalizados em bancos anteriores às colunas"""
+    
+    def test_adiciona_e_preenche_colunas(self, tmp_path):
+        """Testa que a coluna criada por adicionar_colunas é preenchida nas linhas existentes"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'antigo.db'}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            # Banco anterior às colunas normalizadas: sem a coluna, seu índice e os trigramas
+            for sufixo in ("ai", "ad", "au"):
+                conn.execute(text(f"DROP TRIGGER autores_trigramas_{sufixo}"))
+            conn.execute(text("DROP TABLE autores_trigramas"))
+            conn.execute(text("DROP INDEX ix_autores_nome_normalizado"))
+            conn.execute(text("ALTER TABLE autores DROP COLUMN nome_normalizado"))
+            conn.execute(text(
+                "INSERT INTO autores (nome, created_at, updated_at) VALUES ('Graciliano Ramos', '2020-01-01', '2020-01-01')"
+            ))
+        
+        assert adicionar_colunas(engine) == ["autores.nome_normalizado"]
+        assert preencher_normalizados(engine) == 1
+        assert preencher_normalizados(engine) == 0
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT nome_normalizado FROM autores")).scalar() == "graciliano ramos"
+        engine.dispose()
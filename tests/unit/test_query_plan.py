@@ -0,0 +1,174 @@
+"""
+Testes de plano de consulta: nenhum método de repositório pode varrer tabelas inteiras
+"""
+import inspect
+import pytest
+from datetime import date
+
+from src.database.query_plan import capturar_consultas, explicar, varreduras_completas, eh_varredura_completa
+from src.repositories.filtros import indices_filtros
+from src.repositories.paginacao import codificar_cursor
+from src.models.livro import Livro
+from src.repositories.livro_repository import LivroRepository
+from src.repositories.usuario_repository import UsuarioRepository
+from src.repositories.emprestimo_repository import EmprestimoRepository
+from src.repositories.autor_repository import AutorRepository
+from src.repositories.categoria_repository import CategoriaRepository
+
+
+# Métodos cuja varredura completa é esperada (listagens sem filtro, exportações em
+# fluxo, agregações sobre o catálogo filtrado)
+ISENTOS = {
+    "listar_todos",
+    "iterar",
+    ("EmprestimoRepository", "iterar_historico"),
+    "buscar_com_filtros",
+    "buscar_pagina",
+    ("LivroRepository", "contar_facetas"),
+}
+
+# Chamadas de exemplo para cada método de leitura, por repositório
+CHAMADAS = {
+    LivroRepository: {
+        "buscar_por_id": lambda r: r.buscar_por_id(1),
+        "buscar_por_titulo": lambda r: r.buscar_por_titulo("Dom Casmurro"),
+        "buscar_por_prefixo_titulo": lambda r: r.buscar_por_prefixo_titulo("dom"),
+        "buscar_titulo_aproximado": lambda r: r.buscar_titulo_aproximado("dom casmuro"),
+        "buscar_disponiveis": lambda r: r.buscar_disponiveis(),
+        "contar_disponiveis": lambda r: r.contar_disponiveis(),
+        "buscar_por_autor": lambda r: r.buscar_por_autor(1),
+        "buscar_por_categoria": lambda r: r.buscar_por_categoria(1),
+        "buscar_texto": lambda r: r.buscar_texto("dom casmurro", {"disponivel": True}),
+        "buscar_mais_emprestados": lambda r: r.buscar_mais_emprestados(),
+    },
+    UsuarioRepository: {
+        "buscar_por_id": lambda r: r.buscar_por_id(1),
+        "buscar_por_email": lambda r: r.buscar_por_email("joao@example.com"),
+        "buscar_ativos": lambda r: r.buscar_ativos(),
+        "buscar_por_nome": lambda r: r.buscar_por_nome("joao"),
+    },
+    EmprestimoRepository: {
+        "buscar_por_id": lambda r: r.buscar_por_id(1),
+        "buscar_por_usuario": lambda r: r.buscar_por_usuario(1),
+        "buscar_por_livro": lambda r: r.buscar_por_livro(1),
+        "buscar_ativos": lambda r: r.buscar_ativos(),
+        "buscar_atrasados": lambda r: r.buscar_atrasados(),
+        "buscar_por_usuario_ativos": lambda r: r.buscar_por_usuario_ativos(1),
+        "contar_ativos_por_usuario": lambda r: r.contar_ativos_por_usuario(1),
+        "contar_atrasados": lambda r: r.contar_atrasados(),
+        "buscar_ids_para_arquivar": lambda r: r.buscar_ids_para_arquivar(date(2020, 1, 1), 500),
+        "buscar_por_usuario[arquivo]": lambda r: r.buscar_por_usuario(1, incluir_arquivo=True),
+        "buscar_por_livro[arquivo]": lambda r: r.buscar_por_livro(1, incluir_arquivo=True),
+    },
+    AutorRepository: {
+        "buscar_por_id": lambda r: r.buscar_por_id(1),
+        "buscar_texto": lambda r: r.buscar_texto("machado"),
+        "buscar_por_nome": lambda r: r.buscar_por_nome("machado"),
+        "buscar_nome_aproximado": lambda r: r.buscar_nome_aproximado("machdo"),
+    },
+    CategoriaRepository: {
+        "buscar_por_id": lambda r: r.buscar_por_id(1),
+        "buscar_por_nome": lambda r: r.buscar_por_nome("Romance"),
+    },
+}
+
+# Métodos herdados de BaseRepository, verificados em todos os repositórios
+for _metodos in CHAMADAS.values():
+    _metodos["ids_existentes"] = lambda r: r.ids_existentes([1, 2, 3])
+    _metodos["contar"] = lambda r: r.contar({"id": {"gt": 10}})
+    _metodos["existe"] = lambda r: r.existe({"id": 1})
+    # A partir da segunda página a paginação por cursor busca pelo índice
+    _metodos["listar_pagina"] = lambda r: r.listar_pagina(cursor=codificar_cursor(r.model_class(id=1), "id"))
+CHAMADAS[LivroRepository]["listar_pagina[titulo]"] = lambda r: r.listar_pagina(
+    cursor=codificar_cursor(Livro(id=1, titulo="Dom Casmurro"), "titulo"), ordenar_por="titulo"
+)
+CHAMADAS[LivroRepository]["listar_pagina[titulo desc]"] = lambda r: r.listar_pagina(
+    cursor=codificar_cursor(Livro(id=1, titulo="Dom Casmurro"), "titulo", True), ordenar_por="titulo", ordem_desc=True
+)
+CHAMADAS[UsuarioRepository]["emails_existentes"] = lambda r: r.emails_existentes(["a@example.com", "b@example.com"])
+
+# Métodos de escrita: o plano das leituras internas é coberto por buscar_por_id
+ESCRITAS = {
+    "criar", "criar_em_lote", "atualizar", "deletar", "mover_para_arquivo",
+    "atualizar_em_massa", "deletar_em_massa", "reconciliar_contadores",
+}
+
+
+def _metodos_publicos(classe):
+    return {
+        nome for nome, _ in inspect.getmembers(classe, inspect.isfunction)
+        if not nome.startswith("_")
+    }
+
+
+class TestPlanosDeConsulta:
+    """Verifica com EXPLAIN QUERY PLAN que os filtros dos repositórios usam índices"""
+    
+    @pytest.mark.parametrize("classe", list(CHAMADAS), ids=lambda c: c.__name__)
+    def test_todos_os_metodos_estao_cobertos(self, classe):
+        """Garante que todo método público novo seja incluído na verificação"""
+        cobertos = set(CHAMADAS[classe]) | ESCRITAS
+        for nome in _metodos_publicos(classe) - cobertos:
+            assert nome in ISENTOS or (classe.__name__, nome) in ISENTOS, (
+                f"{classe.__name__}.{nome} não tem verificação de plano de consulta"
+            )
+    
+    @pytest.mark.parametrize(
+        "classe,metodo",
+        [(classe, metodo) for classe, metodos in CHAMADAS.items() for metodo in metodos],
+        ids=lambda v: v if isinstance(v, str) else v.__name__
+    )
+    def test_metodo_nao_faz_varredura_completa(self, db_session, classe, metodo):
+        """Falha se algum SELECT do método varrer a tabela inteira"""
+        engine = db_session.get_bind()
+        repo = classe(db_session)
+        
+        varreduras = varreduras_completas(engine, lambda: CHAMADAS[classe][metodo](repo))
+        assert varreduras == [], f"{classe.__name__}.{metodo}: {varreduras}"
+    
+    def test_detecta_varredura_completa(self, db_session):
+        """Testa que o verificador reconhece uma varredura completa"""
+        engine = db_session.get_bind()
+        repo = AutorRepository(db_session)
+        
+        varreduras = varreduras_completas(engine, lambda: repo.buscar_com_filtros({"nacionalidade": "BR"}))
+        assert len(varreduras) == 1
+        assert "autores" in varreduras[0].detalhe
+    
+    def test_classificacao_das_linhas_do_plano(self):
+        """Testa a classificação das linhas do EXPLAIN QUERY PLAN"""
+        assert eh_varredura_completa("SCAN livros")
+        assert eh_varredura_completa("SCAN TABLE livros")
+        assert not eh_varredura_completa("SCAN livros USING INDEX ix_livros_titulo")
+        assert not eh_varredura_completa("SCAN livros_fts VIRTUAL TABLE INDEX 0:M2")
+        assert not eh_varredura_completa("SEARCH emprestimos USING INDEX ix_emprestimos_usuario_devolvido (usuario_id=? AND devolvido=?)")
+    
+    @pytest.mark.parametrize("filtros", [
+        {"titulo": {"prefixo": "Dom"}},
+        {"autor_id": {"in": [1, 2, 3]}},
+        {"id": {"between": [1, 10]}},
+        {"categoria_id": {"isnull": True}},
+        {"ou": [{"autor_id": 1}, {"categoria_id": {"gte": 2}}]},
+        {"titulo": {"iprefixo": "memorias"}},
+        {"titulo": {"ieq": "Dom Casmurro"}},
+    ], ids=["prefixo", "in", "between", "isnull", "ou", "iprefixo", "ieq"])
+    def test_indices_informados_sao_usados(self, db_session, filtros):
+        """Testa que o índice que indices_filtros informa é o usado pelo SQLite"""
+        engine = db_session.get_bind()
+        indices = [indice for _, _, indice in indices_filtros(Livro, filtros)]
+        assert indices and all(indices)
+        
+        with capturar_consultas(engine) as consultas:
+            LivroRepository(db_session).buscar_com_filtros(filtros)
+        detalhes = [detalhe for sql, parametros in consultas for detalhe in explicar(engine, sql, parametros)]
+        assert all(any(indice in detalhe for detalhe in detalhes) for indice in indices), detalhes
+        assert not any(eh_varredura_completa(detalhe) for detalhe in detalhes)
+    
+    def test_operadores_sem_indice(self):
+        """Testa que like e ne são informados como condições sem índice"""
+        assert indices_filtros(Livro, {"titulo": {"like": "Dom%"}, "autor_id": {"ne": 1}, "inexistente": 1}) == [
+            ("titulo", "like", None), ("autor_id", "ne", None)
+        ]
+        assert indices_filtros(Livro, {"titulo": {"iprefixo": "dom"}}) == [
+            ("titulo", "iprefixo", "ix_livros_titulo_normalizado")
+        ]
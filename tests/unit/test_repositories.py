@@ -2,6 +2,7 @@
 Testes unitários para repositórios
 """
 import pytest
+from sqlalchemy.exc import InvalidRequestError
 
 from src.repositories.livro_repository import LivroRepository
 from src.repositories.usuario_repository import UsuarioRepository
@@ -13,6 +14,7 @@ from src.models.usuario import Usuario
 from src.models.emprestimo import Emprestimo
 from src.models.autor import Autor
 from src.models.categoria import Categoria
+from src.database.query_plan import capturar_consultas
 from datetime import date, timedelta
 
 
@@ -119,4 +121,43 @@ class TestEmprestimoRepository:
         
         emprestimos = repo.buscar_atrasados()
         assert len(emprestimos) > 0
-
+    
+    def test_plano_de_carregamento_evita_n_mais_1(self, db_session, livro):
+        """Testa que o plano carrega livro e usuário sem uma consulta por empréstimo"""
+        repo = EmprestimoRepository(db_session)
+        titulo = livro.titulo
+        for i in range(5):
+            usuario = Usuario(nome=f"Leitor {i}", email=f"leitor{i}@example.com", data_nascimento=date(1990, 1, 1))
+            db_session.add(usuario)
+            db_session.flush()
+            db_session.add(Emprestimo(
+                livro_id=livro.id,
+                usuario_id=usuario.id,
+                data_emprestimo=date.today(),
+                data_prevista_devolucao=date.today() + timedelta(days=14)
+            ))
+        db_session.commit()
+        db_session.expunge_all()
+        
+        with capturar_consultas(db_session.get_bind()) as consultas:
+            emprestimos = repo.buscar_ativos(carregar="emprestimo_com_livro_e_usuario")
+            nomes = [e.usuario.nome for e in emprestimos]
+            titulos = {e.livro.titulo for e in emprestimos}
+        assert len(consultas) == 1
+        assert len(nomes) == 5 and titulos == {titulo}
+        
+        db_session.expunge_all()
+        emprestimo = repo.buscar_por_id(1, carregar={"livro.autor": "selectin", "usuario": "raise"})
+        assert emprestimo.livro.autor.nome
+        with pytest.raises(InvalidRequestError):
+            emprestimo.usuario
+    
+    def test_plano_de_carregamento_invalido(self, db_session):
+        """Testa a rejeição de planos, estratégias e relacionamentos desconhecidos"""
+        repo = EmprestimoRepository(db_session)
+        with pytest.raises(ValueError):
+            repo.buscar_ativos(carregar="plano_inexistente")
+        with pytest.raises(ValueError):
+            repo.listar_todos(carregar={"livro": "ansioso"})
+        with pytest.raises(ValueError):
+            repo.buscar_por_id(1, carregar={"livro.editora": "joined"})
@@ -0,0 +1,156 @@
+"""
+Testes unitários para a repetição de transações bloqueadas
+"""
+import sqlite3
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.database.base import Base
+from src.database.retry import PoliticaRetry, POLITICA_RETRY, eh_erro_de_lock
+from src.models.autor import Autor
+from src.models.livro import Livro
+from src.repositories.autor_repository import AutorRepository
+from src.repositories.livro_repository import LivroRepository
+from src.services.autor_service import AutorService
+from src.services.livro_service import LivroService
+
+
+def erro_lock():
+    return OperationalError("INSERT ...", {}, sqlite3.OperationalError("database is locked"))
+
+
+class TestPoliticaRetry:
+    """Testes para PoliticaRetry"""
+    
+    def test_pausa_exponencial_limitada(self):
+        """Testa o crescimento exponencial da pausa até o limite"""
+        politica = PoliticaRetry(espera_inicial=0.1, espera_maxima=0.5, jitter=False)
+        assert [politica.pausa(n) for n in range(1, 5)] == [0.1, 0.2, 0.4, 0.5]
+    
+    def test_jitter_nao_passa_do_limite(self):
+        """Testa que o jitter sorteia entre zero e o limite"""
+        politica = PoliticaRetry(espera_inicial=0.1, espera_maxima=0.5)
+        assert all(0 <= politica.pausa(3) <= 0.4 for _ in range(50))
+    
+    def test_repete_ate_conseguir(self, db_session):
+        """Testa que falhas de lock são repetidas e contabilizadas"""
+        pausas = []
+        politica = PoliticaRetry(dormir=pausas.append, jitter=False)
+        falhas = [erro_lock(), erro_lock()]
+        
+        def operacao():
+            if falhas:
+                raise falhas.pop()
+            return "ok"
+        
+        assert politica.executar(db_session, operacao) == "ok"
+        assert pausas == [0.05, 0.1]
+        metricas = politica.metricas.como_dict()
+        assert metricas["operacoes_repetidas"] == 1
+        assert metricas["repeticoes"] == 2
+        assert metricas["tempo_espera_lock"] >= 0.15
+    
+    def test_esgota_tentativas(self, db_session):
+        """Testa que a exceção é propagada após a última tentativa"""
+        politica = PoliticaRetry(tentativas=3, dormir=lambda s: None)
+        
+        def operacao():
+            raise erro_lock()
+        
+        with pytest.raises(OperationalError):
+            politica.executar(db_session, operacao)
+        assert politica.metricas.como_dict()["esgotadas"] == 1
+        assert politica.metricas.como_dict()["repeticoes"] == 2
+    
+    def test_outros_erros_nao_sao_repetidos(self, db_session):
+        """Testa que erros que não são de lock falham imediatamente"""
+        chamadas = []
+        politica = PoliticaRetry(dormir=lambda s: None)
+        
+        def operacao():
+            chamadas.append(1)
+            raise OperationalError("SELECT", {}, sqlite3.OperationalError("no such table: x"))
+        
+        with pytest.raises(OperationalError):
+            politica.executar(db_session, operacao)
+        assert chamadas == [1]
+        assert not eh_erro_de_lock(ValueError("database is locked"))
+    
+    def test_parametros_invalidos(self):
+        """Testa a validação dos parâmetros"""
+        with pytest.raises(ValueError):
+            PoliticaRetry(tentativas=0)
+        with pytest.raises(ValueError):
+            PoliticaRetry(multiplicador=0.5)
+
+
+class TestTransacionalComRetry:
+    """Testes da repetição integrada ao decorador transacional"""
+    
+    def test_repete_a_operacao_inteira(self, db_session):
+        """Testa que o método de serviço é refeito do início após o rollback"""
+        class RepoInstavel(AutorRepository):
+            falhas = 1
+            
+            def criar(self, entidade):
+                entidade = super().criar(entidade)
+                if RepoInstavel.falhas:
+                    RepoInstavel.falhas -= 1
+                    raise erro_lock()
+                return entidade
+        
+        db_session.info[POLITICA_RETRY] = PoliticaRetry(dormir=lambda s: None)
+        service = AutorService(db_session, autor_repo=RepoInstavel(db_session))
+        
+        autor = service.criar_autor(Autor(nome="Machado de Assis"))
+        
+        assert autor.id is not None
+        assert [a.nome for a in AutorRepository(db_session).listar_todos()] == ["Machado de Assis"]
+        assert db_session.info[POLITICA_RETRY].metricas.como_dict()["repeticoes"] == 1
+    
+    def test_repete_criacao_em_lote(self, db_session, autor):
+        """Testa que um lock no commit de criar_livros_em_lote é repetido com os livros intactos"""
+        falhas = [erro_lock()]
+        
+        def commit_bloqueado(session):
+            if falhas:
+                raise falhas.pop()
+        
+        event.listen(db_session, "before_commit", commit_bloqueado)
+        db_session.info[POLITICA_RETRY] = PoliticaRetry(dormir=lambda s: None)
+        livros = [Livro(titulo=f"Livro {i}", autor_id=autor.id, quantidade_total=1) for i in range(3)]
+        try:
+            ids = LivroService(db_session).criar_livros_em_lote(livros)
+        finally:
+            event.remove(db_session, "before_commit", commit_bloqueado)
+        
+        assert ids == [livro.id for livro in livros]
+        assert all(livro in db_session for livro in livros)
+        assert [l.titulo for l in LivroRepository(db_session).listar_todos()] == ["Livro 0", "Livro 1", "Livro 2"]
+        assert db_session.info[POLITICA_RETRY].metricas.como_dict()["repeticoes"] == 1
+    
+    def test_contencao_real_de_lock(self, tmp_path):
+        """Testa a repetição quando outra conexão segura o lock de escrita"""
+        arquivo = tmp_path / "lock.db"
+        engine = create_engine(f"sqlite:///{arquivo}", connect_args={"timeout": 0})
+        Base.metadata.create_all(bind=engine)
+        
+        bloqueador = sqlite3.connect(str(arquivo), isolation_level=None)
+        bloqueador.execute("BEGIN IMMEDIATE")
+        
+        def liberar(pausa):
+            if bloqueador.in_transaction:
+                bloqueador.execute("ROLLBACK")
+        
+        politica = PoliticaRetry(dormir=liberar)
+        session = sessionmaker(bind=engine, info={POLITICA_RETRY: politica})()
+        try:
+            autor = AutorService(session).criar_autor(Autor(nome="Clarice Lispector"))
+            assert autor.id is not None
+            assert politica.metricas.como_dict()["repeticoes"] == 1
+        finally:
+            session.close()
+            bloqueador.close()
+            engine.dispose()
@@ -66,6 +66,36 @@ class TestLivroService:
         assert resultado is True
         with pytest.raises(EntidadeNaoEncontradaException):
             livro_service.buscar_por_id(livro.id)
+    
+    def test_criar_livros_em_lote(self, livro_service, autor, categoria):
+        """Testa criação de livros em lote"""
+        livros = [
+            Livro(titulo=f"Livro {i}", autor_id=autor.id, categoria_id=categoria.id, quantidade_total=2)
+            for i in range(5)
+        ]
+        ids = livro_service.criar_livros_em_lote(livros, tamanho_lote=2)
+        assert len(ids) == 5
+        assert livro_service.buscar_por_id(ids[-1]).quantidade_disponivel == 2
+    
+    def test_criar_livros_em_lote_valida_antes_de_gravar(self, livro_service, autor):
+        """Testa que uma referência inválida em qualquer bloco impede todas as gravações"""
+        livros = [Livro(titulo=f"Livro {i}", autor_id=autor.id, quantidade_total=1) for i in range(3)]
+        livros.append(Livro(titulo="Órfão", autor_id=999, quantidade_total=1))
+        
+        with pytest.raises(EntidadeNaoEncontradaException):
+            livro_service.criar_livros_em_lote(livros, tamanho_lote=2)
+        assert livro_service.listar_todos() == []
+    
+    def test_listar_pagina_por_titulo(self, livro_service, autor):
+        """Testa a paginação por cursor ordenada por título"""
+        livro_service.criar_livros_em_lote(
+            [Livro(titulo=t, autor_id=autor.id, quantidade_total=1) for t in ["C", "A", "D", "B"]]
+        )
+        primeira = livro_service.listar_pagina(limit=3, ordenar_por="titulo")
+        segunda = livro_service.listar_pagina(primeira.proximo_cursor, limit=3, ordenar_por="titulo")
+        
+        assert [l.titulo for l in primeira] + [l.titulo for l in segunda] == ["A", "B", "C", "D"]
+        assert not segunda.tem_proxima
 
 
 class TestUsuarioService:
@@ -115,6 +145,34 @@ class TestUsuarioService:
         dados = {"nome": "Nome Atualizado"}
         usuario_atualizado = usuario_service.atualizar_usuario(usuario.id, dados)
         assert usuario_atualizado.nome == "Nome Atualizado"
+    
+    def test_desativar_usuarios(self, usuario_service, usuario):
+        """Testa a desativação em massa por filtro"""
+        usuario_service.criar_usuarios_em_lote([
+            Usuario(nome=f"Lote {i}", email=f"massa{i}@example.com", data_nascimento=date(1990, 1, 1))
+            for i in range(3)
+        ])
+        
+        assert usuario_service.desativar_usuarios({"email": {"like": "massa%"}}) == 3
+        assert usuario_service.desativar_usuarios({"email": {"like": "massa%"}}) == 0
+        assert usuario.ativo
+        assert [u.ativo for u in usuario_service.buscar_com_filtros({"email": {"like": "massa%"}})] == [False] * 3
+    
+    def test_criar_usuarios_em_lote(self, usuario_service, usuario):
+        """Testa criação de usuários em lote e a rejeição de emails já cadastrados"""
+        novos = [
+            Usuario(nome=f"Usuário {i}", email=f"lote{i}@example.com", data_nascimento=date(1990, 1, 1))
+            for i in range(4)
+        ]
+        assert len(usuario_service.criar_usuarios_em_lote(novos, tamanho_lote=3)) == 4
+        
+        repetidos = [
+            Usuario(nome="Outro", email="outro@example.com", data_nascimento=date(1990, 1, 1)),
+            Usuario(nome="Duplicado", email=usuario.email, data_nascimento=date(1990, 1, 1)),
+        ]
+        with pytest.raises(ValidacaoException):
+            usuario_service.criar_usuarios_em_lote(repetidos)
+        assert usuario_service.usuario_repo.buscar_por_email("outro@example.com") is None
 
 
 class TestEmprestimoService:
@@ -158,6 +216,16 @@ class TestEmprestimoService:
         with pytest.raises(LimiteEmprestimosException):
             emprestimo_service.criar_emprestimo(livro.id, usuario.id)
     
+    def test_limite_usa_contagem(self, emprestimo_service, livro, usuario, db_session):
+        """Testa que o limite e pode_emprestar contam sem carregar os empréstimos"""
+        emprestimo_service.criar_emprestimo(livro.id, usuario.id)
+        db_session.expire(usuario)
+        
+        assert emprestimo_service.emprestimo_repo.contar_ativos_por_usuario(usuario.id) == 1
+        assert usuario.pode_emprestar(max_emprestimos=2) is True
+        assert usuario.pode_emprestar(max_emprestimos=1) is False
+        assert "emprestimos" not in usuario.__dict__
+    
     def test_criar_emprestimo_idade_insuficiente(self, emprestimo_service, livro, db_session):
         """Testa criação de empréstimo com idade insuficiente"""
         usuario_jovem = Usuario(
@@ -0,0 +1,90 @@
+"""
+Testes unitários para UnitOfWork
+"""
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import event
+
+from src.database.unit_of_work import UnitOfWork, em_unidade_de_trabalho
+from src.repositories.autor_repository import AutorRepository
+from src.repositories.emprestimo_repository import EmprestimoRepository
+from src.services.emprestimo_service import EmprestimoService
+from src.models.autor import Autor
+from src.models.livro import Livro
+from src.models.usuario import Usuario
+
+
+@pytest.fixture
+def contador_commits(db_session):
+    """Conta os commits efetivos da sessão"""
+    commits = []
+    event.listen(db_session, "after_commit", lambda session: commits.append(1))
+    return commits
+
+
+class TestUnitOfWork:
+    """Testes para UnitOfWork"""
+    
+    def test_repositorio_apenas_faz_flush_dentro_da_unidade(self, db_session, contador_commits):
+        """Testa que as escritas dentro do bloco geram um único commit"""
+        repo = AutorRepository(db_session)
+        
+        with UnitOfWork(db_session):
+            assert em_unidade_de_trabalho(db_session)
+            autor_a = repo.criar(Autor(nome="Autor A"))
+            autor_b = repo.criar(Autor(nome="Autor B"))
+            assert autor_a.id is not None and autor_b.id is not None
+            assert contador_commits == []
+        
+        assert not em_unidade_de_trabalho(db_session)
+        assert len(contador_commits) == 1
+        assert len(repo.listar_todos()) == 2
+    
+    def test_rollback_quando_excecao(self, db_session):
+        """Testa que uma exceção desfaz todas as escritas do bloco"""
+        repo = AutorRepository(db_session)
+        
+        with pytest.raises(RuntimeError):
+            with UnitOfWork(db_session):
+                repo.criar(Autor(nome="Autor A"))
+                raise RuntimeError("falha")
+        
+        assert repo.listar_todos() == []
+    
+    def test_unidades_aninhadas_compartilham_transacao(self, db_session, contador_commits):
+        """Testa que blocos aninhados só fazem commit no bloco externo"""
+        repo = AutorRepository(db_session)
+        
+        with UnitOfWork(db_session):
+            with UnitOfWork(db_session):
+                repo.criar(Autor(nome="Autor A"))
+            assert contador_commits == []
+        
+        assert len(contador_commits) == 1
+
+
+class TestEmprestimoAtomico:
+    """Testes de atomicidade das regras de empréstimo"""
+    
+    def test_criar_emprestimo_um_commit(self, emprestimo_service, livro, usuario, contador_commits):
+        """Testa que criar um empréstimo faz um único commit"""
+        emprestimo_service.criar_emprestimo(livro.id, usuario.id)
+        assert len(contador_commits) == 1
+        assert livro.quantidade_disponivel == 4
+    
+    def test_criar_emprestimo_desfaz_livro_se_insercao_falhar(self, db_session, livro, usuario):
+        """Testa que a baixa do livro e os contadores são desfeitos se a gravação do empréstimo falhar"""
+        # O limite é verificado pelo contador do usuário, abaixo do máximo
+        usuario.emprestimos_ativos = 1
+        db_session.commit()
+        emprestimo_repo = Mock(spec=EmprestimoRepository)
+        emprestimo_repo.criar.side_effect = RuntimeError("falha na gravação")
+        service = EmprestimoService(db_session, emprestimo_repo=emprestimo_repo)
+        
+        with pytest.raises(RuntimeError):
+            service.criar_emprestimo(livro.id, usuario.id)
+        
+        livro_recarregado = db_session.get(Livro, livro.id)
+        assert livro_recarregado.quantidade_disponivel == 5
+        assert livro_recarregado.total_emprestimos == 0
+        assert db_session.get(Usuario, usuario.id).emprestimos_ativos == 1